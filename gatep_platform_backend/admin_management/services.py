@@ -5,7 +5,7 @@ from decimal import Decimal
 
 # Import all necessary models
 from talent_management.models import CustomUser
-from employer_management.models import Application, JobPosting, Company, UserRole, JobStatus
+from employer_management.models import Application, JobPosting, JobSkill, Company, UserRole, JobStatus
 
 def _calculate_growth(current_value, previous_value):
     """Helper function to calculate percentage growth, handling division by zero."""
@@ -94,24 +94,22 @@ def get_regional_performance_data(date_ranges):
     results.sort(key=lambda x: x['placements'], reverse=True)
     return results
 
+def _published_job_skill_counts(date_range):
+    """Counter of skill name -> published job postings requiring it, from the JobSkill join table."""
+    rows = JobSkill.objects.filter(
+        job_posting__created_at__range=(date_range['start'], date_range['end']),
+        job_posting__status=JobStatus.PUBLISHED,
+    ).values('skill__name').annotate(mentions=Count('job_posting', distinct=True))
+    return Counter({row['skill__name']: row['mentions'] for row in rows})
+
 def get_skills_in_demand_data(date_ranges):
     """Finds the most frequently requested skills from job postings."""
     
     # --- Skills in Current Period ---
-    current_postings = JobPosting.objects.filter(created_at__range=(date_ranges['current']['start'], date_ranges['current']['end']), status=JobStatus.PUBLISHED)
-    current_skills_flat_list = []
-    for skills in current_postings.values_list('required_skills', flat=True):
-        if isinstance(skills, list):
-            current_skills_flat_list.extend(skills)
-    current_skill_counts = Counter(current_skills_flat_list)
+    current_skill_counts = _published_job_skill_counts(date_ranges['current'])
 
     # --- Skills in Previous Period ---
-    previous_postings = JobPosting.objects.filter(created_at__range=(date_ranges['previous']['start'], date_ranges['previous']['end']), status=JobStatus.PUBLISHED)
-    previous_skills_flat_list = []
-    for skills in previous_postings.values_list('required_skills', flat=True):
-        if isinstance(skills, list):
-            previous_skills_flat_list.extend(skills)
-    previous_skill_counts = Counter(previous_skills_flat_list)
+    previous_skill_counts = _published_job_skill_counts(date_ranges['previous'])
 
     results = []
     # Use the top 5 skills from the current period as the baseline
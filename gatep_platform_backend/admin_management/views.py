@@ -8,7 +8,7 @@ from django.db.models import Avg, Count
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from talent_management.models import CustomUser, Resume
+from talent_management.models import CustomUser, Resume, ResumeSkill
 from employer_management.models import Application, JobPosting
 from django.utils import timezone
 
@@ -125,28 +125,21 @@ class GlobalOverviewAPIView(APIView):
             })
  
         # ------------------ Skills in High Demand ------------------
-        resumes = Resume.objects.filter(talent_id__in=base_applications.values_list('talent', flat=True))
-        skill_counts = {}
-        for resume in resumes:
-            if not resume.skills:
-                continue
-            try:
-                skills = json.loads(resume.skills) if resume.skills.startswith("[") else resume.skills.split(",")
-            except:
-                skills = resume.skills.split(",")
-            for skill in skills:
-                clean_skill = skill.strip().strip('"').strip("'")
-                if clean_skill:
-                    skill_counts[clean_skill] = skill_counts.get(clean_skill, 0) + 1
- 
-        max_skill_placements = max(skill_counts.values()) if skill_counts else 1
+        top_skills = list(
+            ResumeSkill.objects.filter(resume__talent_id__in=base_applications.values_list('talent', flat=True))
+            .values('skill__name')
+            .annotate(placements=Count('resume', distinct=True))
+            .order_by('-placements', 'skill__name')[:10]
+        )
+ 
+        max_skill_placements = top_skills[0]['placements'] if top_skills else 1
         skills_data = [
             {
-                "skill": skill,
-                "placements": count,
-                "growth": round((count / max_skill_placements) * 100, 2)
+                "skill": row['skill__name'],
+                "placements": row['placements'],
+                "growth": round((row['placements'] / max_skill_placements) * 100, 2)
             }
-            for skill, count in sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+            for row in top_skills
         ]
  
         # ------------------ Final Response ------------------
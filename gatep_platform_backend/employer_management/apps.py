@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EmployerManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employer_management'
+
+    def ready(self):
+        # Keeps the JobCandidateMatch table and the job search index in step with resume and job posting changes.
+        from . import signals  # noqa: F401
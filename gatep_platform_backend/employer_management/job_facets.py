@@ -0,0 +1,289 @@
+# employer_management/job_facets.py
+"""
+Server-side filtering of open job postings (published and active) with facet
+counts for the current filter state.
+
+Filters: job_type, experience_level, location and salary_band take one or more
+values and match any of them; remote_work and visa_sponsorship take true/false;
+skills take one or more skill names and match postings requiring all of them.
+
+Each facet is counted over the postings matching every *other* filter, so a
+facet shows what picking another value would give (skills narrow the result, so
+their counts include the skills already picked). The counts are GROUP BY queries
+served by the (status, is_active, ...) composite indexes on JobPosting and are
+cached per filter state in the "job_facets" cache. Saving a posting (publishing,
+closing and editing included) bumps the cache version, which drops every cached
+count at once; entries also expire after JOB_FACET_CACHE_SECONDS, which bounds
+how stale another process's copy can be when the cache is not shared (no REDIS_URL).
+"""
+
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Case, CharField, Count, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Coalesce
+
+from talent_management.skill_taxonomy import known_skill_ids, parse_skill_list, resolve_skills
+
+from .models import ExperienceLevel, JobPosting, JobSkill, JobStatus, JobType
+
+CACHE_ALIAS = "job_facets"
+_VERSION_KEY = "job_facets:version"
+LOCATION_FACET_SIZE = 20
+SKILL_FACET_SIZE = 30
+MAX_FILTER_VALUES = 20
+
+# Bands of the top of the advertised range (salary_max, else salary_min), in the
+# posting's own currency: (key, lower bound inclusive, upper bound exclusive).
+SALARY_BANDS = [
+    ("under_50k", None, 50000),
+    ("50k_100k", 50000, 100000),
+    ("100k_150k", 100000, 150000),
+    ("150k_200k", 150000, 200000),
+    ("200k_plus", 200000, None),
+]
+SALARY_NOT_SPECIFIED = "not_specified"
+
+MULTI_VALUE_FILTERS = ("job_type", "experience_level", "location", "salary_band", "skills")
+BOOLEAN_FILTERS = ("remote_work", "visa_sponsorship")
+_CHOICES = {
+    "job_type": set(JobType.values),
+    "experience_level": set(ExperienceLevel.values),
+    "salary_band": {key for key, _, _ in SALARY_BANDS} | {SALARY_NOT_SPECIFIED},
+}
+
+
+class FilterError(ValueError):
+    pass
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def open_postings():
+    return JobPosting.objects.filter(status=JobStatus.PUBLISHED, is_active=True)
+
+
+# --- Filter state -----------------------------------------------------------------
+
+def parse_filters(query_params):
+    """
+    Reads the filter state from request query params. Multi-value filters may be
+    repeated (?job_type=Contract&job_type=Freelance) or comma-separated, except
+    location, whose values contain commas ("Pune, India") and must be repeated.
+    Raises FilterError for unknown values.
+    """
+    filters = {}
+    for name in MULTI_VALUE_FILTERS:
+        raw = query_params.getlist(name)
+        if name == "location":
+            values = [value.strip() for value in raw]
+        elif name == "skills":
+            values = parse_skill_list(",".join(raw))
+        else:
+            values = [value.strip() for item in raw for value in item.split(",")]
+        values = sorted({value for value in values if value})
+        if not values:
+            continue
+        if len(values) > MAX_FILTER_VALUES:
+            raise FilterError(f"At most {MAX_FILTER_VALUES} values are allowed for {name}.")
+        unknown = [value for value in values if name in _CHOICES and value not in _CHOICES[name]]
+        if unknown:
+            raise FilterError(f"Unknown {name}: {', '.join(unknown)}. Allowed: {', '.join(sorted(_CHOICES[name]))}.")
+        filters[name] = values
+    for name in BOOLEAN_FILTERS:
+        value = query_params.get(name, "").strip().lower()
+        if value in ("true", "false"):
+            filters[name] = value == "true"
+        elif value:
+            raise FilterError(f"{name} must be 'true' or 'false'.")
+    return filters
+
+
+def _salary_band_condition(key):
+    if key == SALARY_NOT_SPECIFIED:
+        return Q(salary_max__isnull=True, salary_min__isnull=True)
+    _, low, high = next(band for band in SALARY_BANDS if band[0] == key)
+    # Same precedence as the salary_band annotation: salary_max when set, else salary_min.
+    conditions = []
+    for field, other in (("salary_max", Q()), ("salary_min", Q(salary_max__isnull=True))):
+        bounds = {}
+        if low is not None:
+            bounds[f"{field}__gte"] = low
+        if high is not None:
+            bounds[f"{field}__lt"] = high
+        conditions.append(Q(**{f"{field}__isnull": False}, **bounds) & other)
+    return conditions[0] | conditions[1]
+
+
+def _skill_ids(names):
+    """
+    Skill ids of the selected names; None when a name is unknown (nothing can match).
+    Two spellings of one skill ("aws", "amazon web services") give one id.
+    """
+    found = known_skill_ids(names)
+    if any(name not in found for name in names):
+        return None
+    return list(dict.fromkeys(found[name] for name in names))
+
+
+def apply_filters(queryset, filters, skill_ids=None, exclude=None):
+    """Narrows `queryset` by every filter except the one named `exclude`."""
+    for name, values in filters.items():
+        if name == exclude:
+            continue
+        if name in BOOLEAN_FILTERS:
+            queryset = queryset.filter(**{name: values})
+        elif name == "job_type":
+            queryset = queryset.filter(job_type__in=values)
+        elif name == "experience_level":
+            queryset = queryset.filter(experience_level__in=values)
+        elif name == "location":
+            queryset = queryset.filter(location__in=values)
+        elif name == "salary_band":
+            condition = Q()
+            for key in values:
+                condition |= _salary_band_condition(key)
+            queryset = queryset.filter(condition)
+        elif name == "skills":
+            if skill_ids is None:
+                return queryset.none()
+            for skill_id in skill_ids:
+                queryset = queryset.filter(Exists(JobSkill.objects.filter(job_posting=OuterRef('pk'), skill_id=skill_id)))
+    return queryset
+
+
+# --- Facet counts -----------------------------------------------------------------
+
+def _salary_band_expression():
+    top = Coalesce('salary_max', 'salary_min')
+    whens = []
+    for key, low, high in SALARY_BANDS:
+        bounds = {}
+        if low is not None:
+            bounds["salary_top__gte"] = low
+        if high is not None:
+            bounds["salary_top__lt"] = high
+        whens.append(When(**bounds, then=Value(key)))
+    return top, Case(*whens, default=Value(SALARY_NOT_SPECIFIED), output_field=CharField())
+
+
+def _value_counts(queryset, field, limit=None):
+    rows = queryset.values(field).annotate(count=Count('id')).order_by('-count', field)
+    if limit:
+        rows = rows[:limit]
+    return [(row[field], row['count']) for row in rows]
+
+
+def _with_selected(counts, selected):
+    """Facet entries for `counts`, plus zero-count entries for selected values that have no match."""
+    present = {value for value, _ in counts}
+    return [{"value": value, "count": count} for value, count in counts] + [
+        {"value": value, "count": 0} for value in selected if value not in present
+    ]
+
+
+def compute_facets(filters):
+    """Total matching postings and the counts of every facet (uncached)."""
+    base = open_postings()
+    skill_ids = _skill_ids(filters["skills"]) if "skills" in filters else []
+
+    def others(name):
+        return apply_filters(base, filters, skill_ids, exclude=name)
+
+    facets = {}
+    for name in ("job_type", "experience_level"):
+        counts = dict(_value_counts(others(name), name))
+        # Every choice is listed, in the model's order, so the client can render the options directly.
+        choices = JobType.values if name == "job_type" else ExperienceLevel.values
+        facets[name] = [{"value": value, "count": counts.get(value, 0)} for value in choices]
+
+    for name in BOOLEAN_FILTERS:
+        counts = dict(_value_counts(others(name), name))
+        facets[name] = [{"value": value, "count": counts.get(value, 0)} for value in (True, False)]
+
+    facets["location"] = _with_selected(
+        _value_counts(others("location").exclude(location=""), "location", LOCATION_FACET_SIZE),
+        filters.get("location", []),
+    )
+
+    salary_top, salary_band = _salary_band_expression()
+    band_counts = dict(_value_counts(
+        others("salary_band").annotate(salary_top=salary_top).annotate(salary_band=salary_band), "salary_band"
+    ))
+    facets["salary_band"] = [
+        {"value": key, "count": band_counts.get(key, 0)}
+        for key in [key for key, _, _ in SALARY_BANDS] + [SALARY_NOT_SPECIFIED]
+    ]
+
+    matching = apply_filters(base, filters, skill_ids)
+    skill_rows = (
+        JobSkill.objects.filter(job_posting__in=matching.values('id'))
+        .values('skill_id', 'skill__name').annotate(count=Count('id')).order_by('-count', 'skill__name')
+    )[:SKILL_FACET_SIZE]
+    facets["skills"] = [{"value": row['skill__name'], "count": row['count']} for row in skill_rows]
+    # Selected skills are in every matching posting, so they are only missing when nothing
+    # matches; they are compared by id since they may be picked by another spelling ("aws").
+    listed = {row['skill_id'] for row in skill_rows}
+    facets["skills"] += [
+        {"value": name, "count": 0}
+        for skill_id, name in resolve_skills(filters.get("skills", []), create=False) if skill_id not in listed
+    ]
+
+    return {"total": matching.count(), "facets": facets}
+
+
+def _version():
+    cache = _cache()
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        # Start from the clock so a version lost to eviction never reuses an older number.
+        cache.add(_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(_VERSION_KEY)
+    return version
+
+
+def facet_counts(filters):
+    """compute_facets(filters), served from the facet cache while no posting was saved since."""
+    state = hashlib.sha1(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    key = f"job_facets:{_version()}:{state}"
+    cache = _cache()
+    result = cache.get(key)
+    if result is None:
+        result = compute_facets(filters)
+        cache.set(key, result, timeout=settings.JOB_FACET_CACHE_SECONDS)
+    return result
+
+
+def invalidate():
+    """Drops every cached facet count; called whenever a job posting is saved (signals.py)."""
+    cache = _cache()
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.add(_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+# --- Results ----------------------------------------------------------------------
+
+RESULT_FIELDS = (
+    'id', 'title', 'company__company_name', 'location', 'job_type', 'experience_level', 'remote_work',
+    'visa_sponsorship', 'salary_currency', 'salary_min', 'salary_max', 'required_skills', 'posted_date',
+    'application_deadline',
+)
+
+
+def filtered_postings(filters, offset=0, limit=20):
+    """One page of the open postings matching `filters`, newest first, as compact dicts."""
+    skill_ids = _skill_ids(filters["skills"]) if "skills" in filters else []
+    rows = apply_filters(open_postings(), filters, skill_ids).order_by('-posted_date', '-id').values(*RESULT_FIELDS)
+    results = []
+    for row in rows[offset:offset + limit]:
+        row["company"] = row.pop("company__company_name")
+        row["required_skills"] = parse_skill_list(row["required_skills"])
+        results.append(row)
+    return results
@@ -0,0 +1,154 @@
+# employer_management/job_matches.py
+"""
+Maintains JobCandidateMatch, the materialized match scores of talents for active,
+published jobs (scores >= settings.JOB_MATCH_MIN_SCORE): the skill overlap score
+blended with the similarity of the resume and job embeddings (semantic_matching.py).
+
+When a resume or a job posting is saved (utils1.match_engine sends
+talent_skills_changed / job_skills_changed, see signals.py), the affected row of
+the table is recomputed on a background thread once the transaction has committed:
+the saved resume or job is re-embedded if its text changed, then one talent is
+scored against every job, or one job against every talent, from the skill match
+engine plus the nearest neighbours in the semantic index. Only scores that changed
+are written. The match views then read the table
+through its (job, score) and (talent, score) indexes.
+
+Each refresh also updates the affected recommendation feeds (job_recommendations.py).
+
+`python manage.py rebuild_job_matches` recomputes every active job, e.g. after
+deploying or changing JOB_MATCH_MIN_SCORE.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from utils1.match_engine import get_match_engine
+
+from . import job_recommendations, semantic_matching
+from .models import JobCandidateMatch, JobPosting, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# A single worker keeps refreshes of the same job or talent in order.
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-match-refresh")
+_queued = set()  # ("job" | "talent", id) waiting on the executor; repeated saves collapse into one refresh
+_queued_lock = threading.Lock()
+
+
+def _to_decimal(score):
+    return Decimal(str(score)).quantize(Decimal("0.01"))
+
+
+def _write_matches(owner_filter, counterpart_field, scores):
+    """
+    Makes the JobCandidateMatch rows selected by `owner_filter` equal to `scores`
+    ({counterpart id: score}), touching only rows that changed.
+    """
+    existing = {
+        row[counterpart_field]: row
+        for row in JobCandidateMatch.objects.filter(**owner_filter).values("id", counterpart_field, "score")
+    }
+    stale_ids = [row["id"] for key, row in existing.items() if key not in scores]
+    changed = [
+        JobCandidateMatch(id=existing[key]["id"], score=_to_decimal(score))
+        for key, score in scores.items()
+        if key in existing and existing[key]["score"] != _to_decimal(score)
+    ]
+    new = [
+        JobCandidateMatch(**owner_filter, **{counterpart_field: key}, score=_to_decimal(score))
+        for key, score in scores.items()
+        if key not in existing
+    ]
+    with transaction.atomic():
+        if stale_ids:
+            JobCandidateMatch.objects.filter(id__in=stale_ids).delete()
+        if changed:
+            JobCandidateMatch.objects.bulk_update(changed, ["score"], batch_size=500)
+        if new:
+            JobCandidateMatch.objects.bulk_create(new, batch_size=1000, ignore_conflicts=True)
+    return len(stale_ids), len(changed), len(new)
+
+
+def score_talents_for_job(job_posting_id, job_vector=None, min_score=None, skill_ids=None):
+    """
+    {talent id: blended score} of every talent matching a job by skills or by text,
+    with score >= min_score. `skill_ids` scores a job the engine does not hold (e.g. a draft).
+    """
+    # Without a job embedding the score is the skill score, so the engine can prune
+    # talents below min_score from its postings; with one, text similarity may lift them.
+    semantic = job_vector is not None and settings.SEMANTIC_MATCHING_ENABLED
+    skill_scores = dict(get_match_engine().rank_talents_for_job(
+        job_id=None if skill_ids is not None else job_posting_id, skill_ids=skill_ids,
+        min_score=None if semantic else min_score,
+    ))
+    scores = semantic_matching.blend_scores(skill_scores, job_vector, semantic_matching.talent_index)
+    return {key: score for key, score in scores.items() if min_score is None or score >= min_score}
+
+
+def score_jobs_for_talent(talent_id, talent_vector=None, min_score=None):
+    """{job id: blended score} of every open job matching a talent by skills or by text."""
+    skill_scores = dict(get_match_engine().rank_jobs_for_talent(talent_id=talent_id))
+    scores = semantic_matching.blend_scores(skill_scores, talent_vector, semantic_matching.job_index)
+    return {key: score for key, score in scores.items() if min_score is None or score >= min_score}
+
+
+def refresh_job_matches(job_posting_id, refresh_feeds=True):
+    """
+    Recomputes the stored matches of one job against every talent, then the
+    recommendation feeds the job enters or leaves (unless refresh_feeds is False).
+    """
+    job_vector = semantic_matching.refresh_job_embedding(job_posting_id)
+    is_open = JobPosting.objects.filter(id=job_posting_id, is_active=True, status=JobStatus.PUBLISHED).exists()
+    scores = score_talents_for_job(
+        job_posting_id, job_vector, min_score=settings.JOB_MATCH_MIN_SCORE
+    ) if is_open else {}
+    counts = _write_matches({"job_posting_id": job_posting_id}, "talent_id", scores)
+    if refresh_feeds:
+        job_recommendations.refresh_feeds_for_job(job_posting_id, scores)
+    return counts
+
+
+def refresh_talent_matches(talent_id):
+    """Recomputes the stored matches of one talent against every open job, then their recommendation feed."""
+    talent_vector = semantic_matching.refresh_talent_embedding(talent_id)
+    scores = score_jobs_for_talent(talent_id, talent_vector, min_score=settings.JOB_MATCH_MIN_SCORE)
+    counts = _write_matches({"talent_id": talent_id}, "job_posting_id", scores)
+    job_recommendations.refresh_feed(talent_id)
+    return counts
+
+
+def _run_refresh(kind, object_id):
+    with _queued_lock:
+        _queued.discard((kind, object_id))
+    try:
+        if kind == "job":
+            refresh_job_matches(object_id)
+        else:
+            refresh_talent_matches(object_id)
+        semantic_matching.rebuild_indexes()
+    except Exception as e:
+        logger.exception("Refreshing job matches of %s %s failed: %s", kind, object_id, e)
+    finally:
+        close_old_connections()
+
+
+def _schedule(kind, object_id):
+    with _queued_lock:
+        if (kind, object_id) in _queued:
+            return
+        _queued.add((kind, object_id))
+    _REFRESH_EXECUTOR.submit(_run_refresh, kind, object_id)
+
+
+def schedule_job_refresh(job_posting_id):
+    """Refreshes the job's matches in the background after the current transaction commits."""
+    transaction.on_commit(lambda: _schedule("job", job_posting_id))
+
+
+def schedule_talent_refresh(talent_id):
+    transaction.on_commit(lambda: _schedule("talent", talent_id))
@@ -0,0 +1,116 @@
+# employer_management/job_recommendations.py
+"""
+Maintains JobRecommendation, each talent's job recommendation feed: up to
+settings.JOB_RECOMMENDATION_FEED_SIZE open jobs in feed order, served by the
+jobs tab with one range read on the (talent, position) index.
+
+A feed is built from the talent's JobCandidateMatch rows (job_matches.py). Each
+job's match score gets a freshness boost of up to FRESHNESS_BOOST points that
+halves every FRESHNESS_HALF_LIFE_DAYS after posting, and jobs are then picked
+greedily, every job already picked from the same company or with the same title
+multiplying a candidate's score by DIVERSITY_DECAY, so one employer's many
+openings do not fill the first page.
+
+Feeds are refreshed on the job-match background thread: a talent's feed after
+their matches are recomputed (resume saved), and after a job's matches are
+recomputed (job published, edited or closed) the feeds the job can enter or is
+already in. Freshness decays with time, so `python manage.py
+rebuild_job_recommendations` should also run nightly (e.g. from cron).
+"""
+
+from collections import Counter
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import JobCandidateMatch, JobRecommendation, JobStatus
+
+FRESHNESS_BOOST = 10.0
+FRESHNESS_HALF_LIFE_DAYS = 7.0
+DIVERSITY_DECAY = 0.85
+CANDIDATE_FACTOR = 3        # best matches considered per feed slot
+_CHUNK = 1000
+
+
+def _to_decimal(score):
+    return Decimal(str(score)).quantize(Decimal("0.01"))
+
+
+def freshness_boost(posted_date, now):
+    age_days = max(0.0, (now - posted_date).total_seconds() / 86400)
+    return FRESHNESS_BOOST * 0.5 ** (age_days / FRESHNESS_HALF_LIFE_DAYS)
+
+
+def build_feed(talent_id):
+    """The talent's feed as [(job id, feed score, match score)] in feed order."""
+    feed_size = settings.JOB_RECOMMENDATION_FEED_SIZE
+    now = timezone.now()
+    candidates = []
+    for job_id, match_score, company_id, title, posted_date in JobCandidateMatch.objects.filter(
+        talent_id=talent_id, job_posting__is_active=True, job_posting__status=JobStatus.PUBLISHED
+    ).order_by('-score', 'job_posting_id').values_list(
+        'job_posting_id', 'score', 'job_posting__company_id', 'job_posting__title', 'job_posting__posted_date'
+    )[:feed_size * CANDIDATE_FACTOR]:
+        match_score = float(match_score)
+        boosted = match_score + freshness_boost(posted_date, now)
+        candidates.append((job_id, boosted, match_score, company_id, " ".join(title.lower().split())))
+
+    feed, companies, titles = [], Counter(), Counter()
+    while candidates and len(feed) < feed_size:
+        best, best_score = 0, -1.0
+        for position, (_, boosted, _, company_id, title) in enumerate(candidates):
+            score = boosted * DIVERSITY_DECAY ** (companies[company_id] + titles[title])
+            if score > best_score:
+                best, best_score = position, score
+        job_id, _, match_score, company_id, title = candidates.pop(best)
+        companies[company_id] += 1
+        titles[title] += 1
+        feed.append((job_id, round(best_score, 2), match_score))
+    return feed
+
+
+def refresh_feed(talent_id):
+    """Rebuilds and stores the talent's feed; returns its length. Unchanged feeds are not rewritten."""
+    feed = build_feed(talent_id)
+    rows = [(job_id, _to_decimal(score), _to_decimal(match_score)) for job_id, score, match_score in feed]
+    existing = list(
+        JobRecommendation.objects.filter(talent_id=talent_id).order_by('position')
+        .values_list('job_posting_id', 'score', 'match_score')
+    )
+    if existing != rows:
+        with transaction.atomic():
+            JobRecommendation.objects.filter(talent_id=talent_id).delete()
+            JobRecommendation.objects.bulk_create([
+                JobRecommendation(talent_id=talent_id, job_posting_id=job_id, position=position,
+                                  score=score, match_score=match_score)
+                for position, (job_id, score, match_score) in enumerate(rows, start=1)
+            ])
+    return len(rows)
+
+
+def refresh_feeds_for_job(job_posting_id, scores):
+    """
+    After a job's matches changed to `scores` ({talent id: match score}), refreshes
+    the feeds holding the job and those it can now enter: feeds not yet full, or
+    whose last entry scores below the job's best possible feed score.
+    """
+    affected = set(JobRecommendation.objects.filter(job_posting_id=job_posting_id).values_list('talent_id', flat=True))
+    candidates = [talent_id for talent_id in scores if talent_id not in affected]
+    feed_size = settings.JOB_RECOMMENDATION_FEED_SIZE
+    for start in range(0, len(candidates), _CHUNK):
+        chunk = candidates[start:start + _CHUNK]
+        feeds = {
+            talent_id: (count, floor) for talent_id, count, floor in
+            JobRecommendation.objects.filter(talent_id__in=chunk).values('talent_id')
+            .annotate(count=Count('id'), floor=Min('score')).values_list('talent_id', 'count', 'floor')
+        }
+        for talent_id in chunk:
+            count, floor = feeds.get(talent_id, (0, None))
+            if count < feed_size or scores[talent_id] + FRESHNESS_BOOST > float(floor):
+                affected.add(talent_id)
+    for talent_id in affected:
+        refresh_feed(talent_id)
+    return len(affected)
@@ -0,0 +1,342 @@
+# employer_management/job_search.py
+"""
+Keyword search over employer job postings and imported job listings (APIJobs),
+ranked together with BM25 (utils1/search_index.py).
+
+Indexed are active, published JobPostings and VERIFIED JobListings. Title, skills
+and company weigh more than location, requirements and description. Filters are
+index terms too: source, job type, remote, experience level and location words.
+
+`python manage.py build_search_index` builds the index; a process that finds none
+builds it on first use. Each process then keeps it current: postings saved in the
+process are re-indexed on the next search (signals.py), and postings, companies and
+listings whose updated_at moved are picked up every SEARCH_INDEX_REFRESH_SECONDS.
+Deleted rows leave no updated_at behind: a process drops the postings and listings
+it deletes itself, and those deleted elsewhere with its next rebuild (until then
+search_results skips them).
+Once the changes held in memory outgrow REBUILD_MIN_DELTA / REBUILD_DELTA_FRACTION
+the index is rebuilt on a background thread.
+"""
+
+import html
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from talent_management.models import JobListing
+from talent_management.skill_taxonomy import parse_skill_list
+from utils1.search_index import SearchIndex, analyze, tokenize
+
+from .models import Company, JobPosting, JobStatus
+from .semantic_matching import plain_text
+
+logger = logging.getLogger(__name__)
+
+SOURCE_POSTING, SOURCE_LISTING = 0, 1
+SOURCES = {"postings": SOURCE_POSTING, "listings": SOURCE_LISTING}
+TITLE_WEIGHT, SKILLS_WEIGHT, COMPANY_WEIGHT = 3, 2, 2
+REBUILD_MIN_DELTA = 5000
+REBUILD_DELTA_FRACTION = 0.05
+POLL_OVERLAP = timedelta(seconds=5)
+SNIPPET_LENGTH = 240
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*", re.IGNORECASE)
+_REBUILD_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-search-rebuild")
+
+
+def document_key(source, object_id):
+    return object_id * 2 + source
+
+
+def split_key(key):
+    """(source, object id) of a document key."""
+    return key % 2, key // 2
+
+
+def _filter_value(value):
+    return re.sub(r"[^a-z0-9]", "", str(value or "").lower())
+
+
+def location_filters(location):
+    return [f"location:{token}" for token in tokenize(location)]
+
+
+# --- Documents --------------------------------------------------------------------
+
+def posting_document(job):
+    fields = [
+        (job.title, TITLE_WEIGHT),
+        (", ".join(parse_skill_list(job.required_skills)), SKILLS_WEIGHT),
+        (job.company.company_name, COMPANY_WEIGHT),
+        (job.location, 1),
+        (plain_text(job.requirements), 1),
+        (job.description, 1),
+        (job.responsibilities, 1),
+    ]
+    filters = ["source:postings", f"type:{_filter_value(job.job_type)}", *location_filters(job.location)]
+    if job.remote_work:
+        filters.append("remote:true")
+    if job.experience_level:
+        filters.append(f"level:{_filter_value(job.experience_level)}")
+    return analyze(fields, filters)
+
+
+def listing_document(listing):
+    fields = [
+        (listing.title, TITLE_WEIGHT),
+        (listing.company_name, COMPANY_WEIGHT),
+        (listing.location, 1),
+        (listing.industry, 1),
+        (listing.requirements, 1),
+        (listing.description, 1),
+    ]
+    filters = ["source:listings", f"type:{_filter_value(listing.employment_type)}", *location_filters(listing.location)]
+    if listing.work_location_type == 'REMOTE':
+        filters.append("remote:true")
+    return analyze(fields, filters)
+
+
+def _open_postings():
+    return JobPosting.objects.filter(is_active=True, status=JobStatus.PUBLISHED).select_related('company').defer('text_embedding')
+
+
+def _verified_listings():
+    return JobListing.objects.filter(status='VERIFIED')
+
+
+def _documents(posting_ids=None, listing_ids=None):
+    """Yields (key, terms, length, filters) of the searchable rows, optionally only the given ids."""
+    postings, listings = _open_postings(), _verified_listings()
+    if posting_ids is not None:
+        postings = postings.filter(id__in=posting_ids)
+    if listing_ids is not None:
+        listings = listings.filter(id__in=listing_ids)
+    for job in postings.order_by('id').iterator(chunk_size=2000):
+        yield (document_key(SOURCE_POSTING, job.id), *posting_document(job))
+    for listing in listings.order_by('id').iterator(chunk_size=2000):
+        yield (document_key(SOURCE_LISTING, listing.id), *listing_document(listing))
+
+
+# --- Index maintenance ------------------------------------------------------------
+
+class _JobSearchIndex:
+    def __init__(self):
+        self.index = SearchIndex("jobs")
+        self._lock = threading.Lock()
+        self._build_name = None
+        self._polled_since = None    # database time the next poll reads from
+        self._checked = 0.0          # monotonic time of the last poll
+        self._pending_postings = set()
+        self._pending_listings = set()
+        self._rebuilding = False
+
+    def posting_changed(self, job_id):
+        with self._lock:
+            self._pending_postings.add(job_id)
+
+    def listing_changed(self, listing_id):
+        with self._lock:
+            self._pending_listings.add(listing_id)
+
+    def _reindex(self, posting_ids, listing_ids):
+        found = set()
+        for key, terms, length, filters in _documents(posting_ids, listing_ids):
+            self.index.upsert(key, terms, length, filters)
+            found.add(key)
+        gone = {document_key(SOURCE_POSTING, job_id) for job_id in posting_ids}
+        gone |= {document_key(SOURCE_LISTING, listing_id) for listing_id in listing_ids}
+        for key in gone - found:
+            self.index.remove(key)
+
+    def current(self):
+        with self._lock:
+            if self.index.build_name is None and not self.index.load():
+                self._rebuild_locked()
+            stale = time.monotonic() - self._checked >= settings.SEARCH_INDEX_REFRESH_SECONDS
+            if stale or self._pending_postings or self._pending_listings:
+                self._sync_locked(poll=stale)
+        if self._needs_rebuild():
+            self._schedule_rebuild()
+        return self.index
+
+    def _sync_locked(self, poll):
+        posting_ids, listing_ids = set(self._pending_postings), set(self._pending_listings)
+        self._pending_postings.clear()
+        self._pending_listings.clear()
+        if poll:
+            self.index.load()
+            if self.index.build_name != self._build_name:
+                # A newer build (e.g. from another process): re-apply what changed since it was built.
+                self._build_name = self.index.build_name
+                built_at = parse_datetime(self.index.built_at) if self.index.built_at else timezone.now()
+                self._polled_since = built_at - POLL_OVERLAP
+            poll_started = timezone.now()
+            since = self._polled_since
+            # Separate queries, each a range read on an updated_at index (an OR across the join is a full scan).
+            posting_ids |= set(JobPosting.objects.filter(updated_at__gte=since).values_list('id', flat=True))
+            company_ids = list(Company.objects.filter(updated_at__gte=since).values_list('id', flat=True))
+            if company_ids:
+                posting_ids |= set(JobPosting.objects.filter(company_id__in=company_ids).values_list('id', flat=True))
+            listing_ids |= set(JobListing.objects.filter(updated_at__gte=since).values_list('id', flat=True))
+            self._polled_since = poll_started - POLL_OVERLAP
+            self._checked = time.monotonic()
+        if posting_ids or listing_ids:
+            self._reindex(posting_ids, listing_ids)
+
+    def _needs_rebuild(self):
+        return not self._rebuilding and self.index.delta_size > max(REBUILD_MIN_DELTA, REBUILD_DELTA_FRACTION * len(self.index))
+
+    def _build(self):
+        started = time.monotonic()
+        built_at = timezone.now()
+        # Searches keep using the previous build (and its delta) until build() publishes the new one.
+        self.index.build(_documents(), built_at.isoformat())
+        print(f"Job search index built: {len(self.index)} documents in {time.monotonic() - started:.2f}s")
+        return built_at
+
+    def _rebuild_locked(self):
+        built_at = self._build()
+        self._build_name = self.index.build_name
+        self._polled_since = built_at - POLL_OVERLAP
+
+    def rebuild(self):
+        built_at = self._build()
+        with self._lock:
+            self._build_name = self.index.build_name
+            self._polled_since = built_at - POLL_OVERLAP
+            self._checked = 0.0  # pick up rows saved while building on the next search
+        return len(self.index)
+
+    def _run_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.exception("Rebuilding the job search index failed: %s", e)
+        finally:
+            self._rebuilding = False
+            close_old_connections()
+
+    def _schedule_rebuild(self):
+        self._rebuilding = True
+        _REBUILD_EXECUTOR.submit(self._run_rebuild)
+
+
+job_search_index = _JobSearchIndex()
+
+
+def posting_changed(job_id):
+    """Re-indexes a saved or deleted job posting before this process's next search."""
+    job_search_index.posting_changed(job_id)
+
+
+def listing_changed(listing_id):
+    """Re-indexes a saved or deleted job listing before this process's next search."""
+    job_search_index.listing_changed(listing_id)
+
+
+# --- Queries ----------------------------------------------------------------------
+
+def search_jobs(query, source=None, job_type=None, location=None, remote=None, experience_level=None,
+                offset=0, limit=20):
+    """
+    Returns (total matches, [(source, object id, score)]) for one page of the jobs
+    matching `query`, best first. Filter values are matched like the indexed fields.
+    """
+    filter_groups = []
+    if source:
+        filter_groups.append([f"source:{source}"])
+    if job_type:
+        filter_groups.append([f"type:{_filter_value(job_type)}"])
+    if experience_level:
+        filter_groups.append([f"level:{_filter_value(experience_level)}"])
+    if remote:
+        filter_groups.append(["remote:true"])
+    filter_groups.extend([term] for term in location_filters(location))
+
+    total, hits = job_search_index.current().search(tokenize(query), filter_groups, offset, limit)
+    return total, [(*split_key(key), score) for key, score in hits]
+
+
+def highlight(text, terms, max_length=None):
+    """
+    HTML-escaped `text` with the words in `terms` wrapped in <mark>. With max_length,
+    returns the window of that many characters holding the most matches.
+    """
+    text = text or ""
+    matches = [m for m in _WORD_RE.finditer(text) if m.group().lower() in terms]
+    start, end = 0, len(text)
+    if max_length and len(text) > max_length:
+        best, last = 0, 0
+        for first, match in enumerate(matches):
+            while last < len(matches) and matches[last].end() - match.start() <= max_length:
+                last += 1
+            if last - first > best:
+                best, start = last - first, max(0, match.start() - 30)
+        end = min(len(text), start + max_length)
+    pieces, cursor = [], start
+    for match in matches:
+        if match.start() < start or match.end() > end:
+            continue
+        pieces.append(html.escape(text[cursor:match.start()]))
+        pieces.append(f"<mark>{html.escape(match.group())}</mark>")
+        cursor = match.end()
+    pieces.append(html.escape(text[cursor:end]))
+    snippet = "".join(pieces).strip()
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
+
+
+def search_results(query, hits):
+    """Loads the rows of a page of hits and renders them with highlighted title and snippet."""
+    terms = set(tokenize(query))
+    posting_ids = [object_id for source, object_id, _ in hits if source == SOURCE_POSTING]
+    listing_ids = [object_id for source, object_id, _ in hits if source == SOURCE_LISTING]
+    postings = _open_postings().in_bulk(posting_ids)
+    listings = _verified_listings().in_bulk(listing_ids)
+
+    results = []
+    for source, object_id, score in hits:
+        if source == SOURCE_POSTING:
+            job = postings.get(object_id)
+            if job is None:
+                continue  # closed since the index last saw it
+            results.append({
+                "source": "posting",
+                "id": job.id,
+                "title": job.title,
+                "company": job.company.company_name,
+                "location": job.location,
+                "job_type": job.job_type,
+                "remote": job.remote_work,
+                "posted_at": job.posted_date,
+                "external_application_url": None,
+                "score": score,
+                "highlighted_title": highlight(job.title, terms),
+                "snippet": highlight(job.description, terms, SNIPPET_LENGTH),
+            })
+        else:
+            listing = listings.get(object_id)
+            if listing is None:
+                continue
+            results.append({
+                "source": "listing",
+                "id": listing.id,
+                "title": listing.title,
+                "company": listing.company_name,
+                "location": listing.location,
+                "job_type": listing.employment_type,
+                "remote": listing.work_location_type == 'REMOTE',
+                "posted_at": listing.published_at or listing.created_at,
+                "external_application_url": listing.external_application_url,
+                "score": score,
+                "highlighted_title": highlight(listing.title, terms),
+                "snippet": highlight(listing.description, terms, SNIPPET_LENGTH),
+            })
+    return results
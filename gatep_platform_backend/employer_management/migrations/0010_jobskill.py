@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0009_interviewfeedback'),
+        ('talent_management', '0032_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='employer_management.jobposting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='talent_management.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'job_posting'], name='jobskill_skill_posting_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job_posting', 'skill'), name='unique_job_posting_skill')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0010_jobskill'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCandidateMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_matches', to='employer_management.jobposting')),
+                ('talent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_matches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['job_posting', '-score'], name='jobmatch_job_score_idx'), models.Index(fields=['talent', '-score'], name='jobmatch_talent_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job_posting', 'talent'), name='unique_job_candidate_match')],
+            },
+        ),
+    ]
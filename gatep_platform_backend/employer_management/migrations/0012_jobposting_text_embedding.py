@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0011_jobcandidatematch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='text_embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='text_embedding_model',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='text_embedding_source',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='text_embedding_updated_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
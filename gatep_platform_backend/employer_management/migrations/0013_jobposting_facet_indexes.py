@@ -0,0 +1,37 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0012_jobposting_text_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', '-posted_date'], name='jobposting_open_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'job_type'], name='jobposting_open_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'experience_level'], name='jobposting_open_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'remote_work', 'visa_sponsorship'], name='jobposting_open_flags_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'location'], name='jobposting_open_location_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'is_active', 'salary_max', 'salary_min'], name='jobposting_open_salary_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-19 11:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0013_jobposting_facet_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('score', models.DecimalField(decimal_places=2, max_digits=6)),
+                ('match_score', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='employer_management.jobposting')),
+                ('talent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['talent', 'position'], name='jobrec_talent_position_idx')],
+                'constraints': [models.UniqueConstraint(fields=('talent', 'job_posting'), name='unique_job_recommendation')],
+            },
+        ),
+    ]
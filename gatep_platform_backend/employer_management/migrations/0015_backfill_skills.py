@@ -0,0 +1,178 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:40
+
+import json
+import re
+import unicodedata
+
+from django.db import migrations
+
+# Frozen copies of the talent_management.skill_taxonomy constants and parsers as of
+# this migration, so later changes to them do not change what it does.
+BATCH_SIZE = 500
+MAX_SKILL_NAME_LENGTH = 100
+MAX_TEXT_NGRAM = 4
+
+DEFAULT_SKILL_ALIASES = {
+    "Machine Learning": ["ML", "machine-learning"],
+    "Deep Learning": ["DL"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "Computer Vision": ["CV"],
+    "Large Language Models": ["LLM", "LLMs"],
+    "Generative AI": ["GenAI", "Gen AI"],
+    "Reinforcement Learning": ["RL"],
+    "Data Science": [],
+    "Python": ["Python3", "Python 3"],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "C++": ["CPP"],
+    "C#": ["C Sharp", "CSharp"],
+    "Go": ["Golang"],
+    "Node.js": ["Node", "NodeJS"],
+    "React": ["React.js", "ReactJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Django": [],
+    "TensorFlow": ["TF", "tensorflow2"],
+    "PyTorch": ["Torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "SQL": [],
+    "PostgreSQL": ["Postgres", "psql"],
+    "MySQL": [],
+    "MongoDB": ["Mongo"],
+    "Amazon Web Services": ["AWS"],
+    "Google Cloud Platform": ["GCP", "Google Cloud"],
+    "Microsoft Azure": ["Azure"],
+    "Kubernetes": ["K8s"],
+    "Docker": [],
+    "CI/CD": ["CICD", "CI CD", "Continuous Integration"],
+    "Git": [],
+    "MLOps": ["ML Ops"],
+    "Power BI": ["PowerBI"],
+    "Microsoft Excel": ["Excel", "MS Excel"],
+}
+
+_LIST_SPLIT_RE = re.compile(r"[,;|\n•]")
+_SEPARATOR_RE = re.compile(r"(?<=\w)[-_](?=\w)")
+_TEXT_TOKEN_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]", re.IGNORECASE)
+_COMMON_WORD_SKILLS = {"go", "node", "react", "excel", "torch", "vue", "angular", "swift", "rust", "spark", "flask"}
+
+
+def normalize_skill_name(name):
+    text = unicodedata.normalize("NFKC", str(name or "")).lower()
+    text = _SEPARATOR_RE.sub(" ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" ,;:!?'\"`()[]{}*-").rstrip(".")
+
+
+def _flatten(value):
+    if isinstance(value, str):
+        yield from _LIST_SPLIT_RE.split(value)
+    elif isinstance(value, dict):
+        name = value.get("name") or value.get("skill")
+        if isinstance(name, str):
+            yield name
+        else:
+            for item in value.values():
+                yield from _flatten(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _flatten(item)
+
+
+def parse_skill_list(value):
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text
+    names, seen = [], set()
+    for name in _flatten(value):
+        name = name.strip().strip("\"'")
+        key = normalize_skill_name(name)
+        if key and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def text_skill_candidates(text):
+    tokens = _TEXT_TOKEN_RE.findall(unicodedata.normalize("NFKC", text or ""))
+    candidates = set()
+    for size in range(1, MAX_TEXT_NGRAM + 1):
+        for start in range(len(tokens) - size + 1):
+            key = normalize_skill_name(" ".join(tokens[start:start + size]))
+            if len(key) <= 1 or (size == 1 and key in _COMMON_WORD_SKILLS and not tokens[start][0].isupper()):
+                continue
+            candidates.add(key)
+    return candidates
+
+
+def backfill_skills(apps, schema_editor):
+    # The join tables start empty, so the skill-based matching, search, facets and
+    # autocomplete would find nothing until every row was saved again. Same result
+    # as `python manage.py backfill_skills`, except that a built-in synonym already
+    # naming another skill is left as it is (that command merges the two).
+    Skill = apps.get_model('talent_management', 'Skill')
+    SkillAlias = apps.get_model('talent_management', 'SkillAlias')
+    aliases = dict(SkillAlias.objects.values_list('alias', 'skill_id'))
+
+    def skill_id(key, name):
+        if key not in aliases:
+            skill, _ = Skill.objects.get_or_create(normalized_name=key, defaults={'name': name[:MAX_SKILL_NAME_LENGTH]})
+            SkillAlias.objects.create(alias=key, skill=skill)
+            aliases[key] = skill.id
+        return aliases[key]
+
+    for canonical, synonyms in DEFAULT_SKILL_ALIASES.items():
+        canonical_id = skill_id(normalize_skill_name(canonical), canonical)
+        for synonym in synonyms:
+            key = normalize_skill_name(synonym)
+            if key not in aliases:
+                SkillAlias.objects.create(alias=key, skill_id=canonical_id)
+                aliases[key] = canonical_id
+
+    def listed_skills(value):
+        keys = {}
+        for name in parse_skill_list(value):
+            key = normalize_skill_name(name)
+            if key and len(key) <= MAX_SKILL_NAME_LENGTH:
+                keys.setdefault(key, name.strip())
+        return {skill_id(key, name) for key, name in keys.items()}
+
+    def mentioned_skills(text):
+        return {aliases[key] for key in text_skill_candidates(text) if key in aliases}
+
+    sources = [
+        (('talent_management', 'Resume'), 'skills', ('talent_management', 'ResumeSkill'), 'resume_id', listed_skills),
+        (('employer_management', 'JobPosting'), 'required_skills', ('employer_management', 'JobSkill'), 'job_posting_id',
+         listed_skills),
+        (('talent_management', 'JobListing'), 'requirements', ('talent_management', 'JobListingSkill'), 'job_listing_id',
+         mentioned_skills),
+    ]
+    for source, field, join, owner_field, skills_of in sources:
+        Source, Join = apps.get_model(*source), apps.get_model(*join)
+        rows = []
+        for owner_id, value in Source.objects.order_by('id').values_list('id', field).iterator(chunk_size=BATCH_SIZE):
+            rows += [Join(**{owner_field: owner_id, 'skill_id': skill}) for skill in skills_of(value)]
+            if len(rows) >= BATCH_SIZE:
+                Join.objects.bulk_create(rows, ignore_conflicts=True)
+                rows = []
+        Join.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0014_jobrecommendation'),
+        ('talent_management', '0032_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employer_management', '0015_backfill_skills'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='company',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='jobposting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
@@ -2,7 +2,7 @@
 
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from talent_management.models import CustomUser, UserRole, IndustryChoices
+from talent_management.models import CustomUser, UserRole, IndustryChoices, Skill, remember_synced_skills, skills_field_changed
 
 class JobStatus(models.TextChoices):
     DRAFT = 'DRAFT', 'Draft'
@@ -77,7 +77,8 @@ class Company(models.Model):
     contact_email = models.EmailField(blank=True)
     phone_number = models.CharField(max_length=20, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    # Indexed: the job search index polls for companies saved since its last look (job_search.py).
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     class Meta:
         verbose_name_plural = "Companies"
     def __str__(self):
@@ -98,6 +99,11 @@ class JobPosting(models.Model):
     contact_email = models.EmailField(blank=True)
     benefits = models.JSONField(default=list, blank=True)
     required_skills = models.JSONField(default=list, blank=True)
+    # MiniLM embedding of the job text, maintained like Resume.text_embedding.
+    text_embedding = models.BinaryField(blank=True, null=True)
+    text_embedding_model = models.CharField(max_length=100, blank=True, default="")
+    text_embedding_source = models.CharField(max_length=64, blank=True, default="")
+    text_embedding_updated_at = models.DateTimeField(blank=True, null=True, db_index=True)
     visa_sponsorship = models.BooleanField(default=False)
     remote_work = models.BooleanField(default=False)
     status = models.CharField(max_length=20, choices=JobStatus.choices, default=JobStatus.DRAFT)
@@ -105,10 +111,79 @@ class JobPosting(models.Model):
     application_deadline = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        # Open postings (status, is_active) grouped or filtered by each facet of job_facets.py.
+        indexes = [
+            models.Index(fields=['status', 'is_active', '-posted_date'], name='jobposting_open_posted_idx'),
+            models.Index(fields=['status', 'is_active', 'job_type'], name='jobposting_open_type_idx'),
+            models.Index(fields=['status', 'is_active', 'experience_level'], name='jobposting_open_level_idx'),
+            models.Index(fields=['status', 'is_active', 'remote_work', 'visa_sponsorship'], name='jobposting_open_flags_idx'),
+            models.Index(fields=['status', 'is_active', 'location'], name='jobposting_open_location_idx'),
+            models.Index(fields=['status', 'is_active', 'salary_max', 'salary_min'], name='jobposting_open_salary_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if skills_field_changed(self, 'required_skills', kwargs.get('update_fields')):
+            from talent_management.skill_taxonomy import sync_job_posting_skills
+            sync_job_posting_skills(self)
+        from utils1.match_engine import notify_job_changed
+        notify_job_changed(self.id)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        return remember_synced_skills(super().from_db(db, field_names, values), 'required_skills')
+
     def __str__(self):
         return f"{self.title} at {self.company.company_name}"
 
+class JobSkill(models.Model):
+    """JobPosting.required_skills resolved to the skill taxonomy, kept in sync by JobPosting.save()."""
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['job_posting', 'skill'], name='unique_job_posting_skill')]
+        indexes = [models.Index(fields=['skill', 'job_posting'], name='jobskill_skill_posting_idx')]
+    def __str__(self):
+        return f"{self.job_posting_id}: {self.skill_id}"
+
+class JobCandidateMatch(models.Model):
+    """
+    Precomputed skill match score of a talent for an active, published job, stored when
+    it reaches settings.JOB_MATCH_MIN_SCORE. Maintained by employer_management/job_matches.py.
+    """
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='candidate_matches')
+    talent = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='job_matches')
+    score = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['job_posting', 'talent'], name='unique_job_candidate_match')]
+        indexes = [
+            models.Index(fields=['job_posting', '-score'], name='jobmatch_job_score_idx'),
+            models.Index(fields=['talent', '-score'], name='jobmatch_talent_score_idx'),
+        ]
+    def __str__(self):
+        return f"{self.talent_id} for {self.job_posting_id}: {self.score}"
+
+class JobRecommendation(models.Model):
+    """
+    A talent's job recommendation feed: the top jobs by match score with freshness
+    and diversity boosts applied, in feed order (see job_recommendations.py).
+    """
+    talent = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='job_recommendations')
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='recommendations')
+    position = models.PositiveIntegerField()
+    score = models.DecimalField(max_digits=6, decimal_places=2)
+    match_score = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['talent', 'job_posting'], name='unique_job_recommendation')]
+        indexes = [models.Index(fields=['talent', 'position'], name='jobrec_talent_position_idx')]
+    def __str__(self):
+        return f"#{self.position} {self.job_posting_id} for {self.talent_id}"
+
 class Application(models.Model):
     job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='applications')
     talent = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='applications')
@@ -0,0 +1,358 @@
+# employer_management/semantic_matching.py
+"""
+Semantic side of job matching.
+
+Resumes and job postings carry a MiniLM embedding of their text
+(Resume/JobPosting.text_embedding, float32 bytes). It is computed on the job-match
+background thread after a save (see job_matches.py), and only when the text or
+the model changed: text_embedding_source is a hash of the embedded text.
+
+Two VectorIndex instances (utils1/vector_index.py) find the nearest counterparts
+of a job or a talent: "talents", keyed by talent id with the latest resume as the
+match engine uses, and "jobs", with active published postings. Vectors written
+after the last build reach every process by polling text_embedding_updated_at /
+updated_at and stay in the index delta until the next build, which happens here
+once the delta is large or with `python manage.py build_semantic_index`.
+
+Skill and semantic scores are blended as
+    score = (1 - SEMANTIC_MATCH_WEIGHT) * skill + SEMANTIC_MATCH_WEIGHT * semantic
+with semantic mapping cosine similarity SIMILARITY_FLOOR..SIMILARITY_CEILING onto
+0..100. A pair with no embedding on either side keeps its skill score, so matching
+behaves as before where torch / transformers are not installed.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from utils1.vector_index import VectorIndex
+
+from .models import JobPosting, JobStatus
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_DIM = 384           # utils1.text_embeddings.EMBEDDING_DIM, without importing torch
+SIMILARITY_FLOOR = 0.2        # MiniLM cosine similarity of unrelated texts sits around here ...
+SIMILARITY_CEILING = 0.75     # ... and closely matching resume/job texts reach this
+REBUILD_MIN_DELTA = 1000      # vectors held in an index delta before it is rebuilt ...
+REBUILD_DELTA_FRACTION = 0.1  # ... or this fraction of the index, whichever is larger
+POLL_OVERLAP = timedelta(seconds=5)
+
+_embedder_error = None  # why embeddings cannot be computed in this process, once known
+
+
+def semantic_matching_enabled():
+    return settings.SEMANTIC_MATCHING_ENABLED and _embedder_error is None
+
+
+def _embed(texts):
+    """Embeds texts, or returns None (and stops trying) if the model cannot be loaded."""
+    global _embedder_error
+    if not semantic_matching_enabled():
+        return None
+    try:
+        from utils1.text_embeddings import embed_texts
+        return embed_texts(texts)
+    except (ImportError, OSError) as e:
+        _embedder_error = e
+        logger.warning("Semantic matching falls back to skill scores only: %s", e)
+        return None
+
+
+@functools.lru_cache(maxsize=512)
+def _embed_query(text):
+    embedded = _embed([text])
+    return None if embedded is None else embedded[0]
+
+
+def embed_query(text):
+    """Embedding of a search query, or None if embeddings are unavailable. Recent queries are cached."""
+    text = " ".join((text or "").split())
+    return _embed_query(text) if text and semantic_matching_enabled() else None
+
+
+# --- Texts ------------------------------------------------------------------------
+
+def plain_text(value):
+    """Flattens a stored value (text, JSON text, list or dict) into plain text."""
+    if isinstance(value, str):
+        text = value.strip()
+        if text[:1] in ("[", "{"):
+            try:
+                return plain_text(json.loads(text))
+            except ValueError:
+                pass
+        return text
+    if isinstance(value, dict):
+        value = list(value.values())
+    if isinstance(value, (list, tuple)):
+        return ". ".join(part for part in (plain_text(item) for item in value) if part)
+    return "" if value is None else str(value)
+
+
+def resume_text(resume):
+    # Skills first: the model reads only the first MAX_TOKENS tokens.
+    from talent_management.skill_taxonomy import parse_skill_list
+
+    parts = [
+        ", ".join(parse_skill_list(resume.skills)),
+        plain_text(resume.preferred_tech_stack),
+        resume.summary or resume.generated_summary,
+        plain_text(resume.experience),
+        plain_text(resume.projects),
+    ]
+    return "\n".join(part for part in parts if part)
+
+
+def job_text(job_posting):
+    from talent_management.skill_taxonomy import parse_skill_list
+
+    parts = [
+        job_posting.title,
+        ", ".join(parse_skill_list(job_posting.required_skills)),
+        job_posting.description,
+        plain_text(job_posting.requirements),
+        job_posting.responsibilities,
+    ]
+    return "\n".join(part for part in parts if part)
+
+
+def _digest(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def vector_from_bytes(data):
+    return np.frombuffer(bytes(data), dtype=np.float32) if data else None
+
+
+# --- Indexes ----------------------------------------------------------------------
+
+def _latest_resume_vectors(talent_ids=None):
+    """{talent id: embedding bytes or None} of each talent's latest resume."""
+    from talent_management.models import Resume, UserRole
+
+    resumes = Resume.objects.filter(is_deleted=False, talent_id__user_role=UserRole.TALENT)
+    if talent_ids is not None:
+        resumes = resumes.filter(talent_id__in=talent_ids)
+    latest = {talent_id: None for talent_id in talent_ids or ()}
+    seen = set()
+    rows = resumes.order_by('talent_id', '-updated_at', '-id').values_list('talent_id', 'text_embedding')
+    for talent_id, data in rows.iterator(chunk_size=2000):
+        if talent_id not in seen:
+            seen.add(talent_id)
+            latest[talent_id] = data
+    return latest
+
+
+def _open_job_vectors(job_ids=None):
+    jobs = JobPosting.objects.filter(is_active=True, status=JobStatus.PUBLISHED)
+    if job_ids is not None:
+        jobs = jobs.filter(id__in=job_ids)
+    vectors = {job_id: None for job_id in job_ids or ()}
+    vectors.update(jobs.values_list('id', 'text_embedding').iterator(chunk_size=2000))
+    return vectors
+
+
+def _changed_talent_ids(since):
+    from talent_management.models import Resume
+
+    changed = Resume.objects.filter(Q(text_embedding_updated_at__gt=since) | Q(updated_at__gt=since))
+    return set(changed.exclude(talent_id=None).values_list('talent_id', flat=True))
+
+
+def _changed_job_ids(since):
+    changed = JobPosting.objects.filter(Q(text_embedding_updated_at__gt=since) | Q(updated_at__gt=since))
+    return set(changed.values_list('id', flat=True))
+
+
+class _SyncedIndex:
+    """A VectorIndex kept in step with the database: new builds and changed rows are picked up on use."""
+
+    def __init__(self, name, load_vectors, changed_ids):
+        self.index = VectorIndex(name, EMBEDDING_DIM)
+        self._load_vectors = load_vectors
+        self._changed_ids = changed_ids
+        self._lock = threading.Lock()
+        self._build_name = None
+        self._polled_at = None      # database time of the last poll
+        self._checked = 0.0         # monotonic time of the last poll
+
+    def _apply(self, vectors):
+        for key, data in vectors.items():
+            vector = vector_from_bytes(data)
+            if vector is None:
+                self.index.remove(key)
+            else:
+                self.index.upsert(key, vector)
+
+    def current(self):
+        with self._lock:
+            if time.monotonic() - self._checked < settings.MATCH_ENGINE_REFRESH_SECONDS:
+                return self.index
+            self.index.load()
+            if self.index.build_name != self._build_name or self._polled_at is None:
+                # New build (or first use): re-apply everything written since it was built.
+                self._build_name = self.index.build_name
+                built_at = parse_datetime(self.index.built_at) if self.index.built_at else None
+                self._polled_at = built_at - POLL_OVERLAP if built_at else None
+            poll_started = timezone.now()
+            if self._polled_at is None:
+                self._apply(self._load_vectors())
+            else:
+                changed = self._changed_ids(self._polled_at)
+                if changed:
+                    self._apply(self._load_vectors(list(changed)))
+            self._polled_at = poll_started - POLL_OVERLAP
+            self._checked = time.monotonic()
+            return self.index
+
+    def update(self, key, vector):
+        """Records a vector this process has just written (or removed, with None)."""
+        if vector is None:
+            self.index.remove(key)
+        else:
+            self.index.upsert(key, vector)
+
+    def needs_rebuild(self):
+        return self.index.delta_size > max(REBUILD_MIN_DELTA, REBUILD_DELTA_FRACTION * len(self.index))
+
+    def rebuild(self):
+        built_at = timezone.now()
+        vectors = {key: vector_from_bytes(data) for key, data in self._load_vectors().items() if data}
+        keys = np.fromiter(vectors.keys(), dtype=np.int64, count=len(vectors))
+        matrix = np.stack(list(vectors.values())) if vectors else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        with self._lock:
+            self.index.build(keys, matrix, built_at.isoformat())
+            self._build_name = self.index.build_name
+            self._polled_at = built_at - POLL_OVERLAP
+            self._checked = 0.0  # pick up rows written while building on the next use
+        return len(keys)
+
+
+talent_index = _SyncedIndex("talents", _latest_resume_vectors, _changed_talent_ids)
+job_index = _SyncedIndex("jobs", _open_job_vectors, _changed_job_ids)
+
+
+def rebuild_indexes(force=False):
+    """Rebuilds the indexes whose delta has grown too large (or both, with force)."""
+    for synced in (talent_index, job_index):
+        if force or synced.needs_rebuild():
+            count = synced.rebuild()
+            logger.info("Rebuilt the %s semantic index with %s vectors.", synced.index.name, count)
+
+
+# --- Embeddings -------------------------------------------------------------------
+
+def _needs_embedding(instance, text):
+    return (
+        not instance.text_embedding
+        or instance.text_embedding_model != settings.SENTENCE_EMBEDDING_MODEL
+        or instance.text_embedding_source != _digest(text)
+    )
+
+
+def embed_instances(instances, text_for):
+    """
+    Computes and stores the embedding of every instance whose text changed. Returns
+    {pk: vector or None}; None when the text is empty or embeddings are unavailable.
+    """
+    vectors, pending = {}, []
+    for instance in instances:
+        text = text_for(instance)
+        if not text:
+            if instance.text_embedding:
+                type(instance).objects.filter(pk=instance.pk).update(
+                    text_embedding=None, text_embedding_model="", text_embedding_source="",
+                    text_embedding_updated_at=timezone.now(),
+                )
+            vectors[instance.pk] = None
+        elif _needs_embedding(instance, text):
+            pending.append((instance, text))
+        else:
+            vectors[instance.pk] = vector_from_bytes(instance.text_embedding)
+
+    embedded = _embed([text for _, text in pending]) if pending else None
+    for position, (instance, text) in enumerate(pending):
+        if embedded is None:
+            vectors[instance.pk] = vector_from_bytes(instance.text_embedding)  # stale beats none
+            continue
+        vector = embedded[position]
+        # update(), not save(): the embedding is derived data and must not look like an edit.
+        type(instance).objects.filter(pk=instance.pk).update(
+            text_embedding=vector.tobytes(),
+            text_embedding_model=settings.SENTENCE_EMBEDDING_MODEL,
+            text_embedding_source=_digest(text),
+            text_embedding_updated_at=timezone.now(),
+        )
+        vectors[instance.pk] = vector
+    return vectors
+
+
+def refresh_talent_embedding(talent_id):
+    """Embeds the talent's latest resume if needed and updates the talent index. Returns the vector."""
+    from talent_management.models import Resume
+
+    resume = (
+        Resume.objects.filter(talent_id=talent_id, is_deleted=False)
+        .order_by('-updated_at', '-id').first()
+    )
+    vector = embed_instances([resume], resume_text)[resume.pk] if resume else None
+    talent_index.update(talent_id, vector)
+    return vector
+
+
+def refresh_job_embedding(job_posting_id):
+    """Embeds the job posting if needed and updates the job index (open jobs only). Returns the vector."""
+    job_posting = JobPosting.objects.filter(id=job_posting_id).first()
+    vector = embed_instances([job_posting], job_text)[job_posting.pk] if job_posting else None
+    is_open = job_posting is not None and job_posting.is_active and job_posting.status == JobStatus.PUBLISHED
+    job_index.update(job_posting_id, vector if is_open else None)
+    return vector
+
+
+def stored_talent_vector(talent_id):
+    return vector_from_bytes(_latest_resume_vectors([talent_id]).get(talent_id))
+
+
+def stored_job_vector(job_posting_id):
+    data = JobPosting.objects.filter(id=job_posting_id).values_list('text_embedding', flat=True).first()
+    return vector_from_bytes(data)
+
+
+# --- Scores -----------------------------------------------------------------------
+
+def semantic_score(similarity):
+    scaled = (similarity - SIMILARITY_FLOOR) / (SIMILARITY_CEILING - SIMILARITY_FLOOR)
+    return 100.0 * min(1.0, max(0.0, scaled))
+
+
+def blend(skill_score, similarity):
+    if similarity is None:
+        return skill_score
+    weight = settings.SEMANTIC_MATCH_WEIGHT
+    return round((1 - weight) * skill_score + weight * semantic_score(similarity), 2)
+
+
+def blend_scores(skill_scores, vector, synced_index, candidates=None):
+    """
+    Blends {key: skill score} with the similarity of each key's vector to `vector`,
+    adding the `candidates` (default settings.SEMANTIC_MATCH_CANDIDATES) nearest keys
+    of the index that share no skills. Returns {key: score}.
+    """
+    if vector is None or not settings.SEMANTIC_MATCHING_ENABLED:
+        return dict(skill_scores)
+    index = synced_index.current()
+    similarities = dict(index.search(vector, candidates or settings.SEMANTIC_MATCH_CANDIDATES))
+    similarities.update(index.similarities(vector, [key for key in skill_scores if key not in similarities]))
+    keys = set(skill_scores) | set(similarities)
+    return {key: blend(skill_scores.get(key, 0.0), similarities.get(key)) for key in keys}
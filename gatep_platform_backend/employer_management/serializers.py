@@ -475,6 +475,9 @@ class CandidateDashboardSerializer(serializers.ModelSerializer):
     
     # Match score is from the 'score' field in the Application model
     match_score = serializers.DecimalField(source='score', max_digits=5, decimal_places=2, read_only=True)
+
+    # Precomputed skill match (JobCandidateMatch), annotated by HiringAnalyticsDashboardViewSet
+    skill_match_score = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True, allow_null=True, default=None)
     
     # Status is from the 'status' field in the Application model
     status = serializers.CharField(read_only=True)
@@ -492,6 +495,7 @@ class CandidateDashboardSerializer(serializers.ModelSerializer):
             'experience',
             'location',
             'match_score',
+            'skill_match_score',
             'status',
             
             # 'id', # Uncomment if you need the application ID
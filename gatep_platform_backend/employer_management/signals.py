@@ -0,0 +1,42 @@
+# employer_management/signals.py
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from talent_management.models import JobListing
+from utils1.match_engine import job_skills_changed, talent_skills_changed
+
+from . import job_facets
+from .job_matches import schedule_job_refresh, schedule_talent_refresh
+from .job_search import listing_changed, posting_changed
+from .models import JobPosting
+
+
+@receiver(talent_skills_changed)
+def refresh_matches_for_talent(sender, talent_id, **kwargs):
+    schedule_talent_refresh(talent_id)
+
+
+@receiver(job_skills_changed)
+def refresh_matches_for_job(sender, job_id, **kwargs):
+    schedule_job_refresh(job_id)
+
+
+@receiver(job_skills_changed)
+def reindex_job_for_search(sender, job_id, **kwargs):
+    posting_changed(job_id)
+
+
+@receiver(post_delete, sender=JobPosting)
+def unindex_deleted_posting(sender, instance, **kwargs):
+    posting_changed(instance.id)
+
+
+@receiver(post_delete, sender=JobListing)
+def unindex_deleted_listing(sender, instance, **kwargs):
+    listing_changed(instance.id)
+
+
+@receiver(job_skills_changed)
+def invalidate_job_facet_counts(sender, job_id, **kwargs):
+    job_facets.invalidate()
@@ -0,0 +1,182 @@
+# employer_management/talent_search.py
+"""
+Free-text talent search for employers ("computer vision engineer with YOLO and
+edge deployment"), ranked the way job matching ranks talents, without an LLM
+call per query.
+
+The query is embedded locally with MiniLM (semantic_matching.embed_query) and
+compared with the precomputed resume embeddings of the "talents" vector index
+(each talent's latest resume: skills, tech stack, summary, experience, projects).
+Skills named in the query are scored with the skill match engine, and the two are
+blended as in job matching; a query naming no known skill is ranked by text
+similarity alone, and without an embedding model only the skill score remains.
+
+Structured filters (current_city, employee_level, is_fresher, work_authorizations)
+are resolved in the database first. A filtered set of up to EXACT_FILTER_MAX
+talents is scored exactly; a larger one is taken from an over-fetched approximate
+search. The ranked list (at most TALENT_SEARCH_MAX_RESULTS talents) is cached for
+TALENT_SEARCH_CACHE_SECONDS, so paging through it does not search again.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from talent_management.models import EmployeeLevelChoices, Resume, ResumeSkill, UserRole
+from talent_management.skill_taxonomy import extract_skills_from_text, parse_skill_list
+from utils1.match_engine import get_match_engine
+
+from . import semantic_matching
+from .job_facets import FilterError
+
+EXACT_FILTER_MAX = 20000  # filtered talents scored exactly against the query vector
+OVERSAMPLE = 10           # approximate hits fetched per wanted result when the filter is broad
+SUMMARY_LENGTH = 300
+MAX_FILTER_VALUES = 20
+
+
+def parse_filters(query_params):
+    """
+    Reads the structured filters from request query params: current_city and
+    work_authorizations (repeated; a talent must list every authorization, matched
+    as a case-insensitive substring), employee_level (repeated or comma-separated)
+    and is_fresher (true | false). Raises FilterError for invalid values.
+    """
+    filters = {}
+    cities = sorted({city.strip() for city in query_params.getlist('current_city') if city.strip()})
+    if cities:
+        filters['current_city'] = cities
+    levels = sorted({
+        level.strip().upper() for item in query_params.getlist('employee_level') for level in item.split(',') if level.strip()
+    })
+    if levels:
+        unknown = [level for level in levels if level not in EmployeeLevelChoices.values]
+        if unknown:
+            raise FilterError(
+                f"Unknown employee_level: {', '.join(unknown)}. Allowed: {', '.join(EmployeeLevelChoices.values)}."
+            )
+        filters['employee_level'] = levels
+    authorizations = sorted({value.strip() for value in query_params.getlist('work_authorizations') if value.strip()})
+    if authorizations:
+        filters['work_authorizations'] = authorizations
+    fresher = query_params.get('is_fresher', '').strip().lower()
+    if fresher in ('true', 'false'):
+        filters['is_fresher'] = fresher == 'true'
+    elif fresher:
+        raise FilterError("is_fresher must be 'true' or 'false'.")
+    if any(isinstance(values, list) and len(values) > MAX_FILTER_VALUES for values in filters.values()):
+        raise FilterError(f"At most {MAX_FILTER_VALUES} values are allowed per filter.")
+    return filters
+
+
+def filtered_talent_ids(filters):
+    """Ids of the talents with a resume matching every filter, or None without filters."""
+    if not filters:
+        return None
+    resumes = Resume.objects.filter(is_deleted=False, talent_id__user_role=UserRole.TALENT)
+    if 'current_city' in filters:
+        cities = Q()
+        for city in filters['current_city']:
+            cities |= Q(current_city__iexact=city)
+        resumes = resumes.filter(cities)
+    if 'employee_level' in filters:
+        resumes = resumes.filter(employee_level__in=filters['employee_level'])
+    if 'is_fresher' in filters:
+        resumes = resumes.filter(is_fresher=filters['is_fresher'])
+    for authorization in filters.get('work_authorizations', []):
+        resumes = resumes.filter(work_authorizations__icontains=authorization)
+    return set(resumes.values_list('talent_id', flat=True).distinct())
+
+
+def _similarities(index, vector, allowed, max_results):
+    if allowed is None:
+        return dict(index.search(vector, max_results))
+    if len(allowed) <= EXACT_FILTER_MAX:
+        return index.similarities(vector, allowed)
+    return {key: similarity for key, similarity in index.search(vector, max_results * OVERSAMPLE) if key in allowed}
+
+
+def rank_talents(query, filters):
+    """
+    Ranks the talents for a query. Returns ([(talent id, score)] best first, at most
+    TALENT_SEARCH_MAX_RESULTS, the skill ids recognised in the query).
+    """
+    max_results = settings.TALENT_SEARCH_MAX_RESULTS
+    vector = semantic_matching.embed_query(query)
+    skill_ids = [skill_id for skill_id, _ in extract_skills_from_text(query)]
+    allowed = filtered_talent_ids(filters)
+    if (vector is None and not skill_ids) or allowed == set():
+        return [], skill_ids
+
+    skill_scores = dict(get_match_engine().rank_talents_for_job(skill_ids=skill_ids)) if skill_ids else {}
+    if allowed is not None:
+        skill_scores = {key: score for key, score in skill_scores.items() if key in allowed}
+    similarities = {}
+    if vector is not None:
+        index = semantic_matching.talent_index.current()
+        similarities = _similarities(index, vector, allowed, max_results)
+        similarities.update(index.similarities(vector, [key for key in skill_scores if key not in similarities]))
+
+    scores = {}
+    for key in set(skill_scores) | set(similarities):
+        if skill_ids:
+            score = semantic_matching.blend(skill_scores.get(key, 0.0), similarities.get(key))
+        else:
+            score = round(semantic_matching.semantic_score(similarities[key]), 2)
+        if score > 0:
+            scores[key] = score
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:max_results]
+    return ranked, skill_ids
+
+
+def search_talents(query, filters, offset=0, limit=20):
+    """Returns (total ranked talents, [(talent id, score)] of one page, query skill ids)."""
+    query = " ".join(query.split())
+    state = json.dumps([query.lower(), filters], sort_keys=True)
+    key = f"talent_search:{hashlib.sha1(state.encode()).hexdigest()}"
+    cached = cache.get(key)
+    if cached is None:
+        cached = rank_talents(query, filters)
+        cache.set(key, cached, timeout=settings.TALENT_SEARCH_CACHE_SECONDS)
+    ranked, skill_ids = cached
+    return len(ranked), ranked[offset:offset + limit], skill_ids
+
+
+def search_results(request, page, skill_ids):
+    """Renders a page of (talent id, score) from each talent's latest resume."""
+    latest_resumes = {}
+    for resume in Resume.objects.filter(
+        talent_id__in=[talent_id for talent_id, _ in page], is_deleted=False
+    ).order_by('talent_id', '-updated_at', '-id').select_related('talent_id'):
+        latest_resumes.setdefault(resume.talent_id_id, resume)
+    matched = {}
+    if skill_ids:
+        for talent_id, name in ResumeSkill.objects.filter(
+            resume__in=[resume.id for resume in latest_resumes.values()], skill_id__in=skill_ids
+        ).values_list('resume__talent_id', 'skill__name'):
+            matched.setdefault(talent_id, []).append(name)
+
+    results = []
+    for talent_id, score in page:
+        resume = latest_resumes.get(talent_id)
+        if resume is None:
+            continue  # deleted since the search was cached
+        talent = resume.talent_id
+        summary = resume.summary or resume.generated_summary
+        results.append({
+            'talent_id': talent_id,
+            'name': f"{talent.first_name} {talent.last_name}".strip() or talent.username,
+            'score': score,
+            'current_city': resume.current_city or None,
+            'employee_level': resume.employee_level,
+            'is_fresher': resume.is_fresher,
+            'work_authorizations': resume.work_authorizations,
+            'skills': parse_skill_list(resume.skills),
+            'matched_skills': sorted(matched.get(talent_id, [])),
+            'summary': summary[:SUMMARY_LENGTH] + ("…" if len(summary) > SUMMARY_LENGTH else ""),
+            'resume_url': request.build_absolute_uri(resume.resume_pdf.url) if resume.resume_pdf else None,
+        })
+    return results
@@ -1,10 +1,10 @@
 from django.urls import path
 from employer_management.views import (
     ApplicationDeleteView, ApplicationOfferExtendAPIView, ApplicationStatusUpdateView, CloseJobPostingView, CombinedDashboardView, CompanyListCreateView, CompanyDetailView, CompletedInterviewCandidateListAPIView, EmpDemographicsView, EmployerAnalyticsDemographicAPIView, EmployerAnalyticsTrendsAPIView, EmployerCompanyUpdateView, EmployerDashboardAPIView, EmployerTalentJobMatchScoreAPIView, HiringAnalyticsDashboardViewSet, InterviewFeedbackView, InterviewStatusUpdateView,
-    JobPostingListCreateView, JobPostingDetailView,
+    JobFilterView, JobPostingListCreateView, JobPostingDetailView, JobSearchView,
     ApplicationListCreateView, ApplicationDetailView,
     InterviewListCreateView, InterviewDetailView, PotentialCandidateMatchView, PublishJobPostingView,
-    SaveJobView, ScheduledInterviewTalentListAPIView, TalentInterviewListView, TalentListByStatusAPIView, UnsaveJobView, ListSavedJobsView,
+    SaveJobView, ScheduledInterviewTalentListAPIView, TalentInterviewListView, TalentListByStatusAPIView, TalentSearchView, UnsaveJobView, ListSavedJobsView,
     EmployerApplicationListForJobView, EmployerApplicationDetailView,
     JobListWithMatchingScoreAPIView,
     EmployerCompanyView , EmployerCompanyDetailView
@@ -20,6 +20,8 @@ urlpatterns = [
     # Job Postings
     path('job-postings/', JobPostingListCreateView.as_view(), name='jobposting-list-create'),
     path('job-postings/<int:pk>/', JobPostingDetailView.as_view(), name='jobposting-detail'),
+    path('job-postings/search/', JobSearchView.as_view(), name='jobposting-search'),
+    path('job-postings/filter/', JobFilterView.as_view(), name='jobposting-filter'),
 
     # Application Management (for talents)
     path('applications/', ApplicationListCreateView.as_view(), name='application-list-create'),
@@ -34,6 +36,7 @@ urlpatterns = [
     path('jobpostings/<int:pk>/close/', CloseJobPostingView.as_view(), name='jobposting-close'),
     path('job-postings/<int:job_posting_id>/potential-candidates/', PotentialCandidateMatchView.as_view(), name='job-potential-candidates'),
     path('job-postings/talents/by-status/', TalentListByStatusAPIView.as_view(), name='talent-list-by-status'),
+    path('talents/search/', TalentSearchView.as_view(), name='talent-search'),
     # Interviews
     path('interviews/', InterviewListCreateView.as_view(), name='interview-list-create'),
     path('interviews/<int:pk>/', InterviewDetailView.as_view(), name='interview-detail'),
@@ -7,15 +7,19 @@ import json
 from rest_framework.response import Response
 from rest_framework import generics, status, permissions
 from rest_framework.views import APIView
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 from django.shortcuts import get_object_or_404
-from .models import ApplicationStatus, Company, FeedbackRecommendation, InterviewFeedback, InterviewOutcome, JobPosting, Application, Interview, JobStatus, SavedJob, InterviewStatus
-from talent_management.models import TalentProfile, Resume, CustomUser, UserRole
+from .models import ApplicationStatus, Company, FeedbackRecommendation, InterviewFeedback, InterviewOutcome, JobCandidateMatch, JobPosting, JobRecommendation, Application, Interview, JobStatus, SavedJob, InterviewStatus
+from talent_management.models import TalentProfile, Resume, ResumeSkill, CustomUser, Skill, UserRole
 from .serializers import (
     ApplicationStatusUpdateSerializer, CandidateDashboardSerializer, CompanySerializer, InterviewFeedbackSerializer, InterviewStatusUpdateSerializer, JobPostingSerializer, ApplicationSerializer, InterviewSerializer, PotentialCandidateSerializer,
     SavedJobSerializer, SaveJobActionSerializer, ApplicationListSerializer, ApplicationDetailSerializer, InterviewListItemSerializer
 )
-from utils1.ai_match import get_ai_match_score
-from django.db.models import Avg
+from talent_management.skill_taxonomy import job_skill_ids, parse_skill_list, resume_skill_ids, skill_match_score
+from . import job_facets, job_matches, job_recommendations, job_search, semantic_matching, talent_search
+from django.db import IntegrityError
+from django.db.models import Avg, Count, F, OuterRef, Q, Subquery
 from rest_framework.exceptions import PermissionDenied
 from employer_management.permissions import (
     IsEmployerUser, IsApplicationOwnerOrJobOwner, IsInterviewParticipantOrJobOwner, IsJobPostingOwner
@@ -112,6 +116,88 @@ class JobPostingListCreateView(generics.ListCreateAPIView):
             raise serializers.ValidationError({"detail": "You must register your company before posting jobs."})
         serializer.save(company=employer_company)
 
+class JobSearchView(APIView):
+    """
+    Keyword search over published job postings and imported job listings, ranked by
+    relevance (BM25, see job_search.py), with highlighted titles and snippets.
+
+    GET /api/job-postings/search/?q=python django&page=1&page_size=20
+    Optional filters: source (postings | listings), job_type, experience_level,
+    location, remote=true.
+    """
+    permission_classes = [permissions.AllowAny]
+    max_page_size = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        source = request.query_params.get('source')
+        if source and source not in job_search.SOURCES:
+            return Response({"detail": "source must be 'postings' or 'listings'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(self.max_page_size, max(1, int(request.query_params.get('page_size', 20))))
+        except ValueError:
+            return Response({"detail": "page and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        total, hits = job_search.search_jobs(
+            query,
+            source=source,
+            job_type=request.query_params.get('job_type'),
+            location=request.query_params.get('location'),
+            remote=request.query_params.get('remote', '').lower() == 'true',
+            experience_level=request.query_params.get('experience_level'),
+            offset=(page - 1) * page_size,
+            limit=page_size,
+        )
+        url = request.build_absolute_uri()
+        return Response({
+            "count": total,
+            "next": replace_query_param(url, 'page', page + 1) if page * page_size < total else None,
+            "previous": replace_query_param(url, 'page', page - 1) if page > 1 else None,
+            "results": job_search.search_results(query, hits),
+        }, status=status.HTTP_200_OK)
+
+
+class JobFilterView(APIView):
+    """
+    Open job postings narrowed by filters, newest first, with the facet counts for the
+    current filter state (see job_facets.py).
+
+    GET /api/job-postings/filter/?job_type=Full-time,Contract&remote_work=true&skills=python,django&page=1
+    Filters: job_type, experience_level, salary_band, skills (comma-separated or repeated),
+    location (repeated), remote_work and visa_sponsorship (true | false).
+    Pass facets=false to skip the facet counts, e.g. when only paging.
+    """
+    permission_classes = [permissions.AllowAny]
+    max_page_size = 100
+
+    def get(self, request, *args, **kwargs):
+        try:
+            filters = job_facets.parse_filters(request.query_params)
+        except job_facets.FilterError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(self.max_page_size, max(1, int(request.query_params.get('page_size', 20))))
+        except ValueError:
+            return Response({"detail": "page and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        counts = job_facets.facet_counts(filters)
+        total = counts["total"]
+        url = request.build_absolute_uri()
+        data = {
+            "count": total,
+            "next": replace_query_param(url, 'page', page + 1) if page * page_size < total else None,
+            "previous": replace_query_param(url, 'page', page - 1) if page > 1 else None,
+            "results": job_facets.filtered_postings(filters, offset=(page - 1) * page_size, limit=page_size),
+        }
+        if request.query_params.get('facets', '').lower() != 'false':
+            data["facets"] = counts["facets"]
+        return Response(data, status=status.HTTP_200_OK)
+
+
 class JobPostingDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
@@ -160,12 +246,33 @@ class CloseJobPostingView(APIView):
         job_posting.save()
         return Response({'detail': 'Job posting closed.'}, status=status.HTTP_200_OK)
 
+class MatchPagination(PageNumberPagination):
+    """
+    Pagination of the match views, applied when ?page= is given (the response is then
+    {"count", "next", "previous", "results"}); without it they return a plain list.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+def _paginate_matches(request, view, ranked, default_limit=None):
+    """Returns (page of `ranked`, paginator or None)."""
+    if 'page' not in request.query_params:
+        return (ranked[:default_limit] if default_limit else ranked), None
+    paginator = MatchPagination()
+    return paginator.paginate_queryset(ranked, request, view=view), paginator
+
+
 class PotentialCandidateMatchView(APIView):
     """
     API endpoint for an employer to discover potential candidates from the talent pool
     who have NOT applied for a specific job, ranked by their AI match score.
 
-    Accessible via: GET /api/job-postings/<job_posting_id>/potential-candidates/
+    Accessible via: GET /api/job-postings/<job_posting_id>/potential-candidates/?limit=100
+    or paginated with ?page=N&page_size=M.
+    Open jobs are read from the precomputed JobCandidateMatch table (scores of at least
+    settings.JOB_MATCH_MIN_SCORE); drafts and closed jobs are ranked on the fly.
     """
     permission_classes = [permissions.IsAuthenticated, IsEmployerUser, IsJobPostingOwner]
 
@@ -173,72 +280,125 @@ class PotentialCandidateMatchView(APIView):
         job_posting = get_object_or_404(JobPosting, pk=job_posting_id)
         self.check_object_permissions(request, job_posting)
 
-        job_required_skills = job_posting.required_skills if job_posting.required_skills else []
-        if not job_required_skills:
+        required_skill_ids = job_skill_ids(job_posting)
+        if not required_skill_ids:
             return Response({"detail": "Job posting has no required skills listed."}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            limit = max(1, int(request.query_params.get('limit', 100)))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
         applied_talent_ids = Application.objects.filter(job_posting=job_posting).values_list('talent_id', flat=True)
-        potential_talents = CustomUser.objects.filter(
-            user_role=UserRole.TALENT
-        ).exclude(
-            id__in=applied_talent_ids
-        )
+
+        if job_posting.is_active and job_posting.status == JobStatus.PUBLISHED:
+            # Indexed range read on (job_posting, -score).
+            ranked = JobCandidateMatch.objects.filter(
+                job_posting=job_posting
+            ).exclude(
+                talent_id__in=applied_talent_ids
+            ).order_by('-score', 'talent_id').values_list('talent_id', 'score')
+        else:
+            # Skill scores for every talent in one sparse matrix-vector product
+            # (utils1/match_engine.py), blended with the semantic index's nearest resumes.
+            scores = job_matches.score_talents_for_job(
+                job_posting.id, semantic_matching.stored_job_vector(job_posting.id), skill_ids=required_skill_ids
+            )
+            applied = set(applied_talent_ids)
+            ranked = sorted(
+                ((talent_id, score) for talent_id, score in scores.items() if score > 0 and talent_id not in applied),
+                key=lambda item: (-item[1], item[0]),
+            )
+        page, paginator = _paginate_matches(request, self, ranked, default_limit=limit)
+        page = list(page)
+
+        latest_resumes = {}
+        for resume in Resume.objects.filter(
+            talent_id__in=[talent_id for talent_id, _ in page], is_deleted=False
+        ).order_by('talent_id', '-updated_at').select_related('talent_id'):
+            latest_resumes.setdefault(resume.talent_id_id, resume)
 
         candidate_scores = []
 
-        for talent in potential_talents:
-            resume = Resume.objects.filter(talent_id=talent.id, is_deleted=False).order_by('-updated_at').first()
-            
-            # If no resume exists for the talent, we cannot get skills, location, or a resume URL.
-            # So, we skip to the next potential candidate.
-            if not resume:
+        for talent_id, score in page:
+            resume = latest_resumes.get(talent_id)
+            if resume is None:
                 continue
+            talent = resume.talent_id
+
+            # --- START: Corrected data retrieval ---
+
+            # Correctly determine the candidate's location.
+            # Prioritize 'current_city', fallback to 'current_location',
+            # and standardize empty or default values to None for a cleaner API response.
+            location = resume.current_city or getattr(resume, 'current_location', None)
+            if not location or location.strip() == "Not Provided":
+                location = None
+
+            # Correctly get the resume URL from the `resume_pdf` FileField.
+            # The `resume_pdf` field is a FileField, not a URLField named `resume_url`.
+            resume_url = None
+            if resume.resume_pdf and hasattr(resume.resume_pdf, 'url'):
+                # `request.build_absolute_uri` creates a full URL (e.g., http://domain/media/...)
+                resume_url = request.build_absolute_uri(resume.resume_pdf.url)
+
+            # --- END: Corrected data retrieval ---
+
+            candidate_scores.append({
+                'talent_id': talent.id,
+                'name': f"{talent.first_name} {talent.last_name}".strip() or talent.username,
+                'ai_match_score': float(score),
+                'location': location,      # Now correctly populated
+                'resume_url': resume_url,  # Now correctly populated
+            })
 
-            user_skills = []
-            if resume.skills:
-                try:
-                    user_skills = json.loads(resume.skills)
-                except (json.JSONDecodeError, TypeError):
-                    user_skills = [s.strip() for s in str(resume.skills).split(',') if s.strip()]
-
-            # Only proceed to score and list candidates who have skills in their resume.
-            if user_skills:
-                score = get_ai_match_score(user_skills, job_required_skills)
-                
-                # --- START: Corrected data retrieval ---
-                
-                # Correctly determine the candidate's location.
-                # Prioritize 'current_city', fallback to 'current_location',
-                # and standardize empty or default values to None for a cleaner API response.
-                location = resume.current_city or resume.current_location
-                if not location or location.strip() == "Not Provided":
-                    location = None
-
-                # Correctly get the resume URL from the `resume_pdf` FileField.
-                # The `resume_pdf` field is a FileField, not a URLField named `resume_url`.
-                resume_url = None
-                if resume.resume_pdf and hasattr(resume.resume_pdf, 'url'):
-                    # `request.build_absolute_uri` creates a full URL (e.g., http://domain/media/...)
-                    resume_url = request.build_absolute_uri(resume.resume_pdf.url)
-                    
-                # --- END: Corrected data retrieval ---
-
-                candidate_scores.append({
-                    'talent_id': talent.id,
-                    'name': f"{talent.first_name} {talent.last_name}".strip() or talent.username,
-                    'ai_match_score': score,
-                    'location': location,      # Now correctly populated
-                    'resume_url': resume_url,  # Now correctly populated
-                })
-
-        sorted_candidates = sorted(candidate_scores, key=lambda x: x['ai_match_score'], reverse=True)
-        serializer = PotentialCandidateSerializer(sorted_candidates, many=True)
+        serializer = PotentialCandidateSerializer(candidate_scores, many=True)
+        if paginator is not None:
+            return paginator.get_paginated_response(serializer.data)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 
 
 
+class TalentSearchView(APIView):
+    """
+    Free-text talent search for employers, e.g.
+    GET /api/talents/search/?q=computer vision engineer with YOLO and edge deployment&current_city=Pune
+
+    Ranks talents by the similarity of their resume to the query and by the skills
+    the query names (see talent_search.py). Optional filters: current_city and
+    work_authorizations (repeated), employee_level (FRESHER | INTERN | EXPERIENCED),
+    is_fresher (true | false). Paginated with page and page_size.
+    """
+    permission_classes = [permissions.IsAuthenticated, IsEmployerUser]
+    max_page_size = 100
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            filters = talent_search.parse_filters(request.query_params)
+        except job_facets.FilterError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = min(self.max_page_size, max(1, int(request.query_params.get('page_size', 20))))
+        except ValueError:
+            return Response({"detail": "page and page_size must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+
+        total, hits, skill_ids = talent_search.search_talents(
+            query, filters, offset=(page - 1) * page_size, limit=page_size
+        )
+        url = request.build_absolute_uri()
+        return Response({
+            "count": total,
+            "next": replace_query_param(url, 'page', page + 1) if page * page_size < total else None,
+            "previous": replace_query_param(url, 'page', page - 1) if page > 1 else None,
+            "results": talent_search.search_results(request, hits, skill_ids),
+        }, status=status.HTTP_200_OK)
+
+
 class ApplicationListCreateView(generics.ListCreateAPIView):
     # This view is primarily for Talent users to list/create applications.
     serializer_class = ApplicationSerializer 
@@ -524,11 +684,16 @@ class EmployerApplicationDetailView(generics.RetrieveUpdateAPIView):
         context['request'] = self.request
         return context
     
-from utils1.ai_match import get_ai_match_score
 
 from talent_management.models import Resume
 
 class JobListWithMatchingScoreAPIView(APIView):
+    """
+    GET: /job-postings/ai-score/ (optionally ?page=N&page_size=M)
+    The talent's job recommendation feed: the best matching open jobs with freshness
+    and diversity boosts, precomputed in JobRecommendation (see job_recommendations.py)
+    and read in feed order on its (talent, position) index.
+    """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
@@ -539,26 +704,29 @@ class JobListWithMatchingScoreAPIView(APIView):
         if not resume or not resume.skills:
             return Response({"detail": "Resume or skills not found."}, status=404)
 
-        try:
-            user_skills = json.loads(resume.skills) if resume.skills else []
-            print(user_skills)
-        except Exception:
-            user_skills = []
+        feed = JobRecommendation.objects.filter(
+            talent=request.user, job_posting__is_active=True, job_posting__status=JobStatus.PUBLISHED
+        ).select_related('job_posting').order_by('position')
+        if not feed.exists() and JobCandidateMatch.objects.filter(talent=request.user).exists():
+            # Matches computed before the feed existed (e.g. right after deploying): build it once here.
+            try:
+                job_recommendations.refresh_feed(request.user.id)
+            except IntegrityError:
+                pass  # the job-match thread wrote the feed at the same time; serve its rows
+        page, paginator = _paginate_matches(request, self, feed)
 
-        jobs = JobPosting.objects.filter(is_active=True, status='PUBLISHED').order_by('-posted_date')
-        print(jobs)
         job_list = []
-        for job in jobs:
-            job_required_skills = job.required_skills if hasattr(job, 'required_skills') and job.required_skills else []
-            print(job_required_skills)
-            score = get_ai_match_score(user_skills, job_required_skills)
-            print(score)
+        for recommendation in page:
             job_list.append({
-                'id': job.id,
-                'title': job.title,
-                'required_skills': job_required_skills,
-                'matching_percentage': score
+                'id': recommendation.job_posting.id,
+                'title': recommendation.job_posting.title,
+                'required_skills': recommendation.job_posting.required_skills or [],
+                'matching_percentage': float(recommendation.match_score),
+                'recommendation_score': float(recommendation.score),
+                'posted_date': recommendation.job_posting.posted_date,
             })
+        if paginator is not None:
+            return paginator.get_paginated_response(job_list)
         return Response(job_list)
 
 class EmployerCompanyView(APIView):
@@ -593,14 +761,9 @@ class EmployerTalentJobMatchScoreAPIView(APIView):
         # Get user skills from latest resume
         from talent_management.models import Resume
         resume_obj = Resume.objects.filter(talent_id=application.talent, is_deleted=False).order_by('-updated_at').first()
-        user_skills = []
-        if resume_obj and resume_obj.skills:
-            try:
-                user_skills = json.loads(resume_obj.skills)
-            except Exception:
-                user_skills = []
+        user_skills = parse_skill_list(resume_obj.skills) if resume_obj else []
 
-        score = get_ai_match_score(user_skills, job_required_skills)
+        score = skill_match_score(resume_skill_ids(resume_obj) if resume_obj else set(), job_skill_ids(job))
 
         data = {
             "job_id": job.id,
@@ -832,7 +995,14 @@ class HiringAnalyticsDashboardViewSet(viewsets.ReadOnlyModelViewSet):
         if start_date:
             queryset = queryset.filter(application_date__gte=start_date, application_date__lte=end_date)
 
-        queryset = queryset.order_by('-score', '-application_date')
+        # Skill match of the applicant for the job, from the precomputed JobCandidateMatch table;
+        # used to rank applications the employer has not scored yet.
+        skill_match = JobCandidateMatch.objects.filter(
+            job_posting=OuterRef('job_posting'), talent=OuterRef('talent')
+        ).values('score')[:1]
+        queryset = queryset.annotate(skill_match_score=Subquery(skill_match)).order_by(
+            F('score').desc(nulls_last=True), F('skill_match_score').desc(nulls_last=True), '-application_date'
+        )
 
         return queryset
 
@@ -844,9 +1014,13 @@ class HiringAnalyticsDashboardViewSet(viewsets.ReadOnlyModelViewSet):
         Query parameters:
         - job_filter: e.g., 'AI Engineer', 'ML Specialist', 'Data Scientist', 'NLP Engineer'
         - time_range: 'Last 6 Months', 'Last 3 Months', 'Last Month', 'Last Year'
+        - page / page_size: optional pagination
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page, paginator = _paginate_matches(request, self, queryset)
+        serializer = self.get_serializer(page, many=True)
+        if paginator is not None:
+            return paginator.get_paginated_response(serializer.data)
         return Response(serializer.data)
 
 from django.db import connection     
@@ -913,7 +1087,6 @@ class EmployerDashboardAPIView(APIView):
  
         return Response(dashboard_data)
 
-import re
 
 class EmployerAnalyticsDemographicAPIView(APIView):
     # permission_classes = [permissions.IsAuthenticated, IsEmployerUser]
@@ -921,37 +1094,19 @@ class EmployerAnalyticsDemographicAPIView(APIView):
     def get(self, request):
         data = {}
  
-        # --- Step 1: Fetch all unique required_skills from JobPosting ---
-        all_skills_set = set()
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT DISTINCT required_skills
-                FROM gatep_platform_db.employer_management_jobposting
-                WHERE required_skills IS NOT NULL AND required_skills != ''
-            """)
-            skill_rows = cursor.fetchall()
- 
-        for row in skill_rows:
-            raw = row[0]
-            if raw:
-                # Try to extract quoted skills (JSON-like), else fallback to comma-split
-                skills = re.findall(r'"([^"]+)"', raw) or raw.split(',')
-                all_skills_set.update(skill.strip().lower() for skill in skills if skill.strip())
- 
-        # --- Step 2: Count how many times each skill appears in Resume.skills ---
-        skill_distribution = []
-        with connection.cursor() as cursor:
-            for skill in sorted(all_skills_set):
-                cursor.execute("""
-                    SELECT COUNT(*)
-                    FROM gatep_platform_db.talent_management_resume
-                    WHERE LOWER(skills) LIKE %s
-                """, [f"%{skill}%"])
-                count = cursor.fetchone()[0]
-                skill_distribution.append({
-                    "skill": skill,
-                    "count": count
-                })
+        # --- Step 1 & 2: For every skill required by a job posting, count the resumes listing it ---
+        # Both sides come from the skill join tables, so "ML" on a resume counts towards
+        # "Machine Learning" on a job and "Java" no longer matches "JavaScript".
+        skills = Skill.objects.filter(
+            job_skills__isnull=False
+        ).annotate(
+            count=Count('resume_skills__resume', filter=Q(resume_skills__resume__is_deleted=False), distinct=True)
+        ).order_by('name').values('name', 'count')
+
+        skill_distribution = [
+            {"skill": skill['name'], "count": skill['count']}
+            for skill in skills
+        ]
  
         data["skill_distribution"] = skill_distribution
  
@@ -1256,18 +1411,16 @@ class EmpDemographicsView(APIView):
         ]
  
         # --- 4. Calculate Skill Distribution ---
-        skill_counter = Counter()
-        # We process the skills in Python for flexibility
-        # Assuming skills in your Resume model are a comma-separated string
-        for resume in relevant_resumes:
-            if resume.skills:
-                skills = [skill.strip().lower() for skill in resume.skills.split(',') if skill.strip()]
-                skill_counter.update(skills)
+        # Counted over the ResumeSkill join table, showing top 20 skills
+        skill_counts = ResumeSkill.objects.filter(resume__in=relevant_resumes) \
+                                          .values('skill__name') \
+                                          .annotate(count=Count('resume', distinct=True)) \
+                                          .order_by('-count', 'skill__name')[:20]
        
-        # Format for the final API response, showing top 20 skills
+        # Format for the final API response
         skill_distribution = [
-            {"skill": skill, "count": count}
-            for skill, count in skill_counter.most_common(20)
+            {"skill": row['skill__name'], "count": row['count']}
+            for row in skill_counts
         ]
  
         # --- 5. Prepare Filter Options for Frontend Dropdowns ---
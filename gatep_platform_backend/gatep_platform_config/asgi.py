@@ -2,6 +2,9 @@
 ASGI config for myproject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP goes to Django as before; WebSocket connections (the real-time mock
+interview channel, talent_management/routing.py) go to Channels. Serve it
+with an ASGI server, e.g. ``daphne gatep_platform_config.asgi:application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -11,6 +14,21 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'gatep_platform_config.settings')
 
-application = get_asgi_application()
+# Initialise Django before importing anything that touches models.
+django_asgi_app = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack
+from channels.routing import ProtocolTypeRouter, URLRouter
+from channels.security.websocket import AllowedHostsOriginValidator
+
+from talent_management.routing import websocket_urlpatterns
+from talent_management.services import QueryStringJWTAuthMiddleware
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(
+        AuthMiddlewareStack(QueryStringJWTAuthMiddleware(URLRouter(websocket_urlpatterns)))
+    ),
+})
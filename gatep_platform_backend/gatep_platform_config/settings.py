@@ -33,6 +33,7 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework_simplejwt',
     'rest_framework_simplejwt.token_blacklist', # For JWT logout functionality
+    'channels',           # WebSocket interview channel (talent_management/consumers.py)
     'talent_management',  # Your custom user app
     'auth_management',    # Your authentication API app
     'employer_management',
@@ -186,6 +187,146 @@ HFF_TOKEN = os.environ.get("HFF_TOKEN")
 GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 
+# --- ML Model Registry ---
+# Heavy models (Whisper, YOLOv5, ...) are loaded lazily on first use through
+# utils1/model_registry.py. A process can pre-load the models its role needs with
+# `python manage.py warmup_models --role <role>` or through the gunicorn
+# post_worker_init hook in gunicorn.conf.py, which reads GATEP_PROCESS_ROLE.
+GATEP_PROCESS_ROLE = os.environ.get("GATEP_PROCESS_ROLE", "web")
+WHISPER_MODEL_SIZE = os.environ.get("WHISPER_MODEL_SIZE", "base")
+# Small sentence-embedding model (384-d) used to pre-score interview answers locally.
+SENTENCE_EMBEDDING_MODEL = os.environ.get("SENTENCE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+# Weights of the local language-proficiency scorer fitted by `manage.py calibrate_language_scorer`.
+LANGUAGE_SCORER_CALIBRATION_PATH = os.environ.get(
+    "LANGUAGE_SCORER_CALIBRATION_PATH", os.path.join(BASE_DIR, "language_scorer_calibration.json")
+)
+
+# --- Vision Backend ---
+# "default": YOLOv5 via torch.hub and ArcFace via DeepFace/TensorFlow.
+# "onnx":    both models on ONNX Runtime (CPU) from the local files below; see
+#            utils1/onnx_vision.py for how to export them. ONNX_USE_INT8 uses the
+#            dynamically quantized copies. Compare with `manage.py compare_vision_backends`.
+VISION_INFERENCE_BACKEND = os.environ.get("VISION_INFERENCE_BACKEND", "default")
+ONNX_MODEL_DIR = os.environ.get("ONNX_MODEL_DIR", os.path.join(BASE_DIR, "onnx_models"))
+ONNX_YOLOV5_PATH = os.environ.get("ONNX_YOLOV5_PATH", os.path.join(ONNX_MODEL_DIR, "yolov5s.onnx"))
+ONNX_ARCFACE_PATH = os.environ.get("ONNX_ARCFACE_PATH", os.path.join(ONNX_MODEL_DIR, "arcface.onnx"))
+ONNX_USE_INT8 = os.environ.get("ONNX_USE_INT8", "False").lower() in ("true", "1", "yes")
+ONNX_INTRA_OP_THREADS = int(os.environ.get("ONNX_INTRA_OP_THREADS", "0"))  # 0 = onnxruntime default
+
+_VISION_MODELS = (["yolov5_onnx", "arcface_onnx"] if VISION_INFERENCE_BACKEND == "onnx" else ["yolov5", "arcface"]) \
+    + ["mediapipe_face_detection", "mediapipe_face_mesh"]
+MODEL_WARMUP_ROLES = {
+    "web": [],                                  # plain API workers: nothing is pre-loaded
+    "interview": ["whisper", "minilm"] + _VISION_MODELS,  # workers serving transcription, photo checks and scoring
+    "all": ["whisper", "minilm"] + _VISION_MODELS,
+    "inference": ["whisper"] + _VISION_MODELS,  # the run_inference_server sidecar
+}
+
+# --- Caches ---
+# "proctoring" holds the per-interview proctoring state (talent_management/proctoring_state.py)
+# and must be shared by every worker, so PROCTORING_CACHE selects a shared backend:
+#   "redis"    -- REDIS_URL (the default when REDIS_URL is set),
+#   "database" -- the "proctoring_cache" table (run `python manage.py createcachetable`;
+#                 its incr is not atomic, so concurrent strikes may be undercounted),
+#   "locmem"   -- per-process memory (the default without REDIS_URL); only for a
+#                 single-process dev server.
+# `python manage.py check --deploy` fails unless a shared backend is configured.
+REDIS_URL = os.environ.get("REDIS_URL")
+PROCTORING_CACHE = os.environ.get("PROCTORING_CACHE", "redis" if REDIS_URL else "locmem")
+_PROCTORING_CACHES = {
+    "redis": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL},
+    "database": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "proctoring_cache"},
+    "locmem": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "proctoring"},
+}
+_PROCTORING_USABLE = PROCTORING_CACHE in _PROCTORING_CACHES and (PROCTORING_CACHE != "redis" or REDIS_URL)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "proctoring": _PROCTORING_CACHES[PROCTORING_CACHE if _PROCTORING_USABLE else "locmem"],
+    # Facet counts of the job filter endpoint (employer_management/job_facets.py).
+    "job_facets": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+    } if REDIS_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "job_facets",
+    },
+}
+
+# --- Inference Server ---
+# When INFERENCE_SERVER_URL is set, web workers send transcription and photo-check
+# inference to the `run_inference_server` sidecar instead of loading the models
+# themselves. Either "unix:///path/to/inference.sock" or "http://127.0.0.1:8765".
+INFERENCE_SERVER_URL = os.environ.get("INFERENCE_SERVER_URL") or None
+INFERENCE_BATCH_WINDOW_MS = int(os.environ.get("INFERENCE_BATCH_WINDOW_MS", "10"))
+INFERENCE_MAX_BATCH_SIZE = int(os.environ.get("INFERENCE_MAX_BATCH_SIZE", "8"))
+INFERENCE_MAX_QUEUE_DEPTH = int(os.environ.get("INFERENCE_MAX_QUEUE_DEPTH", "64"))
+INFERENCE_REQUEST_TIMEOUT_SECONDS = float(os.environ.get("INFERENCE_REQUEST_TIMEOUT_SECONDS", "30"))
+
+# --- Real-time Interview Channel ---
+# WebSockets are served from the ASGI application (gatep_platform_config/asgi.py).
+# The in-memory channel layer only reaches sockets of the same process, which is
+# enough for a single-node deploy; use channels_redis for several ASGI processes.
+ASGI_APPLICATION = 'gatep_platform_config.asgi.application'
+CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+}
+
+# --- Match Engine ---
+# Sparse talent x skill and job x skill matrices used to rank candidates and jobs
+# (utils1/match_engine.py). Each worker builds them on first use, picks up resumes
+# and jobs changed by other workers every MATCH_ENGINE_REFRESH_SECONDS and rebuilds
+# them from scratch every MATCH_ENGINE_REBUILD_SECONDS.
+MATCH_ENGINE_REFRESH_SECONDS = float(os.environ.get("MATCH_ENGINE_REFRESH_SECONDS", "30"))
+MATCH_ENGINE_REBUILD_SECONDS = float(os.environ.get("MATCH_ENGINE_REBUILD_SECONDS", "3600"))
+# Scores at or above this are stored in JobCandidateMatch and served by the match views.
+JOB_MATCH_MIN_SCORE = float(os.environ.get("JOB_MATCH_MIN_SCORE", "20"))
+# Jobs kept in each talent's recommendation feed (employer_management/job_recommendations.py).
+JOB_RECOMMENDATION_FEED_SIZE = int(os.environ.get("JOB_RECOMMENDATION_FEED_SIZE", "100"))
+# Semantic matching (employer_management/semantic_matching.py): MiniLM embeddings of
+# resumes and job postings, searched with the memory-mapped index in
+# utils1/vector_index.py and blended into the skill score with SEMANTIC_MATCH_WEIGHT.
+# Each match refresh also considers the SEMANTIC_MATCH_CANDIDATES nearest neighbours.
+SEMANTIC_MATCHING_ENABLED = os.environ.get("SEMANTIC_MATCHING_ENABLED", "True").lower() in ("true", "1", "yes")
+SEMANTIC_MATCH_WEIGHT = float(os.environ.get("SEMANTIC_MATCH_WEIGHT", "0.4"))
+SEMANTIC_MATCH_CANDIDATES = int(os.environ.get("SEMANTIC_MATCH_CANDIDATES", "500"))
+VECTOR_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", os.path.join(BASE_DIR, "vector_indexes"))
+VECTOR_INDEX_NPROBE = int(os.environ.get("VECTOR_INDEX_NPROBE", "8"))
+
+# --- Job Search ---
+# BM25 keyword index over job postings and imported job listings
+# (employer_management/job_search.py, utils1/search_index.py). Built with
+# `python manage.py build_search_index`; each worker picks up rows changed by other
+# workers every SEARCH_INDEX_REFRESH_SECONDS.
+SEARCH_INDEX_DIR = os.environ.get("SEARCH_INDEX_DIR", os.path.join(BASE_DIR, "search_indexes"))
+SEARCH_INDEX_REFRESH_SECONDS = float(os.environ.get("SEARCH_INDEX_REFRESH_SECONDS", "30"))
+
+# --- Job Filters ---
+# Facet counts of /api/job-postings/filter/ are cached per filter state and dropped
+# whenever a job posting is saved. Without a shared cache (REDIS_URL) a worker can
+# serve counts up to JOB_FACET_CACHE_SECONDS old after another worker's save.
+JOB_FACET_CACHE_SECONDS = int(os.environ.get("JOB_FACET_CACHE_SECONDS", "300"))
+
+# --- Talent Search ---
+# Free-text talent search for employers (employer_management/talent_search.py): the
+# query embedding is compared with the "talents" semantic index. A query's ranked
+# list (at most TALENT_SEARCH_MAX_RESULTS talents) is cached for paging.
+TALENT_SEARCH_MAX_RESULTS = int(os.environ.get("TALENT_SEARCH_MAX_RESULTS", "500"))
+TALENT_SEARCH_CACHE_SECONDS = int(os.environ.get("TALENT_SEARCH_CACHE_SECONDS", "120"))
+
+# --- Autocomplete ---
+# Skill and job-title suggestions (talent_management/autocomplete.py) are served from
+# in-memory prefix indexes that each worker rebuilds every AUTOCOMPLETE_REBUILD_SECONDS.
+AUTOCOMPLETE_REBUILD_SECONDS = int(os.environ.get("AUTOCOMPLETE_REBUILD_SECONDS", "600"))
+
+# --- Startup Budget ---
+# Upper bound for a cold django.setup() + URL resolution, enforced by the startup
+# budget test in talent_management/tests.py. Inspect offenders with
+# `python manage.py profile_startup`. STARTUP_RSS_BUDGET_MB is optional (unset = not enforced).
+STARTUP_TIME_BUDGET_SECONDS = float(os.environ.get("STARTUP_TIME_BUDGET_SECONDS", "5.0"))
+STARTUP_RSS_BUDGET_MB = float(os.environ["STARTUP_RSS_BUDGET_MB"]) if os.environ.get("STARTUP_RSS_BUDGET_MB") else None
+
 # Django REST Framework settings to use JWT as the default authentication
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -0,0 +1,27 @@
+# gunicorn.conf.py
+# Usage: GATEP_PROCESS_ROLE=interview gunicorn -c gunicorn.conf.py gatep_platform_config.wsgi
+
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "3"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+
+
+def post_worker_init(worker):
+    """
+    Runs in each worker right after fork, once Django has been loaded.
+    Pre-loads the ML models configured for this process role so the first
+    request does not pay for them. Roles are defined in settings.MODEL_WARMUP_ROLES.
+    """
+    from django.conf import settings
+    from utils1.model_registry import warmup
+
+    if settings.INFERENCE_SERVER_URL:
+        worker.log.info("[pid %s] models are served by %s; skipping warm-up", worker.pid, settings.INFERENCE_SERVER_URL)
+        return
+
+    role = settings.GATEP_PROCESS_ROLE
+    report = warmup(role=role)
+    for name, stats in report.items():
+        worker.log.info("[pid %s] warm-up '%s' (role=%s): %s", worker.pid, name, role, stats)
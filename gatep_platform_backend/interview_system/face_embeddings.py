@@ -0,0 +1,182 @@
+# interview_system/face_embeddings.py
+"""
+Reference face embeddings for the interview photo check.
+
+The resume photo never changes between interview snapshots, so its ArcFace
+embedding is computed once (when the photo is uploaded, or lazily on the first
+check for older resumes) and stored on the Resume together with a model tag and
+the photo file it came from. Each snapshot then only has to detect and embed the
+live frame, which is compared against the stored vector by cosine distance --
+the same metric and threshold DeepFace.verify uses for ArcFace.
+"""
+
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from utils1.inference_client import infer, remote_inference_enabled
+from utils1.model_registry import get_model
+
+logger = logging.getLogger(__name__)
+
+FACE_EMBEDDING_MODEL = "ArcFace"
+FACE_DETECTOR_BACKEND = "retinaface"
+# Bump the version whenever the model, detector or preprocessing changes so
+# stored embeddings are recomputed instead of compared across models.
+FACE_EMBEDDING_VERSION = "v1"
+
+
+def face_detector_backend():
+    """The face detector actually used by the configured vision backend."""
+    return "mediapipe" if settings.VISION_INFERENCE_BACKEND == "onnx" else FACE_DETECTOR_BACKEND
+
+
+def face_embedding_tag():
+    """Model/detector/version tag stored with each embedding; differs per vision backend."""
+    model = FACE_EMBEDDING_MODEL
+    if settings.VISION_INFERENCE_BACKEND == "onnx":
+        model = f"{model}-onnx{'-int8' if settings.ONNX_USE_INT8 else ''}"
+    return f"{model}/{face_detector_backend()}/{FACE_EMBEDDING_VERSION}"
+
+# DeepFace's verification threshold for ArcFace with the cosine metric.
+FACE_MATCH_COSINE_THRESHOLD = 0.68
+
+
+def _encoded_image_bytes(image):
+    """File path / encoded bytes / BGR array -> encoded image bytes for the inference server."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return bytes(image)
+    if isinstance(image, str):
+        with open(image, "rb") as f:
+            return f.read()
+    import cv2
+    ok, buffer = cv2.imencode(".jpg", image)
+    if not ok:
+        raise ValueError("Could not encode image")
+    return buffer.tobytes()
+
+
+def compute_face_embedding(image):
+    """
+    Detects the face in `image` (a file path, encoded bytes or a BGR numpy array) and
+    returns its embedding as a list of floats. If several faces are found, the largest
+    one is used. Raises ValueError if no face is detected.
+
+    Runs on the inference server when settings.INFERENCE_SERVER_URL is set.
+    """
+    if remote_inference_enabled():
+        result = infer("face_embedding", _encoded_image_bytes(image))
+        if "error" in result:
+            raise ValueError(result["error"])
+        return result["embedding"]
+    return compute_face_embedding_local(image)
+
+
+def compute_face_embedding_local(image):
+    """In-process version of compute_face_embedding (used by the inference server itself)."""
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        import cv2
+        image = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if settings.VISION_INFERENCE_BACKEND == "onnx":
+        return _compute_face_embedding_onnx(image)
+    deepface = get_model("arcface")
+    faces = deepface.represent(
+        img_path=image,
+        model_name=FACE_EMBEDDING_MODEL,
+        detector_backend=FACE_DETECTOR_BACKEND,
+        enforce_detection=True,
+    )
+    largest = max(faces, key=lambda f: f["facial_area"]["w"] * f["facial_area"]["h"])
+    return [float(x) for x in largest["embedding"]]
+
+
+def _compute_face_embedding_onnx(image):
+    # The ONNX backend has no TensorFlow detector: faces are located with the
+    # long-lived MediaPipe detector already used by the photo check.
+    import cv2
+    from interview_system.interview_cam import decode_image, face_boxes_from_rgb
+
+    bgr_image = decode_image(image)
+    if bgr_image is None:
+        raise ValueError("Could not read image")
+    boxes = face_boxes_from_rgb(cv2.cvtColor(bgr_image, cv2.COLOR_BGR2RGB))
+    if not boxes:
+        raise ValueError("Face could not be detected in the image.")
+    x, y, w, h = max(boxes, key=lambda b: b[2] * b[3])
+    return get_model("arcface_onnx").embed([bgr_image[y:y + h, x:x + w]])[0]
+
+
+def cosine_distance(embedding_a, embedding_b):
+    a = np.asarray(embedding_a, dtype=np.float32)
+    b = np.asarray(embedding_b, dtype=np.float32)
+    return float(1.0 - np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def resume_embedding_is_current(resume):
+    """True if the stored embedding was computed from the current photo with the current model."""
+    return bool(
+        resume.profile_photo
+        and resume.profile_photo_embedding
+        and resume.profile_photo_embedding_model == face_embedding_tag()
+        and resume.profile_photo_embedding_source == resume.profile_photo.name
+    )
+
+
+def ensure_resume_face_embedding(resume):
+    """
+    Returns the reference embedding for the resume photo, computing and saving it
+    only if it is missing or stale (photo changed or model tag bumped).
+    Returns None if the resume has no photo. Raises ValueError if no face is found.
+    """
+    if not resume.profile_photo:
+        return None
+    if resume_embedding_is_current(resume):
+        return resume.profile_photo_embedding
+
+    resume.profile_photo_embedding = compute_face_embedding(resume.profile_photo.path)
+    resume.profile_photo_embedding_model = face_embedding_tag()
+    resume.profile_photo_embedding_source = resume.profile_photo.name
+    resume.profile_photo_embedding_updated_at = timezone.now()
+    resume.save(update_fields=[
+        'profile_photo_embedding', 'profile_photo_embedding_model',
+        'profile_photo_embedding_source', 'profile_photo_embedding_updated_at',
+    ])
+    return resume.profile_photo_embedding
+
+
+def reference_face_embedding(resume):
+    """
+    ensure_resume_face_embedding for the photo checks: None (logged) instead of an
+    error when the photo has no usable face, so the check falls back to a pairwise verify.
+    """
+    try:
+        return ensure_resume_face_embedding(resume)
+    except Exception as e:
+        logger.warning("Could not compute the reference face embedding for resume %s: %s", resume.pk, e)
+        return None
+
+
+def verify_face_against_embedding(reference_embedding, interview_image):
+    """
+    Embeds only the interview frame and compares it with the stored reference.
+    Returns the same shape as interview_cam.verify_face_match.
+    """
+    try:
+        live_embedding = compute_face_embedding(interview_image)
+    except Exception as e:
+        # No face in the live frame (or detector failure).
+        logger.warning("Face embedding of the interview frame failed: %s", e)
+        return {'match': False, 'error': str(e)}
+    return compare_face_embeddings(reference_embedding, live_embedding)
+
+
+def compare_face_embeddings(reference_embedding, live_embedding):
+    distance = cosine_distance(reference_embedding, live_embedding)
+    return {
+        'match': distance <= FACE_MATCH_COSINE_THRESHOLD,
+        'distance': distance,
+        'model_used': FACE_EMBEDDING_MODEL,
+        'detector_used': face_detector_backend(),
+    }
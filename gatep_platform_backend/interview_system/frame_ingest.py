@@ -0,0 +1,149 @@
+# interview_system/frame_ingest.py
+"""
+Batched proctoring frame ingest with perceptual-hash dedupe and adaptive sampling.
+
+The client uploads a batch of webcam frames per request instead of one snapshot.
+Only a fraction of them reach the vision pipeline (run_full_interview_photo_check):
+
+  1. Dedupe: each frame gets a 64-bit difference hash (dHash). A frame within
+     DUPLICATE_MAX_DISTANCE bits of the last checked frame shows the same scene
+     and is dropped.
+  2. Scene change: a frame at least SCENE_CHANGE_MIN_DISTANCE bits away from
+     the last checked frame is always checked, so a sudden event (a second
+     person, a phone, the candidate leaving) is never sampled away.
+  3. Otherwise every `interval`-th distinct frame is checked. The interval
+     drops to MIN_INTERVAL as soon as a check fails and doubles (up to
+     MAX_INTERVAL) after STABLE_CHECKS_TO_RELAX clean checks in a row.
+
+The sampler state is kept per interview in the proctoring cache, so it carries
+over between batches and between workers.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from interview_system.interview_cam import decode_image, run_full_interview_photo_check
+
+DUPLICATE_MAX_DISTANCE = 5
+SCENE_CHANGE_MIN_DISTANCE = 20
+MIN_INTERVAL = 1
+BASE_INTERVAL = 3        # same as FRAME_SKIP in interview_bot/cam.py
+MAX_INTERVAL = 12
+STABLE_CHECKS_TO_RELAX = 3
+MAX_FRAMES_PER_BATCH = 30
+
+# Separate from interview_cam's executor: every check submits its YOLO stage there,
+# so running the checks on the same pool could deadlock it.
+_FRAME_CHECK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("FRAME_CHECK_WORKERS", "4")), thread_name_prefix="frame-check"
+)
+
+
+def difference_hash(image_bgr):
+    """64-bit dHash: sign of the horizontal gradient of a 9x8 grayscale thumbnail."""
+    gray = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def hamming_distance(hash_a, hash_b):
+    return bin(hash_a ^ hash_b).count("1")
+
+
+def new_sampler_state():
+    return {"interval": BASE_INTERVAL, "since_check": 0, "last_hash": None, "stable_checks": 0}
+
+
+def select_frames(state, hashes):
+    """
+    Decides which frames of a batch to check. Mutates `state` (interval counter and
+    last checked hash) and returns (indices_to_check, duplicate_count).
+    """
+    to_check, duplicates = [], 0
+    for index, frame_hash in enumerate(hashes):
+        last_hash = state["last_hash"]
+        distance = hamming_distance(frame_hash, last_hash) if last_hash is not None else None
+        if distance is not None and distance <= DUPLICATE_MAX_DISTANCE:
+            duplicates += 1
+            continue
+
+        state["since_check"] += 1
+        if distance is None or distance >= SCENE_CHANGE_MIN_DISTANCE or state["since_check"] >= state["interval"]:
+            to_check.append(index)
+            state["since_check"] = 0
+            state["last_hash"] = frame_hash
+    return to_check, duplicates
+
+
+def update_sampling_rate(state, any_violation):
+    """Samples densely right after a warning and backs off while the interview is clean."""
+    if any_violation:
+        state["interval"] = MIN_INTERVAL
+        state["stable_checks"] = 0
+    else:
+        state["stable_checks"] += 1
+        if state["stable_checks"] >= STABLE_CHECKS_TO_RELAX:
+            state["interval"] = min(max(state["interval"], 1) * 2, MAX_INTERVAL)
+            state["stable_checks"] = 0
+    return state
+
+
+def is_violation(result):
+    return (not result.get("match", True)
+            or not result.get("orientation_ok", True)
+            or result.get("multiple_faces", False)
+            or result.get("malpractice", False))
+
+
+def process_frame_batch(frames, resume_photo_path, reference_embedding, state):
+    """
+    Runs the sampled subset of `frames` (list of encoded image bytes, in capture order)
+    through the photo check in the worker pool.
+    Returns (summary dict, updated sampler state).
+    """
+    started = time.perf_counter()
+    decoded = [decode_image(frame) for frame in frames]
+    valid = [i for i, image in enumerate(decoded) if image is not None]
+    hashes = [difference_hash(decoded[i]) for i in valid]
+
+    selected, duplicates = select_frames(state, hashes)
+    frame_indices = [valid[i] for i in selected]
+    futures = {
+        index: _FRAME_CHECK_EXECUTOR.submit(
+            run_full_interview_photo_check, resume_photo_path, decoded[index], reference_embedding=reference_embedding
+        )
+        for index in frame_indices
+    }
+
+    violations = []
+    for index, future in futures.items():
+        result = future.result()
+        if is_violation(result):
+            violations.append({
+                "frame_index": index,
+                "match": result.get("match"),
+                "orientation_ok": result.get("orientation_ok"),
+                "multiple_faces": result.get("multiple_faces"),
+                "malpractice": result.get("malpractice"),
+                "message": result.get("message"),
+            })
+
+    if frame_indices:
+        update_sampling_rate(state, bool(violations))
+
+    summary = {
+        "frames_received": len(frames),
+        "frames_unreadable": len(frames) - len(valid),
+        "frames_duplicate": duplicates,
+        "frames_checked": len(frame_indices),
+        "frames_sampled_out": len(valid) - duplicates - len(frame_indices),
+        "violations": violations,
+        "sampling_interval": state["interval"],
+        "processing_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return summary, state
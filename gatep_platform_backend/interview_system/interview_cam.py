@@ -216,124 +216,190 @@ Checks Performed:
 """
 
 import cv2
-import torch
-from deepface import DeepFace
-import mediapipe as mp
 import numpy as np
+import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from utils1.inference_client import infer, remote_inference_enabled
+from utils1.model_registry import get_model
+from interview_system.face_embeddings import (
+    FACE_DETECTOR_BACKEND, FACE_EMBEDDING_MODEL, compute_face_embedding, verify_face_against_embedding,
+)
+
+logger = logging.getLogger(__name__)
 
 # --- MODEL AND LIBRARY INITIALIZATION ---
 
-# Load YOLOv5 model once for object detection.
-# trust_repo=True is required for the current version of the ultralytics hub.
-print("Loading YOLOv5 model for object detection...")
-model = torch.hub.load('ultralytics/yolov5', 'yolov5s', trust_repo=True)
-print("YOLOv5 model loaded.")
+# The YOLOv5 object detector and the MediaPipe FaceDetection/FaceMesh graphs are
+# registered in utils1.model_registry ("yolov5", "mediapipe_face_detection",
+# "mediapipe_face_mesh") and are built once per process on first use (or by the
+# warm-up hook) instead of once per check.
+#
+# MediaPipe solution graphs are not thread-safe, so each one is guarded by a lock.
+# When settings.INFERENCE_SERVER_URL is set, all of these run on the inference
+# server instead (see utils1/inference_server.py) and none is loaded here.
+_FACE_DETECTION_LOCK = threading.Lock()
+_FACE_MESH_LOCK = threading.Lock()
 
-# Initialize MediaPipe Face Mesh for detailed landmark detection (used for orientation).
-mp_face_mesh = mp.solutions.face_mesh
+# Runs the object detection stage alongside the MediaPipe stage of a check.
+_VISION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="interview-vision")
 
-# Initialize MediaPipe Face Detection for finding the number of faces.
-mp_face_detection = mp.solutions.face_detection
+
+# ----------- STEP 0: Decode the image once ----------- #
+def decode_image(image):
+    """
+    Decodes an image into a BGR numpy array.
+    Args:
+        image: A file path, the raw encoded bytes (e.g. an uploaded JPEG) or an already decoded BGR array.
+    Returns:
+        numpy.ndarray or None: The decoded image, or None if it could not be read.
+    """
+    if isinstance(image, np.ndarray):
+        return image
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        return cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if isinstance(image, str) and os.path.isfile(image):
+        return cv2.imread(image)
+    return None
+
+
+def _to_rgb(image):
+    bgr = decode_image(image)
+    return None if bgr is None else cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
 
 
 # ----------- STEP 1: Face Match Check ----------- #
-def verify_face_match(resume_builder_photo_path, interview_talent_photo_path):
+def verify_face_match(resume_builder_photo_path, interview_talent_photo):
     """
     Verifies if two faces from different images belong to the same person using DeepFace.
     Args:
         resume_builder_photo_path (str): Path to the reference image.
-        interview_talent_photo_path (str): Path to the image captured during the interview.
+        interview_talent_photo: Path or decoded BGR array of the image captured during the interview.
     Returns:
         dict: A dictionary containing the match status, distance, model, or an error.
     """
     try:
-        # Using ArcFace model as it's highly accurate for verification tasks.
-        result = DeepFace.verify(resume_builder_photo_path, interview_talent_photo_path, model_name='ArcFace')
+        # Using ArcFace model as it's highly accurate for verification tasks, with the same
+        # detector as the stored embeddings so both paths locate the face the same way.
+        result = get_model("arcface").verify(
+            resume_builder_photo_path, interview_talent_photo,
+            model_name=FACE_EMBEDDING_MODEL, detector_backend=FACE_DETECTOR_BACKEND,
+        )
         return {
             'match': result['verified'],
             'distance': result['distance'],
-            'model_used': result['model']
+            'model_used': result['model'],
+            'detector_used': result.get('detector_backend', FACE_DETECTOR_BACKEND),
         }
     except Exception as e:
         # Handle cases where a face isn't found in one of the images.
+        logger.warning("Face verification failed: %s", e)
         return {'match': False, 'error': str(e)}
 
 
 # ----------- STEP 2: Frontal Face / Orientation Check ----------- #
-def is_frontal_face(image_path, threshold_ratio=0.1):
+def _frontal_face_from_rgb(rgb_image, threshold_ratio=0.1):
+    face_mesh = get_model("mediapipe_face_mesh")
+    with _FACE_MESH_LOCK:
+        results = face_mesh.process(rgb_image)
+    if not results.multi_face_landmarks:
+        return False, "No face detected for orientation check"
+
+    face_landmarks = results.multi_face_landmarks[0]
+    # Key landmarks for orientation check
+    nose_tip = face_landmarks.landmark[1]
+    left_eye = face_landmarks.landmark[33]
+    right_eye = face_landmarks.landmark[263]
+
+    # Calculate the ratio of nose offset to eye distance
+    eye_distance = abs(left_eye.x - right_eye.x)
+    nose_center_offset = abs((left_eye.x + right_eye.x) / 2 - nose_tip.x)
+
+    # Avoid division by zero if eyes are not detected properly
+    if eye_distance == 0:
+        return False, "Could not determine eye distance"
+
+    ratio = nose_center_offset / eye_distance
+
+    if ratio < threshold_ratio:
+        return True, "Frontal face detected"
+    else:
+        return False, "Face is turned – please look straight"
+
+
+def is_frontal_face(image, threshold_ratio=0.1):
     """
     Checks if a face in an image is looking straight ahead.
     Compares the horizontal distance between the nose tip and the center of the eyes.
     Args:
-        image_path (str): Path to the interview image.
+        image: Path, encoded bytes or decoded BGR array of the interview image.
         threshold_ratio (float): Sensitivity for detecting non-frontal poses. Lower is stricter.
     Returns:
         tuple: (bool: True if frontal, str: Descriptive message)
     """
-    image = cv2.imread(image_path)
-    if image is None:
+    rgb_image = _to_rgb(image)
+    if rgb_image is None:
         return False, "Image not found for orientation check"
+    return _frontal_face_from_rgb(rgb_image, threshold_ratio)
 
-    # Use a 'with' statement for resource management. static_image_mode=True is for single images.
-    with mp_face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, min_detection_confidence=0.5) as face_mesh:
-        results = face_mesh.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        if not results.multi_face_landmarks:
-            return False, "No face detected for orientation check"
-
-        face_landmarks = results.multi_face_landmarks[0]
-        # Key landmarks for orientation check
-        nose_tip = face_landmarks.landmark[1]
-        left_eye = face_landmarks.landmark[33]
-        right_eye = face_landmarks.landmark[263]
-
-        # Calculate the ratio of nose offset to eye distance
-        eye_distance = abs(left_eye.x - right_eye.x)
-        nose_center_offset = abs((left_eye.x + right_eye.x) / 2 - nose_tip.x)
-        
-        # Avoid division by zero if eyes are not detected properly
-        if eye_distance == 0:
-            return False, "Could not determine eye distance"
 
-        ratio = nose_center_offset / eye_distance
+# ----------- STEP 3: Multiple Face Detection ----------- #
+def _detect_faces_from_rgb(rgb_image):
+    face_detection = get_model("mediapipe_face_detection")
+    with _FACE_DETECTION_LOCK:
+        results = face_detection.process(rgb_image)
+    return results.detections or []
 
-        if ratio < threshold_ratio:
-            return True, "Frontal face detected"
-        else:
-            return False, "Face is turned – please look straight"
 
+def _count_faces_from_rgb(rgb_image):
+    return len(_detect_faces_from_rgb(rgb_image))
 
-# ----------- STEP 3: Multiple Face Detection ----------- #
-def detect_multiple_faces(image_path):
+
+def face_boxes_from_rgb(rgb_image):
+    """Returns the pixel bounding boxes (x, y, w, h) of all faces found by MediaPipe, clipped to the image."""
+    h, w = rgb_image.shape[:2]
+    boxes = []
+    for detection in _detect_faces_from_rgb(rgb_image):
+        box = detection.location_data.relative_bounding_box
+        x1, y1 = max(0, int(box.xmin * w)), max(0, int(box.ymin * h))
+        x2, y2 = min(w, int((box.xmin + box.width) * w)), min(h, int((box.ymin + box.height) * h))
+        if x2 > x1 and y2 > y1:
+            boxes.append((x1, y1, x2 - x1, y2 - y1))
+    return boxes
+
+
+def detect_multiple_faces(image):
     """
     Detects if more than one face is present in the image.
     Args:
-        image_path (str): Path to the interview image.
+        image: Path, encoded bytes or decoded BGR array of the interview image.
     Returns:
         bool: True if more than one face is detected, False otherwise.
     """
-    image = cv2.imread(image_path)
-    if image is None:
+    rgb_image = _to_rgb(image)
+    if rgb_image is None:
         return False
-
-    # Use FaceDetection model which is optimized for finding faces.
-    with mp_face_detection.FaceDetection(model_selection=1, min_detection_confidence=0.5) as face_detection:
-        results = face_detection.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-        # Check if detections exist and if the count is greater than 1
-        return results.detections and len(results.detections) > 1
+    return _count_faces_from_rgb(rgb_image) > 1
 
 
 # ----------- STEP 4: Malpractice Detection (Only Cell Phone) ----------- #
-def detect_phone_or_malpractice(image_path):
+def detect_object_labels(rgb_images):
     """
-    Runs YOLOv5 object detection on an image to find cell phones.
-    Args:
-        image_path (str): Path to the interview image.
-    Returns:
-        tuple: (bool: True if a cell phone is found, list: List of detected 'cell phone' labels)
+    Runs the object detector on a list of RGB images in one call and returns one list
+    of class names per image. Uses YOLOv5 on ONNX Runtime when
+    settings.VISION_INFERENCE_BACKEND is "onnx", the torch.hub model otherwise.
     """
-    results = model(image_path)
-    labels = results.pandas().xyxy[0]['name'].tolist()
+    if settings.VISION_INFERENCE_BACKEND == "onnx":
+        return get_model("yolov5_onnx").detect(rgb_images)
+    results = get_model("yolov5")(list(rgb_images))
+    return [frame['name'].tolist() for frame in results.pandas().xyxy]
+
+
+def _detect_phones_from_rgb(rgb_image):
+    labels = detect_object_labels([rgb_image])[0]
 
     # We are only interested in 'cell phone' for this check
     cell_phones_detected = [label for label in labels if label == 'cell phone']
@@ -342,36 +408,99 @@ def detect_phone_or_malpractice(image_path):
     return malpractice, cell_phones_detected
 
 
+def detect_phone_or_malpractice(image):
+    """
+    Runs YOLOv5 object detection on an image to find cell phones.
+    Args:
+        image: Path, encoded bytes or decoded BGR array of the interview image.
+    Returns:
+        tuple: (bool: True if a cell phone is found, list: List of detected 'cell phone' labels)
+    """
+    rgb_image = _to_rgb(image)
+    if rgb_image is None:
+        return False, []
+    return _detect_phones_from_rgb(rgb_image)
+
+
+def _face_stage(rgb_image):
+    """MediaPipe stage: face count, then orientation. Skips FaceMesh when no face is visible."""
+    face_count = _count_faces_from_rgb(rgb_image)
+    if face_count == 0:
+        return False, "No face detected for orientation check", False
+    is_frontal, frontal_msg = _frontal_face_from_rgb(rgb_image)
+    return is_frontal, frontal_msg, face_count > 1
+
+
 # ----------- Final Pipeline Function ----------- #
-def run_full_interview_photo_check(resume_photo_path, interview_photo_path):
+def run_full_interview_photo_check(resume_photo_path, interview_photo, reference_embedding=None):
     """
     Executes the full pipeline of checks on the provided interview photo.
+
+    The interview image is decoded once and shared by every stage. The face match
+    runs first and short-circuits the rest on failure; the MediaPipe stage and the
+    YOLO stage then run concurrently.
     Args:
         resume_photo_path (str): Path to the reference image.
-        interview_photo_path (str): Path to the image captured during the interview.
+        interview_photo: Path, encoded bytes or decoded BGR array of the image captured during the interview.
+        reference_embedding (list, optional): Precomputed embedding of the reference image
+            (Resume.profile_photo_embedding). When given, only the interview photo is embedded.
     Returns:
         dict: A comprehensive dictionary with the results of all checks.
     """
-    if not os.path.isfile(resume_photo_path) or not os.path.isfile(interview_photo_path):
+    timings = {}
+    started = time.perf_counter()
+
+    image = decode_image(interview_photo)
+    if image is None or (reference_embedding is None and not os.path.isfile(resume_photo_path)):
         return {'success': False, 'message': 'One or both image files not found'}
+    timings['decode_ms'] = round((time.perf_counter() - started) * 1000, 1)
+
+    remote = remote_inference_enabled()
+    # The inference server takes encoded images; reuse the upload bytes when we have them.
+    encoded = bytes(interview_photo) if isinstance(interview_photo, (bytes, bytearray, memoryview)) else None
 
     # 1. Face Match Verification
-    match_result = verify_face_match(resume_photo_path, interview_photo_path)
+    stage_start = time.perf_counter()
+    if reference_embedding is not None:
+        match_result = verify_face_against_embedding(reference_embedding, encoded if remote and encoded else image)
+    elif remote or settings.VISION_INFERENCE_BACKEND == "onnx":
+        # Only embeddings are available here (inference server / ONNX backend), so embed the reference photo as well.
+        try:
+            reference_embedding = compute_face_embedding(resume_photo_path)
+            match_result = verify_face_against_embedding(reference_embedding, encoded or image)
+        except Exception as e:
+            logger.warning("Face embedding of the reference photo failed: %s", e)
+            match_result = {'match': False, 'error': str(e)}
+    else:
+        match_result = verify_face_match(resume_photo_path, image)
+    timings['face_match_ms'] = round((time.perf_counter() - stage_start) * 1000, 1)
     if not match_result.get('match'):
         return {
             'success': False,
             'match': False,
-            'message': f"Face mismatch ❌ – person not same. Reason: {match_result.get('error', 'N/A')}"
+            'message': f"Face mismatch ❌ – person not same. Reason: {match_result.get('error', 'N/A')}",
+            'timings_ms': timings,
         }
 
-    # 2. Frontal Face Orientation Check
-    is_frontal, frontal_msg = is_frontal_face(interview_photo_path)
-
-    # 3. Multiple Faces Detection
-    multiple_faces = detect_multiple_faces(interview_photo_path)
-
-    # 4. Malpractice Detection (Cell Phone)
-    malpractice, detected_labels = detect_phone_or_malpractice(interview_photo_path)
+    # 2-4. Orientation + multiple faces (MediaPipe) alongside cell phone detection (YOLO)
+    stage_start = time.perf_counter()
+    if remote:
+        if encoded is None:
+            encoded = cv2.imencode(".jpg", image)[1].tobytes()
+        yolo_future = _VISION_EXECUTOR.submit(infer, "detect_objects", encoded)
+        face_stage = infer("face_stage", encoded)
+        is_frontal, frontal_msg, multiple_faces = (
+            face_stage['orientation_ok'], face_stage['face_orientation_msg'], face_stage['multiple_faces']
+        )
+        detected_labels = [label for label in yolo_future.result()['labels'] if label == 'cell phone']
+        malpractice = len(detected_labels) > 0
+    else:
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        yolo_future = _VISION_EXECUTOR.submit(_detect_phones_from_rgb, rgb_image)
+        is_frontal, frontal_msg, multiple_faces = _face_stage(rgb_image)
+        malpractice, detected_labels = yolo_future.result()
+    timings['detectors_ms'] = round((time.perf_counter() - stage_start) * 1000, 1)
+    timings['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
 
     # 5. Compile Final Result and Message
     # This structure is designed to be easily consumed by a Django API view.
@@ -390,7 +519,8 @@ def run_full_interview_photo_check(resume_photo_path, interview_photo_path):
             f"{'cell phone detected ❌ – possible malpractice' if malpractice else 'no malpractice detected ✅'}"
         ),
         'distance': match_result.get('distance'),
-        'model_used': match_result.get('model_used')
+        'model_used': match_result.get('model_used'),
+        'timings_ms': timings,
     }
 
 
@@ -3,7 +3,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 # CHANGED: Import renamed profile models, removed EmployeeProfile
-from .models import CustomUser, TalentProfile, EmployerProfile
+from .models import CustomUser, TalentProfile, EmployerProfile, Skill, SkillAlias
 
 class CustomUserAdmin(UserAdmin):
     # CHANGED: Update list_display and fieldsets for new boolean role names
@@ -16,3 +16,16 @@ class CustomUserAdmin(UserAdmin):
 admin.site.register(CustomUser, CustomUserAdmin)
 admin.site.register(TalentProfile)   # Renamed
 admin.site.register(EmployerProfile) # Renamed
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ('name', 'normalized_name', 'created_at')
+    search_fields = ('name', 'aliases__alias')
+    inlines = [SkillAliasInline]
+
+admin.site.register(Skill, SkillAdmin)
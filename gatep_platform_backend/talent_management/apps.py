@@ -6,3 +6,7 @@ from django.apps import AppConfig
 class TalentManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'talent_management' # ENSURE THIS MATCHES YOUR APP FOLDER NAME EXACTLY
+
+    def ready(self):
+        # Registers the deploy check for the shared proctoring cache.
+        from . import proctoring_state  # noqa: F401
@@ -0,0 +1,126 @@
+# talent_management/autocomplete.py
+"""
+Autocomplete for skill and job-title entry (resume builder, job posting form),
+served from in-memory prefix indexes (utils1/prefix_index.py).
+
+Skills: every canonical Skill, reachable by its name and by its aliases, so
+typing "k8s" or "reactjs" offers "Kubernetes" / "React" and users pick canonical
+values. Ranked by how many resumes and job postings list the skill
+(ResumeSkill / JobSkill, i.e. Resume.skills and JobPosting.required_skills).
+
+Titles: the titles of open job postings and verified job listings, grouped by
+their normalised form and shown in their most common spelling, ranked by count.
+
+Each process builds the indexes on first use and rebuilds them on a background
+thread once they are older than AUTOCOMPLETE_REBUILD_SECONDS, answering from the
+previous build meanwhile.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Count
+
+from utils1.prefix_index import PrefixIndex
+
+from .models import JobListing, ResumeSkill, Skill, SkillAlias
+from .skill_taxonomy import normalize_skill_name
+
+logger = logging.getLogger(__name__)
+
+KINDS = ("skills", "titles")
+_REBUILD_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autocomplete-rebuild")
+
+
+def normalize_prefix(text):
+    """Lookup form of typed text; the same folding as the indexed keys."""
+    return normalize_skill_name(text)
+
+
+def _skill_entries():
+    from employer_management.models import JobSkill
+
+    usage = Counter(dict(
+        ResumeSkill.objects.filter(resume__is_deleted=False)
+        .values_list('skill_id').annotate(count=Count('id')).order_by()
+    ))
+    usage.update(dict(JobSkill.objects.values_list('skill_id').annotate(count=Count('id')).order_by()))
+    aliases = defaultdict(set)
+    for skill_id, alias in SkillAlias.objects.values_list('skill_id', 'alias').iterator(chunk_size=5000):
+        aliases[skill_id].add(alias)
+    for skill_id, name, normalized in Skill.objects.values_list('id', 'name', 'normalized_name').iterator(chunk_size=5000):
+        spellings = aliases.get(skill_id, set()) - {normalized}
+        yield name, usage.get(skill_id, 0), [normalized, *sorted(spellings)], spellings
+
+
+def _title_entries():
+    from employer_management.models import JobPosting, JobStatus
+
+    spellings = defaultdict(Counter)
+    open_titles = JobPosting.objects.filter(status=JobStatus.PUBLISHED, is_active=True).values_list('title', flat=True)
+    listing_titles = JobListing.objects.filter(status='VERIFIED').values_list('title', flat=True)
+    for titles in (open_titles, listing_titles):
+        for title in titles.iterator(chunk_size=5000):
+            title = " ".join((title or "").split())
+            key = normalize_prefix(title)
+            if key:
+                spellings[key][title] += 1
+    for key, counts in spellings.items():
+        yield counts.most_common(1)[0][0], sum(counts.values()), [key], set()
+
+
+class _Autocomplete:
+    def __init__(self):
+        self._indexes = None
+        self._built = 0.0           # monotonic time of the current build
+        self._lock = threading.Lock()
+        self._rebuilding = False
+
+    def rebuild(self):
+        started = time.monotonic()
+        indexes = {"skills": PrefixIndex(_skill_entries()), "titles": PrefixIndex(_title_entries())}
+        self._indexes, self._built = indexes, time.monotonic()
+        print(
+            f"Autocomplete indexes built: {len(indexes['skills'])} skills, {len(indexes['titles'])} titles "
+            f"in {self._built - started:.2f}s"
+        )
+        return indexes
+
+    def _run_rebuild(self):
+        try:
+            self.rebuild()
+        except Exception as e:
+            logger.exception("Rebuilding the autocomplete indexes failed: %s", e)
+        finally:
+            self._rebuilding = False
+            close_old_connections()
+
+    def current(self):
+        if self._indexes is None:
+            with self._lock:
+                if self._indexes is None:
+                    self.rebuild()
+        elif time.monotonic() - self._built >= settings.AUTOCOMPLETE_REBUILD_SECONDS and not self._rebuilding:
+            self._rebuilding = True
+            _REBUILD_EXECUTOR.submit(self._run_rebuild)
+        return self._indexes
+
+
+autocomplete_indexes = _Autocomplete()
+
+
+def complete(kind, text, limit=10):
+    """Returns [{"value", "count", "matched"}] for typed `text`; "matched" is the alias that matched, if any."""
+    prefix = normalize_prefix(text)
+    if not prefix:
+        return []
+    index = autocomplete_indexes.current()[kind]
+    return [
+        {"value": value, "count": count, "matched": matched}
+        for value, count, matched in index.complete(prefix, limit)
+    ]
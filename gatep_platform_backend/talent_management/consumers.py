@@ -0,0 +1,315 @@
+# talent_management/consumers.py
+"""
+Real-time mock interview channel.
+
+    ws://<host>/ws/mock-interview/<interview_id>/?auth_token=<JWT access token>
+
+One WebSocket per interview replaces the chain of HTTP calls (verify-identity,
+submit-answer, transcribe-audio, malpractice-check, malpractice). The
+AIInterviewer is loaded from the database once on connect and kept in memory
+until the socket closes; answers go through the same interview_session logic
+as the HTTP endpoint, so both can be used for the same interview.
+
+Client -> server messages (JSON, "type" selects the handler):
+    {"type": "verify_identity", "is_verified": true}
+    {"type": "answer", "answer_text": "..."}
+    {"type": "audio_chunk", "data": "<base64>"}        buffered until audio_end
+    {"type": "audio_end", "suffix": ".wav", "submit_as_answer": true}
+    {"type": "frames", "frames": ["<base64 image>", ...]}
+    {"type": "proctoring_event", "type_of_malpractice": "tab_switch"}
+
+Server -> client messages:
+    question, transcription, proctoring, interview_complete, terminated, error
+"""
+
+import base64
+import os
+import tempfile
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.utils import timezone
+
+from . import interview_session, proctoring_state
+from .interview_bot.interviewer_logic import AIInterviewer
+from .models import MockInterviewResult, Resume
+
+# Whisper needs the whole utterance; cap what a single answer may buffer.
+MAX_AUDIO_BYTES = 25 * 1024 * 1024
+
+
+def interview_group_name(interview_id):
+    """Channel-layer group of the sockets open for an interview (used to push terminations)."""
+    return f"mock_interview_{interview_id}"
+
+
+def _run_sync(func, *args, **kwargs):
+    # thread_sensitive=False: scoring and vision calls of different interviews must not
+    # queue behind each other on the single shared sync thread.
+    return database_sync_to_async(func, thread_sensitive=False)(*args, **kwargs)
+
+
+def transcribe_audio(data, suffix=".wav"):
+    """Transcribes an encoded audio file with Whisper (on the inference server when configured)."""
+    from utils1.inference_client import infer, remote_inference_enabled
+    from utils1.model_registry import get_model
+
+    if remote_inference_enabled():
+        return infer("transcribe", data, suffix=suffix).get("text", "")
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_audio:
+        temp_audio.write(data)
+        temp_path = temp_audio.name
+    try:
+        return get_model("whisper").transcribe(temp_path, fp16=False).get("text", "")
+    finally:
+        os.remove(temp_path)
+
+
+class MockInterviewConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Holds one in-progress mock interview for the lifetime of the connection.
+    Messages of a connection are handled one at a time, so the in-memory
+    interviewer is never mutated concurrently.
+    """
+
+    async def connect(self):
+        self.interview_id = self.scope["url_route"]["kwargs"]["interview_id"]
+        self.group_name = interview_group_name(self.interview_id)
+        self.interviewer = None
+        self.audio_buffer = bytearray()
+        self.sampler_state = None
+        self.ended = False
+
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.user = user
+        loaded = await _run_sync(self._load_interview)
+        if not loaded:
+            await self.close(code=4404)
+            return
+
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+        await self.send_json({
+            "type": "question",
+            "message": "Connected to the interview.",
+            "interview_id": self.interview_id,
+            "current_round": self.interviewer.current_round_name,
+            "question_number": self.interviewer.current_question_index + 1,
+            "question_text": interview_session.current_question_text(self.interviewer),
+            "status": self.mock_interview.status,
+        })
+
+    async def disconnect(self, code):
+        # The interview itself stays in progress; the client may reconnect or fall back to HTTP.
+        if self.interviewer is not None:
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    def _load_interview(self):
+        try:
+            self.mock_interview = MockInterviewResult.objects.get(
+                id=self.interview_id,
+                user=self.user,
+                status=MockInterviewResult.InterviewStatus.IN_PROGRESS,
+            )
+        except MockInterviewResult.DoesNotExist:
+            return False
+
+        interviewer = AIInterviewer.load_from_db_instance(self.mock_interview)
+        if not interviewer or not interviewer.all_generated_questions:
+            return False
+
+        # Pick up after the last stored answer, whichever socket or browser gave it. Without
+        # one (a new interview, or answers from before question indexes were stored) the
+        # HTTP session's position is used if this browser session started the interview.
+        if not interview_session.restore_answered_position(interviewer, self.mock_interview):
+            session = self.scope.get("session")
+            round_name, question_index = "communication", 0
+            if session is not None and session.get("current_mock_interview_id") == self.interview_id:
+                round_name = session.get("current_round_name") or round_name
+                question_index = session.get("current_question_index") or 0
+            interview_session.restore_position(interviewer, round_name, question_index)
+        self.interviewer = interviewer
+        return True
+
+    def _save_session_position(self, ended=False):
+        """Keeps the HTTP session in step so the REST endpoints still work for this interview."""
+        session = self.scope.get("session")
+        if session is None or not session.session_key:
+            return
+        if ended:
+            for key in ('current_mock_interview_id', 'current_round_name', 'current_question_index'):
+                session.pop(key, None)
+        else:
+            session['current_mock_interview_id'] = self.interview_id
+            session['current_round_name'] = self.interviewer.current_round_name
+            session['current_question_index'] = self.interviewer.current_question_index
+        session.save()
+
+    # --- Dispatch ---
+
+    async def receive_json(self, content, **kwargs):
+        if self.ended:
+            return
+        handler = {
+            "verify_identity": self.handle_verify_identity,
+            "answer": self.handle_answer,
+            "audio_chunk": self.handle_audio_chunk,
+            "audio_end": self.handle_audio_end,
+            "frames": self.handle_frames,
+            "proctoring_event": self.handle_proctoring_event,
+        }.get(content.get("type"))
+        if handler is None:
+            await self.send_json({"type": "error", "error": f"Unknown message type '{content.get('type')}'."})
+            return
+        try:
+            await handler(content)
+        except Exception as e:
+            print(f"Error in interview channel {self.interview_id}: {e}")
+            await self.send_json({"type": "error", "error": str(e)})
+
+    # --- Interview flow ---
+
+    async def handle_verify_identity(self, content):
+        is_verified = bool(content.get("is_verified", False))
+        await _run_sync(self._verify_identity, is_verified)
+        if not is_verified:
+            await self._end({"type": "terminated", "reason": self.mock_interview.malpractice_reason,
+                             "status": self.mock_interview.status})
+            return
+        await self.send_json({
+            "type": "question",
+            "message": "Identity verified. We can now proceed with the interview.",
+            "current_round": self.interviewer.current_round_name,
+            "question_number": self.interviewer.current_question_index + 1,
+            "question_text": interview_session.current_question_text(self.interviewer),
+            "status": self.mock_interview.status,
+        })
+
+    def _verify_identity(self, is_verified):
+        self.mock_interview.identity_verified = is_verified
+        proctoring_state.set_identity_verified(self.interview_id, is_verified)
+        if not is_verified:
+            self.mock_interview.status = MockInterviewResult.InterviewStatus.TERMINATED_ERROR
+            self.mock_interview.malpractice_detected = True
+            self.mock_interview.malpractice_reason = "Identity verification failed."
+            self.mock_interview.interview_end_time = timezone.now()
+            proctoring_state.clear(self.interview_id)
+            self._save_session_position(ended=True)
+        self.mock_interview.save()
+
+    async def handle_answer(self, content):
+        await self._submit_answer((content.get("answer_text") or "").strip())
+
+    async def _submit_answer(self, candidate_answer):
+        if await _run_sync(proctoring_state.is_terminated, self.interview_id):
+            await _run_sync(self.interviewer._check_malpractice_status,
+                            lambda: proctoring_state.get_status(self.interview_id))
+            await _run_sync(proctoring_state.clear, self.interview_id)
+            await self._end({"type": "terminated", "reason": self.mock_interview.malpractice_reason,
+                             "status": self.mock_interview.status})
+            return
+
+        result = await _run_sync(interview_session.submit_answer, self.interviewer, self.mock_interview, candidate_answer)
+        if result["completed"]:
+            await _run_sync(proctoring_state.clear, self.interview_id)
+            await _run_sync(self._save_session_position, True)
+            await self._end({
+                "type": "interview_complete",
+                "message": result["message"],
+                "round_completed": result["round_completed"],
+                "status": self.mock_interview.status,
+                "global_readiness_score": self.mock_interview.global_readiness_score,
+                "report_url": f"/api/mock-interview/report/{self.interview_id}/",
+            })
+            return
+
+        await _run_sync(self._save_session_position)
+        result.pop("completed")
+        await self.send_json({"type": "question", **result, "status": self.mock_interview.status})
+
+    # --- Audio ---
+
+    async def handle_audio_chunk(self, content):
+        chunk = base64.b64decode(content.get("data") or "")
+        if len(self.audio_buffer) + len(chunk) > MAX_AUDIO_BYTES:
+            self.audio_buffer.clear()
+            await self.send_json({"type": "error", "error": "Audio answer is too long; buffer discarded."})
+            return
+        self.audio_buffer.extend(chunk)
+
+    async def handle_audio_end(self, content):
+        if not self.audio_buffer:
+            await self.send_json({"type": "error", "error": "No audio received."})
+            return
+        data, self.audio_buffer = bytes(self.audio_buffer), bytearray()
+        text = await _run_sync(transcribe_audio, data, content.get("suffix") or ".wav")
+        await self.send_json({"type": "transcription", "text": text})
+        if content.get("submit_as_answer", True):
+            await self._submit_answer(text.strip())
+
+    # --- Proctoring ---
+
+    async def handle_frames(self, content):
+        from interview_system import frame_ingest
+
+        frames = [base64.b64decode(frame) for frame in content.get("frames") or []]
+        if not frames:
+            await self.send_json({"type": "error", "error": "No frames received."})
+            return
+        if len(frames) > frame_ingest.MAX_FRAMES_PER_BATCH:
+            await self.send_json({"type": "error", "error": f"At most {frame_ingest.MAX_FRAMES_PER_BATCH} frames per batch."})
+            return
+        summary = await _run_sync(self._check_frames, frames)
+        await self.send_json({"type": "proctoring", **summary})
+        # A strike that reaches the limit terminates via proctoring_state, which pushes
+        # interview.terminated to this group.
+
+    def _check_frames(self, frames):
+        from interview_system import frame_ingest
+        from interview_system.face_embeddings import reference_face_embedding
+
+        if self.sampler_state is None:
+            self.resume = Resume.objects.get(talent_id=self.user)
+            if not self.resume.profile_photo:
+                raise ValueError("No reference photo found in DB.")
+            self.reference_embedding = reference_face_embedding(self.resume)
+            self.sampler_state = proctoring_state.get_frame_sampler_state(self.interview_id) or frame_ingest.new_sampler_state()
+
+        summary, self.sampler_state = frame_ingest.process_frame_batch(
+            frames, self.resume.profile_photo.path, self.reference_embedding, self.sampler_state
+        )
+        # Persisted so a reconnect (or the HTTP frame endpoint) resumes the same sampling.
+        proctoring_state.set_frame_sampler_state(self.interview_id, self.sampler_state)
+        if summary["violations"]:
+            summary["malpractice_count"] = proctoring_state.record_strike(self.interview_id)
+        else:
+            summary["malpractice_count"] = proctoring_state.get_strikes(self.interview_id)
+        return summary
+
+    async def handle_proctoring_event(self, content):
+        type_of_malpractice = content.get("type_of_malpractice")
+        if not type_of_malpractice:
+            await self.send_json({"type": "error", "error": "Missing 'type_of_malpractice'."})
+            return
+        # Pushes interview.terminated to this group when this call wins.
+        await _run_sync(proctoring_state.terminate, self.interview_id, f"Malpractice detected: {type_of_malpractice}")
+
+    # --- Channel-layer events ---
+
+    async def interview_terminated(self, event):
+        """Sent by proctoring_state.terminate from any consumer or HTTP view of this process."""
+        await _run_sync(self._save_session_position, True)
+        await self._end({"type": "terminated", "reason": event["reason"],
+                         "status": MockInterviewResult.InterviewStatus.TERMINATED_MALPRACTICE})
+
+    async def _end(self, message):
+        if self.ended:
+            return
+        self.ended = True
+        await self.send_json({**message, "interview_id": self.interview_id})
+        await self.close()
@@ -0,0 +1,103 @@
+# talent_management/interview_bot/answer_prescoring.py
+"""
+Local pre-scoring of interview answers before the LLM scoring call.
+
+Each communication / psychometric / technical question is generated together with
+a short reference answer; both are embedded once with MiniLM (utils1/text_embeddings.py)
+and stored on the question dict. At scoring time:
+
+  * empty, "I don't know"-style and gibberish answers score 0 without any model,
+  * answers barely related to both the question and the reference score 0 (off-topic),
+  * answers very close to the reference answer (and not much shorter) score 80-100,
+  * everything else is ambiguous and is left to the LLM.
+
+`prescore_answers` returns {index: (score, analysis)} for the answers it could
+resolve; the analysis strings use the same wording the LLM scoring rules ask for.
+"""
+
+import re
+
+from . import config
+
+_NON_ANSWER_RE = re.compile(
+    r"^\W*(i\s+(really\s+)?(do\s*n[o']?t|dont|have\s+no)\s+(know|idea|remember)|no\s+idea|"
+    r"(i\s*'?\s*a?m\s+)?not\s+sure)\b",
+    re.IGNORECASE,
+)
+# Whole-answer non-answers ("pass" alone, but not "Pass the data through...").
+_SKIP_RE = re.compile(r"^\W*(skip|pass|next(\s+question)?|nothing|no\s+answer|n/?a)\W*$", re.IGNORECASE)
+_WORD_RE = re.compile(r"[A-Za-z]+(?:'[a-z]+)?")
+_VOWEL_RE = re.compile(r"[aeiouy]", re.IGNORECASE)
+
+# Non-answers are short; a long answer starting with "I'm not sure, but..." still goes on.
+NON_ANSWER_MAX_WORDS = 8
+
+
+def _words(text):
+    return _WORD_RE.findall(text or "")
+
+
+def trivial_answer_score(answer_text, check_words=True):
+    """
+    Model-free checks. Returns (0, analysis) for an empty, skipped, "I don't know"
+    or gibberish answer, else None. `check_words=False` skips the word-based checks
+    for code answers.
+    """
+    text = (answer_text or "").strip()
+    if not text:
+        return 0, "No answer provided."
+    words = _words(text)
+    if (check_words and _SKIP_RE.match(text)) or (len(words) <= NON_ANSWER_MAX_WORDS and _NON_ANSWER_RE.search(text)):
+        return 0, "Candidate stated they don't know the answer."
+    # Short answers ("Binary search", "Port 80") are often right, so they go on to the
+    # similarity check and the LLM; only longer ones are judged nonsensical here.
+    if not check_words or len(words) < config.PRESCORE_GIBBERISH_MIN_WORDS:
+        return None
+    # Speech-to-text of noise or keyboard mashing: mostly "words" without vowels
+    # (acronyms such as "SQL" or "TCP" count as words).
+    wordlike = sum(1 for word in words if (_VOWEL_RE.search(word) or word.isupper()) and len(word) < 20)
+    if wordlike / len(words) < 0.6:
+        return 0, "Answer was nonsensical."
+    return None
+
+
+def _similarity_score(similarity):
+    """Maps a similarity above the excellent threshold linearly onto 80-100."""
+    high = config.PRESCORE_EXCELLENT_SIMILARITY
+    return int(round(80 + 20 * min(1.0, (similarity - high) / max(1e-6, 1.0 - high))))
+
+
+def prescore_answers(qa_pairs, question_lookup, is_code=False):
+    """
+    Pre-scores a list of {"question_text", "answer"} dicts. `question_lookup(question_text)`
+    returns the generated question dict (with "reference_answer", "reference_embedding"
+    and "question_embedding" when available) or None.
+    Returns {index: (score, analysis)} for the answers resolved locally.
+    """
+    resolved = {}
+    to_embed = []
+    for index, qa_pair in enumerate(qa_pairs):
+        trivial = trivial_answer_score(qa_pair.get("answer", ""), check_words=not is_code)
+        if trivial is not None:
+            resolved[index] = trivial
+            continue
+        question = None if is_code else question_lookup(qa_pair.get("question_text", ""))
+        if question and question.get("reference_embedding") and question.get("question_embedding"):
+            to_embed.append((index, question))
+
+    if not to_embed:
+        return resolved
+
+    from utils1.text_embeddings import decode_vector, embed_texts
+
+    answer_vectors = embed_texts([qa_pairs[index].get("answer", "") for index, _ in to_embed])
+    for (index, question), answer_vector in zip(to_embed, answer_vectors):
+        reference_similarity = float(decode_vector(question["reference_embedding"]) @ answer_vector)
+        question_similarity = float(decode_vector(question["question_embedding"]) @ answer_vector)
+
+        if max(reference_similarity, question_similarity) < config.PRESCORE_OFF_TOPIC_SIMILARITY:
+            resolved[index] = (0, "Answer was off-topic.")
+        elif reference_similarity >= config.PRESCORE_EXCELLENT_SIMILARITY and \
+                len(_words(qa_pairs[index].get("answer", ""))) >= 0.5 * len(_words(question.get("reference_answer", ""))):
+            resolved[index] = (_similarity_score(reference_similarity), "Answer closely matches the expected answer.")
+    return resolved
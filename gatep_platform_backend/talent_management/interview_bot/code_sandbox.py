@@ -0,0 +1,294 @@
+# talent_management/interview_bot/code_sandbox.py
+"""
+Runs untrusted interview code (LLM-generated snippets, candidate answers) in a
+separate Python process:
+
+  * `python -I -S`: no user site-packages, environment variables or cwd on sys.path,
+  * CPU time, address space, file size, open files and process limits (setrlimit),
+  * in new user, mount and network namespaces, created without any privilege: the
+    network namespace has no interfaces but loopback, and the filesystem root is
+    a small tmpfs holding read-only binds of the system directories and the
+    interpreter's installation (SANDBOX_READONLY_PATHS and sys.base_prefix), so the
+    project, its settings and the rest of the host filesystem are not visible,
+  * with every capability dropped and no_new_privs set before the code runs,
+  * with a wall-clock timeout and a cap on captured output.
+
+The web worker needs no root: the namespaces are created by a small bootstrap
+inside the child before the untrusted code runs (not via preexec_fn, which is
+unsafe in the threaded web workers). The kernel must allow unprivileged user
+namespaces; if the child cannot isolate itself it exits before running anything.
+`sandbox_available()` checks once per process that all of this works and is False
+otherwise (and on non-Linux systems); callers then grade with the LLM instead.
+Results report failures by exception type only, never the message, so output of
+the code cannot leak into interview reports.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_ISOLATION_FAILED_EXIT_CODE = 97
+
+_BOOTSTRAP = r"""
+import ctypes, json, os, platform, resource, sys
+
+limits = json.loads(os.environ.pop("SANDBOX_LIMITS"))
+resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu"], limits["cpu"]))
+resource.setrlimit(resource.RLIMIT_AS, (limits["memory"], limits["memory"]))
+resource.setrlimit(resource.RLIMIT_FSIZE, (1024 * 1024, 1024 * 1024))
+resource.setrlimit(resource.RLIMIT_NOFILE, (32, 32))
+resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+try:
+    resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+except (ValueError, OSError):
+    pass
+
+with open("main.py") as f:
+    source = f.read()
+
+def isolate(libc, uid, gid, new_root, readonly_paths):
+    CLONE_NEWUSER, CLONE_NEWNS, CLONE_NEWNET = 0x10000000, 0x00020000, 0x40000000
+    MS_RDONLY, MS_NOSUID, MS_NODEV, MS_NOEXEC, MS_REMOUNT = 1, 2, 4, 8, 32
+    MS_BIND, MS_REC, MS_PRIVATE, MNT_DETACH = 4096, 16384, 1 << 18, 2
+    PR_SET_NO_NEW_PRIVS = 38
+    pivot_root = {"x86_64": 155, "aarch64": 41}[platform.machine()]
+
+    def check(result):
+        if result != 0:
+            raise OSError(ctypes.get_errno(), "sandbox isolation failed")
+
+    check(libc.unshare(CLONE_NEWUSER | CLONE_NEWNS | CLONE_NEWNET))
+    # Uid/gid 1000 inside, not root, so executing a program cannot regain capabilities.
+    for name, line in (("setgroups", "deny"), ("uid_map", f"1000 {uid} 1"), ("gid_map", f"1000 {gid} 1")):
+        with open(f"/proc/self/{name}", "w") as f:
+            f.write(line)
+    check(libc.mount(None, b"/", None, MS_REC | MS_PRIVATE, None))
+    check(libc.mount(b"tmpfs", new_root.encode(), b"tmpfs", MS_NOSUID | MS_NODEV, b"size=16m,mode=0755"))
+    for path in readonly_paths:
+        if not os.path.isdir(path):
+            continue
+        target = new_root + path
+        os.makedirs(target, exist_ok=True)
+        check(libc.mount(path.encode(), target.encode(), None, MS_BIND | MS_REC, None))
+        # A remount must keep the flags the kernel locked on the source mount.
+        flags = os.statvfs(target).f_flag & (MS_NOSUID | MS_NODEV | MS_NOEXEC)
+        check(libc.mount(None, target.encode(), None, MS_REMOUNT | MS_BIND | MS_RDONLY | flags, None))
+    os.mkdir(new_root + "/work")
+    os.chdir(new_root)
+    check(libc.syscall(pivot_root, b".", b"."))
+    check(libc.umount2(b".", MNT_DETACH))  # the host filesystem is no longer reachable
+    os.chdir("/work")
+    check(libc.prctl(PR_SET_NO_NEW_PRIVS, 1, 0, 0, 0))
+    header = (ctypes.c_uint32 * 2)(0x20080522, 0)
+    check(libc.capset(header, (ctypes.c_uint32 * 6)()))
+
+try:
+    isolate(
+        ctypes.CDLL(None, use_errno=True), os.getuid(), os.getgid(), os.getcwd(),
+        sorted({*limits["readonly_paths"], sys.base_prefix, sys.base_exec_prefix}),
+    )
+except Exception:
+    os._exit(%(isolation_failed)d)
+
+del ctypes, json, os, platform, resource, limits, isolate, f
+sys.argv = ["main.py"]
+exec(compile(source, "main.py", "exec"), {"__name__": "__main__", "__builtins__": __builtins__})
+""" % {"isolation_failed": _ISOLATION_FAILED_EXIT_CODE}
+
+# Calls `function_name` on every test input and prints the JSON-encoded results on one
+# line after a marker, so output printed by the code itself does not interfere. Errors
+# are reported by exception type only.
+_TEST_HARNESS = r'''
+import json as _json, sys as _sys
+_spec = _json.loads(_sys.stdin.readline())
+_namespace = {"__name__": "__candidate__"}
+exec(compile(_spec["code"], "<answer>", "exec"), _namespace)
+_function = _namespace.get(_spec["function_name"])
+_results = []
+for _args in _spec["inputs"]:
+    if not callable(_function):
+        _results.append({"ok": False, "error": "function not defined"})
+        continue
+    try:
+        _value = _function(*_args)
+        _results.append({"ok": True, "value": _json.dumps(_value, sort_keys=True, default=repr)})
+    except BaseException as _e:
+        _results.append({"ok": False, "error": type(_e).__name__})
+_sys.stdout.write("\n" + _spec["marker"] + _json.dumps(_results) + "\n")
+'''
+
+_available = None
+
+
+class SandboxUnavailable(RuntimeError):
+    """The sandbox could not isolate the child (no unprivileged namespaces); nothing was run."""
+
+
+def sandbox_available():
+    """True if code can be run isolated here; checked once per process with a trial run."""
+    global _available
+    if _available is None:
+        try:
+            if not sys.platform.startswith("linux"):
+                raise SandboxUnavailable("namespaces need Linux")
+            result = _run_isolated("print(6 * 7)", "", config.SANDBOX_TIMEOUT_SECONDS, config.SANDBOX_MEMORY_MB)
+            if result["stdout"].strip() != "42":
+                raise SandboxUnavailable(f"trial run failed (exit code {result['exit_code']})")
+            _available = True
+        except Exception as e:
+            logger.warning("Coding sandbox unavailable, coding answers are graded by the LLM: %s", e)
+            _available = False
+    return _available
+
+
+def _truncate(data):
+    text = data.decode("utf-8", errors="replace")
+    if len(data) > config.SANDBOX_MAX_OUTPUT_BYTES:
+        text = text[:config.SANDBOX_MAX_OUTPUT_BYTES] + "\n[output truncated]"
+    return text
+
+
+def _run_isolated(code, stdin_text, timeout, memory_mb):
+    limits = {
+        "cpu": max(1, int(timeout)),
+        "memory": memory_mb * 1024 * 1024,
+        "readonly_paths": config.SANDBOX_READONLY_PATHS,
+    }
+
+    with tempfile.TemporaryDirectory(prefix="interview-sandbox-") as workdir:
+        with open(os.path.join(workdir, "main.py"), "w", encoding="utf-8") as f:
+            f.write(code)
+        env = {"PATH": "/usr/bin:/bin", "LANG": "C.UTF-8", "PYTHONHASHSEED": "0", "SANDBOX_LIMITS": json.dumps(limits)}
+        started = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [config.SANDBOX_PYTHON, "-I", "-S", "-B", "-c", _BOOTSTRAP],
+                input=stdin_text.encode("utf-8"),
+                capture_output=True,
+                cwd=workdir,
+                env=env,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired as e:
+            return {
+                "stdout": _truncate(e.stdout or b""),
+                "stderr": _truncate(e.stderr or b""),
+                "exit_code": None,
+                "timed_out": True,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+    if completed.returncode == _ISOLATION_FAILED_EXIT_CODE:
+        raise SandboxUnavailable("could not create the user, mount and network namespaces")
+    return {
+        "stdout": _truncate(completed.stdout),
+        "stderr": _truncate(completed.stderr),
+        "exit_code": completed.returncode,
+        "timed_out": False,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def run_python(code, stdin_text="", timeout=None, memory_mb=None):
+    """
+    Runs `code` as a script in the sandbox. Returns a dict with stdout, stderr,
+    exit_code, timed_out and duration_ms. Raises SandboxUnavailable if the sandbox
+    cannot isolate the code (see sandbox_available()).
+    """
+    if not sandbox_available():
+        raise SandboxUnavailable("the coding sandbox is not available on this host")
+    return _run_isolated(
+        code, stdin_text, timeout or config.SANDBOX_TIMEOUT_SECONDS, memory_mb or config.SANDBOX_MEMORY_MB
+    )
+
+
+_EXCEPTION_LINE_RE = re.compile(r"^([A-Za-z_][\w.]*)(?::|$)")
+
+
+def run_function_tests(code, function_name, test_inputs, timeout=None):
+    """
+    Defines `code`, calls `function_name(*args)` for each entry of `test_inputs` and
+    returns one {"ok": bool, "value": <JSON of the return value>} or {"ok": False,
+    "error": <exception type>} per input. The whole run shares one timeout; if it fails
+    before the results are printed every test is reported as failed with the error.
+    """
+    marker = f"__SANDBOX_RESULTS_{os.urandom(8).hex()}__"
+    spec = json.dumps({"code": code, "function_name": function_name, "inputs": test_inputs, "marker": marker})
+    result = run_python(_TEST_HARNESS, stdin_text=spec + "\n", timeout=timeout)
+
+    for line in reversed(result["stdout"].splitlines()):
+        if line.startswith(marker):
+            return json.loads(line[len(marker):])
+
+    if result["timed_out"]:
+        error = "timed out"
+    else:
+        # The traceback's last line is "<ExceptionType>: <message>"; only the type is kept.
+        stderr_lines = result["stderr"].strip().splitlines()
+        match = _EXCEPTION_LINE_RE.match(stderr_lines[-1]) if stderr_lines else None
+        error = match.group(1).rsplit(".", 1)[-1] if match else f"exit code {result['exit_code']}"
+    return [{"ok": False, "error": error} for _ in test_inputs]
+
+
+_FENCE_RE = re.compile(r"```(?:python|py)?\s*\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def extract_code(text):
+    """Returns the code of a fenced block if there is one, otherwise the text itself."""
+    blocks = _FENCE_RE.findall(text or "")
+    return "\n".join(blocks).strip() if blocks else (text or "").strip()
+
+
+def split_predict_output_question(question_text):
+    """
+    Splits a generated predict_output question ("<code>\\nWhat is the output of this code?")
+    into its code, dropping trailing instruction lines.
+    """
+    code = extract_code(question_text)
+    lines = code.rstrip().splitlines()
+    while lines and re.search(r"\b(what|predict)\b.*\boutput\b", lines[-1], re.IGNORECASE):
+        lines.pop()
+    return "\n".join(lines).strip()
+
+
+def normalize_output(text):
+    """Whitespace-insensitive form of program output used to compare answers."""
+    lines = [re.sub(r"\s+", " ", line).strip() for line in (text or "").strip().splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+_OUTPUT_LEAD_RE = re.compile(
+    r"^(?:(?:the\s+)?(?:output|result)(?:\s+(?:is|will\s+be|would\s+be))?|(?:it\s+)?(?:prints|outputs|will\s+print|would\s+print))"
+    r"\s*[:\-]?\s*",
+    re.IGNORECASE,
+)
+
+
+def output_matches(expected_output, answer_text):
+    """
+    True if the candidate's answer is exactly the expected output, after an optional
+    leading "The output is" / "It prints" and surrounding quotes or a final period
+    are stripped ("The output is:\n6\n7", "It prints `6`."). Anything else, including
+    answers that merely contain the output ("Either 5, 6 or 7"), is False: it may
+    still be right in other words, so callers leave it to the LLM.
+    """
+    expected = normalize_output(expected_output)
+    answer = normalize_output(extract_code(answer_text))
+    if not expected or not answer:
+        return False
+    if answer == expected:
+        return True
+    answer = _OUTPUT_LEAD_RE.sub("", answer, count=1).strip()
+    if not expected.endswith("."):
+        answer = answer.rstrip(".").rstrip()
+    if len(answer) >= 2 and answer[0] == answer[-1] and answer[0] in "`'\"" and expected[:1] != answer[0]:
+        answer = answer[1:-1].strip()
+    return answer == expected
@@ -6,6 +6,7 @@
 
 
 import os
+import sys
 # GROQ_API_KEY = os.environ.get("GROQ_API_KEY")
 # GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions" # Groq's OpenAI-compatible endpoint
 # GROQ_MODEL_NAME = "llama3-8b-8192" # Using Llama 3 8B. You can change to "mixtral-8x7b-32768" or other suitable Groq models
@@ -48,3 +49,41 @@ MALPRACTICE_STRIKES_LIMIT = 3 # Number of malpractice incidents before terminati
 # --- AI Scoring Configuration ---
 # You can define specific prompts or parameters for scoring here if needed
 # For now, scoring prompts are embedded in interviewer_logic.py
+
+# --- Coding Sandbox ---
+# Limits for running interview code locally (code_sandbox.py): predict_output snippets
+# at generation time and write_program answers against their test cases at scoring time.
+SANDBOX_TIMEOUT_SECONDS = float(os.environ.get("SANDBOX_TIMEOUT_SECONDS", "5"))  # wall clock; CPU limit is the same
+SANDBOX_MEMORY_MB = int(os.environ.get("SANDBOX_MEMORY_MB", "256"))
+SANDBOX_MAX_OUTPUT_BYTES = 64 * 1024
+# The code runs with this interpreter, whose installation (sys.base_prefix) must not
+# be inside the project, and sees only these directories plus that installation, read
+# only. Without unprivileged user namespaces code is not run locally and the LLM grades instead.
+SANDBOX_PYTHON = os.environ.get("SANDBOX_PYTHON") or sys.executable
+SANDBOX_READONLY_PATHS = [
+    path for path in os.environ.get("SANDBOX_READONLY_PATHS", "/usr,/lib,/lib64,/bin").split(",") if path
+]
+NUM_WRITE_PROGRAM_TEST_CASES = 5
+
+# --- Local Answer Pre-scoring ---
+# Answers are compared with the reference answer generated with each question
+# (answer_prescoring.py). Clear cases are scored locally; only answers in between
+# go to the LLM. Similarities are MiniLM cosine similarities.
+ANSWER_PRESCORING_ENABLED = os.environ.get("ANSWER_PRESCORING_ENABLED", "True").lower() in ("true", "1", "yes")
+PRESCORE_OFF_TOPIC_SIMILARITY = float(os.environ.get("PRESCORE_OFF_TOPIC_SIMILARITY", "0.15"))  # below: scored 0 as off-topic
+PRESCORE_EXCELLENT_SIMILARITY = float(os.environ.get("PRESCORE_EXCELLENT_SIMILARITY", "0.80"))  # above: scored 80-100 locally
+PRESCORE_GIBBERISH_MIN_WORDS = 4  # shorter answers are never judged nonsensical locally
+
+# --- Language Proficiency Scoring ---
+# "local": deterministic feature-based scorer (language_scoring.py), no LLM call.
+# "llm":   the previous end-of-interview LLM call.
+LANGUAGE_SCORER = os.environ.get("LANGUAGE_SCORER", "local")
+# Count grammar issues with LanguageTool (language_tool_python, optional, needs Java)
+# instead of the built-in rules.
+LANGUAGE_SCORER_USE_LANGUAGETOOL = os.environ.get("LANGUAGE_SCORER_USE_LANGUAGETOOL", "False").lower() in ("true", "1", "yes")
+
+# --- Batch Scoring (assessment mode) ---
+# Interviews started with mode "assessment" are scored once at the end: all rounds
+# go into as few LLM calls as possible, each holding at most this many characters
+# of questions and answers (a round is never split).
+BATCH_SCORING_MAX_PROMPT_CHARS = int(os.environ.get("BATCH_SCORING_MAX_PROMPT_CHARS", "16000"))
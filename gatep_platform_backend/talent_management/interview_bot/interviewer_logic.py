@@ -9,6 +9,7 @@ from .llm_utils import call_llm_api
 from .speech_utils import speak_text
 from . import config # Import config from the same package
 from .timer_utils import RoundTimer
+from . import answer_prescoring, code_sandbox, language_scoring
 
 # NEW: Import Django models and timezone for database interaction
 from django.utils import timezone
@@ -30,7 +31,8 @@ class AIInterviewer:
         self.position = position
         self.experience = experience
         self.aiml_specialization = aiml_specialization # This is list input
-        self.all_interview_answers = [] # Stores ALL Q&A pairs for the entire interview, for language scoring
+        self._all_interview_answers = [] # Stores ALL Q&A pairs for the entire interview, for language scoring (see all_interview_answers)
+        self.next_answer_sequence = None # Sequence number of the next MockInterviewAnswer row (looked up on first answer)
         self.round_detailed_results = {} # Stores detailed scoring results per round (e.g., communication, psychometric)
         self.round_scores = { # Stores just the overall score for each major round/stage
             "communication": 0,
@@ -51,6 +53,7 @@ class AIInterviewer:
         self.global_readiness_score = 0
         self.language_score = 0
         self.language_analysis = "N/A"
+        self.language_scoring_method = ""
 
         # Initialize current round state (will be managed by views and updated here)
         self.current_round_name = None
@@ -101,6 +104,21 @@ class AIInterviewer:
             "answer_acknowledgement_template": "Thank you for your answer." # Added for smoother flow
         }
 
+    @property
+    def all_interview_answers(self):
+        """
+        Every Q&A pair of the interview, in order. For an interviewer loaded from the DB
+        this is assembled from the MockInterviewAnswer rows the first time it is needed.
+        """
+        if self._all_interview_answers is None:
+            db_instance = self.mock_interview_db_instance
+            self._all_interview_answers = db_instance.qa_transcript() if db_instance and db_instance.pk else []
+        return self._all_interview_answers
+
+    @all_interview_answers.setter
+    def all_interview_answers(self, value):
+        self._all_interview_answers = value
+
     def _add_to_chat_history(self, role, text):
         """Adds a message to the internal chat history and manages its size."""
         self.chat_history.append({"role": role, "parts": [{"text": text}]})
@@ -111,7 +129,7 @@ class AIInterviewer:
     # UPDATED: This function now also updates the database instance
     def _check_malpractice_status(self, read_status_func):
         """
-        Checks the malpractice status file and updates internal flag and DB instance.
+        Checks the malpractice status (via read_status_func) and updates internal flag and DB instance.
         Returns True if interview should terminate due to malpractice, False otherwise.
         """
         status = read_status_func()
@@ -178,6 +196,13 @@ class AIInterviewer:
         prompt = ""
         output_tokens = 500
         generated_question_dicts = []
+        # Non-coding questions come with a short model answer, used for local pre-scoring
+        # (answer_prescoring.py).
+        reference_answer_format = (
+            f"For each question also write a concise reference answer (2-4 sentences) that a strong candidate would give. "
+            f"Format them as a JSON array of objects: [{{\"question\": \"Question 1\", \"reference_answer\": \"Reference answer 1\"}}, ..., "
+            f"{{\"question\": \"Question {num_questions}\", \"reference_answer\": \"Reference answer {num_questions}\"}}]."
+        )
 
         if round_name == "coding":
             prompt = (
@@ -213,7 +238,7 @@ class AIInterviewer:
                 f"Present ONLY the JSON array of strings, no other text or conversational filler. "
                 f"Ensure questions are straightforward and can can be understood without visual aids. "
                 f"The expected answers should be conceptual and easy to articulate verbally, focusing on 'how you would approach', 'explain the concept', 'describe your strategy', or 'share your experience'. "
-                f"Format them as a JSON array of strings: [\"Question 1\", \"Question 2\", ..., \"Question {num_questions}\"]."
+                + reference_answer_format
             )
         else:
             prompt_map = {
@@ -224,7 +249,7 @@ class AIInterviewer:
                                   f"Ensure questions are straightforward and can be understood without visual aids. "
                                   f"The expected answers should be conceptual and easy to articulate verbally. "
                                   f"Do NOT ask technical questions or questions requiring specific domain knowledge, coding, or detailed implementation steps. "
-                                  f"Format them as a JSON array of strings: [\"Question 1\", \"Question 2\", ..., \"Question {num_questions}\"]."),
+                                  + reference_answer_format),
                 "psychometric": (f"Generate EXACTLY {num_questions} unique psychometric interview questions relevant for a {self.position} role, considering the candidate's experience: \"{self.experience}\". "
                                  f"The questions should emphasize the '{self.position}' role. "
                                  f"Present ONLY the JSON array of strings, no other text or conversational filler. "
@@ -232,9 +257,11 @@ class AIInterviewer:
                                  f"The expected answers should be conceptual and easy to articulate verbally. "
                                  f"Do NOT ask technical questions or questions requiring specific domain knowledge, coding, or detailed implementation steps. "
                                  f"Focus on behavioral, situational, or personality-based questions. "
-                                 f"Format them as a JSON array of strings: [\"Question 1\", \"Question 2\", ..., \"Question {num_questions}\"]."),
+                                 + reference_answer_format),
             }
             prompt = prompt_map.get(round_name)
+        if round_name != "coding":
+            output_tokens = 300 * num_questions + 300
 
         if not prompt:
             raise ValueError(f"Unknown round name: {round_name} or specialization: {specialization}")
@@ -246,7 +273,8 @@ class AIInterviewer:
             
             # Attempt to extract JSON using a more robust regex first
             # This regex aims to capture a full JSON array of strings, handling escaped quotes
-            json_match = re.search(r'\[\s*\"(?:[^\"\\]|\\.)*\"(?:\s*,\s*\"(?:[^\"\\]|\\.)*\")*\s*\]', response_text, re.DOTALL)
+            json_match = re.search(r'\[\s*\{.*\}\s*\]', response_text, re.DOTALL) if round_name != "coding" else None
+            json_match = json_match or re.search(r'\[\s*\"(?:[^\"\\]|\\.)*\"(?:\s*,\s*\"(?:[^\"\\]|\\.)*\")*\s*\]', response_text, re.DOTALL)
             
             
             # Fallback to stripped text
@@ -279,6 +307,10 @@ class AIInterviewer:
                 raw_questions = raw_questions[:num_questions]
 
                 for i, q_text in enumerate(raw_questions):
+                    reference_answer = None
+                    if isinstance(q_text, dict):
+                        reference_answer = q_text.get("reference_answer")
+                        q_text = q_text.get("question", "")
                     speak_text_for_q = ""
                     if round_name == "coding":
                         stage_display_name = coding_stage.replace('_', ' ').title()
@@ -286,14 +318,19 @@ class AIInterviewer:
                     else:
                         speak_text_for_q = self.all_generated_questions["question_intro_template"].format(number=i+1, question_text=q_text)
 
-                    generated_question_dicts.append({
+                    question_dict = {
                         "question_text": q_text,
                         "speak_text": speak_text_for_q
-                    })
+                    }
+                    if reference_answer:
+                        question_dict["reference_answer"] = reference_answer
+                    generated_question_dicts.append(question_dict)
 
             except json.JSONDecodeError as e:
                 print(f"Warning: Failed to decode JSON for {round_name} questions after robust regex search: {e}. Attempting simpler regex extraction. Raw: {json_string_to_parse}")
-                raw_questions = re.findall(r'\"(.*?)(?<!\\)\"', response_text, re.DOTALL) # Robust regex for fallback
+                # Question/reference-answer objects: keep only the questions.
+                raw_questions = re.findall(r'\"question\"\s*:\s*\"((?:[^\"\\]|\\.)*)\"', response_text)
+                raw_questions = raw_questions or re.findall(r'\"(.*?)(?<!\\)\"', response_text, re.DOTALL) # Robust regex for fallback
                 # STRICTLY enforce num_questions here for regex fallback too
                 raw_questions = raw_questions[:num_questions]
                 for i, q_text in enumerate(raw_questions):
@@ -323,6 +360,106 @@ class AIInterviewer:
 
         return generated_question_dicts
 
+    def _prepare_coding_ground_truth(self):
+        """
+        Runs the objective coding stages through the local sandbox so they can be graded
+        without the LLM: records the real output of each predict_output snippet and
+        builds test cases for each write_program problem from a reference solution.
+        Questions that cannot be prepared keep LLM grading.
+        """
+        if not code_sandbox.sandbox_available():
+            return
+        try:
+            for question in self.all_generated_questions["coding"]["predict_output"]["questions"]:
+                result = code_sandbox.run_python(code_sandbox.split_predict_output_question(question["question_text"]))
+                if result["exit_code"] == 0 and result["stdout"].strip():
+                    question["expected_output"] = result["stdout"]
+                else:
+                    print(f"DEBUG: predict_output snippet did not run cleanly in the sandbox; keeping LLM grading. stderr: {result['stderr'][-200:]}")
+
+            write_program_questions = self.all_generated_questions["coding"]["write_program"]["questions"]
+            if write_program_questions:
+                self._generate_write_program_tests(write_program_questions)
+        except Exception as e:
+            print(f"Warning: Could not prepare coding ground truth: {e}")
+
+    def _generate_write_program_tests(self, questions):
+        """
+        Asks the LLM once for a reference solution and test inputs per problem, runs the
+        reference in the sandbox to get the expected outputs and stores the passing cases
+        on the question. The reference solution itself is not stored.
+        """
+        problems = [q["question_text"] for q in questions]
+        prompt = (
+            f"For each of the following Python programming problems, write a correct reference solution as ONE Python function "
+            f"and {config.NUM_WRITE_PROGRAM_TEST_CASES} test inputs covering normal and edge cases. "
+            f"Present ONLY a JSON array with one object per problem, in the same order, no other text:\n"
+            f"[{{\"function_name\": \"<name>\", \"signature\": \"(<parameters>)\", \"reference_solution\": \"<python code defining the function>\", "
+            f"\"test_inputs\": [[<positional arguments of test 1>], [<positional arguments of test 2>]]}}]\n"
+            f"Test inputs must be plain JSON values (numbers, strings, lists, objects). Problems:\n{json.dumps(problems, indent=2)}"
+        )
+        response_text = call_llm_api(prompt, current_conversation_history=[], output_max_tokens=2000)
+        if not response_text:
+            return
+
+        json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+        try:
+            specs = json.loads(json_match.group(0) if json_match else response_text)
+        except json.JSONDecodeError as e:
+            print(f"Warning: Failed to decode write_program test specs: {e}")
+            return
+
+        for question, spec in zip(questions, specs if isinstance(specs, list) else []):
+            if not isinstance(spec, dict) or not spec.get("function_name") or not isinstance(spec.get("test_inputs"), list):
+                continue
+            test_inputs = [args if isinstance(args, list) else [args] for args in spec["test_inputs"]]
+            reference_results = code_sandbox.run_function_tests(spec.get("reference_solution", ""), spec["function_name"], test_inputs)
+            test_cases = [
+                {"args": args, "expected": result["value"]}
+                for args, result in zip(test_inputs, reference_results) if result.get("ok")
+            ]
+            if not test_cases:
+                print(f"DEBUG: Reference solution for '{question['question_text'][:50]}...' failed in the sandbox; keeping LLM grading.")
+                continue
+            question["function_name"] = spec["function_name"]
+            question["test_cases"] = test_cases
+            question["question_text"] = (
+                f"{question['question_text']}\n\nImplement it as a Python function named "
+                f"`{spec['function_name']}{spec.get('signature') or '(...)'}`."
+            )
+
+    def _embed_reference_answers(self):
+        """
+        Embeds every non-coding question and its reference answer in one MiniLM batch and
+        stores the vectors on the question dicts for answer_prescoring. Without the model
+        the questions are simply scored by the LLM as before.
+        """
+        if not config.ANSWER_PRESCORING_ENABLED:
+            return
+        questions = [
+            q for q in self._non_coding_questions()
+            if q.get("reference_answer") and not q.get("reference_embedding")
+        ]
+        if not questions:
+            return
+        try:
+            from utils1.text_embeddings import embed_texts, encode_vector
+
+            vectors = embed_texts([q["reference_answer"] for q in questions] + [q["question_text"] for q in questions])
+            for i, question in enumerate(questions):
+                question["reference_embedding"] = encode_vector(vectors[i])
+                question["question_embedding"] = encode_vector(vectors[len(questions) + i])
+        except Exception as e:
+            print(f"Warning: Could not embed reference answers, answers will be scored by the LLM only: {e}")
+
+    def _non_coding_questions(self):
+        questions = []
+        for round_name in ("communication", "psychometric"):
+            questions.extend(self.all_generated_questions.get(round_name, {}).get("questions", []))
+        for specialization_data in self.all_generated_questions.get("technical", {}).get("specializations", {}).values():
+            questions.extend(specialization_data.get("questions", []))
+        return questions
+
     # NEW METHOD: To pre-generate all questions at the start of the interview
     def _pre_generate_all_questions(self):
         """
@@ -361,6 +498,8 @@ class AIInterviewer:
             self._generate_questions("coding", config.NUM_CODING_PREDICT_OUTPUT_QUESTIONS, coding_stage="predict_output")
             self._generate_questions("coding", config.NUM_CODING_FIX_ERROR_QUESTIONS, coding_stage="fix_error")
             self._generate_questions("coding", config.NUM_CODING_WRITE_PROGRAM_QUESTIONS, coding_stage="write_program")
+            self._prepare_coding_ground_truth()
+            self._embed_reference_answers()
 
             # Save the generated questions to the database instance
             if self.mock_interview_db_instance:
@@ -448,29 +587,19 @@ class AIInterviewer:
             interviewer.all_generated_questions = {} # Initialize empty if none found
 
 
-        # Load chat history and all_interview_answers from full_qa_transcript
+        # The answers live in MockInterviewAnswer rows and are only loaded when something
+        # needs the whole transcript (see all_interview_answers). The chat history only
+        # keeps the last turns, so only those are read here.
+        interviewer._all_interview_answers = None
         reconstructed_chat_history = []
-        reconstructed_all_interview_answers = []
-        if mock_interview_db_instance.full_qa_transcript:
-            for qa_pair in mock_interview_db_instance.full_qa_transcript:
-                q_text = qa_pair.get('question_text', 'N/A')
-                s_text = qa_pair.get('speak_text', q_text) # Use speak_text if available, else question_text
-                answer = qa_pair.get('answer', '')
-
-                reconstructed_chat_history.append({"role": "model", "parts": [{"text": q_text}]})
-                reconstructed_all_interview_answers.append({
-                    "question_text": q_text,
-                    "speak_text": s_text,
-                    "answer": answer
-                })
-                if answer: # Only add user answer to chat history if it's not empty
-                    reconstructed_chat_history.append({"role": "user", "parts": [{"text": answer}]})
-            interviewer.chat_history = reconstructed_chat_history
-            interviewer.all_interview_answers = reconstructed_all_interview_answers
-            print(f"DEBUG: Reconstructed chat history with {len(reconstructed_chat_history)} entries.")
-            print(f"DEBUG: Reconstructed all_interview_answers with {len(reconstructed_all_interview_answers)} entries.")
-        else:
-            print(f"DEBUG: No full Q&A transcript found in DB for interview ID: {mock_interview_db_instance.id}.")
+        for qa_pair in mock_interview_db_instance.qa_transcript(last=interviewer.MAX_CHAT_HISTORY_TURNS):
+            q_text = qa_pair.get('question_text', 'N/A')
+            answer = qa_pair.get('answer', '')
+            reconstructed_chat_history.append({"role": "model", "parts": [{"text": q_text}]})
+            if answer: # Only add user answer to chat history if it's not empty
+                reconstructed_chat_history.append({"role": "user", "parts": [{"text": answer}]})
+        interviewer.chat_history = reconstructed_chat_history
+        print(f"DEBUG: Reconstructed chat history with {len(reconstructed_chat_history)} entries.")
         
 
 
@@ -504,6 +633,7 @@ class AIInterviewer:
         interviewer.global_readiness_score = mock_interview_db_instance.global_readiness_score
         interviewer.language_score = mock_interview_db_instance.language_proficiency_score
         interviewer.language_analysis = mock_interview_db_instance.language_analysis
+        interviewer.language_scoring_method = mock_interview_db_instance.language_scoring_method
         
         # Reconstruct technical_specializations from the database field (aiml_specialization JSONField)
         #if mock_interview_db_instance.aiml_specialization:
@@ -534,7 +664,25 @@ class AIInterviewer:
         Scores the candidate's language proficiency based on their answers throughout the interview.
         This method should be called at the end of the interview.
         It updates self.language_score and self.language_analysis.
+        Uses the local scorer (language_scoring.py) unless config.LANGUAGE_SCORER is "llm".
         """
+        if config.LANGUAGE_SCORER == "llm":
+            self._score_language_proficiency_llm(all_qa_pairs)
+            return
+
+        self.language_scoring_method = "local"
+        try:
+            self.language_score, self.language_analysis, details = language_scoring.score_language(
+                [qa.get('answer', '') for qa in all_qa_pairs or []]
+            )
+            print(f"DEBUG: Local Language Score: {self.language_score}, Components: {details.get('components')}")
+        except Exception as e:
+            print(f"Warning: Local language scoring failed, falling back to the LLM: {e}")
+            self._score_language_proficiency_llm(all_qa_pairs)
+
+    def _score_language_proficiency_llm(self, all_qa_pairs):
+        """Language proficiency scored by the LLM (opt-in via config.LANGUAGE_SCORER = "llm")."""
+        self.language_scoring_method = "llm"
         if not all_qa_pairs:
             self.language_score = 0
             self.language_analysis = "No substantive answers provided for language assessment."
@@ -649,12 +797,163 @@ class AIInterviewer:
         # --- MODIFIED LANGUAGE SCORING PARSING END ---
 
 
-    def _score_round(self, round_name, relevant_answers_for_scoring, specialization=None, coding_stage=None):
+    def _score_coding_stage_locally(self, coding_stage, relevant_answers_for_scoring):
+        """
+        Grades predict_output / write_program answers by execution instead of an LLM call:
+        the stated output is compared with the snippet's real output, and programs are run
+        against their test cases in the sandbox. Returns None (use LLM grading) if any
+        question of the stage has no ground truth or a stated output is not exactly the
+        expected one.
+        """
+        questions_by_text = {
+            re.sub(r'\s+', ' ', q['question_text'].strip().lower()): q
+            for q in self.all_generated_questions.get("coding", {}).get(coding_stage, {}).get("questions", [])
+        }
+        scored_questions = []
+        for qa_pair in relevant_answers_for_scoring:
+            question = questions_by_text.get(re.sub(r'\s+', ' ', qa_pair.get('question_text', '').strip().lower()))
+            answer_text = qa_pair.get('answer', '')
+            if coding_stage == "predict_output" and question and question.get("expected_output"):
+                if not answer_text.strip():
+                    score, analysis = 0, "No answer provided."
+                elif code_sandbox.output_matches(question["expected_output"], answer_text):
+                    score, analysis = 100, "Output predicted correctly."
+                else:
+                    return None  # not the exact output: wrong, hedged or reworded, which the LLM judges
+            elif coding_stage == "write_program" and question and question.get("test_cases"):
+                if not answer_text.strip():
+                    score, analysis = 0, "No answer provided."
+                else:
+                    test_cases = question["test_cases"]
+                    try:
+                        results = code_sandbox.run_function_tests(
+                            code_sandbox.extract_code(answer_text), question["function_name"], [case["args"] for case in test_cases]
+                        )
+                    except code_sandbox.SandboxUnavailable:
+                        return None
+                    passed = sum(1 for case, result in zip(test_cases, results) if result.get("ok") and result.get("value") == case["expected"])
+                    score = int(100 * passed / len(test_cases))
+                    analysis = f"Passed {passed}/{len(test_cases)} test cases."
+                    # Test number and exception type only: the code's own output never reaches the report.
+                    first_failure = next((
+                        (number, r) for number, (c, r) in enumerate(zip(test_cases, results), start=1)
+                        if not (r.get("ok") and r.get("value") == c["expected"])
+                    ), None)
+                    if first_failure is not None:
+                        number, result = first_failure
+                        analysis += f" First failure: test {number} ({result.get('error') or 'wrong result'})."
+            else:
+                return None
+
+            scored_questions.append({
+                "question_text": qa_pair.get('question_text', 'N/A'),
+                "speak_text": qa_pair.get('speak_text', qa_pair.get('question_text', 'N/A')),
+                "score": score,
+                "answer": answer_text,
+                "analysis": analysis,
+            })
+
+        overall_score = int(sum(q["score"] for q in scored_questions) / len(scored_questions)) if scored_questions else 0
+        stage_display_name = coding_stage.replace('_', ' ').title()
+        print(f"Local sandbox scoring for {stage_display_name}: {overall_score}")
+        return {
+            'overall_score': overall_score,
+            'questions': scored_questions,
+            'round_summary': f"{stage_display_name}: " + " ".join(q["analysis"] for q in scored_questions),
+        }
+
+    @staticmethod
+    def _enforce_zero_score_rules(score, analysis, answer_text):
+        """Applies the 0-score rule to an LLM score based on the LLM's own analysis."""
+        llm_analysis = (analysis or "N/A").lower()
+        if not answer_text or \
+           "no answer provided" in llm_analysis or \
+           "nonsensical" in llm_analysis or \
+           "off-topic" in llm_analysis or \
+           "irrelevant" in llm_analysis or \
+           "incorrect" in llm_analysis or \
+           "incomplete" in llm_analysis:
+            return 0
+        return score
+
+    def _find_generated_question(self, question_text, round_name, specialization=None, coding_stage=None):
+        """Returns the pre-generated question dict matching `question_text` (normalized), or None."""
+        if coding_stage:
+            questions_list = self.all_generated_questions.get("coding", {}).get(coding_stage, {}).get("questions", [])
+        elif specialization:
+            questions_list = self.all_generated_questions.get("technical", {}).get("specializations", {}).get(specialization, {}).get("questions", [])
+        else:
+            questions_list = self.all_generated_questions.get(round_name, {}).get("questions", [])
+
+        normalized_question_text = re.sub(r'\s+', ' ', (question_text or "").strip().lower())
+        for q_dict in questions_list:
+            if re.sub(r'\s+', ' ', q_dict.get("question_text", "").strip().lower()) == normalized_question_text:
+                return q_dict
+        return None
+
+    def _prescore_answers(self, round_name, relevant_answers_for_scoring, specialization=None, coding_stage=None):
+        """Returns {index: (score, analysis)} for the answers answer_prescoring resolves locally."""
+        try:
+            return answer_prescoring.prescore_answers(
+                relevant_answers_for_scoring,
+                lambda question_text: self._find_generated_question(question_text, round_name, specialization, coding_stage),
+                is_code=(round_name == "coding" or coding_stage is not None),
+            )
+        except Exception as e:
+            print(f"Warning: Local pre-scoring failed, scoring all answers with the LLM: {e}")
+            return {}
+
+    def _merge_prescored_results(self, round_name, relevant_answers_for_scoring, prescored, llm_results, specialization=None, coding_stage=None):
+        """
+        Combines the locally scored answers with the LLM results for the rest (same order
+        as the answers pre-scoring left open), keeping the original answer order.
+        """
+        llm_questions = iter(llm_results['questions']) if llm_results else iter(())
+
+        questions = []
+        for i, qa_pair in enumerate(relevant_answers_for_scoring):
+            if i in prescored:
+                score, analysis = prescored[i]
+                q_text = qa_pair.get('question_text', 'N/A')
+                questions.append({
+                    "question_text": q_text,
+                    "speak_text": qa_pair.get('speak_text', self._get_speak_text_for_question_fallback(q_text, round_name, specialization, coding_stage)),
+                    "score": score,
+                    "answer": qa_pair.get('answer', ''),
+                    "analysis": analysis,
+                })
+            else:
+                questions.append(next(llm_questions))
+
+        overall_score = int(sum(q['score'] for q in questions) / len(questions))
+        local_summary = " ".join(sorted({analysis for _, analysis in prescored.values()}))
+        round_summary = " ".join(part for part in (llm_results['round_summary'] if llm_results else "", local_summary) if part)
+        print(f"Pre-scored {len(prescored)}/{len(questions)} answers locally for {round_name}"
+              + (f" - {specialization}" if specialization else "") + (f" - {coding_stage}" if coding_stage else "")
+              + f". Overall score: {overall_score}")
+        return {
+            'overall_score': overall_score,
+            'questions': questions,
+            'round_summary': round_summary,
+        }
+
+    @staticmethod
+    def _with_llm_feedback(local_results, llm_round_summary):
+        """
+        Sandbox-graded stage results with the LLM's qualitative round summary kept in
+        front of the test results. The scores stay the sandbox's.
+        """
+        round_summary = " ".join(part for part in (llm_round_summary, local_results['round_summary']) if part)
+        return {**local_results, 'round_summary': round_summary}
+
+    def _score_round(self, round_name, relevant_answers_for_scoring, specialization=None, coding_stage=None, prescore=True):
         """
         Scores a given round or technical specialization, returning overall score, per-question scores, and analyses.
         This version is made more robust to handle unexpected LLM responses and ensures correct data mapping.
         It now takes `relevant_answers_for_scoring` as an explicit parameter, which should contain
         all Q&A pairs for the current round.
+        Answers that answer_prescoring can resolve locally are not sent to the LLM (prescore=False disables this).
+        Objective coding stages are scored in the sandbox; the LLM still reviews them for the round summary.
         """
         if not relevant_answers_for_scoring:
             print(f"No answers provided for {round_name}" + (f" - {specialization}" if specialization else "") + ". Score 0.")
@@ -664,6 +963,22 @@ class AIInterviewer:
                 'round_summary': f"No answers were provided for the {round_name}" + (f" ({specialization})" if specialization else "") + " round."
             }
 
+        if prescore and coding_stage in ("predict_output", "write_program") and code_sandbox.sandbox_available():
+            local_results = self._score_coding_stage_locally(coding_stage, relevant_answers_for_scoring)
+            if local_results is not None:
+                llm_results = self._score_round(round_name, relevant_answers_for_scoring, specialization, coding_stage, prescore=False)
+                # Only a parsed LLM response has 'question_details'; a failed one has no feedback to keep.
+                return self._with_llm_feedback(
+                    local_results, llm_results.get('round_summary', '') if 'question_details' in llm_results else ''
+                )
+
+        if prescore and config.ANSWER_PRESCORING_ENABLED:
+            prescored = self._prescore_answers(round_name, relevant_answers_for_scoring, specialization, coding_stage)
+            if prescored:
+                ambiguous = [qa for i, qa in enumerate(relevant_answers_for_scoring) if i not in prescored]
+                llm_results = self._score_round(round_name, ambiguous, specialization, coding_stage, prescore=False) if ambiguous else None
+                return self._merge_prescored_results(round_name, relevant_answers_for_scoring, prescored, llm_results, specialization, coding_stage)
+
         base_scoring_rules = (
             f"Your ONLY output MUST be a JSON object with the following structure. Do NOT include any other text, explanations, or conversational filler outside of the JSON:\n"
             f"{{\n"
@@ -788,18 +1103,7 @@ class AIInterviewer:
             llm_score_detail = llm_scored_questions_map.get(normalized_original_question)
 
             if llm_score_detail:
-                score = llm_score_detail.get('score', 0)
-                llm_analysis = llm_score_detail.get('analysis', "N/A").lower()
-                
-                # Apply 0 score rule based on LLM's analysis
-                if not answer_text or \
-                   "no answer provided" in llm_analysis or \
-                   "nonsensical" in llm_analysis or \
-                   "off-topic" in llm_analysis or \
-                   "irrelevant" in llm_analysis or \
-                   "incorrect" in llm_analysis or \
-                   "incomplete" in llm_analysis:
-                    score = 0
+                score = self._enforce_zero_score_rules(llm_score_detail.get('score', 0), llm_score_detail.get('analysis', "N/A"), answer_text)
             else:
                 # If LLM didn't return a score for this specific question, default to 0
                 print(f"WARNING: LLM did not provide score for question: '{q_text[:50]}...'. Defaulting to 0.")
@@ -836,6 +1140,159 @@ class AIInterviewer:
             print(f"    Score: {qa.get('score')}")
         return scoring_results
 
+    def _score_rounds_batch(self, rounds):
+        """
+        Scores several rounds with as few LLM calls as possible (assessment mode).
+        `rounds` is a list of {"round_name", "specialization", "coding_stage", "answers"}.
+        Answers resolved by pre-scoring never reach the LLM; coding stages graded in the
+        sandbox still go to it for their round summary only. The rest of every round is
+        packed into size-bounded multi-round requests.
+        Returns one result per round, in the same structure as _score_round.
+        """
+        results = [None] * len(rounds)
+        local_results = {}  # round index -> sandbox-graded results
+        open_rounds = []  # (round index, prescored answers, answers left for the LLM)
+        for index, round_info in enumerate(rounds):
+            answers = round_info["answers"]
+            round_name, specialization, coding_stage = round_info["round_name"], round_info.get("specialization"), round_info.get("coding_stage")
+            if not answers:
+                results[index] = self._score_round(round_name, answers, specialization, coding_stage)
+                continue
+            if coding_stage in ("predict_output", "write_program") and code_sandbox.sandbox_available():
+                local = self._score_coding_stage_locally(coding_stage, answers)
+                if local is not None:
+                    local_results[index] = local
+                    open_rounds.append((index, {}, answers))
+                    continue
+            prescored = self._prescore_answers(round_name, answers, specialization, coding_stage) if config.ANSWER_PRESCORING_ENABLED else {}
+            ambiguous = [qa for i, qa in enumerate(answers) if i not in prescored]
+            if not ambiguous:
+                results[index] = self._merge_prescored_results(round_name, answers, prescored, None, specialization, coding_stage)
+            else:
+                open_rounds.append((index, prescored, ambiguous))
+
+        # Pack whole rounds into requests of at most BATCH_SCORING_MAX_PROMPT_CHARS.
+        chunks, current, current_size = [], [], 0
+        for open_round in open_rounds:
+            size = len(json.dumps(open_round[2]))
+            if current and current_size + size > config.BATCH_SCORING_MAX_PROMPT_CHARS:
+                chunks.append(current)
+                current, current_size = [], 0
+            current.append(open_round)
+            current_size += size
+        if current:
+            chunks.append(current)
+
+        for chunk in chunks:
+            llm_results = self._score_rounds_chunk([(rounds[index], ambiguous) for index, _, ambiguous in chunk])
+            for (index, prescored, ambiguous), round_llm_results in zip(chunk, llm_results):
+                round_info = rounds[index]
+                round_name, specialization, coding_stage = round_info["round_name"], round_info.get("specialization"), round_info.get("coding_stage")
+                if index in local_results:
+                    results[index] = self._with_llm_feedback(local_results[index], (round_llm_results or {}).get('round_summary', ''))
+                    continue
+                if round_llm_results is None:
+                    print(f"WARNING: Batch scoring returned nothing for '{round_name}'; scoring it separately.")
+                    round_llm_results = self._score_round(round_name, ambiguous, specialization, coding_stage, prescore=False)
+                results[index] = self._merge_prescored_results(round_name, round_info["answers"], prescored, round_llm_results, specialization, coding_stage)
+        print(f"Batch scoring: {len(rounds)} rounds scored with {len(chunks)} LLM call(s).")
+        return results
+
+    def _score_rounds_chunk(self, chunk):
+        """
+        One LLM call for several rounds. `chunk` is a list of (round_info, answers).
+        Returns a list aligned with `chunk` of _score_round-style results, or None for a
+        round the response did not cover.
+        """
+        prompt_rounds = []
+        for round_number, (round_info, answers) in enumerate(chunk, start=1):
+            if round_info.get("coding_stage"):
+                title = f"Coding - {round_info['coding_stage'].replace('_', ' ').title()}"
+            elif round_info.get("specialization"):
+                title = f"Technical - {round_info['specialization']}"
+            else:
+                title = round_info["round_name"].title()
+            prompt_rounds.append({
+                "round_id": f"r{round_number}",
+                "round": title,
+                "questions": [
+                    {"question_id": f"r{round_number}q{q_number}", "question": qa.get('question_text', 'N/A'), "answer": qa.get('answer', '')}
+                    for q_number, qa in enumerate(answers, start=1)
+                ],
+            })
+
+        scoring_prompt = (
+            f"As a strict and unbiased AI interviewer, evaluate the candidate's performance in each of the following interview rounds out of 100. "
+            f"Consider the candidate's experience: \"{self.experience}\" and the target position: \"{self.position}\". "
+            f"The scoring should primarily consider the '{self.position}' role. "
+            f"Here are the rounds with their questions and the candidate's answers:\n{json.dumps(prompt_rounds, indent=2)}\n"
+            f"Your ONLY output MUST be a JSON object with the following structure. Do NOT include any other text, explanations, or conversational filler outside of the JSON:\n"
+            f"{{\n"
+            f" \"rounds\": [\n"
+            f" {{\n"
+            f" \"round_id\": \"<round_id from the input>\",\n"
+            f" \"round_summary\": \"<Overall qualitative assessment of this round. Be concise.>\",\n"
+            f" \"question_details\": [\n"
+            f" {{\"question_id\": \"<question_id from the input>\", \"score\": <integer 0-100>, \"analysis\": \"<Specific analysis for this answer. Be concise.>\"}}\n"
+            f" // ... repeat for each question of the round\n"
+            f" ]\n"
+            f" }}\n"
+            f" // ... repeat for each round\n"
+            f" ]\n"
+            f"}}\n"
+            f"IMPORTANT SCORING RULES: "
+            f"1. Every 'score' field must be an integer between 0 and 100. "
+            f"2. If an answer is empty, nonsensical, contains gibberish, is off-topic, explicitly states 'I don't know', or is clearly incorrect/incomplete, you MUST assign a score of 0. "
+            f"3. If a score is 0, provide a clear, concise reason in the 'analysis' why it received 0 (e.g., 'No answer provided.', 'Answer was off-topic.', 'Incorrect output.'). "
+            f"4. Score every question of every round; do not merge rounds. "
+            f"5. All analysis must be concise, direct, and professional."
+        )
+        num_questions = sum(len(answers) for _, answers in chunk)
+        print(f"\n[AI Batch Scoring: {len(chunk)} rounds, {num_questions} answers]...")
+        response_text = call_llm_api(scoring_prompt, current_conversation_history=[],
+                                     output_max_tokens=min(4000, 300 + 150 * num_questions + 100 * len(chunk)))
+
+        rounds_by_id = {}
+        if response_text:
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            try:
+                parsed_json = json.loads(json_match.group(0) if json_match else response_text)
+                for round_data in parsed_json.get("rounds", []) if isinstance(parsed_json, dict) else []:
+                    if isinstance(round_data, dict) and isinstance(round_data.get("question_details"), list):
+                        rounds_by_id[str(round_data.get("round_id"))] = round_data
+            except json.JSONDecodeError as e:
+                print(f"Warning: Failed to decode JSON for batch scoring response: {e}. Raw: {response_text}")
+
+        results = []
+        for prompt_round, (round_info, answers) in zip(prompt_rounds, chunk):
+            round_data = rounds_by_id.get(prompt_round["round_id"])
+            if round_data is None:
+                results.append(None)
+                continue
+            details_by_id = {str(d.get("question_id")): d for d in round_data["question_details"] if isinstance(d, dict)}
+            questions = []
+            for prompt_question, qa_pair in zip(prompt_round["questions"], answers):
+                detail = details_by_id.get(prompt_question["question_id"])
+                if detail is None:
+                    print(f"WARNING: LLM did not provide score for question: '{prompt_question['question'][:50]}...'. Defaulting to 0.")
+                score = 0
+                if detail and str(detail.get("score", "")).strip().isdigit():
+                    score = self._enforce_zero_score_rules(min(100, int(str(detail["score"]).strip())), detail.get("analysis"), qa_pair.get('answer', ''))
+                q_text = qa_pair.get('question_text', 'N/A')
+                questions.append({
+                    "question_text": q_text,
+                    "speak_text": qa_pair.get('speak_text', self._get_speak_text_for_question_fallback(
+                        q_text, round_info["round_name"], round_info.get("specialization"), round_info.get("coding_stage"))),
+                    "score": score,
+                    "answer": qa_pair.get('answer', ''),
+                })
+            results.append({
+                'overall_score': int(sum(q['score'] for q in questions) / len(questions)) if questions else 0,
+                'questions': questions,
+                'round_summary': round_data.get("round_summary", ""),
+            })
+        return results
+
     def _get_speak_text_for_question_fallback(self, question_text, round_name, specialization=None, coding_stage=None):
         """
         Helper to reconstruct speak_text for a given question when original is not directly available.
@@ -925,9 +1382,12 @@ class AIInterviewer:
             "speak_text": speak_text,
             "answer": answer_text if answer_text else ""
         }
-        self.all_interview_answers.append(q_a_pair)
+        # Not loaded yet means the rows are the source of truth; the caller appends the row.
+        if self._all_interview_answers is not None:
+            self._all_interview_answers.append(q_a_pair)
         self._add_to_chat_history("user", answer_text if answer_text else "[No answer detected]")
         print(f"DEBUG: Recorded answer for question: '{question_text[:50]}...'")
+        return q_a_pair
 
 
     def run_interview(self, read_malpractice_status_func):
@@ -1004,6 +1464,7 @@ class AIInterviewer:
         self.mock_interview_db_instance.global_readiness_score = self.global_readiness_score
         self.mock_interview_db_instance.language_proficiency_score = self.language_score
         self.mock_interview_db_instance.language_analysis = self.language_analysis
+        self.mock_interview_db_instance.language_scoring_method = self.language_scoring_method
         self.mock_interview_db_instance.round_analysis_json = self.round_detailed_results # Store full detailed results
 
         # NEW: Save communication and psychometric overall scores
@@ -1024,7 +1485,14 @@ class AIInterviewer:
         self.mock_interview_db_instance.status = MockInterviewResult.InterviewStatus.COMPLETED
         
         try:
-            self.mock_interview_db_instance.save()
+            # Only the report fields: strikes and malpractice flags are written behind by other
+            # workers (proctoring_state) and must not be overwritten with this instance's copies.
+            self.mock_interview_db_instance.save(update_fields=[
+                'global_readiness_score', 'language_proficiency_score', 'language_analysis',
+                'language_scoring_method', 'round_analysis_json', 'communication_overall_score',
+                'psychometric_overall_score', 'aiml_specialization', 'full_qa_transcript',
+                'technical_specialization_scores', 'interview_end_time', 'status', 'updated_at',
+            ])
             print(f"Final comprehensive interview report saved to database for interview ID: {self.mock_interview_db_instance.id}")
             # The frontend will fetch this via the report API.
             speak_text(self.all_generated_questions["final_report_saved_message_template"].format(report_filename=f"database record ID {self.mock_interview_db_instance.id}"))
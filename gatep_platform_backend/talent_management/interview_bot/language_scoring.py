@@ -0,0 +1,213 @@
+# talent_management/interview_bot/language_scoring.py
+"""
+Deterministic local language-proficiency scoring (the default; the LLM scorer is
+opt-in via config.LANGUAGE_SCORER = "llm").
+
+The candidate's spoken/written answers are reduced to a few features:
+
+  * vocabulary  - moving-average type-token ratio (MATTR), which does not drop with length,
+  * grammar     - grammar issues per 100 words (LanguageTool when installed and enabled,
+                  otherwise a small set of rules that catch common spoken-English errors),
+  * fluency     - filler words and immediate word repetitions per 100 words,
+  * clarity     - Flesch reading ease and average sentence length,
+  * volume      - how much the candidate actually said.
+
+Each feature is mapped to a 0-100 component and the score is a weighted sum.
+The weights can be fitted to the scores the LLM gave in past interviews with
+`python manage.py calibrate_language_scorer`, which writes them to
+settings.LANGUAGE_SCORER_CALIBRATION_PATH; without that file the defaults below
+are used.
+"""
+
+import json
+import os
+import re
+import threading
+
+from . import config
+
+COMPONENTS = ("vocabulary", "grammar", "fluency", "clarity", "volume")
+DEFAULT_WEIGHTS = {"intercept": 0.0, "vocabulary": 0.27, "grammar": 0.27, "fluency": 0.22, "clarity": 0.12, "volume": 0.12}
+
+MATTR_WINDOW = 50
+FULL_VOLUME_WORDS = 150   # answers totalling this many words get the full volume component
+
+_WORD_RE = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_FILLER_RE = re.compile(r"\b(um+|uh+|er+|hmm+|you know|i mean|kind of|sort of|basically)\b", re.IGNORECASE)
+_CODE_CHARS_RE = re.compile(r"[{}()\[\]=<>;:_#*/+\-\"'`]")
+
+# Rule-based fallback for the grammar component: patterns that are almost always wrong.
+# Subject-verb rules only fire on a clause-initial subject, so questions and inversions
+# ("Does it have", "would he do") are not flagged; "A"/"I" as plain letters ("Plan A is",
+# "i.e.") are not articles or pronouns and are left alone.
+_CLAUSE_START = r"(?:^|[.!?;:,]\s*|\b(?i:and|but|so|because|since|although|though|while|then)\s+)"
+_GRAMMAR_RULES = [
+    re.compile(r"\ba\s+(?!one\b|once\b|eu|ewe)[aeio][a-z]+"),                           # "a apple"
+    re.compile(r"\b[Aa]n\s+(?![aeiouh])[a-z]{2,}"),                                    # "an car"
+    re.compile(_CLAUSE_START + r"(he|she|it)\s+(have|do|don't|are|were)\b", re.IGNORECASE | re.MULTILINE),  # "he have"
+    re.compile(_CLAUSE_START + r"(you|we|they)\s+(has|does|doesn't|is|was)\b", re.IGNORECASE | re.MULTILINE),  # "they is"
+    re.compile(_CLAUSE_START + r"(I)\s+(has|does|doesn't|is|are)\b", re.MULTILINE),  # "I is"
+    re.compile(r"\b(more|most)\s+(better|worse|easier|harder|faster|bigger|smaller)\b", re.IGNORECASE),  # "more better"
+    re.compile(r"\b(could|should|would|must)\s+of\b", re.IGNORECASE),                 # "should of"
+    # "didn't wanted": a past-tense -ed form, not a base verb ending in -ed ("need", "embed").
+    re.compile(r"\b(didn't|doesn't|don't|did not|does not|do not)\s+(?!(?:embed|shred)\b)[a-z]{2,}[^e\W]ed\b", re.IGNORECASE),
+]
+
+_calibration = None
+_calibration_lock = threading.Lock()
+
+
+def _clamp(value, low=0.0, high=100.0):
+    return max(low, min(high, value))
+
+
+def looks_like_code(text):
+    """True for coding-round answers, which say nothing about spoken language."""
+    stripped = (text or "").strip()
+    if not stripped or "```" in stripped:
+        return bool(stripped)
+    return len(_CODE_CHARS_RE.findall(stripped)) / len(stripped) > 0.08
+
+
+def _count_syllables(word):
+    word = word.lower().strip("'")
+    groups = re.findall(r"[aeiouy]+", word)
+    count = len(groups)
+    if word.endswith("e") and count > 1 and not word.endswith(("le", "ee")):
+        count -= 1
+    return max(1, count)
+
+
+def _mattr(words):
+    """Moving-average type-token ratio over MATTR_WINDOW-word windows."""
+    words = [w.lower() for w in words]
+    if len(words) <= MATTR_WINDOW:
+        return len(set(words)) / len(words) if words else 0.0
+    ratios = [len(set(words[i:i + MATTR_WINDOW])) / MATTR_WINDOW for i in range(len(words) - MATTR_WINDOW + 1)]
+    return sum(ratios) / len(ratios)
+
+
+def _grammar_issue_count(text):
+    if config.LANGUAGE_SCORER_USE_LANGUAGETOOL:
+        try:
+            from utils1.model_registry import get_model
+            return len(get_model("languagetool").check(text))
+        except Exception as e:
+            print(f"Warning: LanguageTool unavailable, using rule-based grammar check: {e}")
+
+    return sum(len(rule.findall(text)) for rule in _GRAMMAR_RULES)
+
+
+def extract_features(answers):
+    """
+    Returns the raw features and the 0-100 components for a list of answer strings
+    (code answers are ignored), or None if there is no natural-language text.
+    """
+    texts = [a.strip() for a in answers if a and a.strip() and not looks_like_code(a)]
+    if not texts:
+        return None
+    text = "\n".join(texts)
+    words = _WORD_RE.findall(text)
+    if not words:
+        return None
+
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if _WORD_RE.search(s)]
+    num_words, num_sentences = len(words), max(1, len(sentences))
+    avg_sentence_length = num_words / num_sentences
+    syllables_per_word = sum(_count_syllables(w) for w in words) / num_words
+    flesch = 206.835 - 1.015 * avg_sentence_length - 84.6 * syllables_per_word
+    mattr = _mattr(words)
+    grammar_per_100 = 100 * _grammar_issue_count(text) / num_words
+    fillers = len(_FILLER_RE.findall(text))
+    repetitions = sum(1 for a, b in zip(words, words[1:]) if a.lower() == b.lower())
+    disfluency_per_100 = 100 * (fillers + repetitions) / num_words
+
+    # Clear spoken English sits around Flesch 50-80 with 8-25 word sentences.
+    clarity = _clamp(100 - 2 * max(0.0, 50 - flesch) - 1.5 * max(0.0, flesch - 90))
+    clarity -= 3 * max(0.0, avg_sentence_length - 25) + 5 * max(0.0, 6 - avg_sentence_length)
+
+    features = {
+        "words": num_words,
+        "sentences": num_sentences,
+        "avg_sentence_length": round(avg_sentence_length, 1),
+        "flesch_reading_ease": round(flesch, 1),
+        "mattr": round(mattr, 3),
+        "grammar_issues_per_100_words": round(grammar_per_100, 2),
+        "disfluencies_per_100_words": round(disfluency_per_100, 2),
+    }
+    components = {
+        "vocabulary": _clamp((mattr - 0.45) / 0.35 * 100),
+        "grammar": _clamp(100 - 12.5 * grammar_per_100),
+        "fluency": _clamp(100 - 10 * disfluency_per_100),
+        "clarity": _clamp(clarity),
+        "volume": _clamp(100 * num_words / FULL_VOLUME_WORDS),
+    }
+    return {"features": features, "components": {k: round(v, 1) for k, v in components.items()}}
+
+
+def load_calibration():
+    """Returns the calibrated weights (or DEFAULT_WEIGHTS), read once per process."""
+    global _calibration
+    if _calibration is None:
+        with _calibration_lock:
+            if _calibration is None:
+                from django.conf import settings
+                path = getattr(settings, "LANGUAGE_SCORER_CALIBRATION_PATH", None)
+                weights = dict(DEFAULT_WEIGHTS)
+                if path and os.path.exists(path):
+                    try:
+                        with open(path) as f:
+                            weights.update(json.load(f)["weights"])
+                    except (OSError, ValueError, KeyError) as e:
+                        print(f"Warning: Could not read language scorer calibration {path}: {e}")
+                _calibration = weights
+    return _calibration
+
+
+def reset_calibration():
+    global _calibration
+    _calibration = None
+
+
+def _describe(features, components):
+    notes = []
+    vocabulary, grammar, fluency, clarity = (components[k] for k in ("vocabulary", "grammar", "fluency", "clarity"))
+    notes.append("Varied, precise vocabulary." if vocabulary >= 75 else
+                 "Adequate vocabulary with some repetition." if vocabulary >= 45 else
+                 "Limited, repetitive vocabulary.")
+    notes.append("Grammar is largely accurate." if grammar >= 80 else
+                 "Noticeable grammar errors." if grammar >= 50 else
+                 "Frequent grammar errors.")
+    notes.append("Fluent delivery with few fillers." if fluency >= 80 else
+                 "Some hesitation and filler words." if fluency >= 50 else
+                 "Frequent fillers and repetitions affect fluency.")
+    notes.append("Sentences are clear and well structured." if clarity >= 70 else
+                 "Sentences are sometimes hard to follow." if clarity >= 40 else
+                 "Answers lack clear sentence structure.")
+    if components["volume"] < 50:
+        notes.append("Answers were brief, so there was little to assess.")
+    notes.append(
+        f"({features['words']} words, {features['avg_sentence_length']} words/sentence, "
+        f"{features['grammar_issues_per_100_words']} grammar issues and "
+        f"{features['disfluencies_per_100_words']} disfluencies per 100 words.)"
+    )
+    return " ".join(notes)
+
+
+def score_components(components, weights=None):
+    weights = weights or load_calibration()
+    score = weights.get("intercept", 0.0) + sum(weights.get(k, 0.0) * components[k] for k in COMPONENTS)
+    return int(round(_clamp(score)))
+
+
+def score_language(answers):
+    """
+    Scores a list of answer strings. Returns (score 0-100, analysis string, details dict);
+    details holds the features and components so they can be stored or inspected.
+    """
+    extracted = extract_features(answers)
+    if extracted is None:
+        return 0, "No substantive answers provided for language assessment.", {}
+    score = score_components(extracted["components"])
+    return score, _describe(extracted["features"], extracted["components"]), extracted
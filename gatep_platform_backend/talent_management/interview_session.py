@@ -0,0 +1,513 @@
+# talent_management/interview_session.py
+"""
+Answer handling and round transitions of a mock interview.
+
+Shared by the HTTP submit-answer endpoint (MockInterviewSubmitAnswerView),
+which rebuilds the AIInterviewer from the database on every request, and the
+WebSocket interview channel (talent_management/consumers.py), which keeps one
+AIInterviewer in memory for the whole interview.
+
+When the last answer of a round arrives, the round is scored on a background
+executor and the next round's first question is returned straight away. The job
+works on a snapshot of the interviewer and only writes to the database: scores
+are merged into round_analysis_json as they finish, and the final report waits
+for the outstanding jobs (wait_for_round_scoring). A round being scored is
+claimed in round_scoring_claims, so a worker finishing the interview waits for
+another worker's job instead of scoring the round a second time. Interviews in
+batch scoring mode (assessment) skip the per-round jobs and score every round at
+the end with one or a few multi-round LLM requests.
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Max
+
+from .models import MockInterviewAnswer
+
+CODING_STAGES = ["predict_output", "fix_error", "write_program"]
+INTERVIEW_COMPLETE = "interview_complete"
+
+# Round scoring (one LLM call per round) runs here while the candidate answers the
+# next round; the final report waits for whatever is still running.
+_ROUND_SCORING_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ROUND_SCORING_WORKERS", "4")), thread_name_prefix="round-scoring"
+)
+ROUND_SCORING_TIMEOUT_SECONDS = float(os.environ.get("ROUND_SCORING_TIMEOUT_SECONDS", "180"))
+ROUND_SCORING_POLL_SECONDS = 2  # how often the final report checks on another worker's scoring job
+_PENDING_ROUND_SCORING = {}  # interview id -> futures of this process
+_PENDING_LOCK = threading.Lock()
+
+
+def questions_for_round(interviewer, round_name):
+    """Returns the pre-generated questions of a round, technical sub-round or coding stage."""
+    if round_name == "communication" or round_name == "psychometric":
+        return interviewer.all_generated_questions[round_name]["questions"]
+    if round_name in interviewer.technical_specializations:
+        return interviewer.all_generated_questions["technical"]["specializations"].get(round_name, {}).get("questions", [])
+    if round_name in CODING_STAGES:
+        return interviewer.all_generated_questions["coding"][round_name]["questions"]
+    return []
+
+
+def restore_position(interviewer, round_name, question_index):
+    """Puts a freshly loaded interviewer back on the question the candidate is answering."""
+    interviewer.current_round_name = round_name
+    interviewer.current_question_index = question_index
+    interviewer.current_round_questions = questions_for_round(interviewer, round_name)
+
+
+def current_question_text(interviewer):
+    questions = interviewer.current_round_questions
+    if questions and interviewer.current_question_index < len(questions):
+        return questions[interviewer.current_question_index]["question_text"]
+    return None
+
+
+def _append_answer(interviewer, mock_interview, qa_pair):
+    """
+    Appends the answer to the current question as one row; returns False if that
+    question already has one (a double submit), which is left as it is.
+    The sequence number is looked up once per interviewer (a MAX over the unique
+    (interview, sequence) index) and then counted in memory.
+    """
+    if interviewer.next_answer_sequence is None:
+        last_sequence = mock_interview.answers.aggregate(last=Max('sequence'))['last']
+        interviewer.next_answer_sequence = (last_sequence or 0) + 1
+    question = {"round_name": interviewer.current_round_name, "question_index": interviewer.current_question_index}
+    try:
+        with transaction.atomic():
+            MockInterviewAnswer.objects.create(
+                mock_interview=mock_interview, sequence=interviewer.next_answer_sequence, **question, **qa_pair
+            )
+    except IntegrityError:
+        if mock_interview.answers.filter(**question).exists():
+            return False
+        # Another question's answer took this sequence number; take the next free one.
+        interviewer.next_answer_sequence = None
+        return _append_answer(interviewer, mock_interview, qa_pair)
+    interviewer.next_answer_sequence += 1
+    return True
+
+
+def _answers_for_round(interviewer, mock_interview, round_name):
+    """Reads only this round's answer rows (indexed on interview + round)."""
+    answers = mock_interview.qa_transcript(round_name=round_name)
+    if answers:
+        return answers
+
+    # Interviews started before the answer table: match the round's questions in the JSON transcript.
+    normalized_round_questions = {re.sub(r'\s+', ' ', q['question_text'].strip().lower()) for q in questions_for_round(interviewer, round_name)}
+    return [
+        qa_pair for qa_pair in interviewer.all_interview_answers
+        if re.sub(r'\s+', ' ', qa_pair.get('question_text', '').strip().lower()) in normalized_round_questions
+    ]
+
+
+def _round_result_slot(interviewer, round_name):
+    """(container key, key) under which a round's result is stored in round_detailed_results."""
+    if round_name in interviewer.technical_specializations:
+        return "technical", round_name
+    return None, round_name
+
+
+def _apply_round_results(interviewer, round_analysis):
+    """Replaces the interviewer's round results and rebuilds round_scores from them."""
+    interviewer.round_detailed_results = round_analysis
+    round_scores = {"communication": 0, "psychometric": 0, "technical": {}, "coding": {}}
+    for round_key, round_data in round_analysis.items():
+        if round_key in ("technical", "coding") and isinstance(round_data, dict):
+            for sub_key, sub_data in round_data.items():
+                if isinstance(sub_data, dict) and 'overall_score' in sub_data:
+                    round_scores[round_key][sub_key] = sub_data['overall_score']
+        elif isinstance(round_data, dict) and 'overall_score' in round_data:
+            round_scores[round_key] = round_data['overall_score']
+    interviewer.round_scores = round_scores
+
+
+def _scoring_snapshot(interviewer):
+    """
+    Copy of the interviewer for a background scoring job. Scoring only reads the
+    interview setup (position, experience, generated questions, specializations);
+    the state the request thread keeps changing is detached, and the snapshot has
+    no model instance, so the job cannot save over the request's writes.
+    """
+    snapshot = copy.copy(interviewer)
+    snapshot.technical_specializations = tuple(interviewer.technical_specializations)
+    snapshot.current_round_questions = list(interviewer.current_round_questions)
+    snapshot.chat_history = list(interviewer.chat_history)
+    snapshot.round_detailed_results = copy.deepcopy(interviewer.round_detailed_results)
+    snapshot.round_scores = copy.deepcopy(interviewer.round_scores)
+    snapshot._all_interview_answers = []
+    snapshot.mock_interview_db_instance = None
+    return snapshot
+
+
+def _claim_rounds(interview_id, round_names):
+    """
+    Claims the scoring of `round_names` for the caller and returns the ones it got:
+    those without a claim younger than ROUND_SCORING_TIMEOUT_SECONDS (a job that
+    died leaves a claim that simply expires). The interview row is locked for the
+    check, so two workers never claim the same round.
+    """
+    from .models import MockInterviewResult
+
+    now = time.time()
+    with transaction.atomic():
+        row = MockInterviewResult.objects.select_for_update().only('round_scoring_claims').get(pk=interview_id)
+        claims = row.round_scoring_claims or {}
+        claimed = [name for name in round_names if now - claims.get(name, 0) >= ROUND_SCORING_TIMEOUT_SECONDS]
+        if claimed:
+            claims.update({name: now for name in claimed})
+            MockInterviewResult.objects.filter(pk=interview_id).update(round_scoring_claims=claims)
+    return claimed
+
+
+def _release_rounds(interview_id, round_names):
+    """Drops the caller's claims (the rounds were scored, or scoring failed and may be retried)."""
+    from .models import MockInterviewResult
+
+    with transaction.atomic():
+        row = MockInterviewResult.objects.select_for_update().only('round_scoring_claims').get(pk=interview_id)
+        claims = row.round_scoring_claims or {}
+        if any(name in claims for name in round_names):
+            for name in round_names:
+                claims.pop(name, None)
+            MockInterviewResult.objects.filter(pk=interview_id).update(round_scoring_claims=claims)
+
+
+def _round_kwargs(interviewer, round_name):
+    return {
+        "specialization": round_name if round_name in interviewer.technical_specializations else None,
+        "coding_stage": round_name if round_name in CODING_STAGES else None,
+    }
+
+
+def _round_result(round_scoring_results):
+    return {
+        "overall_score": round_scoring_results['overall_score'],
+        "round_summary": round_scoring_results['round_summary'],
+        "questions": round_scoring_results['questions']
+    }
+
+
+def _store_round_results(interviewer, interview_id, round_results):
+    """
+    Merges {round_name: result} into the stored round analysis and releases the rounds'
+    claims. The merge locks the interview row, so rounds scored concurrently (in any
+    worker) never overwrite each other. The interviewer itself is not updated; the
+    final report loads the merged results (wait_for_round_scoring).
+    """
+    from .models import MockInterviewResult
+
+    with transaction.atomic():
+        row = MockInterviewResult.objects.select_for_update().only(
+            'round_analysis_json', 'round_scoring_claims'
+        ).get(pk=interview_id)
+        round_analysis = row.round_analysis_json or {}
+        claims = row.round_scoring_claims or {}
+        for round_name, round_result in round_results.items():
+            claims.pop(round_name, None)
+            container, key = _round_result_slot(interviewer, round_name)
+            if container:
+                round_analysis.setdefault(container, {})[key] = round_result
+            else:
+                round_analysis[key] = round_result
+        MockInterviewResult.objects.filter(pk=interview_id).update(
+            round_analysis_json=round_analysis,
+            round_scoring_claims=claims,
+            communication_overall_score=round_analysis.get("communication", {}).get("overall_score", 0),
+            psychometric_overall_score=round_analysis.get("psychometric", {}).get("overall_score", 0),
+            technical_specialization_scores={
+                spec: data.get("overall_score", 0) for spec, data in round_analysis.get("technical", {}).items()
+            },
+        )
+
+
+def _score_round_job(interviewer, interview_id, round_name, relevant_answers_for_scoring):
+    """
+    Scores one completed, claimed round (LLM call) and stores the result. Runs on the
+    background executor with a _scoring_snapshot of the interviewer, or inline.
+    """
+    try:
+        round_scoring_results = interviewer._score_round(
+            round_name, relevant_answers_for_scoring, **_round_kwargs(interviewer, round_name)
+        )
+        _store_round_results(interviewer, interview_id, {round_name: _round_result(round_scoring_results)})
+        print(f"DEBUG: Scoring of round '{round_name}' for interview {interview_id} finished.")
+    except Exception:
+        _release_rounds(interview_id, [round_name])
+        raise
+    finally:
+        close_old_connections()
+
+
+def _score_rounds_batch_job(interviewer, interview_id, answers_by_round):
+    """Scores several rounds in as few LLM calls as possible (AIInterviewer._score_rounds_batch)."""
+    rounds = [
+        {"round_name": round_name, "answers": answers, **_round_kwargs(interviewer, round_name)}
+        for round_name, answers in answers_by_round.items()
+    ]
+    try:
+        results = interviewer._score_rounds_batch(rounds)
+        _store_round_results(interviewer, interview_id, {
+            round_info["round_name"]: _round_result(result) for round_info, result in zip(rounds, results)
+        })
+    except Exception:
+        _release_rounds(interview_id, list(answers_by_round))
+        raise
+
+
+def _schedule_round_scoring(interviewer, mock_interview):
+    """
+    Claims the completed round, reads its answer rows and hands the scoring to the
+    background executor, so the next question can be returned without waiting on the LLM.
+    """
+    round_name = interviewer.current_round_name
+    if not _claim_rounds(mock_interview.pk, [round_name]):
+        return None  # already being scored
+    relevant_answers_for_scoring = _answers_for_round(interviewer, mock_interview, round_name)
+    future = _ROUND_SCORING_EXECUTOR.submit(
+        _score_round_job, _scoring_snapshot(interviewer), mock_interview.pk, round_name, relevant_answers_for_scoring
+    )
+    with _PENDING_LOCK:
+        pending = [f for f in _PENDING_ROUND_SCORING.get(mock_interview.pk, []) if not f.done()]
+        pending.append(future)
+        _PENDING_ROUND_SCORING[mock_interview.pk] = pending
+    return future
+
+
+def _round_scored(interviewer, round_analysis, round_name):
+    container, key = _round_result_slot(interviewer, round_name)
+    results = round_analysis.get(container, {}) if container else round_analysis
+    return isinstance(results.get(key), dict) and 'overall_score' in results[key]
+
+
+def wait_for_round_scoring(interviewer, mock_interview, timeout=None):
+    """
+    Blocks until every answered round of the interview has its score, then loads the
+    merged results into the interviewer. Waits for this process's outstanding jobs,
+    then for rounds claimed by a job in another worker; unclaimed rounds (batch mode,
+    or a job that died and whose claim expired) are claimed and scored inline.
+    Gives up after `timeout` and reports whatever has been scored by then.
+    """
+    from .models import MockInterviewResult
+
+    timeout = ROUND_SCORING_TIMEOUT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    with _PENDING_LOCK:
+        pending = _PENDING_ROUND_SCORING.pop(mock_interview.pk, [])
+    for future in pending:
+        try:
+            future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except Exception as e:
+            print(f"Background round scoring failed for interview {mock_interview.pk}: {e}")
+
+    answered_rounds = list(
+        mock_interview.answers.order_by('round_name').values_list('round_name', flat=True).distinct()
+    )
+    while True:
+        round_analysis = MockInterviewResult.objects.only('round_analysis_json').get(pk=mock_interview.pk).round_analysis_json or {}
+        unscored_rounds = [r for r in answered_rounds if not _round_scored(interviewer, round_analysis, r)]
+        if not unscored_rounds:
+            break
+        claimed_rounds = _claim_rounds(mock_interview.pk, unscored_rounds)
+        if len(claimed_rounds) == 1:
+            print(f"DEBUG: Round '{claimed_rounds[0]}' of interview {mock_interview.pk} has no score yet; scoring inline.")
+            _score_round_job(interviewer, mock_interview.pk, claimed_rounds[0],
+                             _answers_for_round(interviewer, mock_interview, claimed_rounds[0]))
+        elif claimed_rounds:
+            # Batch (assessment) mode, or several background jobs lost: one multi-round request.
+            print(f"DEBUG: Scoring rounds {claimed_rounds} of interview {mock_interview.pk} in batch.")
+            _score_rounds_batch_job(interviewer, mock_interview.pk, {
+                round_name: _answers_for_round(interviewer, mock_interview, round_name) for round_name in claimed_rounds
+            })
+        elif time.monotonic() >= deadline:
+            print(f"Rounds {unscored_rounds} of interview {mock_interview.pk} were not scored within {timeout}s.")
+            break
+        else:
+            # Still being scored by another worker.
+            time.sleep(ROUND_SCORING_POLL_SECONDS)
+
+    _apply_round_results(interviewer, round_analysis)
+    mock_interview.round_analysis_json = interviewer.round_detailed_results
+    mock_interview.communication_overall_score = interviewer.round_scores.get("communication", 0)
+    mock_interview.psychometric_overall_score = interviewer.round_scores.get("psychometric", 0)
+    mock_interview.technical_specialization_scores = interviewer.round_scores["technical"]
+
+
+def _first_coding_stage(interviewer, after=None):
+    stages_with_questions = [
+        stage for stage in CODING_STAGES
+        if interviewer.all_generated_questions["coding"].get(stage, {}).get("questions")
+    ]
+    if after is None:
+        return stages_with_questions[0] if stages_with_questions else None
+    if after not in stages_with_questions:
+        return None
+    position = stages_with_questions.index(after)
+    return stages_with_questions[position + 1] if position + 1 < len(stages_with_questions) else None
+
+
+def _next_technical_specialization(interviewer, start_index):
+    for i in range(start_index, len(interviewer.technical_specializations)):
+        spec = interviewer.technical_specializations[i]
+        if interviewer.all_generated_questions["technical"]["specializations"].get(spec, {}).get("questions"):
+            return i, spec
+    return None, None
+
+
+def _move_to_next_round(interviewer):
+    """
+    Moves the interviewer to the first question of the next round that has questions.
+    Returns (next_round_name, message); next_round_name is INTERVIEW_COMPLETE after the last round.
+    """
+    round_name = interviewer.current_round_name
+    complete_message = interviewer.all_generated_questions["interview_complete_message"]
+
+    if round_name == "communication":
+        next_round_name, message = "psychometric", f"Round '{round_name.replace('_', ' ').title()}' completed. Moving to the next round."
+    elif round_name == "psychometric" or round_name in interviewer.technical_specializations:
+        start_index = 0 if round_name == "psychometric" else interviewer.technical_specializations.index(round_name) + 1
+        spec_index, next_spec = _next_technical_specialization(interviewer, start_index)
+        if next_spec:
+            interviewer.technical_current_specialization_index = spec_index
+            next_round_name = next_spec
+            if round_name == "psychometric":
+                message = f"Starting Technical Skills Round, focusing on {next_spec}."
+            else:
+                message = f"Moving to Technical Sub-Round: {next_spec}."
+        else:
+            next_round_name = _first_coding_stage(interviewer)
+            if next_round_name:
+                interviewer.coding_current_stage_index = list(interviewer.all_generated_questions["coding"].keys()).index(next_round_name)
+                message = f"Starting Coding Skills Round - {next_round_name.replace('_', ' ').title()} stage."
+            else:
+                return INTERVIEW_COMPLETE, complete_message
+    elif round_name in CODING_STAGES:
+        next_round_name = _first_coding_stage(interviewer, after=round_name)
+        if not next_round_name:
+            return INTERVIEW_COMPLETE, complete_message
+        message = f"Moving to Coding Stage: {next_round_name.replace('_', ' ').title()}."
+    else:
+        return INTERVIEW_COMPLETE, complete_message
+
+    restore_position(interviewer, next_round_name, 0)
+    return next_round_name, message
+
+
+def restore_answered_position(interviewer, mock_interview):
+    """
+    Puts the interviewer on the question after the last one answered, read from the
+    interview's answer rows. Returns False (position untouched) if no answer records
+    its question index yet.
+    """
+    last = mock_interview.answers.filter(question_index__isnull=False).order_by('-sequence') \
+        .values_list('round_name', 'question_index').first()
+    if last is None:
+        return False
+    round_name, question_index = last
+    restore_position(interviewer, round_name, question_index + 1)
+    if interviewer.current_question_index >= len(interviewer.current_round_questions):
+        _move_to_next_round(interviewer)
+    return True
+
+
+def _finish_interview(interviewer):
+    """
+    Waits for the outstanding round scoring, scores language proficiency, computes the
+    global readiness score and saves the final report.
+    """
+    wait_for_round_scoring(interviewer, interviewer.mock_interview_db_instance)
+    interviewer._score_language_proficiency(interviewer.all_interview_answers)
+
+    total_score_sum = 0
+    num_scores = 0
+    if "communication" in interviewer.round_scores:
+        total_score_sum += interviewer.round_scores["communication"]
+        num_scores += 1
+    if "psychometric" in interviewer.round_scores:
+        total_score_sum += interviewer.round_scores["psychometric"]
+        num_scores += 1
+
+    coding_stage_scores = [score for score in interviewer.round_scores["coding"].values()]
+    if coding_stage_scores:
+        total_score_sum += sum(coding_stage_scores) / len(coding_stage_scores)
+        num_scores += 1
+
+    technical_specialization_scores = [score for score in interviewer.round_scores["technical"].values()]
+    if technical_specialization_scores:
+        total_score_sum += sum(technical_specialization_scores) / len(technical_specialization_scores)
+        num_scores += 1
+
+    total_score_sum += interviewer.language_score
+    num_scores += 1
+
+    interviewer.global_readiness_score = int(total_score_sum / num_scores) if num_scores > 0 else 0
+    interviewer._generate_final_report()
+
+
+def submit_answer(interviewer, mock_interview, candidate_answer):
+    """
+    Records the answer to the current question (one MockInterviewAnswer row), queues
+    the round's scoring once its last question is answered and moves the interviewer on.
+
+    Returns a dict describing what the candidate sees next:
+        {"completed": bool, "message": str, "round_completed": str | None,
+         "current_round": str, "question_number": int, "question_text": str | None}
+    When "completed" is True the final report has been generated.
+    """
+    questions_for_current_round = interviewer.current_round_questions
+    duplicate = False
+    if not questions_for_current_round or interviewer.current_question_index >= len(questions_for_current_round):
+        print(f"DEBUG: No valid current question found for {interviewer.current_round_name} at index {interviewer.current_question_index}. Attempting to transition.")
+    else:
+        current_question_dict = questions_for_current_round[interviewer.current_question_index]
+        qa_pair = interviewer.record_answer(current_question_dict["question_text"], current_question_dict["speak_text"], candidate_answer)
+        # A double submit moves the candidate on the same way, but the request that stored
+        # the answer is the one that scores the round and finishes the interview.
+        duplicate = not _append_answer(interviewer, mock_interview, qa_pair)
+
+        interviewer.current_question_index += 1
+
+    message_to_user = "Answer received. Moving to the next question."
+    round_completed = None
+
+    if interviewer.current_question_index >= len(questions_for_current_round):
+        round_completed = interviewer.current_round_name
+        if duplicate:
+            print(f"DEBUG: End of round '{interviewer.current_round_name}' resubmitted; the first submission scores it.")
+        elif mock_interview.scoring_mode == mock_interview.ScoringMode.BATCH:
+            print(f"DEBUG: End of round '{interviewer.current_round_name}'. Batch mode: scored with the other rounds at the end.")
+        else:
+            print(f"DEBUG: End of round '{interviewer.current_round_name}'. Scoring round in the background.")
+            _schedule_round_scoring(interviewer, mock_interview)
+        next_round_name, message_to_user = _move_to_next_round(interviewer)
+
+        if next_round_name == INTERVIEW_COMPLETE or not current_question_text(interviewer):
+            if not duplicate:
+                _finish_interview(interviewer)
+            return {
+                "completed": True,
+                "message": interviewer.all_generated_questions["interview_complete_message"],
+                "round_completed": round_completed,
+                "current_round": INTERVIEW_COMPLETE,
+                "question_number": None,
+                "question_text": None,
+            }
+
+    next_question_text = current_question_text(interviewer)
+    interviewer._add_to_chat_history("model", next_question_text)
+    return {
+        "completed": False,
+        "message": message_to_user,
+        "round_completed": round_completed,
+        "current_round": interviewer.current_round_name,
+        "question_number": interviewer.current_question_index + 1,
+        "question_text": next_question_text,
+    }
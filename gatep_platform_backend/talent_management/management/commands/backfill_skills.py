@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from employer_management.models import JobPosting
+from talent_management import skill_taxonomy
+from talent_management.models import JobListing, Resume
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds the built-in skill synonyms and fills the ResumeSkill, JobSkill and JobListingSkill '
+        'tables from the free-text skill fields of existing rows. Safe to re-run. '
+        'Usage: python manage.py backfill_skills [--seed-only] [--batch-size 500]'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed-only', action='store_true', help='Only seed the built-in skills and synonyms.')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows fetched per database round trip.')
+
+    def handle(self, *args, **options):
+        merged = skill_taxonomy.seed_default_aliases()
+        self.stdout.write(f"Seeded {len(skill_taxonomy.DEFAULT_SKILL_ALIASES)} built-in skills ({merged} duplicate skills merged).")
+        if options['seed_only']:
+            return
+
+        sources = [
+            ('resumes', Resume.objects.only('id', 'skills'), skill_taxonomy.sync_resume_skills),
+            ('job postings', JobPosting.objects.only('id', 'required_skills'), skill_taxonomy.sync_job_posting_skills),
+            ('job listings', JobListing.objects.only('id', 'requirements'), skill_taxonomy.sync_job_listing_skills),
+        ]
+        for label, queryset, sync in sources:
+            count = 0
+            for instance in queryset.order_by('id').iterator(chunk_size=options['batch_size']):
+                sync(instance)
+                count += 1
+            self.stdout.write(f"Synced skills of {count} {label}.")
+
+        self.stdout.write(self.style.SUCCESS("Skill taxonomy backfill complete."))
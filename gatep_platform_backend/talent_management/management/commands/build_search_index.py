@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from employer_management.job_search import job_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds the keyword search index over published job postings and verified job listings '
+        '(served by /api/job-postings/search/). Running workers load the new build on their next poll. '
+        'Usage: python manage.py build_search_index'
+    )
+
+    def handle(self, *args, **options):
+        count = job_search_index.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Job search index built with {count} documents."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from employer_management import semantic_matching
+from employer_management.models import JobPosting
+from talent_management.models import Resume
+
+
+class Command(BaseCommand):
+    help = (
+        'Computes the missing or outdated text embeddings of resumes and job postings and rebuilds '
+        'the memory-mapped semantic indexes used for job matching. Run after deploying or changing '
+        'SENTENCE_EMBEDDING_MODEL, then `rebuild_job_matches`. '
+        'Usage: python manage.py build_semantic_index [--index-only] [--batch-size 256]'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--index-only', action='store_true', help='Rebuild the indexes from stored embeddings only.')
+        parser.add_argument('--batch-size', type=int, default=256, help='Rows embedded per model call.')
+
+    def handle(self, *args, **options):
+        if not options['index_only']:
+            sources = [
+                ('resumes', Resume.objects.filter(is_deleted=False), semantic_matching.resume_text),
+                ('job postings', JobPosting.objects.all(), semantic_matching.job_text),
+            ]
+            for label, queryset, text_for in sources:
+                count, batch = 0, []
+                for instance in queryset.order_by('id').iterator(chunk_size=options['batch_size']):
+                    batch.append(instance)
+                    if len(batch) == options['batch_size']:
+                        semantic_matching.embed_instances(batch, text_for)
+                        count, batch = count + len(batch), []
+                if batch:
+                    semantic_matching.embed_instances(batch, text_for)
+                    count += len(batch)
+                self.stdout.write(f"Checked the embeddings of {count} {label}.")
+            if not semantic_matching.semantic_matching_enabled():
+                self.stdout.write(self.style.WARNING(
+                    "Text embeddings are unavailable in this environment; only stored embeddings were indexed."
+                ))
+
+        for synced in (semantic_matching.talent_index, semantic_matching.job_index):
+            count = synced.rebuild()
+            self.stdout.write(f"Built the {synced.index.name} index with {count} vectors.")
+        self.stdout.write(self.style.SUCCESS("Semantic index build complete."))
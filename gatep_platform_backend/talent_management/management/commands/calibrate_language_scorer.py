@@ -0,0 +1,84 @@
+import json
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from talent_management.interview_bot import language_scoring
+from talent_management.models import MockInterviewResult
+
+
+class Command(BaseCommand):
+    help = (
+        'Fits the weights of the local language-proficiency scorer to the scores the LLM gave in '
+        'completed interviews (language_scoring_method="llm") and writes them to '
+        'settings.LANGUAGE_SCORER_CALIBRATION_PATH. '
+        'Usage: python manage.py calibrate_language_scorer [--dry-run] [--min-samples 30]'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--min-samples', type=int, default=30, help='Minimum number of usable interviews.')
+        parser.add_argument('--ridge', type=float, default=1.0, help='L2 regularisation strength of the fit.')
+        parser.add_argument('--dry-run', action='store_true', help='Report the fit without writing the calibration file.')
+
+    @staticmethod
+    def _fit(components, targets, ridge):
+        # Ridge regression with an unpenalised intercept: targets ~ intercept + components @ weights.
+        x = np.hstack([np.ones((len(components), 1)), components])
+        penalty = ridge * np.eye(x.shape[1])
+        penalty[0, 0] = 0.0
+        return np.linalg.solve(x.T @ x + penalty, x.T @ targets)
+
+    @staticmethod
+    def _predict(coefficients, components):
+        return np.clip(coefficients[0] + components @ coefficients[1:], 0, 100)
+
+    def handle(self, *args, **options):
+        interviews = MockInterviewResult.objects.filter(
+            status=MockInterviewResult.InterviewStatus.COMPLETED,
+            language_scoring_method='llm',
+            language_proficiency_score__gt=0,  # 0 is also what a failed LLM parse produced
+        ).only('id', 'language_proficiency_score', 'full_qa_transcript').prefetch_related('answers')
+
+        rows, targets = [], []
+        for interview in interviews.iterator(chunk_size=200):
+            extracted = language_scoring.extract_features([qa.get('answer', '') for qa in interview.qa_transcript()])
+            if extracted is None:
+                continue
+            rows.append([extracted['components'][k] for k in language_scoring.COMPONENTS])
+            targets.append(interview.language_proficiency_score)
+
+        if len(rows) < options['min_samples']:
+            raise CommandError(f"Only {len(rows)} usable LLM-scored interviews; need at least {options['min_samples']}.")
+
+        components, targets = np.array(rows, dtype=float), np.array(targets, dtype=float)
+        default = np.array([language_scoring.DEFAULT_WEIGHTS['intercept']]
+                           + [language_scoring.DEFAULT_WEIGHTS[k] for k in language_scoring.COMPONENTS])
+        coefficients = self._fit(components, targets, options['ridge'])
+
+        # 5-fold cross-validated error, so the report is not just the in-sample fit.
+        folds = np.arange(len(targets)) % 5
+        cv_errors = []
+        for fold in range(5):
+            train, test = folds != fold, folds == fold
+            fold_coefficients = self._fit(components[train], targets[train], options['ridge'])
+            cv_errors.extend(np.abs(self._predict(fold_coefficients, components[test]) - targets[test]))
+
+        report = {
+            'samples': len(targets),
+            'mae_default_weights': round(float(np.mean(np.abs(self._predict(default, components) - targets))), 2),
+            'mae_fitted_in_sample': round(float(np.mean(np.abs(self._predict(coefficients, components) - targets))), 2),
+            'mae_fitted_cross_validated': round(float(np.mean(cv_errors)), 2),
+        }
+        weights = {'intercept': round(float(coefficients[0]), 4)}
+        weights.update({k: round(float(c), 4) for k, c in zip(language_scoring.COMPONENTS, coefficients[1:])})
+        self.stdout.write(json.dumps({'weights': weights, **report}, indent=2))
+
+        if options['dry_run']:
+            return
+        path = settings.LANGUAGE_SCORER_CALIBRATION_PATH
+        with open(path, 'w') as f:
+            json.dump({'weights': weights, 'fitted_at': timezone.now().isoformat(), **report}, f, indent=2)
+        language_scoring.reset_calibration()
+        self.stdout.write(self.style.SUCCESS(f"Calibration written to {path}. Restart the workers to pick it up."))
@@ -0,0 +1,138 @@
+import json
+import os
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from utils1 import model_registry
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the ONNX Runtime vision backend (optionally int8) with the default torch/TensorFlow one: '
+        'phone-detection and face-match agreement, embedding distance drift, latency and model memory. '
+        'Usage: python manage.py compare_vision_backends path/to/frames --reference path/to/resume_photo.jpg --int8'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('images_dir', type=str, help='Directory of interview snapshots to run both backends on.')
+        parser.add_argument('--reference', type=str, default=None, help='Resume photo used for the face-match comparison.')
+        parser.add_argument('--int8', action='store_true', help='Also evaluate the int8-quantized ONNX models.')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+
+    def _run_backend(self, frames, reference):
+        import cv2
+        from interview_system.face_embeddings import compare_face_embeddings, compute_face_embedding_local
+        from interview_system.interview_cam import detect_object_labels
+
+        reference_embedding = compute_face_embedding_local(reference) if reference is not None else None
+        per_image, detect_ms, embed_ms = {}, [], []
+        for name, bgr_image in frames:
+            rgb_image = cv2.cvtColor(bgr_image, cv2.COLOR_BGR2RGB)
+            start = time.perf_counter()
+            labels = detect_object_labels([rgb_image])[0]
+            detect_ms.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            try:
+                embedding = compute_face_embedding_local(bgr_image)
+            except Exception:
+                embedding = None
+            embed_ms.append((time.perf_counter() - start) * 1000)
+
+            match = None
+            if reference_embedding is not None and embedding is not None:
+                match = compare_face_embeddings(reference_embedding, embedding)
+            per_image[name] = {'labels': labels, 'face_found': embedding is not None, 'match': match}
+
+        return {
+            'images': per_image,
+            'detect_ms_mean': round(statistics.mean(detect_ms), 1),
+            'detect_ms_p95': round(sorted(detect_ms)[min(len(detect_ms) - 1, int(len(detect_ms) * 0.95))], 1),
+            'embed_ms_mean': round(statistics.mean(embed_ms), 1),
+            'models': model_registry.model_stats(),
+        }
+
+    @staticmethod
+    def _agreement(baseline, candidate):
+        names = list(baseline['images'])
+        phone_agree, jaccards, match_agree, distance_drift = 0, [], [], []
+        for name in names:
+            base, cand = baseline['images'][name], candidate['images'][name]
+            phone_agree += ('cell phone' in base['labels']) == ('cell phone' in cand['labels'])
+            union = set(base['labels']) | set(cand['labels'])
+            jaccards.append(len(set(base['labels']) & set(cand['labels'])) / len(union) if union else 1.0)
+            if base['match'] and cand['match']:
+                match_agree.append(base['match']['match'] == cand['match']['match'])
+                distance_drift.append(abs(base['match']['distance'] - cand['match']['distance']))
+        return {
+            'phone_detection_agreement': round(phone_agree / len(names), 3),
+            'label_jaccard_mean': round(statistics.mean(jaccards), 3),
+            'face_found_agreement': round(sum(
+                baseline['images'][n]['face_found'] == candidate['images'][n]['face_found'] for n in names
+            ) / len(names), 3),
+            'face_match_agreement': round(sum(match_agree) / len(match_agree), 3) if match_agree else None,
+            'face_distance_drift_mean': round(statistics.mean(distance_drift), 4) if distance_drift else None,
+        }
+
+    def handle(self, *args, **options):
+        import cv2
+
+        images_dir = options['images_dir']
+        if not os.path.isdir(images_dir):
+            raise CommandError(f"Not a directory: {images_dir}")
+        frames = []
+        for filename in sorted(os.listdir(images_dir)):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                image = cv2.imread(os.path.join(images_dir, filename))
+                if image is not None:
+                    frames.append((filename, image))
+        if not frames:
+            raise CommandError(f"No readable images in {images_dir}")
+
+        reference = None
+        if options['reference']:
+            reference = cv2.imread(options['reference'])
+            if reference is None:
+                raise CommandError(f"Could not read reference photo {options['reference']}")
+
+        variants = [('default', {'VISION_INFERENCE_BACKEND': 'default'}),
+                    ('onnx', {'VISION_INFERENCE_BACKEND': 'onnx', 'ONNX_USE_INT8': False})]
+        if options['int8']:
+            variants.append(('onnx-int8', {'VISION_INFERENCE_BACKEND': 'onnx', 'ONNX_USE_INT8': True}))
+
+        results = {}
+        for label, overrides in variants:
+            # Fresh instances per variant so fp32 and int8 sessions are not shared.
+            for name in ('yolov5', 'arcface', 'yolov5_onnx', 'arcface_onnx'):
+                model_registry.unload_model(name)
+            with override_settings(**overrides):
+                try:
+                    results[label] = self._run_backend(frames, reference)
+                except Exception as e:
+                    raise CommandError(f"Backend '{label}' failed: {e}")
+
+        report = {'images': len(frames), 'backends': {}}
+        for label, result in results.items():
+            summary = {k: v for k, v in result.items() if k != 'images'}
+            if label != 'default':
+                summary.update(self._agreement(results['default'], result))
+            report['backends'][label] = summary
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(f"Compared {len(frames)} images.")
+        for label, summary in report['backends'].items():
+            self.stdout.write(self.style.SUCCESS(f"\n[{label}]"))
+            for key, value in summary.items():
+                if key == 'models':
+                    for model_name, stats in value.items():
+                        self.stdout.write(f"  model {model_name}: load {stats['load_seconds']}s, RSS +{stats['rss_delta_mb']} MB")
+                else:
+                    self.stdout.write(f"  {key}: {value}")
@@ -0,0 +1,70 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils1.startup_profiler import run_startup_profile, top_modules, top_packages
+
+
+class Command(BaseCommand):
+    help = (
+        'Profiles a cold Django start (setup() + URL resolution) in a fresh interpreter and reports '
+        'per-module import time and memory, with the top offenders. Usage: python manage.py profile_startup --top 25'
+    )
+    # The profile runs in a child process; checks here would only import everything up-front for nothing.
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Number of offenders to show (default: 20).')
+        parser.add_argument(
+            '--sort',
+            choices=['time', 'memory'],
+            default='time',
+            help='Rank offenders by import time or by RSS growth (default: time).'
+        )
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON.')
+
+    def handle(self, *args, **options):
+        try:
+            report = run_startup_profile(
+                settings_module=os.environ.get('DJANGO_SETTINGS_MODULE'),
+                base_dir=str(settings.BASE_DIR),
+            )
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        n = options['top']
+        by_memory = options['sort'] == 'memory'
+        budget = getattr(settings, 'STARTUP_TIME_BUDGET_SECONDS', None)
+        rss_budget = getattr(settings, 'STARTUP_RSS_BUDGET_MB', None)
+
+        total_style = self.style.ERROR if budget and report['total_seconds'] > budget else self.style.SUCCESS
+        self.stdout.write(total_style(
+            f"Cold start: {report['total_seconds']:.2f}s "
+            f"(setup {report['setup_seconds']:.2f}s + URL resolution {report['url_resolution_seconds']:.2f}s)"
+            + (f", budget {budget:.2f}s" if budget else "")
+        ))
+        if report['rss_end_mb'] is not None:
+            rss_style = self.style.ERROR if rss_budget and report['rss_end_mb'] > rss_budget else self.style.SUCCESS
+            self.stdout.write(rss_style(
+                f"RSS: {report['rss_start_mb']:.1f} MB -> {report['rss_end_mb']:.1f} MB"
+                + (f", budget {rss_budget:.1f} MB" if rss_budget else "")
+            ))
+        self.stdout.write(f"Modules imported: {len(report['modules'])}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nTop {n} packages by {'RSS growth' if by_memory else 'import time'} (self cost):"))
+        for p in top_packages(report, n=n, key='self_rss_mb' if by_memory else 'self_seconds'):
+            self.stdout.write(f"  {p['package']:<40} {p['seconds']:8.3f}s {p['rss_mb']:9.1f} MB  ({p['modules']} modules)")
+
+        key = 'cumulative_rss_mb' if by_memory else 'cumulative_seconds'
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\nTop {n} modules by cumulative {'RSS growth' if by_memory else 'import time'}:"))
+        for r in top_modules(report, n=n, key=key):
+            self.stdout.write(
+                f"  {r['module']:<60} {r['cumulative_seconds']:8.3f}s {r['cumulative_rss_mb']:9.1f} MB"
+                f"  (self {r['self_seconds']:.3f}s)"
+            )
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from employer_management import job_matches
+from employer_management.models import JobCandidateMatch, JobPosting, JobStatus
+
+
+class Command(BaseCommand):
+    help = (
+        'Recomputes the JobCandidateMatch table for every active, published job and drops the '
+        'rows of jobs that are no longer open. Run after deploying or changing JOB_MATCH_MIN_SCORE, '
+        'then `rebuild_job_recommendations`. '
+        'Usage: python manage.py rebuild_job_matches'
+    )
+
+    def handle(self, *args, **options):
+        open_jobs = JobPosting.objects.filter(is_active=True, status=JobStatus.PUBLISHED)
+        removed, _ = JobCandidateMatch.objects.exclude(job_posting__in=open_jobs).delete()
+
+        totals = [0, 0, 0]
+        job_ids = list(open_jobs.order_by('id').values_list('id', flat=True))
+        for job_id in job_ids:
+            for index, count in enumerate(job_matches.refresh_job_matches(job_id, refresh_feeds=False)):
+                totals[index] += count
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed matches of {len(job_ids)} jobs: {totals[2]} added, {totals[1]} updated, "
+            f"{totals[0] + removed} removed."
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from employer_management import job_recommendations
+from employer_management.models import JobCandidateMatch, JobRecommendation
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds the job recommendation feed of every talent with job matches and clears the feeds '
+        'of talents without any. Run nightly (e.g. from cron) so freshness boosts follow the age of '
+        'each posting, and after `rebuild_job_matches`. '
+        'Usage: python manage.py rebuild_job_recommendations'
+    )
+
+    def handle(self, *args, **options):
+        talent_ids = set(JobCandidateMatch.objects.values_list('talent_id', flat=True).distinct())
+        talent_ids |= set(JobRecommendation.objects.values_list('talent_id', flat=True).distinct())
+        entries = 0
+        for talent_id in sorted(talent_ids):
+            entries += job_recommendations.refresh_feed(talent_id)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt the recommendation feeds of {len(talent_ids)} talents ({entries} entries)."
+        ))
@@ -0,0 +1,49 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils1 import model_registry
+from utils1.inference_server import build_server
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs the local inference server that owns the interview models (Whisper, ArcFace, MediaPipe, YOLOv5). '
+        'Usage: python manage.py run_inference_server --socket /run/gatep/inference.sock  |  '
+        'python manage.py run_inference_server --port 8765'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', type=str, default=None, help='Unix socket path to listen on.')
+        parser.add_argument('--host', type=str, default='127.0.0.1', help='Host to bind when not using --socket.')
+        parser.add_argument('--port', type=int, default=8765, help='Port to bind when not using --socket.')
+        parser.add_argument('--no-warmup', action='store_true', help="Load models on first request instead of at startup.")
+
+    def handle(self, *args, **options):
+        if not options['no_warmup']:
+            report = model_registry.warmup(role='inference')
+            for name, stats in report.items():
+                if 'error' in stats:
+                    self.stdout.write(self.style.ERROR(f"{name}: FAILED - {stats['error']}"))
+                else:
+                    self.stdout.write(f"{name}: loaded in {stats['load_seconds']}s")
+
+        address = options['socket'] or (options['host'], options['port'])
+        try:
+            server = build_server(
+                address,
+                max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+                batch_window_ms=settings.INFERENCE_BATCH_WINDOW_MS,
+                max_queue_depth=settings.INFERENCE_MAX_QUEUE_DEPTH,
+                request_timeout=settings.INFERENCE_REQUEST_TIMEOUT_SECONDS,
+            )
+        except OSError as e:
+            raise CommandError(f"Could not bind inference server to {address}: {e}")
+
+        where = f"unix://{address}" if options['socket'] else f"http://{address[0]}:{address[1]}"
+        self.stdout.write(self.style.SUCCESS(f"Inference server listening on {where} (tasks: {', '.join(server.batchers)})"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
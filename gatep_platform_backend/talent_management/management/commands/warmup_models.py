@@ -0,0 +1,60 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils1 import model_registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Pre-loads ML models into this process and reports load time and RSS per model. '
+        'Usage: python manage.py warmup_models --role interview  |  python manage.py warmup_models whisper yolov5'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            type=str,
+            help='Model names to load (see --list). Overrides --role when given.'
+        )
+        parser.add_argument(
+            '--role',
+            type=str,
+            default=None,
+            help='Process role from settings.MODEL_WARMUP_ROLES (defaults to GATEP_PROCESS_ROLE).'
+        )
+        parser.add_argument('--list', action='store_true', help='List registered models and roles, then exit.')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            self.stdout.write(f"Registered models: {', '.join(model_registry.registered_models())}")
+            for role, names in settings.MODEL_WARMUP_ROLES.items():
+                self.stdout.write(f"  {role}: {', '.join(names) if names else '(none)'}")
+            return
+
+        names = options['models'] or None
+        role = options['role'] or settings.GATEP_PROCESS_ROLE
+        try:
+            report = model_registry.warmup(names=names, role=None if names else role)
+        except KeyError as e:
+            raise CommandError(str(e))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        if not report:
+            self.stdout.write(self.style.WARNING(f"No models configured for role '{role}'."))
+            return
+
+        for name, stats in report.items():
+            if 'error' in stats:
+                self.stdout.write(self.style.ERROR(f"{name}: FAILED - {stats['error']}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{name}: loaded in {stats['load_seconds']}s, "
+                    f"RSS +{stats['rss_delta_mb']} MB (total {stats['rss_after_mb']} MB)"
+                ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0026_alter_resume_employee_level'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='profile_photo_embedding',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='profile_photo_embedding_model',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='profile_photo_embedding_source',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='profile_photo_embedding_updated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
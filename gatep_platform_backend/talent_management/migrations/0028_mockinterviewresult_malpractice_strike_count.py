@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0027_resume_profile_photo_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mockinterviewresult',
+            name='malpractice_strike_count',
+            field=models.IntegerField(default=0, verbose_name='Malpractice Strike Count'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0028_mockinterviewresult_malpractice_strike_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MockInterviewAnswer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField(verbose_name='Answer Sequence Number')),
+                ('round_name', models.CharField(max_length=255, verbose_name='Round / Stage')),
+                ('question_text', models.TextField(verbose_name='Question')),
+                ('speak_text', models.TextField(blank=True, default='', verbose_name='Spoken Question')),
+                ('answer', models.TextField(blank=True, default='', verbose_name='Answer')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('mock_interview', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='talent_management.mockinterviewresult')),
+            ],
+            options={
+                'verbose_name': 'Mock Interview Answer',
+                'verbose_name_plural': 'Mock Interview Answers',
+                'ordering': ['mock_interview', 'sequence'],
+                'indexes': [models.Index(fields=['mock_interview', 'round_name'], name='mock_answer_round_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mock_interview', 'sequence'), name='unique_mock_interview_answer_sequence')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 09:59
+
+from django.db import migrations, models
+
+
+def mark_existing_scores_as_llm(apps, schema_editor):
+    # Every language score stored before this migration came from the LLM.
+    MockInterviewResult = apps.get_model('talent_management', 'MockInterviewResult')
+    MockInterviewResult.objects.filter(status='COMPLETED').update(language_scoring_method='llm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0029_mockinterviewanswer'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mockinterviewresult',
+            name='language_scoring_method',
+            field=models.CharField(blank=True, default='', max_length=10, verbose_name='Language Scoring Method'),
+        ),
+        migrations.RunPython(mark_existing_scores_as_llm, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0030_mockinterviewresult_language_scoring_method'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mockinterviewresult',
+            name='scoring_mode',
+            field=models.CharField(choices=[('per_round', 'Per Round'), ('batch', 'Batch (Assessment)')], default='per_round', max_length=20, verbose_name='Scoring Mode'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.3 on 2026-10-19 10:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0031_mockinterviewresult_scoring_mode'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Skill Name')),
+                ('normalized_name', models.CharField(max_length=100, unique=True, verbose_name='Normalized Name')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Skill',
+                'verbose_name_plural': 'Skills',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True, verbose_name='Alias')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='talent_management.skill')),
+            ],
+            options={
+                'verbose_name': 'Skill Alias',
+                'verbose_name_plural': 'Skill Aliases',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='talent_management.resume')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_skills', to='talent_management.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'resume'], name='resumeskill_skill_resume_idx')],
+                'constraints': [models.UniqueConstraint(fields=('resume', 'skill'), name='unique_resume_skill')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobListingSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_skills', to='talent_management.joblisting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listing_skills', to='talent_management.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['skill', 'job_listing'], name='listingskill_skill_listing_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job_listing', 'skill'), name='unique_job_listing_skill')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-19 11:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0033_resume_text_embedding'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['current_city'], name='resume_current_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['employee_level', 'is_fresher'], name='resume_level_fresher_idx'),
+        ),
+    ]
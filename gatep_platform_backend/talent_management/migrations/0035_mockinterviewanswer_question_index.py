@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0034_resume_search_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mockinterviewanswer',
+            name='question_index',
+            field=models.PositiveIntegerField(blank=True, null=True, verbose_name='Question Index'),
+        ),
+        migrations.AddConstraint(
+            model_name='mockinterviewanswer',
+            constraint=models.UniqueConstraint(fields=('mock_interview', 'round_name', 'question_index'), name='unique_mock_interview_answer_question'),
+        ),
+    ]
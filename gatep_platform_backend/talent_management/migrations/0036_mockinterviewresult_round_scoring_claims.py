@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0035_mockinterviewanswer_question_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mockinterviewresult',
+            name='round_scoring_claims',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Round Scoring Claims'),
+        ),
+    ]
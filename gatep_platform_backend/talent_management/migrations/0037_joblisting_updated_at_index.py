@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('talent_management', '0036_mockinterviewresult_round_scoring_claims'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='joblisting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True, verbose_name='Last Updated Timestamp'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.utils.translation import gettext_lazy as _
 from django.utils import timezone
+import copy
 import random
 import string
 from decimal import Decimal # Import for DecimalField
@@ -51,6 +52,24 @@ class CustomUser(AbstractUser):
         return f"{self.username} ({self.user_role})"
     
 
+# --- SKILL SYNC HELPERS ---
+# Resume, JobListing and employer_management.JobPosting keep their free-text skills in
+# one field and mirror them into a skill join table on save (see skill_taxonomy.py).
+# The value last mirrored is remembered on the instance so unrelated saves skip the sync.
+def remember_synced_skills(instance, field_name):
+    # A copy, so in-place edits of a JSON list still count as a change.
+    instance._synced_skills = copy.deepcopy(instance.__dict__.get(field_name))
+    return instance
+
+
+def skills_field_changed(instance, field_name, update_fields):
+    if field_name in instance.get_deferred_fields():
+        return False
+    if update_fields is not None and field_name not in update_fields:
+        return False
+    return getattr(instance, '_synced_skills', None) != getattr(instance, field_name)
+
+
 # --- PROFILES ---
 class TalentProfile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, primary_key=True)
@@ -148,6 +167,23 @@ class Resume(models.Model):
     profile_photo = models.ImageField(upload_to='profile_photos/', blank=True, null=True)
     resume_pdf = models.FileField(upload_to='resumes/', blank=True, null=True)
 
+    # Reference face embedding of profile_photo, used by the interview photo check.
+    # Computed once per uploaded photo (see interview_system/face_embeddings.py);
+    # `profile_photo_embedding_source` is the photo file it was computed from and
+    # `profile_photo_embedding_model` the model/detector/version tag.
+    profile_photo_embedding = models.JSONField(blank=True, null=True)
+    profile_photo_embedding_model = models.CharField(max_length=100, blank=True, default="")
+    profile_photo_embedding_source = models.CharField(max_length=255, blank=True, default="")
+    profile_photo_embedding_updated_at = models.DateTimeField(blank=True, null=True)
+
+    # MiniLM embedding of the resume text for semantic job matching (float32 bytes,
+    # see employer_management/semantic_matching.py). `text_embedding_source` is a hash
+    # of the embedded text, so the embedding is only recomputed when the text changes.
+    text_embedding = models.BinaryField(blank=True, null=True)
+    text_embedding_model = models.CharField(max_length=100, blank=True, default="")
+    text_embedding_source = models.CharField(max_length=64, blank=True, default="")
+    text_embedding_updated_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
     # Summaries & Preferences 
     summary = models.TextField(blank=True, default="")
     generated_summary = models.TextField(blank=True, default="")
@@ -231,12 +267,37 @@ class Resume(models.Model):
     current_country = models.CharField(max_length=100, blank=True, default="")
     permanent_country = models.CharField(max_length=100, blank=True, default="")
     
+    def save(self, *args, **kwargs):
+        # Drop the stored face embedding as soon as the photo changes so a stale
+        # reference is never compared against; it is recomputed for the new photo.
+        photo_name = self.profile_photo.name if self.profile_photo else ""
+        if self.profile_photo_embedding_source and self.profile_photo_embedding_source != photo_name:
+            self.profile_photo_embedding = None
+            self.profile_photo_embedding_model = ""
+            self.profile_photo_embedding_source = ""
+            self.profile_photo_embedding_updated_at = None
+        super().save(*args, **kwargs)
+        if skills_field_changed(self, 'skills', kwargs.get('update_fields')):
+            from .skill_taxonomy import sync_resume_skills
+            sync_resume_skills(self)
+        from utils1.match_engine import notify_talent_changed
+        notify_talent_changed(self.talent_id_id)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        return remember_synced_skills(super().from_db(db, field_names, values), 'skills')
+
     def __str__(self):
         return f"{self.name} ({self.email})"
 
     class Meta:
         verbose_name = "Resume"
         verbose_name_plural = "Resumes"
+        # Structured filters of the employer talent search (employer_management/talent_search.py).
+        indexes = [
+            models.Index(fields=['current_city'], name='resume_current_city_idx'),
+            models.Index(fields=['employee_level', 'is_fresher'], name='resume_level_fresher_idx'),
+        ]
 
 # --- JOB LISTING (NEW MODEL) ---
 class JobListing(models.Model):
@@ -348,16 +409,93 @@ class JobListing(models.Model):
 
     # Timestamps (Django's auto-managed)
     created_at = models.DateTimeField(auto_now_add=True, verbose_name=_('Creation Timestamp'))
-    updated_at = models.DateTimeField(auto_now=True, verbose_name=_('Last Updated Timestamp'))
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name=_('Last Updated Timestamp'))
 
     class Meta:
         verbose_name = _('Job Listing')
         verbose_name_plural = _('Job Listings')
         ordering = ['-created_at'] # Order by creation date descending
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        if skills_field_changed(self, 'requirements', kwargs.get('update_fields')):
+            from .skill_taxonomy import sync_job_listing_skills
+            sync_job_listing_skills(self)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        return remember_synced_skills(super().from_db(db, field_names, values), 'requirements')
+
     def __str__(self):
         return f"{self.title} at {self.company_name} ({self.status})"
-    
+
+
+# --- SKILL TAXONOMY ---
+class Skill(models.Model):
+    """A canonical skill. Every spelling that maps to it is a SkillAlias."""
+    name = models.CharField(max_length=100, verbose_name=_('Skill Name'))
+    normalized_name = models.CharField(max_length=100, unique=True, verbose_name=_('Normalized Name'))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Skill')
+        verbose_name_plural = _('Skills')
+        ordering = ['name']
+
+    def save(self, *args, **kwargs):
+        if not self.normalized_name:
+            from .skill_taxonomy import normalize_skill_name
+            self.normalized_name = normalize_skill_name(self.name)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """A normalized spelling or synonym of a skill ("ml" -> Machine Learning)."""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+    alias = models.CharField(max_length=100, unique=True, verbose_name=_('Alias'))
+
+    class Meta:
+        verbose_name = _('Skill Alias')
+        verbose_name_plural = _('Skill Aliases')
+
+    def save(self, *args, **kwargs):
+        from .skill_taxonomy import normalize_skill_name
+        self.alias = normalize_skill_name(self.alias)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
+class ResumeSkill(models.Model):
+    """Resume.skills resolved to the taxonomy, kept in sync by Resume.save()."""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='resume_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='resume_skills')
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['resume', 'skill'], name='unique_resume_skill')]
+        indexes = [models.Index(fields=['skill', 'resume'], name='resumeskill_skill_resume_idx')]
+
+    def __str__(self):
+        return f"{self.resume_id}: {self.skill_id}"
+
+
+class JobListingSkill(models.Model):
+    """Known skills mentioned in JobListing.requirements, kept in sync by JobListing.save()."""
+    job_listing = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='listing_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='listing_skills')
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['job_listing', 'skill'], name='unique_job_listing_skill')]
+        indexes = [models.Index(fields=['skill', 'job_listing'], name='listingskill_skill_listing_idx')]
+
+    def __str__(self):
+        return f"{self.job_listing_id}: {self.skill_id}"
+
+
 class ResumeDocument(models.Model):
     """
     Stores various documents and certificates associated with a Talent's user profile.
@@ -454,14 +592,20 @@ class MockInterviewResult(models.Model):
     # Malpractice Tracking
     malpractice_detected = models.BooleanField(default=False, verbose_name=_('Malpractice Detected'))
     malpractice_reason = models.TextField(blank=True, null=True, verbose_name=_('Malpractice Reason'))
+    malpractice_strike_count = models.IntegerField(default=0, verbose_name=_('Malpractice Strike Count'))
     
     # Scores
     global_readiness_score = models.IntegerField(default=0, verbose_name=_('Global Readiness Score'))
     language_proficiency_score = models.IntegerField(default=0, verbose_name=_('Language Proficiency Score'))
     language_analysis = models.TextField(blank=True, null=True, verbose_name=_('Language Analysis'))
+    # 'llm' or 'local' (interview_bot/language_scoring.py); the LLM scores calibrate the local scorer.
+    language_scoring_method = models.CharField(max_length=10, blank=True, default='', verbose_name=_('Language Scoring Method'))
     
     # Detailed round-wise analysis (JSONField to store the structure from the bot)
     round_analysis_json = models.JSONField(default=dict, blank=True, null=True, verbose_name=_('Detailed Round Analysis (JSON)'))
+    # Rounds whose scoring a worker has claimed: {round name: claim time (epoch seconds)}
+    # (talent_management/interview_session.py).
+    round_scoring_claims = models.JSONField(default=dict, blank=True, verbose_name=_('Round Scoring Claims'))
 
     # Interview Status
     class InterviewStatus(models.TextChoices):
@@ -478,6 +622,19 @@ class MockInterviewResult(models.Model):
         verbose_name=_('Interview Status')
     )
 
+    # How rounds are scored: after each round in the background, or all at the end in
+    # as few LLM calls as possible (non-interactive assessment mode).
+    class ScoringMode(models.TextChoices):
+        PER_ROUND = 'per_round', _('Per Round')
+        BATCH = 'batch', _('Batch (Assessment)')
+
+    scoring_mode = models.CharField(
+        max_length=20,
+        choices=ScoringMode.choices,
+        default=ScoringMode.PER_ROUND,
+        verbose_name=_('Scoring Mode')
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -489,6 +646,74 @@ class MockInterviewResult(models.Model):
     def __str__(self):
         return f"Mock Interview for {self.user.username} ({self.position_applied}) - {self.status}"
 
+    def qa_transcript(self, round_name=None, last=None):
+        """
+        Q&A pairs in answer order, assembled from the MockInterviewAnswer rows.
+        `round_name` limits it to one round / sub-round / coding stage, `last` to the
+        most recent answers. Interviews recorded before the answer table existed
+        fall back to the full_qa_transcript JSON. Uses prefetch_related('answers')
+        when present, so listing interviews costs one query for all their answers.
+        """
+        prefetched = getattr(self, '_prefetched_objects_cache', {}).get('answers')
+        if prefetched is not None:
+            rows = sorted(
+                (row for row in prefetched if round_name is None or row.round_name == round_name),
+                key=lambda row: row.sequence,
+            )
+            if last is not None:
+                rows = rows[-last:] if last else []
+        else:
+            answers = self.answers.all()
+            if round_name is not None:
+                answers = answers.filter(round_name=round_name)
+            if last is not None:
+                rows = list(answers.order_by('-sequence')[:last])[::-1]
+            else:
+                rows = list(answers.order_by('sequence'))
+        if rows or round_name is not None:
+            return [row.as_qa_pair() for row in rows]
+
+        legacy = self.full_qa_transcript or []
+        return legacy[-last:] if last else list(legacy)
+
+
+class MockInterviewAnswer(models.Model):
+    """
+    One answered question of a mock interview. Rows are only ever appended, so
+    recording an answer costs one INSERT however long the interview gets. A question
+    (round + question index) is answered at most once, so a resubmitted answer is a no-op.
+    """
+    mock_interview = models.ForeignKey(MockInterviewResult, on_delete=models.CASCADE, related_name='answers')
+    sequence = models.PositiveIntegerField(verbose_name=_('Answer Sequence Number'))
+    round_name = models.CharField(max_length=255, verbose_name=_('Round / Stage'))
+    # Position of the question within its round; null for answers recorded before it was tracked.
+    question_index = models.PositiveIntegerField(null=True, blank=True, verbose_name=_('Question Index'))
+    question_text = models.TextField(verbose_name=_('Question'))
+    speak_text = models.TextField(blank=True, default='', verbose_name=_('Spoken Question'))
+    answer = models.TextField(blank=True, default='', verbose_name=_('Answer'))
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Mock Interview Answer')
+        verbose_name_plural = _('Mock Interview Answers')
+        ordering = ['mock_interview', 'sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['mock_interview', 'sequence'], name='unique_mock_interview_answer_sequence'),
+            models.UniqueConstraint(
+                fields=['mock_interview', 'round_name', 'question_index'], name='unique_mock_interview_answer_question'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['mock_interview', 'round_name'], name='mock_answer_round_idx'),
+        ]
+
+    def __str__(self):
+        return f"Answer {self.sequence} of interview {self.mock_interview_id} ({self.round_name})"
+
+    def as_qa_pair(self):
+        """Same shape as AIInterviewer.all_interview_answers entries."""
+        return {"question_text": self.question_text, "speak_text": self.speak_text, "answer": self.answer}
+
 
 
 
@@ -0,0 +1,191 @@
+# talent_management/proctoring_state.py
+"""
+Per-interview proctoring state.
+
+Replaces the process-global `malpractice_status.txt` / `identity_verified.txt`
+files: every mock interview gets its own keys in the "proctoring" cache
+(settings.CACHES), so concurrent interviews never see each other's state and
+the submit-answer path only needs one in-memory cache read.
+
+All updates are atomic cache operations:
+  * strikes are counted with `incr`,
+  * termination uses `add`, so the first reason wins when several workers
+    detect malpractice at the same time.
+
+A termination is also pushed to the interview's WebSocket group (see
+talent_management/consumers.py), so an open interview channel closes at once.
+
+The database is updated write-behind: termination and strike counts are
+persisted to MockInterviewResult from a background thread, so the request that
+triggered them does not wait on the write. Status strings keep the values the
+old status file used ("NOT_STARTED", "ACTIVE", "TERMINATED_<reason>").
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .interview_bot import config
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = "proctoring"
+# Long enough to outlive any interview; the state is cleared when it ends.
+STATE_TIMEOUT_SECONDS = 6 * 60 * 60
+
+STATUS_NOT_STARTED = "NOT_STARTED"
+STATUS_ACTIVE = "ACTIVE"
+
+# A single worker keeps the write-behind updates for an interview in order.
+_WRITE_BEHIND = ThreadPoolExecutor(max_workers=1, thread_name_prefix="proctoring-write-behind")
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """The state must be shared by every worker; settings fall back to locmem so dev commands still run."""
+    hint = "Set REDIS_URL, or PROCTORING_CACHE=database and run `python manage.py createcachetable`."
+    if settings.PROCTORING_CACHE not in ("redis", "database") or (settings.PROCTORING_CACHE == "redis" and not settings.REDIS_URL):
+        return [checks.Error(
+            f"The proctoring cache ({settings.PROCTORING_CACHE!r}) is not shared between workers, so "
+            "strikes and terminations would be lost.",
+            hint=hint, id="talent_management.E001",
+        )]
+    return []
+
+
+def _key(interview_id, name):
+    return f"proctor:{interview_id}:{name}"
+
+
+def _persist(interview_id, **fields):
+    """Writes fields to the MockInterviewResult row (runs on the write-behind thread)."""
+    from .models import MockInterviewResult
+    try:
+        MockInterviewResult.objects.filter(pk=interview_id).update(**fields)
+    except Exception as e:
+        logger.exception("Proctoring write-behind failed for interview %s: %s", interview_id, e)
+    finally:
+        close_old_connections()
+
+
+def _write_behind(interview_id, **fields):
+    return _WRITE_BEHIND.submit(_persist, interview_id, **fields)
+
+
+def _notify_channel(interview_id, reason):
+    """Tells an open interview WebSocket in this process that the interview was terminated."""
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+        from .consumers import interview_group_name
+
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(channel_layer.group_send)(
+                interview_group_name(interview_id), {"type": "interview.terminated", "reason": reason}
+            )
+    except Exception as e:
+        logger.warning("Could not notify the interview channel of %s: %s", interview_id, e)
+
+
+def flush():
+    """Blocks until every queued write-behind update has been written (used by tests and shutdown)."""
+    _WRITE_BEHIND.submit(lambda: None).result()
+
+
+def start(interview_id):
+    """Resets the state for a new interview."""
+    cache = _cache()
+    cache.delete_many([_key(interview_id, n) for n in ("terminated", "strikes", "identity_verified", "frame_sampler")])
+    cache.set(_key(interview_id, "status"), STATUS_ACTIVE, STATE_TIMEOUT_SECONDS)
+    cache.set(_key(interview_id, "strikes"), 0, STATE_TIMEOUT_SECONDS)
+
+
+def get_status(interview_id):
+    """Returns the current status string: ACTIVE, NOT_STARTED or TERMINATED_<reason>."""
+    cache = _cache()
+    values = cache.get_many([_key(interview_id, "terminated"), _key(interview_id, "status")])
+    return values.get(_key(interview_id, "terminated")) or values.get(_key(interview_id, "status"), STATUS_NOT_STARTED)
+
+
+def is_terminated(interview_id):
+    status = get_status(interview_id)
+    return status.startswith("TERMINATED") and status != "TERMINATED_NORMAL_EXIT"
+
+
+def terminate(interview_id, reason, status=None):
+    """
+    Marks the interview as terminated for malpractice. Only the first call wins;
+    returns True if this call terminated it. The MockInterviewResult row is updated
+    write-behind with `status` (defaults to TERMINATED_MALPRACTICE).
+    """
+    from .models import MockInterviewResult
+
+    terminated = _cache().add(_key(interview_id, "terminated"), f"TERMINATED_{reason}", STATE_TIMEOUT_SECONDS)
+    if terminated:
+        _write_behind(
+            interview_id,
+            malpractice_detected=True,
+            malpractice_reason=reason,
+            status=status or MockInterviewResult.InterviewStatus.TERMINATED_MALPRACTICE,
+            interview_end_time=timezone.now(),
+        )
+        _notify_channel(interview_id, reason)
+    return terminated
+
+
+def record_strike(interview_id, reason=None):
+    """
+    Atomically counts one proctoring violation and returns the new count.
+    Terminates the interview once config.MALPRACTICE_STRIKES_LIMIT is reached.
+    """
+    cache = _cache()
+    key = _key(interview_id, "strikes")
+    try:
+        strikes = cache.incr(key)
+    except ValueError:
+        # Key expired or was never initialised; add() keeps this race-free.
+        if not cache.add(key, 1, STATE_TIMEOUT_SECONDS):
+            strikes = cache.incr(key)
+        else:
+            strikes = 1
+
+    _write_behind(interview_id, malpractice_strike_count=strikes)
+    if strikes >= config.MALPRACTICE_STRIKES_LIMIT:
+        terminate(interview_id, reason or f"{strikes} proctoring violations")
+    return strikes
+
+
+def get_strikes(interview_id):
+    return _cache().get(_key(interview_id, "strikes"), 0)
+
+
+def set_identity_verified(interview_id, verified):
+    _cache().set(_key(interview_id, "identity_verified"), bool(verified), STATE_TIMEOUT_SECONDS)
+
+
+def is_identity_verified(interview_id):
+    return _cache().get(_key(interview_id, "identity_verified"), False)
+
+
+def get_frame_sampler_state(interview_id):
+    """Adaptive sampling state of the batched frame ingest (interview_system/frame_ingest.py), or None."""
+    return _cache().get(_key(interview_id, "frame_sampler"))
+
+
+def set_frame_sampler_state(interview_id, state):
+    _cache().set(_key(interview_id, "frame_sampler"), state, STATE_TIMEOUT_SECONDS)
+
+
+def clear(interview_id):
+    """Drops all state for an interview once it has ended."""
+    _cache().delete_many([_key(interview_id, n) for n in ("status", "terminated", "strikes", "identity_verified", "frame_sampler")])
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .consumers import MockInterviewConsumer
+
+websocket_urlpatterns = [
+    path('ws/mock-interview/<int:interview_id>/', MockInterviewConsumer.as_asgi()),
+]
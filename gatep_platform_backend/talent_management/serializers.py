@@ -203,6 +203,16 @@ from .models import MockInterviewResult # ADD THIS IMPORT
 
 class MockInterviewResultSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username') # Display username instead of user ID
+    # Assembled from the per-answer rows, so it is also complete while the interview is in progress.
+    # Serialize lists from a queryset with prefetch_related('answers'), or this is one query per interview.
+    full_qa_transcript = serializers.SerializerMethodField()
+    pre_generated_questions_data = serializers.SerializerMethodField()
+
+    # Per-question grading data kept with the generated questions (reference answers and
+    # their embeddings, sandbox ground truth). Never sent while the interview is running;
+    # the embedding vectors are never sent at all.
+    EMBEDDING_KEYS = ('reference_embedding', 'question_embedding')
+    GRADING_KEYS = ('reference_answer', 'expected_output', 'function_name', 'test_cases')
 
     class Meta:
         model = MockInterviewResult
@@ -217,7 +227,7 @@ class MockInterviewResultSerializer(serializers.ModelSerializer):
             'technical_specialization_scores', # NEW: Include this field
             'pre_generated_questions_data', # NEW: Include this field
             'full_qa_transcript', # NEW: Include this field
-            'round_analysis_json', 'status', 'created_at', 'updated_at'
+            'round_analysis_json', 'status', 'scoring_mode', 'created_at', 'updated_at'
         ]
         read_only_fields = [
             'user', 'interview_start_time', 'interview_end_time',
@@ -225,9 +235,26 @@ class MockInterviewResultSerializer(serializers.ModelSerializer):
             'global_readiness_score', 'language_proficiency_score',
             'communication_overall_score', 'psychometric_overall_score',
             'technical_specialization_scores', 'pre_generated_questions_data',
-            'full_qa_transcript', 'round_analysis_json', 'status', 'created_at', 'updated_at'
+            'full_qa_transcript', 'round_analysis_json', 'status', 'scoring_mode', 'created_at', 'updated_at'
         ]
 
+    def get_full_qa_transcript(self, obj):
+        return obj.qa_transcript()
+
+    def get_pre_generated_questions_data(self, obj):
+        hidden = self.EMBEDDING_KEYS
+        if obj.status == MockInterviewResult.InterviewStatus.IN_PROGRESS:
+            hidden += self.GRADING_KEYS
+
+        def strip(value):
+            if isinstance(value, dict):
+                return {k: strip(v) for k, v in value.items() if k not in hidden}
+            if isinstance(value, list):
+                return [strip(v) for v in value]
+            return value
+
+        return strip(obj.pre_generated_questions_data)
+
 
 
 
@@ -57,4 +57,37 @@ class BeaconTokenAuthentication(JWTAuthentication):
         # If no token was found in the query parameter, proceed with the default
         # authentication method (which checks the Authorization header).
         # The `super().authenticate(request)` call handles the header-based logic.
-        return super().authenticate(request)
\ No newline at end of file
+        return super().authenticate(request)
+
+
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+
+
+class QueryStringJWTAuthMiddleware(BaseMiddleware):
+    """
+    Channels middleware that authenticates a WebSocket from a JWT access token in
+    the 'auth_token' query parameter (browsers cannot set an Authorization header
+    on a WebSocket). Same parameter name as BeaconTokenAuthentication.
+
+    Without the parameter the user set by AuthMiddlewareStack (session cookie)
+    is kept; an invalid token yields AnonymousUser.
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        token = query.get("auth_token", [None])[0]
+        if token:
+            scope = dict(scope, user=await database_sync_to_async(self._get_user)(token))
+        return await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def _get_user(raw_token):
+        authentication = JWTAuthentication()
+        try:
+            return authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return AnonymousUser()
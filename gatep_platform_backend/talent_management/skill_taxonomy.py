@@ -0,0 +1,311 @@
+# talent_management/skill_taxonomy.py
+"""
+Canonical skill taxonomy.
+
+Skills are entered as free text: Resume.skills (a JSON list or comma-separated
+text), JobPosting.required_skills (a JSON list) and JobListing.requirements
+(prose). This module maps them onto the Skill table:
+
+  * every spelling of a skill ("ML", "machine-learning", "Machine Learning") is a
+    SkillAlias row pointing at one Skill, so resolving names is one indexed lookup,
+  * ResumeSkill, JobSkill and JobListingSkill rows are rewritten by the models'
+    save() whenever the source field changes, so matching and analytics join on
+    skill ids instead of parsing text,
+  * migration employer_management 0015 seeds the built-in synonyms below and fills
+    the join tables for the rows that existed before them; `python manage.py
+    backfill_skills` does the same again (e.g. after editing the synonyms).
+
+Names listed on resumes and job postings that are not in the taxonomy become new
+skills. Job listing requirements are prose, so only skills that already exist are
+picked out of them.
+"""
+
+import json
+import re
+import unicodedata
+
+from django.db import transaction
+
+from .models import JobListingSkill, ResumeSkill, Skill, SkillAlias, remember_synced_skills
+
+MAX_SKILL_NAME_LENGTH = 100
+MAX_TEXT_NGRAM = 4          # longest alias looked up in free text, in words
+_LOOKUP_CHUNK = 1000        # aliases per IN (...) query
+
+# Canonical name -> synonyms. Seeded by `backfill_skills`; more can be added in the admin.
+DEFAULT_SKILL_ALIASES = {
+    "Machine Learning": ["ML", "machine-learning"],
+    "Deep Learning": ["DL"],
+    "Artificial Intelligence": ["AI"],
+    "Natural Language Processing": ["NLP"],
+    "Computer Vision": ["CV"],
+    "Large Language Models": ["LLM", "LLMs"],
+    "Generative AI": ["GenAI", "Gen AI"],
+    "Reinforcement Learning": ["RL"],
+    "Data Science": [],
+    "Python": ["Python3", "Python 3"],
+    "JavaScript": ["JS", "ECMAScript"],
+    "TypeScript": ["TS"],
+    "C++": ["CPP"],
+    "C#": ["C Sharp", "CSharp"],
+    "Go": ["Golang"],
+    "Node.js": ["Node", "NodeJS"],
+    "React": ["React.js", "ReactJS"],
+    "Vue.js": ["Vue", "VueJS"],
+    "Angular": ["AngularJS", "Angular.js"],
+    "Django": [],
+    "TensorFlow": ["TF", "tensorflow2"],
+    "PyTorch": ["Torch"],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "SQL": [],
+    "PostgreSQL": ["Postgres", "psql"],
+    "MySQL": [],
+    "MongoDB": ["Mongo"],
+    "Amazon Web Services": ["AWS"],
+    "Google Cloud Platform": ["GCP", "Google Cloud"],
+    "Microsoft Azure": ["Azure"],
+    "Kubernetes": ["K8s"],
+    "Docker": [],
+    "CI/CD": ["CICD", "CI CD", "Continuous Integration"],
+    "Git": [],
+    "MLOps": ["ML Ops"],
+    "Power BI": ["PowerBI"],
+    "Microsoft Excel": ["Excel", "MS Excel"],
+}
+
+_LIST_SPLIT_RE = re.compile(r"[,;|\n•]")
+_SEPARATOR_RE = re.compile(r"(?<=\w)[-_](?=\w)")
+_TEXT_TOKEN_RE = re.compile(r"[a-z0-9.+#]*[a-z0-9+#]", re.IGNORECASE)
+# Skill names that are also everyday words; in prose they only count when capitalised.
+_COMMON_WORD_SKILLS = {"go", "node", "react", "excel", "torch", "vue", "angular", "swift", "rust", "spark", "flask"}
+
+
+def normalize_skill_name(name):
+    """Lookup form of a skill name: case, width, spacing and word separators folded."""
+    text = unicodedata.normalize("NFKC", str(name or "")).lower()
+    text = _SEPARATOR_RE.sub(" ", text)
+    text = re.sub(r"\s+", " ", text)
+    return text.strip(" ,;:!?'\"`()[]{}*-").rstrip(".")
+
+
+def _flatten(value):
+    if isinstance(value, str):
+        yield from _LIST_SPLIT_RE.split(value)
+    elif isinstance(value, dict):
+        name = value.get("name") or value.get("skill")
+        if isinstance(name, str):
+            yield name
+        else:
+            for item in value.values():
+                yield from _flatten(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            yield from _flatten(item)
+
+
+def parse_skill_list(value):
+    """
+    Returns the skill names in a stored skills value: a JSON list (of strings or
+    {"name": ...} dicts), comma/semicolon/newline-separated text or a Python list.
+    Duplicates (after normalization) are dropped, keeping the first spelling.
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return []
+        try:
+            value = json.loads(text)
+        except ValueError:
+            value = text
+
+    names, seen = [], set()
+    for name in _flatten(value):
+        name = name.strip().strip("\"'")
+        key = normalize_skill_name(name)
+        if key and key not in seen:
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def _alias_map(keys):
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), _LOOKUP_CHUNK):
+        found.update(SkillAlias.objects.filter(alias__in=keys[start:start + _LOOKUP_CHUNK]).values_list("alias", "skill_id"))
+    return found
+
+
+def resolve_skills(names, create=True):
+    """
+    Maps skill names to Skill ids. Returns [(skill_id, name)] in input order with
+    one entry per skill. Unknown names become new skills when `create` is true and
+    are dropped otherwise.
+    """
+    wanted = {}
+    for name in names:
+        key = normalize_skill_name(name)
+        if key and len(key) <= MAX_SKILL_NAME_LENGTH:
+            wanted.setdefault(key, name.strip())
+    if not wanted:
+        return []
+
+    alias_map = _alias_map(wanted)
+    missing = [key for key in wanted if key not in alias_map]
+    if missing and create:
+        # ignore_conflicts: a concurrent save may create the same skill first.
+        Skill.objects.bulk_create(
+            [Skill(name=wanted[key][:MAX_SKILL_NAME_LENGTH], normalized_name=key) for key in missing],
+            ignore_conflicts=True,
+        )
+        created = dict(Skill.objects.filter(normalized_name__in=missing).values_list("normalized_name", "id"))
+        SkillAlias.objects.bulk_create(
+            [SkillAlias(alias=key, skill_id=created[key]) for key in missing if key in created],
+            ignore_conflicts=True,
+        )
+        alias_map.update(_alias_map(missing))
+
+    resolved, seen = [], set()
+    for key, name in wanted.items():
+        skill_id = alias_map.get(key)
+        if skill_id is not None and skill_id not in seen:
+            seen.add(skill_id)
+            resolved.append((skill_id, name))
+    return resolved
+
+
+def text_skill_candidates(text):
+    """
+    The normalised runs of up to MAX_TEXT_NGRAM words in free text that may name a
+    skill. Single characters ("C", "R") are left out, and so are lower-case
+    everyday words such as "go" or "react".
+    """
+    tokens = _TEXT_TOKEN_RE.findall(unicodedata.normalize("NFKC", text or ""))
+    candidates = set()
+    for size in range(1, MAX_TEXT_NGRAM + 1):
+        for start in range(len(tokens) - size + 1):
+            key = normalize_skill_name(" ".join(tokens[start:start + size]))
+            if len(key) <= 1 or (size == 1 and key in _COMMON_WORD_SKILLS and not tokens[start][0].isupper()):
+                continue
+            candidates.add(key)
+    return candidates
+
+
+def known_skill_ids(names):
+    """{name: skill id} for the names in the taxonomy; unknown names are left out and nothing is created."""
+    keys = {name: normalize_skill_name(name) for name in names}
+    alias_map = _alias_map({key for key in keys.values() if key})
+    return {name: alias_map[key] for name, key in keys.items() if key in alias_map}
+
+
+def extract_skills_from_text(text):
+    """
+    Finds known skills mentioned in free text by looking up every candidate run of
+    words (text_skill_candidates) as an alias. Returns [(skill_id, matched text)].
+    """
+    candidates = text_skill_candidates(text)
+    if not candidates:
+        return []
+    return resolve_skills(sorted(candidates), create=False)
+
+
+def _sync_join_rows(join_model, owner_field, owner, resolved):
+    desired = {skill_id for skill_id, _ in resolved}
+    rows = join_model.objects.filter(**{owner_field: owner})
+    existing = set(rows.values_list("skill_id", flat=True))
+    with transaction.atomic():
+        if existing - desired:
+            rows.filter(skill_id__in=existing - desired).delete()
+        join_model.objects.bulk_create(
+            [join_model(**{owner_field: owner, "skill_id": skill_id}) for skill_id in desired - existing],
+            ignore_conflicts=True,
+        )
+
+
+def sync_resume_skills(resume):
+    _sync_join_rows(ResumeSkill, "resume", resume, resolve_skills(parse_skill_list(resume.skills)))
+    remember_synced_skills(resume, "skills")
+
+
+def sync_job_posting_skills(job_posting):
+    from employer_management.models import JobSkill
+
+    _sync_join_rows(JobSkill, "job_posting", job_posting, resolve_skills(parse_skill_list(job_posting.required_skills)))
+    remember_synced_skills(job_posting, "required_skills")
+
+
+def sync_job_listing_skills(job_listing):
+    _sync_join_rows(JobListingSkill, "job_listing", job_listing, extract_skills_from_text(job_listing.requirements))
+    remember_synced_skills(job_listing, "requirements")
+
+
+def _join_tables():
+    from employer_management.models import JobSkill
+
+    return [(ResumeSkill, "resume_id"), (JobSkill, "job_posting_id"), (JobListingSkill, "job_listing_id")]
+
+
+@transaction.atomic
+def merge_skills(source, target):
+    """Moves the aliases and join rows of `source` onto `target` and deletes `source`."""
+    for join_model, owner_field in _join_tables():
+        # Evaluated to a list: MySQL cannot UPDATE a table filtered by a subquery on itself.
+        owners_with_target = list(join_model.objects.filter(skill=target).values_list(owner_field, flat=True))
+        join_model.objects.filter(skill=source).exclude(**{f"{owner_field}__in": owners_with_target}).update(skill=target)
+    SkillAlias.objects.filter(skill=source).update(skill=target)
+    source.delete()  # cascades to the join rows that were already on target
+
+
+def seed_default_aliases(aliases=None):
+    """
+    Creates the built-in skills and synonyms. A skill created earlier from one of
+    the synonyms (e.g. "ML" from a resume) is merged into the canonical skill.
+    Returns the number of skills merged.
+    """
+    merged = 0
+    for canonical, synonyms in (aliases or DEFAULT_SKILL_ALIASES).items():
+        skill, created = Skill.objects.get_or_create(
+            normalized_name=normalize_skill_name(canonical), defaults={"name": canonical}
+        )
+        if not created and skill.name != canonical:
+            skill.name = canonical
+            skill.save(update_fields=["name"])
+        for alias in [canonical, *synonyms]:
+            key = normalize_skill_name(alias)
+            existing = SkillAlias.objects.filter(alias=key).select_related("skill").first()
+            if existing is None:
+                SkillAlias.objects.create(alias=key, skill=skill)
+            elif existing.skill_id != skill.id:
+                merge_skills(existing.skill, skill)
+                merged += 1
+    return merged
+
+
+def skill_match_score(candidate_skill_ids, required_skill_ids):
+    """Percentage of the required skills the candidate has (same formula as utils1.ai_match)."""
+    required = set(required_skill_ids)
+    if not required:
+        return 0.0
+    return round(100 * len(required & set(candidate_skill_ids)) / len(required), 2)
+
+
+def resume_skill_ids(resume):
+    """Skill ids of a resume, syncing it first if it predates the taxonomy."""
+    ids = set(ResumeSkill.objects.filter(resume=resume).values_list("skill_id", flat=True))
+    if not ids and resume.skills:
+        sync_resume_skills(resume)
+        ids = set(ResumeSkill.objects.filter(resume=resume).values_list("skill_id", flat=True))
+    return ids
+
+
+def job_skill_ids(job_posting):
+    """Skill ids a job posting requires, syncing it first if it predates the taxonomy."""
+    from employer_management.models import JobSkill
+
+    ids = set(JobSkill.objects.filter(job_posting=job_posting).values_list("skill_id", flat=True))
+    if not ids and job_posting.required_skills:
+        sync_job_posting_skills(job_posting)
+        ids = set(JobSkill.objects.filter(job_posting=job_posting).values_list("skill_id", flat=True))
+    return ids
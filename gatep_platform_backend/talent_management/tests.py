@@ -1,3 +1,122 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from talent_management.interview_bot import answer_prescoring, code_sandbox
+from talent_management.interview_bot import config as interview_config
+from talent_management.interview_bot import language_scoring
+from utils1.startup_profiler import run_startup_profile, top_packages
+
+
+class StartupBudgetTests(SimpleTestCase):
+    """
+    Guards against import-time regressions: a cold django.setup() plus URL
+    resolution must stay within settings.STARTUP_TIME_BUDGET_SECONDS (and
+    STARTUP_RSS_BUDGET_MB when it is set). Run `python manage.py profile_startup`
+    to see what is slow when this fails.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = run_startup_profile(base_dir=str(settings.BASE_DIR))
+
+    def _offenders(self):
+        return ", ".join(
+            f"{p['package']} ({p['seconds']:.2f}s, {p['rss_mb']:.0f} MB)" for p in top_packages(self.report, n=5)
+        )
+
+    def test_cold_start_within_time_budget(self):
+        budget = settings.STARTUP_TIME_BUDGET_SECONDS
+        self.assertLessEqual(
+            self.report['total_seconds'], budget,
+            f"Cold start took {self.report['total_seconds']:.2f}s (budget {budget:.2f}s). Top offenders: {self._offenders()}"
+        )
+
+    def test_cold_start_within_memory_budget(self):
+        budget = settings.STARTUP_RSS_BUDGET_MB
+        if budget is None or self.report['rss_end_mb'] is None:
+            self.skipTest("STARTUP_RSS_BUDGET_MB not set or psutil unavailable.")
+        self.assertLessEqual(
+            self.report['rss_end_mb'], budget,
+            f"Cold start RSS is {self.report['rss_end_mb']:.0f} MB (budget {budget:.0f} MB). Top offenders: {self._offenders()}"
+        )
+
+
+@mock.patch.object(interview_config, "LANGUAGE_SCORER_USE_LANGUAGETOOL", False)
+class GrammarRuleTests(SimpleTestCase):
+    """The rule-based grammar check must not penalise correct English."""
+
+    CORRECT = [
+        "Does it have a cache?",
+        "What would he do next?",
+        "Where should she do the deployment?",
+        "Plan A is to retrain the model.",
+        "We didn't need a GPU.",
+        "Use a simpler model, i.e. a linear one.",
+        "If it were cheaper, we would use it.",
+        "Why do they have two replicas?",
+        "I don't embed the vectors twice.",
+        "He has a European client and a one-off task.",
+    ]
+    INCORRECT = [
+        "He have three years of experience.",
+        "They is working on it.",
+        "I didn't wanted that.",
+        "It was a apple.",
+        "I bought an car.",
+        "We should of tested it.",
+        "This is more better.",
+    ]
+
+    def test_correct_sentences_have_no_issues(self):
+        for sentence in self.CORRECT:
+            with self.subTest(sentence=sentence):
+                self.assertEqual(language_scoring._grammar_issue_count(sentence), 0)
+
+    def test_common_errors_are_counted(self):
+        for sentence in self.INCORRECT:
+            with self.subTest(sentence=sentence):
+                self.assertEqual(language_scoring._grammar_issue_count(sentence), 1)
+
+    def test_correct_answer_gets_full_grammar_component(self):
+        answer = (
+            "Plan A is to retrain the model, i.e. a smaller one. Does it have a cache? We didn't need a GPU "
+            "for that. What would he do next? Where should she do the deployment? I think the team would "
+            "agree with this plan overall."
+        )
+        self.assertEqual(language_scoring.extract_features([answer])["components"]["grammar"], 100.0)
+
+
+class OutputMatchTests(SimpleTestCase):
+    """predict_output answers are only passed locally when they state exactly the output."""
+
+    def test_exact_answers_match(self):
+        for expected, answer in [
+            ("6", "6"), ("6", "The output is 6."), ("6", "It prints `6`."), ("6\n7", "The output is:\n6\n7"),
+            ("[1, 2, 3]", "```\n[1, 2, 3]\n```"),
+        ]:
+            with self.subTest(answer=answer):
+                self.assertTrue(code_sandbox.output_matches(expected, answer))
+
+    def test_hedged_answers_do_not_match(self):
+        for expected, answer in [
+            ("True", "It prints True or False"), ("6", "Either 5, 6 or 7"), ("0", "Output is 10 - no wait, 0"),
+        ]:
+            with self.subTest(answer=answer):
+                self.assertFalse(code_sandbox.output_matches(expected, answer))
+
+
+class TrivialAnswerTests(SimpleTestCase):
+    """Only empty, skipped, "don't know" and gibberish answers are scored 0 without the LLM."""
+
+    def test_short_answers_go_to_the_llm(self):
+        for answer in ["Binary search", "Hash map", "Port 80", "Yes, absolutely", "SQL"]:
+            with self.subTest(answer=answer):
+                self.assertIsNone(answer_prescoring.trivial_answer_score(answer))
+
+    def test_non_answers_score_zero(self):
+        for answer in ["", "skip", "I don't know", "asdfg qwrtz zxcvb plkmn hjgf"]:
+            with self.subTest(answer=answer):
+                self.assertEqual(answer_prescoring.trivial_answer_score(answer)[0], 0)
@@ -1,7 +1,7 @@
 
 from django.urls import path
 from talent_management.views import (
-     AudioTranscriptionView, CulturalPreparationAPIView, FullInterviewPhotoCheckAPIView,  MalpracticeDetectionView, MockInterviewReportListView, MockInterviewReportView, MockInterviewStartView, MockInterviewSubmitAnswerView, MockInterviewVerifyIdentityView, RecommendedSkillsView, ResumeBuilderAPIView, ResumeDocumentAPIView, ResumeProgressAPIView, ResumeReviewAPIView, SalaryInsightsAPIView , SkillGapAnalysisAPIView , CareerRoadmapAPIView, SkillsPassportView )
+     AudioTranscriptionView, AutocompleteView, CulturalPreparationAPIView, FullInterviewPhotoCheckAPIView, InterviewFrameBatchView, MalpracticeDetectionView, MockInterviewReportListView, MockInterviewReportView, MockInterviewStartView, MockInterviewSubmitAnswerView, MockInterviewVerifyIdentityView, RecommendedSkillsView, ResumeBuilderAPIView, ResumeDocumentAPIView, ResumeProgressAPIView, ResumeReviewAPIView, SalaryInsightsAPIView , SkillGapAnalysisAPIView , CareerRoadmapAPIView, SkillsPassportView )
 # from employer_management.views import (ApplicationListCreateView, ApplicationDetailView,
 #                                         SaveJobView, UnsaveJobView, ListSavedJobsView, JobPostingListCreateView,JobListWithMatchingScoreAPIView)
 from talent_management import views
@@ -18,6 +18,7 @@ urlpatterns = [
     path('resume-progress/', ResumeProgressAPIView.as_view(), name='resume-progress'),
 
     path('trending-skills/', RecommendedSkillsView.as_view(), name='trending-skills-list'),
+    path('autocomplete/', AutocompleteView.as_view(), name='autocomplete'),
     path('ai/cultural-preparation/', CulturalPreparationAPIView.as_view(), name='cultural-preparation'),
     # 🔹 AI Salary Insight
     path('ai/salary-insights/', SalaryInsightsAPIView.as_view(), name='ai-salary-insights'),
@@ -30,6 +31,7 @@ urlpatterns = [
     path('mock-interview/malpractice/', MalpracticeDetectionView.as_view(), name='mock_interview_malpractice'),
     path('transcribe-audio/', AudioTranscriptionView.as_view(), name='transcribe-audio'),
     path('malpractice-check/' , FullInterviewPhotoCheckAPIView.as_view(), name='malpractice-check'),
+    path('malpractice-check/batch/', InterviewFrameBatchView.as_view(), name='malpractice-check-batch'),
     path('mock-interview/reports/', MockInterviewReportListView.as_view(), name='mock-interview-report-list'),
     path('skills-passport/', SkillsPassportView.as_view(), name='skills-passport-api'),
 ]
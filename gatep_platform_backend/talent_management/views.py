@@ -6,7 +6,6 @@ _A = 'meta-llama/Meta-Llama-3-70B-Instruct'
 import os, fitz, json, re, collections.abc
 from django.http import JsonResponse
 from django.conf import settings
-from huggingface_hub import InferenceClient
 from .models import Resume, CustomUser, MockInterviewResult
 from django.contrib.auth import get_user_model
 from rest_framework.views import APIView
@@ -33,21 +32,25 @@ from .interview_bot.config import MOCK_INTERVIEW_POSITION
 from .interview_bot import config
 from .interview_bot.timer_utils import RoundTimer
 from .interview_bot.interviewer_logic import AIInterviewer
+from .skill_taxonomy import parse_skill_list
 from django.utils import timezone
 from groq import Groq
 from django.core.cache import cache
 from employer_management.models import JobPosting
 from .ai_cultural_prep import generate_cultural_preparation, extract_unique_locations
 from .ai_salary_insights import generate_salary_insights
-import whisper
+from utils1.model_registry import get_model
+from utils1.inference_client import infer, remote_inference_enabled, InferenceServerBusy
+from interview_system.face_embeddings import reference_face_embedding
 import tempfile
 
 # Get the CustomUser model
 User = get_user_model()
 
 HFF_TOKEN = os.getenv('HFF_TOKEN')
-if not HFF_TOKEN:
-    raise ValueError('HuggingFace token not set in environment (HFF_TOKEN). Please set it to proceed.')
+# NOTE: a missing HFF_TOKEN is reported when the resume pipeline actually calls the
+# HuggingFace API, not at import time, so management commands and workers that never
+# parse resumes can still boot without it.
 
 # --- UPDATED Constants for clarity (only used constants remain) ---
 L = 'name'; M = 'email'; N = 'phone'; V = 'current_company'
@@ -57,7 +60,7 @@ F = 'tenth'; G = 'twelfth'
 
 class ResumeAIPipeline:
     def __init__(self):
-        self.client = InferenceClient(token=HFF_TOKEN)
+        self.client = None  # created on first LLM call; huggingface_hub is too heavy to import at startup
         self.temp_pdf_paths = []
 
     def _extract_text_from_pdf(self, pdf_path):
@@ -118,6 +121,11 @@ Strict JSON Output:
 '''
 
     def _call_llama_model(self, prompt):
+        if not HFF_TOKEN:
+            raise ValueError('HuggingFace token not set in environment (HFF_TOKEN). Please set it to proceed.')
+        if self.client is None:
+            from huggingface_hub import InferenceClient
+            self.client = InferenceClient(token=HFF_TOKEN)
         response = self.client.chat.completions.create(model=_A, messages=[{'role': 'user', _B: prompt}], max_tokens=4096)
         content = response.choices[0].message.content
         clean_content = re.sub(r'^```json\s*|\s*```$', '', content.strip())
@@ -342,6 +350,10 @@ class ResumeBuilderAPIView(APIView):
         self._update_resume_instance(resume, final_data, files)
         resume.save()
 
+        if 'profile_photo' in files:
+            # Compute the interview reference face embedding once, at upload time.
+            reference_face_embedding(resume)
+
         return resume, created
 
     def get(self, request, *args, **kwargs):
@@ -687,10 +699,8 @@ class SkillGapAnalysisAPIView(APIView):
             # 1. Fetch resume_skills from the user's resume in the DB
             try:
                 resume = Resume.objects.get(talent_id=user)
-                resume_skills = resume.skills  # Adjust this field as per your model
-                # If skills are stored as a string, split to list if needed
-                if isinstance(resume_skills, str):
-                    resume_skills = [s.strip() for s in resume_skills.split(",") if s.strip()]
+                # Handles both the JSON-list and the comma-separated storage format
+                resume_skills = parse_skill_list(resume.skills)
             except Resume.DoesNotExist:
                 return Response({"error": "Resume not found for user."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1129,32 +1139,12 @@ from .interview_bot import config
 from .models import Resume, CustomUser, MockInterviewResult
 from django.utils import timezone
 from .serializers import MockInterviewResultSerializer, RoleListSerializer, SkillGapAnalysisRequestSerializer
-MALPRACTICE_STATUS_FILE = "malpractice_status.txt"
-IDENTITY_VERIFIED_FILE = "identity_verified.txt"
+from . import interview_session, proctoring_state
 import json
 import os # Make sure os is imported for your other functions
 
-def cleanup_proctor_files_api_context():
-    """Removes temporary status files used by the proctoring system."""
-    files_to_remove = [MALPRACTICE_STATUS_FILE, IDENTITY_VERIFIED_FILE]
-    for f in files_to_remove:
-        if os.path.exists(f):
-            try:
-                os.remove(f)
-                print(f"Cleaned up {f} in API context.")
-            except OSError as e:
-                print(f"Error cleaning up {f} in API context: {e}")
-
-def read_malpractice_status_api_context():
-    """Reads the current malpractice status from the file for API context."""
-    try:
-        if os.path.exists(MALPRACTICE_STATUS_FILE):
-            with open(MALPRACTICE_STATUS_FILE, "r") as f:
-                return f.read().strip()
-        return "NOT_STARTED" # Default if file doesn't exist yet
-    except IOError as e:
-        print(f"Error reading malpractice status file in API context: {e}")
-        return "ERROR_READING_STATUS"
+# Proctoring state (malpractice status, strikes, identity check) is kept per interview
+# in talent_management/proctoring_state.py instead of the old global status files.
 
 # Hardcoded position for mock interviews
 MOCK_INTERVIEW_POSITION = "AI Engineer"
@@ -1179,9 +1169,6 @@ class MockInterviewStartView(APIView):
 
     def post(self, request):
         user = request.user
-        
-        # Clean up any residual files from previous runs
-        cleanup_proctor_files_api_context()
 
         # Fetch candidate's experience and AIML specialization from their Resume
         try:
@@ -1253,8 +1240,12 @@ class MockInterviewStartView(APIView):
             status=MockInterviewResult.InterviewStatus.IN_PROGRESS,
             pre_generated_questions_data={}, # Initialize, will be populated by AIInterviewer
             full_qa_transcript=[], # Initialize
-            technical_specialization_scores={} # Initialize
+            technical_specialization_scores={}, # Initialize
+            # "mode": "assessment" (non-interactive runs) scores all rounds together at the end
+            scoring_mode=(MockInterviewResult.ScoringMode.BATCH if request.data.get("mode") == "assessment"
+                          else MockInterviewResult.ScoringMode.PER_ROUND),
         )
+        proctoring_state.start(mock_interview.id)
         
         try:
             # Initialize the AI Interviewer bot
@@ -1314,7 +1305,8 @@ class MockInterviewStartView(APIView):
                 "current_round": "communication",
                 "question_number": 1,
                 "question_text": first_question_text,
-                "status": mock_interview.status
+                "status": mock_interview.status,
+                "scoring_mode": mock_interview.scoring_mode
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -1330,7 +1322,7 @@ class MockInterviewStartView(APIView):
             request.session.pop('current_round_name', None)
             request.session.pop('current_question_index', None)
             request.session.modified = True
-            cleanup_proctor_files_api_context()
+            proctoring_state.clear(mock_interview.id)
             return Response({"error": f"Failed to start interview: {e}", "interview_id": mock_interview.id},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -1365,12 +1357,14 @@ class MockInterviewVerifyIdentityView(APIView):
             is_verified = request.data.get('is_verified', False)
 
             mock_interview.identity_verified = is_verified
+            proctoring_state.set_identity_verified(interview_id, is_verified)
             if not is_verified:
                 mock_interview.status = MockInterviewResult.InterviewStatus.TERMINATED_ERROR
                 mock_interview.malpractice_detected = True
                 mock_interview.malpractice_reason = "Identity verification failed."
                 mock_interview.interview_end_time = timezone.now()
                 mock_interview.save()
+                proctoring_state.clear(interview_id)
                 # Clear session data
                 request.session.pop('current_mock_interview_id', None)
                 request.session.pop('current_round_name', None)
@@ -1445,19 +1439,7 @@ class MockInterviewSubmitAnswerView(APIView):
                                 status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             # Re-set current state for the interviewer instance
-            interviewer.current_round_name = current_round_name
-            interviewer.current_question_index = current_question_index
-            
-            # Get the questions for the current round from the pre-generated data
-            questions_for_current_round = []
-            if current_round_name == "communication" or current_round_name == "psychometric":
-                questions_for_current_round = interviewer.all_generated_questions[current_round_name]["questions"]
-            elif current_round_name in interviewer.technical_specializations:
-                questions_for_current_round = interviewer.all_generated_questions["technical"]["specializations"].get(current_round_name, {}).get("questions", [])
-            elif current_round_name in ["predict_output", "fix_error", "write_program"]: # Coding stages
-                questions_for_current_round = interviewer.all_generated_questions["coding"][current_round_name]["questions"]
-            
-            interviewer.current_round_questions = questions_for_current_round # Ensure the interviewer has the correct list
+            interview_session.restore_position(interviewer, current_round_name, current_question_index)
 
             if mock_interview.status != MockInterviewResult.InterviewStatus.IN_PROGRESS:
                 return Response({
@@ -1472,14 +1454,14 @@ class MockInterviewSubmitAnswerView(APIView):
             print(f"DEBUG VIEWS: Extracted candidate_answer: '{candidate_answer}'")
             # --- DEBUGGING ADDITION END ---
             
-            malpractice_status_from_file = read_malpractice_status_api_context()
-            if malpractice_status_from_file.startswith("TERMINATED") and malpractice_status_from_file != "TERMINATED_NORMAL_EXIT":
-                interviewer._check_malpractice_status(read_malpractice_status_api_context)
+            # O(1) cache read of this interview's proctoring state.
+            if proctoring_state.is_terminated(interview_id):
+                interviewer._check_malpractice_status(lambda: proctoring_state.get_status(interview_id))
                 request.session.pop('current_mock_interview_id', None)
                 request.session.pop('current_round_name', None)
                 request.session.pop('current_question_index', None)
                 request.session.modified = True
-                cleanup_proctor_files_api_context()
+                proctoring_state.clear(interview_id)
                 return Response({
                     "message": "Interview terminated due to detected malpractice.",
                     "reason": mock_interview.malpractice_reason,
@@ -1487,302 +1469,33 @@ class MockInterviewSubmitAnswerView(APIView):
                     "status": mock_interview.status
                 }, status=status.HTTP_403_FORBIDDEN)
 
-            # Check if current question index is valid for the current round
-            if not questions_for_current_round or current_question_index >= len(questions_for_current_round):
-                print(f"DEBUG VIEWS: No valid current question found for {current_round_name} at index {current_question_index}. Attempting to transition.")
-                pass 
-            else:
-                # Get the current question details
-                current_question_dict = questions_for_current_round[current_question_index]
-                current_question_text = current_question_dict["question_text"]
-                current_question_speak_text = current_question_dict["speak_text"]
-                
-                # Directly record the answer using the new method
-                interviewer.record_answer(current_question_text, current_question_speak_text, candidate_answer)
-                
-                # --- NEW DEBUGGING ADDITION START ---
-                print(f"DEBUG VIEWS: State of interviewer.all_interview_answers BEFORE save:")
-                for i, qa_pair in enumerate(interviewer.all_interview_answers):
-                    print(f"  Q{i+1}: '{qa_pair.get('question_text', '')[:50]}...' A: '{qa_pair.get('answer', '')}'")
-                # --- NEW DEBUGGING ADDITION END ---
-
-                # IMPORTANT: Persist the full Q&A transcript after each answer
-                mock_interview.full_qa_transcript = interviewer.all_interview_answers
-                mock_interview.save(update_fields=['full_qa_transcript'])
-
-                interviewer.current_question_index += 1
-            
-            next_question_text = None
-            next_round_name = interviewer.current_round_name
-            message_to_user = "Answer received. Moving to the next question."
-
-            # Determine if we are at the end of the current round
-            if interviewer.current_question_index >= len(questions_for_current_round):
-                print(f"DEBUG VIEWS: End of round '{interviewer.current_round_name}'. Scoring round.")
-
-                relevant_answers_for_scoring = []
-                original_questions_for_completed_round = []
-                if interviewer.current_round_name == "communication" or interviewer.current_round_name == "psychometric":
-                    original_questions_for_completed_round = interviewer.all_generated_questions[interviewer.current_round_name]["questions"]
-                elif interviewer.current_round_name in interviewer.technical_specializations:
-                    original_questions_for_completed_round = interviewer.all_generated_questions["technical"]["specializations"].get(interviewer.current_round_name, {}).get("questions", [])
-                elif interviewer.current_round_name in ["predict_output", "fix_error", "write_program"]:
-                    original_questions_for_completed_round = interviewer.all_generated_questions["coding"][interviewer.current_round_name]["questions"]
-
-                normalized_completed_round_questions = {re.sub(r'\s+', ' ', q['question_text'].strip().lower()) for q in original_questions_for_completed_round}
-
-                for qa_pair in interviewer.all_interview_answers:
-                    normalized_qa_question = re.sub(r'\s+', ' ', qa_pair.get('question_text', '').strip().lower())
-                    if normalized_qa_question in normalized_completed_round_questions:
-                        relevant_answers_for_scoring.append(qa_pair)
-                
-                round_scoring_results = interviewer._score_round(
-                    interviewer.current_round_name,
-                    relevant_answers_for_scoring,
-                    specialization=interviewer.current_round_name if interviewer.current_round_name in interviewer.technical_specializations else None,
-                    coding_stage=interviewer.current_round_name if interviewer.current_round_name in ["predict_output", "fix_error", "write_program"] else None
-                )
-                
-                if interviewer.current_round_name == "coding":
-                    if "coding" not in interviewer.round_detailed_results:
-                        interviewer.round_detailed_results["coding"] = {}
-                    interviewer.round_detailed_results["coding"][interviewer.current_round_name] = {
-                        "overall_score": round_scoring_results['overall_score'],
-                        "round_summary": round_scoring_results['round_summary'],
-                        "questions": round_scoring_results['questions']
-                    }
-                    interviewer.round_scores["coding"][interviewer.current_round_name] = round_scoring_results['overall_score']
-                elif interviewer.current_round_name in interviewer.technical_specializations:
-                    if "technical" not in interviewer.round_detailed_results:
-                        interviewer.round_detailed_results['technical'] = {}
-                    interviewer.round_detailed_results["technical"][interviewer.current_round_name] = {
-                        "overall_score": round_scoring_results['overall_score'],
-                        "round_summary": round_scoring_results['round_summary'],
-                        "questions": round_scoring_results['questions']
-                    }
-                    interviewer.round_scores["technical"][interviewer.current_round_name] = round_scoring_results['overall_score']
-                else: 
-                    interviewer.round_detailed_results[interviewer.current_round_name] = {
-                        "overall_score": round_scoring_results['overall_score'],
-                        "round_summary": round_scoring_results['round_summary'],
-                        "questions": round_scoring_results['questions']
-                    }
-                    interviewer.round_scores[interviewer.current_round_name] = round_scoring_results['overall_score']
-
-                mock_interview.round_analysis_json = interviewer.round_detailed_results
-                mock_interview.communication_overall_score = interviewer.round_scores.get("communication", 0)
-                mock_interview.psychometric_overall_score = interviewer.round_scores.get("psychometric", 0)
-                mock_interview.technical_specialization_scores = interviewer.round_scores["technical"]
-
-                mock_interview.save(update_fields=[
-                    'round_analysis_json', 
-                    'communication_overall_score', 
-                    'psychometric_overall_score', 
-                    'technical_specialization_scores'
-                ])
-
-                message_to_user = f"Round '{interviewer.current_round_name.replace('_', ' ').title()}' completed. Moving to the next round."
-                
-                if interviewer.current_round_name == "communication":
-                    next_round_name = "psychometric"
-                    interviewer.current_round_name = next_round_name
-                    interviewer.current_question_index = 0
-                    if not interviewer.all_generated_questions["psychometric"]["questions"]:
-                        interviewer.current_round_questions = []
-                    else:
-                        interviewer.current_round_questions = interviewer.all_generated_questions["psychometric"]["questions"]
-                elif interviewer.current_round_name == "psychometric":
-                    has_technical_questions = False
-                    if interviewer.technical_specializations:
-                        for spec in interviewer.technical_specializations:
-                            if interviewer.all_generated_questions["technical"]["specializations"].get(spec, {}).get("questions"):
-                                has_technical_questions = True
-                                break
-                    if has_technical_questions:
-                        first_tech_spec_with_questions = None
-                        for spec in interviewer.technical_specializations:
-                            if interviewer.all_generated_questions["technical"]["specializations"].get(spec, {}).get("questions"):
-                                first_tech_spec_with_questions = spec
-                                break
-                        next_round_name = first_tech_spec_with_questions
-                        interviewer.technical_current_specialization_index = interviewer.technical_specializations.index(first_tech_spec_with_questions)
-                        interviewer.current_round_name = next_round_name
-                        interviewer.current_round_questions = interviewer.all_generated_questions["technical"]["specializations"].get(interviewer.current_round_name, {}).get("questions", [])
-                        interviewer.current_question_index = 0
-                        message_to_user = f"Starting Technical Skills Round, focusing on {interviewer.current_round_name}."
-                    else:
-                        coding_stages_with_questions = [
-                            stage for stage in ["predict_output", "fix_error", "write_program"]
-                            if interviewer.all_generated_questions["coding"].get(stage, {}).get("questions")
-                        ]
-                        if coding_stages_with_questions:
-                            next_round_name = coding_stages_with_questions[0]
-                            interviewer.coding_current_stage_index = list(interviewer.all_generated_questions["coding"].keys()).index(next_round_name)
-                            interviewer.current_round_name = next_round_name
-                            interviewer.current_round_questions = interviewer.all_generated_questions["coding"][interviewer.current_round_name]["questions"]
-                            interviewer.current_question_index = 0
-                            message_to_user = f"Starting Coding Skills Round - {interviewer.current_round_name.replace('_', ' ').title()} stage."
-                        else:
-                            next_round_name = "interview_complete"
-                            message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                elif interviewer.current_round_name in interviewer.technical_specializations:
-                    current_spec_index = interviewer.technical_specializations.index(interviewer.current_round_name)
-                    
-                    next_tech_spec_with_questions = None
-                    for i in range(current_spec_index + 1, len(interviewer.technical_specializations)):
-                        spec = interviewer.technical_specializations[i]
-                        if interviewer.all_generated_questions["technical"]["specializations"].get(spec, {}).get("questions"):
-                            next_tech_spec_with_questions = spec
-                            interviewer.technical_current_specialization_index = i
-                            break
-
-                    if next_tech_spec_with_questions:
-                        next_round_name = next_tech_spec_with_questions
-                        interviewer.current_round_name = next_round_name
-                        interviewer.current_round_questions = interviewer.all_generated_questions["technical"]["specializations"].get(interviewer.current_round_name, {}).get("questions", [])
-                        interviewer.current_question_index = 0
-                        message_to_user = f"Moving to Technical Sub-Round: {interviewer.current_round_name}."
-                    else: 
-                        coding_stages_with_questions = [
-                            stage for stage in ["predict_output", "fix_error", "write_program"]
-                            if interviewer.all_generated_questions["coding"].get(stage, {}).get("questions")
-                        ]
-                        if coding_stages_with_questions:
-                            next_round_name = coding_stages_with_questions[0]
-                            interviewer.coding_current_stage_index = list(interviewer.all_generated_questions["coding"].keys()).index(next_round_name)
-                            interviewer.current_round_name = next_round_name
-                            interviewer.current_round_questions = interviewer.all_generated_questions["coding"][interviewer.current_round_name]["questions"]
-                            interviewer.current_question_index = 0
-                            message_to_user = f"Starting Coding Skills Round - {interviewer.current_round_name.replace('_', ' ').title()} stage."
-                        else:
-                            next_round_name = "interview_complete"
-                            message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                elif interviewer.current_round_name in ["predict_output", "fix_error", "write_program"]:
-                    coding_stages_keys_with_questions = [
-                        stage for stage in ["predict_output", "fix_error", "write_program"]
-                        if interviewer.all_generated_questions["coding"].get(stage, {}).get("questions")
-                    ]
-                    
-                    if not coding_stages_keys_with_questions:
-                        next_round_name = "interview_complete"
-                        message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                    else:
-                        try:
-                            current_coding_stage_index_in_filtered = coding_stages_keys_with_questions.index(interviewer.current_round_name)
-                            if current_coding_stage_index_in_filtered + 1 < len(coding_stages_keys_with_questions):
-                                next_round_name = coding_stages_keys_with_questions[current_coding_stage_index_in_filtered + 1]
-                                interviewer.current_round_name = next_round_name
-                                interviewer.current_round_questions = interviewer.all_generated_questions["coding"][interviewer.current_round_name]["questions"]
-                                interviewer.current_question_index = 0
-                                message_to_user = f"Moving to Coding Stage: {interviewer.current_round_name.replace('_', ' ').title()}."
-                            else:
-                                next_round_name = "interview_complete"
-                                message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                        except ValueError:
-                             next_round_name = "interview_complete"
-                             message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                else:
-                    next_round_name = "interview_complete"
-                    message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-
+            result = interview_session.submit_answer(interviewer, mock_interview, candidate_answer)
 
-                if next_round_name == "interview_complete":
-                    interviewer._score_language_proficiency(interviewer.all_interview_answers)
-                    
-                    total_score_sum = 0
-                    num_scores = 0
-
-                    if "communication" in interviewer.round_scores:
-                        total_score_sum += interviewer.round_scores["communication"]
-                        num_scores += 1
-                    if "psychometric" in interviewer.round_scores:
-                        total_score_sum += interviewer.round_scores["psychometric"]
-                        num_scores += 1
-
-                    coding_stage_scores = [score for score in interviewer.round_scores["coding"].values()]
-                    if coding_stage_scores:
-                        avg_coding_score = sum(coding_stage_scores) / len(coding_stage_scores)
-                        total_score_sum += avg_coding_score
-                        num_scores += 1
-
-                    technical_specialization_scores = [score for score in interviewer.round_scores["technical"].values()]
-                    if technical_specialization_scores:
-                        avg_technical_score = sum(technical_specialization_scores) / len(technical_specialization_scores)
-                        total_score_sum += avg_technical_score
-                        num_scores += 1
-                    
-                    total_score_sum += interviewer.language_score
-                    num_scores += 1
-
-                    if num_scores > 0:
-                        interviewer.global_readiness_score = int(total_score_sum / num_scores)
-                    else:
-                        interviewer.global_readiness_score = 0
+            if result["completed"]:
+                request.session.pop('current_mock_interview_id', None)
+                request.session.pop('current_round_name', None)
+                request.session.pop('current_question_index', None)
+                request.session.modified = True
+                proctoring_state.clear(interview_id)
 
-                    interviewer._generate_final_report()
+                return Response({
+                    "message": result["message"],
+                    "interview_id": mock_interview.id,
+                    "status": mock_interview.status,
+                    "global_readiness_score": mock_interview.global_readiness_score,
+                    "report_url": request.build_absolute_uri(f'/api/mock-interview/report/{mock_interview.id}/')
+                }, status=status.HTTP_200_OK)
 
-                    request.session.pop('current_mock_interview_id', None)
-                    request.session.pop('current_round_name', None)
-                    request.session.pop('current_question_index', None)
-                    request.session.modified = True
-                    cleanup_proctor_files_api_context()
-
-                    return Response({
-                        "message": message_to_user,
-                        "interview_id": mock_interview.id,
-                        "status": mock_interview.status,
-                        "global_readiness_score": mock_interview.global_readiness_score,
-                        "report_url": request.build_absolute_uri(f'/api/mock-interview/report/{mock_interview.id}/')
-                    }, status=status.HTTP_200_OK)
-                
-                if interviewer.current_round_questions and interviewer.current_question_index < len(interviewer.current_round_questions):
-                    next_question_text = interviewer.current_round_questions[interviewer.current_question_index]["question_text"]
-                    interviewer._add_to_chat_history("model", next_question_text)
-                else:
-                    next_round_name = "interview_complete"
-                    message_to_user = interviewer.all_generated_questions["interview_complete_message"]
-                    
-                    interviewer._score_language_proficiency(interviewer.all_interview_answers)
-                    total_score_sum = 0
-                    num_scores = 0
-                    if "communication" in interviewer.round_scores: total_score_sum += interviewer.round_scores["communication"]; num_scores += 1
-                    if "psychometric" in interviewer.round_scores: total_score_sum += interviewer.round_scores["psychometric"]; num_scores += 1
-                    coding_stage_scores = [score for score in interviewer.round_scores["coding"].values()]
-                    if coding_stage_scores: avg_coding_score = sum(coding_stage_scores) / len(coding_stage_scores); total_score_sum += avg_coding_score; num_scores += 1
-                    technical_specialization_scores = [score for score in interviewer.round_scores["technical"].values()]
-                    if technical_specialization_scores: avg_technical_score = sum(technical_specialization_scores) / len(technical_specialization_scores); total_score_sum += avg_technical_score; num_scores += 1
-                    total_score_sum += interviewer.language_score; num_scores += 1
-                    interviewer.global_readiness_score = int(total_score_sum / num_scores) if num_scores > 0 else 0
-
-                    interviewer._generate_final_report()
-
-                    request.session.pop('current_mock_interview_id', None)
-                    request.session.pop('current_round_name', None)
-                    request.session.pop('current_question_index', None)
-                    request.session.modified = True
-                    cleanup_proctor_files_api_context()
-                    return Response({
-                        "message": message_to_user,
-                        "interview_id": mock_interview.id,
-                        "status": mock_interview.status,
-                        "global_readiness_score": mock_interview.global_readiness_score,
-                        "report_url": request.build_absolute_uri(f'/api/mock-interview/report/{mock_interview.id}/')
-                    }, status=status.HTTP_200_OK)
-
-            else: 
-                next_question_text = interviewer.current_round_questions[interviewer.current_question_index]["question_text"]
-                interviewer._add_to_chat_history("model", next_question_text)
-            
             request.session['current_round_name'] = interviewer.current_round_name
             request.session['current_question_index'] = interviewer.current_question_index
             request.session.modified = True 
 
             return Response({
-                "message": message_to_user,
+                "message": result["message"],
                 "interview_id": mock_interview.id,
-                "current_round": interviewer.current_round_name,
-                "question_number": interviewer.current_question_index + 1,
-                "question_text": next_question_text,
+                "current_round": result["current_round"],
+                "question_number": result["question_number"],
+                "question_text": result["question_text"],
                 "status": mock_interview.status
             }, status=status.HTTP_200_OK)
 
@@ -1805,7 +1518,8 @@ class MockInterviewSubmitAnswerView(APIView):
             request.session.pop('current_round_name', None)
             request.session.pop('current_question_index', None)
             request.session.modified = True
-            cleanup_proctor_files_api_context()
+            if interview_id:
+                proctoring_state.clear(interview_id)
             return Response({"error": f"An error occurred while processing your answer: {e}"},
                             status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 # --- MockInterviewSubmitAnswerView.post method ---
@@ -1939,19 +1653,18 @@ class MalpracticeDetectionView(APIView):
                 status=MockInterviewResult.InterviewStatus.IN_PROGRESS
             )
  
+            # Atomic and first-wins across workers; the DB row is updated write-behind.
+            malpractice_reason = f"Malpractice detected: {type_of_malpractice}"
+            proctoring_state.terminate(mock_interview.id, malpractice_reason)
             mock_interview.malpractice_detected = True
-            mock_interview.malpractice_reason = f"Malpractice detected: {type_of_malpractice}"
+            mock_interview.malpractice_reason = malpractice_reason
             mock_interview.status = MockInterviewResult.InterviewStatus.TERMINATED_MALPRACTICE
-            mock_interview.interview_end_time = timezone.now()
-            mock_interview.save()
  
             request.session.pop('current_mock_interview_id', None)
             request.session.pop('current_round_name', None)
             request.session.pop('current_question_index', None)
             request.session.modified = True
  
-            # cleanup_proctor_files_api_context()
- 
             return Response(
                 {
                     "message": "Interview terminated due to malpractice.",
@@ -2022,12 +1735,11 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
-import whisper
 import tempfile
 import os
  
-# Load Whisper model ONCE globally
-model = whisper.load_model("base")  # You can also try "base" if accuracy needed
+# Whisper is loaded once per process on first use through the model registry
+# (see utils1/model_registry.py), not at import time.
  
 class AudioTranscriptionView(APIView):
     parser_classes = (MultiPartParser, FormParser)
@@ -2037,6 +1749,16 @@ class AudioTranscriptionView(APIView):
         if not audio_file:
             return Response({"error": "No audio file provided."}, status=status.HTTP_400_BAD_REQUEST)
  
+        if remote_inference_enabled():
+            # Whisper runs on the shared inference server; this worker never loads it.
+            try:
+                result = infer("transcribe", audio_file.read(), suffix=".wav")
+                return Response({"transcription": result.get("text", "")}, status=status.HTTP_200_OK)
+            except InferenceServerBusy as e:
+                return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
         # Save uploaded file temporarily
         with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as temp_audio:
             for chunk in audio_file.chunks():
@@ -2045,7 +1767,7 @@ class AudioTranscriptionView(APIView):
  
         try:
             # Transcribe using Whisper (remove vad_filter)
-            result = model.transcribe(temp_path, fp16=False)  # Only fp16=False needed for CPU
+            result = get_model("whisper").transcribe(temp_path, fp16=False)  # Only fp16=False needed for CPU
             transcription = result.get("text", "")
  
             return Response({"transcription": transcription}, status=status.HTTP_200_OK)
@@ -2065,7 +1787,8 @@ import tempfile
 import os
  
 from .models import Resume  # Adjust to your model name
-from interview_system.interview_cam import run_full_interview_photo_check
+# NOTE: interview_system.interview_cam pulls in DeepFace/TensorFlow and MediaPipe,
+# so it is imported inside FullInterviewPhotoCheckAPIView.post rather than here.
  
  
 class FullInterviewPhotoCheckAPIView(APIView):
@@ -2078,8 +1801,9 @@ class FullInterviewPhotoCheckAPIView(APIView):
  
     def post(self, request):
         try:
-            # 1️⃣ Malpractice count from session
-            malpractice_count = request.session.get("malpractice_count", 0)
+            # 1️⃣ Malpractice count: per interview in the proctoring store, or from the session outside an interview
+            interview_id = request.session.get("current_mock_interview_id")
+            malpractice_count = proctoring_state.get_strikes(interview_id) if interview_id else request.session.get("malpractice_count", 0)
  
             # 2️⃣ Get reference resume photo path from DB
             try:
@@ -2104,34 +1828,36 @@ class FullInterviewPhotoCheckAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
  
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".jpg") as temp_captured:
-                for chunk in captured_file.chunks():
-                    temp_captured.write(chunk)
-                interview_photo_path = temp_captured.name
+            # Decoded once from memory by the vision pipeline; no temp file round-trip.
+            interview_photo_bytes = captured_file.read()
             
-            # 4️⃣ Run AI check
+            # 4️⃣ Run AI check against the stored reference embedding (computed once per photo)
+            from interview_system.interview_cam import run_full_interview_photo_check
+            # None when the resume photo has no usable face; the check then falls back to a pairwise verify.
+            reference_embedding = reference_face_embedding(resume)
             print(resume_photo_path) 
-            print(interview_photo_path)
-            result = run_full_interview_photo_check(resume_photo_path, interview_photo_path)
+            result = run_full_interview_photo_check(resume_photo_path, interview_photo_bytes, reference_embedding=reference_embedding)
  
             # 5️⃣ Update malpractice_count if any fail
             if not result.get("match", True) \
                or not result.get("orientation_ok", True) \
                or result.get("multiple_faces", False) \
                or result.get("malpractice", False):
-                malpractice_count += 1
-                request.session["malpractice_count"] = malpractice_count
-                request.session.modified = True
- 
-            # 6️⃣ Cleanup
-            if os.path.exists(interview_photo_path):
-                os.remove(interview_photo_path)
+                if interview_id:
+                    malpractice_count = proctoring_state.record_strike(interview_id)
+                    result["interview_terminated"] = proctoring_state.is_terminated(interview_id)
+                else:
+                    malpractice_count += 1
+                    request.session["malpractice_count"] = malpractice_count
+                    request.session.modified = True
  
-            # 7️⃣ Append count to result
+            # 6️⃣ Append count to result
             result["malpractice_count"] = malpractice_count
  
             return Response(result, status=status.HTTP_200_OK)
  
+        except InferenceServerBusy as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
         except Exception as e:
             return Response(
                 {"error": f"Internal server error: {str(e)}"},
@@ -2139,6 +1865,64 @@ class FullInterviewPhotoCheckAPIView(APIView):
             )
 
 
+class InterviewFrameBatchView(APIView):
+    """
+    Batched proctoring ingest for the active mock interview.
+    Accepts several webcam frames per request (multipart key: 'frames', in capture order),
+    drops near-duplicates, checks an adaptively sampled subset in the worker pool and
+    counts at most one strike per batch. Returns the per-batch summary with malpractice_count.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request):
+        interview_id = request.session.get("current_mock_interview_id")
+        if not interview_id:
+            return Response({"error": "No active interview found for this user in the session."},
+                            status=status.HTTP_404_NOT_FOUND)
+        if proctoring_state.is_terminated(interview_id):
+            return Response({"error": "Interview has already been terminated.",
+                             "status": proctoring_state.get_status(interview_id)},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        from interview_system import frame_ingest
+
+        frame_files = request.FILES.getlist("frames")
+        if not frame_files:
+            return Response({"error": "No frames uploaded (key: 'frames')."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(frame_files) > frame_ingest.MAX_FRAMES_PER_BATCH:
+            return Response({"error": f"At most {frame_ingest.MAX_FRAMES_PER_BATCH} frames per batch."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            resume = Resume.objects.get(talent_id=request.user)
+            if not resume.profile_photo:
+                return Response({"error": "No reference photo found in DB."}, status=status.HTTP_404_NOT_FOUND)
+            reference_embedding = reference_face_embedding(resume)
+
+            state = proctoring_state.get_frame_sampler_state(interview_id) or frame_ingest.new_sampler_state()
+            summary, state = frame_ingest.process_frame_batch(
+                [f.read() for f in frame_files], resume.profile_photo.path, reference_embedding, state
+            )
+            proctoring_state.set_frame_sampler_state(interview_id, state)
+
+            # One strike per batch with any violation, like one failed snapshot before.
+            if summary["violations"]:
+                summary["malpractice_count"] = proctoring_state.record_strike(interview_id)
+            else:
+                summary["malpractice_count"] = proctoring_state.get_strikes(interview_id)
+            summary["interview_terminated"] = proctoring_state.is_terminated(interview_id)
+            return Response(summary, status=status.HTTP_200_OK)
+
+        except Resume.DoesNotExist:
+            return Response({"error": "Resume not found for this user."}, status=status.HTTP_404_NOT_FOUND)
+        except InferenceServerBusy as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            return Response({"error": f"Internal server error: {str(e)}"},
+                            status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 # class FullInterviewPhotoCheckAPIView(APIView):
 #     """
 #     API to run full AI interview image check.
@@ -2546,4 +2330,35 @@ class SkillsPassportView(APIView):
                 passport.status = SkillsPassport.PassportStatus.FAILED
                 passport.save()
             print(f"Error during passport generation: {e}")
-            return Response({"error": f"An unexpected error occurred during passport generation: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+            return Response({"error": f"An unexpected error occurred during passport generation: {e}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+from rest_framework.permissions import AllowAny
+from django.utils.cache import patch_cache_control
+from .autocomplete import KINDS, complete as autocomplete_complete
+
+
+class AutocompleteView(APIView):
+    """
+    Skill and job-title suggestions for free-text entry, steering users to canonical values.
+
+    GET /api/autocomplete/?q=reac&type=skills&limit=10
+    type is skills (default) or titles; each result is {"value", "count", "matched"},
+    where "matched" is the alias the text matched ("reactjs" -> React), if any.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []  # public data; skipping JWT checks keeps each keystroke cheap
+    max_limit = 20
+
+    def get(self, request):
+        kind = request.query_params.get('type', 'skills')
+        if kind not in KINDS:
+            return Response({"detail": "type must be 'skills' or 'titles'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(self.max_limit, max(1, int(request.query_params.get('limit', 10))))
+        except ValueError:
+            return Response({"detail": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        response = Response({
+            "results": autocomplete_complete(kind, request.query_params.get('q', ''), limit),
+        }, status=status.HTTP_200_OK)
+        patch_cache_control(response, public=True, max_age=300)
+        return response
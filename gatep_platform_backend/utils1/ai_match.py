@@ -1,10 +1,8 @@
 import re
-from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
 
-model_id = "distilbert/distilgpt2"
-tokenizer = AutoTokenizer.from_pretrained(model_id)
-model = AutoModelForCausalLM.from_pretrained(model_id)
-generator = pipeline("text-generation", model=model, tokenizer=tokenizer)
+# The distilgpt2 text-generation pipeline used by the LLM scoring path below is
+# registered in utils1.model_registry as "distilgpt2" and is only loaded if that
+# path is re-enabled.
 
 def get_ai_match_score(user_skills, job_skills):
     if not user_skills or not job_skills:
@@ -25,6 +23,7 @@ def get_ai_match_score(user_skills, job_skills):
 #     How well do they match? Give only a percentage score between 0 and 100.
 #     """
 
+#     generator = get_model("distilgpt2")
 #     result = generator(prompt, max_length=50, do_sample=False, num_return_sequences=1)
 #     text = result[0]['generated_text']
 #     match = re.search(r'\d+\.?\d*', text)
@@ -0,0 +1,77 @@
+# utils1/inference_client.py
+"""
+Client for the local inference server (utils1/inference_server.py).
+
+`remote_inference_enabled()` tells callers whether settings.INFERENCE_SERVER_URL
+is configured; if it is not, they keep running the models in-process through
+utils1.model_registry.
+"""
+
+import http.client
+import json
+import socket
+from urllib.parse import urlencode, urlparse
+
+from django.conf import settings
+
+
+class InferenceServerError(Exception):
+    """The inference server returned an error or could not be reached."""
+
+
+class InferenceServerBusy(InferenceServerError):
+    """The task queue on the inference server is full (HTTP 503); retry later."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def remote_inference_enabled():
+    return bool(getattr(settings, "INFERENCE_SERVER_URL", None))
+
+
+def _connection(timeout):
+    url = urlparse(settings.INFERENCE_SERVER_URL)
+    if url.scheme == "unix":
+        return _UnixHTTPConnection(url.path, timeout)
+    return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+
+
+def _request(method, path, body=None):
+    # The server enforces the same timeout per request; allow a little slack for the transfer.
+    timeout = settings.INFERENCE_REQUEST_TIMEOUT_SECONDS + 5
+    conn = _connection(timeout)
+    try:
+        conn.request(method, path, body=body, headers={"Content-Type": "application/octet-stream"})
+        response = conn.getresponse()
+        payload = json.loads(response.read() or b"{}")
+    except (OSError, http.client.HTTPException, ValueError) as e:
+        raise InferenceServerError(f"Inference server unreachable at {settings.INFERENCE_SERVER_URL}: {e}")
+    finally:
+        conn.close()
+
+    if response.status == 503:
+        raise InferenceServerBusy(payload.get("error", "Inference server is busy"))
+    if response.status != 200:
+        raise InferenceServerError(payload.get("error", f"HTTP {response.status}"))
+    return payload
+
+
+def infer(task, data, **params):
+    """Runs `task` on the raw input bytes `data` and returns the JSON result."""
+    path = f"/v1/{task}"
+    if params:
+        path += "?" + urlencode(params)
+    return _request("POST", path, body=data)
+
+
+def server_metrics():
+    return _request("GET", "/metrics")
@@ -0,0 +1,313 @@
+# utils1/inference_server.py
+"""
+Local inference server (sidecar) for the interview models.
+
+One process owns Whisper, ArcFace, MediaPipe and YOLOv5 (loaded through
+utils1.model_registry) and serves them to the web workers over a Unix socket
+or localhost HTTP, so the weights live in memory once per host instead of once
+per gunicorn worker. Started with the `run_inference_server` management
+command; web workers talk to it through utils1.inference_client when
+settings.INFERENCE_SERVER_URL is set.
+
+Protocol:
+    POST /v1/<task>?<params>   body = raw input bytes (encoded image / audio file)
+                               -> 200 JSON result
+                               -> 503 if the task queue is full (backpressure)
+    GET  /metrics              -> per-task queue and latency metrics
+    GET  /health               -> {"status": "ok"}
+
+Each task has its own queue and worker thread. The worker collects requests
+for up to `batch_window_ms` (or until `max_batch_size` requests are waiting)
+and hands them to the task handler in one call, so concurrent requests share
+a forward pass where the model supports it (YOLOv5 takes a list of images).
+"""
+
+import json
+import logging
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a task queue is at its depth limit; mapped to HTTP 503."""
+
+
+class _PendingRequest:
+    __slots__ = ("data", "params", "enqueued_at", "done", "result", "error", "abandoned")
+
+    def __init__(self, data, params):
+        self.data = data
+        self.params = params
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False    # the caller timed out; nobody is waiting for the result
+
+
+class MicroBatcher:
+    """
+    Queue + worker thread for one task. `handler(batch)` receives a list of
+    (data, params) tuples and must return a list of results of the same length;
+    any other length fails every request of the batch. Requests whose caller has
+    already timed out are dropped from a batch instead of being computed.
+    """
+
+    def __init__(self, name, handler, max_batch_size=8, batch_window_ms=10, max_queue_depth=64):
+        self.name = name
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_queue_depth = max_queue_depth
+        self._queue = queue.Queue()
+        self._metrics_lock = threading.Lock()
+        self._latencies_ms = deque(maxlen=1000)
+        self._queue_waits_ms = deque(maxlen=1000)
+        self._counts = {"requests": 0, "rejected": 0, "errors": 0, "batches": 0, "batched_items": 0, "abandoned": 0}
+        self._thread = threading.Thread(target=self._run, name=f"inference-{name}", daemon=True)
+        self._thread.start()
+
+    def submit(self, data, params, timeout=None):
+        # qsize() is approximate, which is fine for a backpressure limit.
+        if self._queue.qsize() >= self.max_queue_depth:
+            with self._metrics_lock:
+                self._counts["rejected"] += 1
+            raise QueueFullError(f"Task '{self.name}' queue is full ({self.max_queue_depth} pending).")
+
+        pending = _PendingRequest(data, params)
+        self._queue.put(pending)
+        if not pending.done.wait(timeout):
+            pending.abandoned = True
+            with self._metrics_lock:
+                self._counts["abandoned"] += 1
+            raise TimeoutError(f"Task '{self.name}' did not complete within {timeout}s.")
+        with self._metrics_lock:
+            self._counts["requests"] += 1
+            self._latencies_ms.append((time.perf_counter() - pending.enqueued_at) * 1000)
+            if pending.error is not None:
+                self._counts["errors"] += 1
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _collect_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = [pending for pending in self._collect_batch() if not pending.abandoned]
+            if not batch:
+                continue
+            started = time.perf_counter()
+            with self._metrics_lock:
+                self._counts["batches"] += 1
+                self._counts["batched_items"] += len(batch)
+                self._queue_waits_ms.extend((started - p.enqueued_at) * 1000 for p in batch)
+            try:
+                results = self.handler([(p.data, p.params) for p in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(
+                        f"Task '{self.name}' handler returned {len(results)} results for a batch of {len(batch)}."
+                    )
+                for pending, result in zip(batch, results):
+                    pending.result = result
+            except Exception as e:
+                logger.exception("Inference task '%s' failed for a batch of %d", self.name, len(batch))
+                for pending in batch:
+                    pending.error = e
+            finally:
+                for pending in batch:
+                    pending.done.set()
+
+    @staticmethod
+    def _percentile(values, pct):
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))], 1)
+
+    def metrics(self):
+        with self._metrics_lock:
+            latencies = list(self._latencies_ms)
+            waits = list(self._queue_waits_ms)
+            counts = dict(self._counts)
+        return {
+            **counts,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "avg_batch_size": round(counts["batched_items"] / counts["batches"], 2) if counts["batches"] else None,
+            "latency_ms_p50": self._percentile(latencies, 50),
+            "latency_ms_p95": self._percentile(latencies, 95),
+            "queue_wait_ms_p50": self._percentile(waits, 50),
+            "queue_wait_ms_p95": self._percentile(waits, 95),
+        }
+
+
+# --- Built-in tasks ---
+# Handlers import the heavy libraries lazily; the models come from the registry
+# so `warmup(role="inference")` at startup pre-loads exactly what is served here.
+
+def _decode_rgb(data):
+    import cv2
+    from interview_system.interview_cam import decode_image
+    image = decode_image(data)
+    if image is None:
+        raise ValueError("Could not decode image")
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def _transcribe_batch(batch):
+    # Whisper has no batched transcribe(); the queue still provides backpressure.
+    import tempfile
+    from utils1.model_registry import get_model
+    results = []
+    for data, params in batch:
+        with tempfile.NamedTemporaryFile(delete=False, suffix=params.get("suffix", ".wav")) as temp_audio:
+            temp_audio.write(data)
+            temp_path = temp_audio.name
+        try:
+            result = get_model("whisper").transcribe(temp_path, fp16=False)
+            results.append({"text": result.get("text", "")})
+        finally:
+            os.remove(temp_path)
+    return results
+
+
+def _face_embedding_batch(batch):
+    from interview_system.face_embeddings import compute_face_embedding_local, face_embedding_tag
+    results = []
+    for data, _ in batch:
+        try:
+            embedding = compute_face_embedding_local(data)
+            results.append({"embedding": embedding, "model": face_embedding_tag()})
+        except Exception as e:
+            # No face in the frame is a normal outcome, not a server error.
+            results.append({"error": str(e)})
+    return results
+
+
+def _face_stage_batch(batch):
+    from interview_system.interview_cam import _face_stage
+    results = []
+    for data, _ in batch:
+        is_frontal, frontal_msg, multiple_faces = _face_stage(_decode_rgb(data))
+        results.append({"orientation_ok": is_frontal, "face_orientation_msg": frontal_msg, "multiple_faces": multiple_faces})
+    return results
+
+
+def _detect_objects_batch(batch):
+    from interview_system.interview_cam import detect_object_labels
+    images = [_decode_rgb(data) for data, _ in batch]
+    # One forward pass for the whole batch.
+    return [{"labels": labels} for labels in detect_object_labels(images)]
+
+
+BUILTIN_TASKS = {
+    "transcribe": {"handler": _transcribe_batch, "max_batch_size": 1},
+    "face_embedding": {"handler": _face_embedding_batch},
+    "face_stage": {"handler": _face_stage_batch},
+    "detect_objects": {"handler": _detect_objects_batch},
+}
+
+
+# --- HTTP server ---
+
+class _InferenceRequestHandler(BaseHTTPRequestHandler):
+    server_version = "GatepInference/1.0"
+
+    def _send_json(self, status_code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if status_code == 503:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            self._send_json(200, {name: batcher.metrics() for name, batcher in self.server.batchers.items()})
+        else:
+            self._send_json(404, {"error": f"Unknown path '{path}'"})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        task = parsed.path[len("/v1/"):] if parsed.path.startswith("/v1/") else None
+        batcher = self.server.batchers.get(task)
+        if batcher is None:
+            self._send_json(404, {"error": f"Unknown task '{task}'"})
+            return
+
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            result = batcher.submit(data, dict(parse_qsl(parsed.query)), timeout=self.server.request_timeout)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)})
+        except TimeoutError as e:
+            self._send_json(504, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+        else:
+            self._send_json(200, result)
+
+    def address_string(self):
+        # client_address is an empty string on a Unix socket.
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        socketserver.UnixStreamServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def build_server(address, tasks=None, max_batch_size=8, batch_window_ms=10, max_queue_depth=64, request_timeout=30):
+    """
+    Builds (but does not start) the server. `address` is either a filesystem path
+    for a Unix socket or a (host, port) tuple.
+    """
+    if isinstance(address, str):
+        if os.path.exists(address):
+            os.remove(address)
+        server = _ThreadingUnixHTTPServer(address, _InferenceRequestHandler)
+    else:
+        server = ThreadingHTTPServer(address, _InferenceRequestHandler)
+
+    server.request_timeout = request_timeout
+    server.batchers = {}
+    for name, spec in (tasks or BUILTIN_TASKS).items():
+        server.batchers[name] = MicroBatcher(
+            name,
+            spec["handler"],
+            max_batch_size=spec.get("max_batch_size", max_batch_size),
+            batch_window_ms=spec.get("batch_window_ms", batch_window_ms),
+            max_queue_depth=spec.get("max_queue_depth", max_queue_depth),
+        )
+    return server
@@ -0,0 +1,411 @@
+# utils1/match_engine.py
+"""
+Vectorised skill matching between talents and published jobs.
+
+Each process keeps two sparse binary matrices built from the skill join tables
+(talent_management.skill_taxonomy): talents x skills (the skills of every talent's
+latest resume) and jobs x skills (active, published job postings). Each matrix also
+has an inverted index, skill -> sorted keys (postings) of the rows with that skill.
+The match score is the one utils1.ai_match has always used, the share of the job's
+skills the talent has. Ranking one job against all talents (or one talent against
+all jobs) only reads the postings of the query's skills:
+
+  * candidates are the union of those postings, so rows sharing no skill with the
+    query are never touched and the cost follows the number of relevant rows,
+  * with a minimum score, a row needs m of the n query skills, and by pigeonhole it
+    must then appear in one of the n - m + 1 rarest postings (lowest document
+    frequency); only those are unioned and the rest are intersected with them,
+
+followed by an argpartition top-k.
+
+Changes are applied incrementally: Resume.save() and JobPosting.save() queue the
+talent / job in the process that saved it, and every MATCH_ENGINE_REFRESH_SECONDS
+the engine also polls rows whose updated_at moved (changes made by other workers).
+Changed rows are kept beside the base matrix until there are enough of them to be
+worth folding in. A full rebuild every MATCH_ENGINE_REBUILD_SECONDS picks up hard
+deletes.
+"""
+
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.dispatch import Signal
+from django.utils import timezone
+
+COMPACT_MIN_ROWS = 1000     # changed rows held beside the base matrix before it is rebuilt ...
+COMPACT_FRACTION = 0.05     # ... or this fraction of its rows, whichever is larger
+POLL_OVERLAP = timedelta(seconds=5)  # re-read a little before the last poll to tolerate clock skew
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+_NO_KEYS = np.zeros(0, dtype=np.int64)
+
+# Sent by notify_talent_changed / notify_job_changed after a resume or job posting was
+# saved, whether or not this process has built the engine (see employer_management/signals.py).
+talent_skills_changed = Signal()  # kwargs: talent_id
+job_skills_changed = Signal()     # kwargs: job_id
+
+
+def _contains(postings, keys):
+    """Boolean mask of which `keys` are in the sorted array `postings`."""
+    if not len(postings):
+        return np.zeros(len(keys), dtype=bool)
+    positions = np.minimum(np.searchsorted(postings, keys), len(postings) - 1)
+    return postings[positions] == keys
+
+
+def intersect_postings(postings_lists):
+    """Sorted keys present in every postings list; the shortest lists are merged first."""
+    postings_lists = sorted(postings_lists, key=len)
+    if not postings_lists:
+        return _NO_KEYS
+    result = postings_lists[0]
+    for postings in postings_lists[1:]:
+        if not len(result):
+            break
+        result = result[_contains(postings, result)]
+    return result
+
+
+def union_postings(postings_lists):
+    """Sorted keys present in any postings list."""
+    postings_lists = [postings for postings in postings_lists if len(postings)]
+    if not postings_lists:
+        return _NO_KEYS
+    return np.unique(np.concatenate(postings_lists))
+
+
+class SkillMatrix:
+    """
+    Binary key x skill-column matrix (CSR, plus its CSC transpose as the inverted
+    index) and the rows changed since it was built. A changed row hides the base row
+    with the same key; an empty row removes the key.
+    """
+
+    def __init__(self, rows, num_columns):
+        from scipy import sparse
+
+        self.keys = np.array(sorted(rows), dtype=np.int64)
+        lengths = np.array([len(rows[key]) for key in self.keys], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate([rows[key] for key in self.keys]).astype(np.int32) if len(self.keys) else _EMPTY
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(len(self.keys), num_columns)
+        )
+        self.sizes = lengths.astype(np.float32)
+        self.hidden = np.zeros(len(self.keys), dtype=bool)
+        self.key_to_row = {int(key): row for row, key in enumerate(self.keys)}
+        self.changed = {}
+        # Column c's base postings are rows columns.indices[indptr[c]:indptr[c + 1]], in
+        # ascending row (and so key) order; changed rows are tracked per column separately.
+        self.columns = self.matrix.tocsc()
+        self.columns.sort_indices()
+        self.changed_postings = defaultdict(set)
+
+    def __len__(self):
+        return int((self.sizes[~self.hidden] > 0).sum()) + sum(1 for columns in self.changed.values() if len(columns))
+
+    def set_row(self, key, columns):
+        row = self.key_to_row.get(key)
+        if row is not None:
+            self.hidden[row] = True
+        for column in self.changed.get(key, _EMPTY):
+            self.changed_postings[int(column)].discard(key)
+        self.changed[key] = np.unique(np.asarray(columns, dtype=np.int32))
+        for column in self.changed[key]:
+            self.changed_postings[int(column)].add(key)
+
+    def row(self, key):
+        if key in self.changed:
+            return self.changed[key]
+        row = self.key_to_row.get(key)
+        if row is None:
+            return _EMPTY
+        return self.matrix.indices[self.matrix.indptr[row]:self.matrix.indptr[row + 1]]
+
+    def needs_compaction(self):
+        return len(self.changed) > max(COMPACT_MIN_ROWS, COMPACT_FRACTION * len(self.keys))
+
+    def current_rows(self):
+        rows = {int(key): self.row(int(key)) for key in self.keys[~self.hidden]}
+        rows.update(self.changed)
+        return {key: columns for key, columns in rows.items() if len(columns)}
+
+    def postings(self, column):
+        """Sorted keys of the current rows that contain `column`."""
+        if column < self.columns.shape[1]:
+            rows = self.columns.indices[self.columns.indptr[column]:self.columns.indptr[column + 1]]
+            keys = self.keys[rows[~self.hidden[rows]]]
+        else:
+            keys = _NO_KEYS  # skill first seen after the build
+        extra = self.changed_postings.get(int(column))
+        if extra:
+            keys = union_postings([keys, np.array(sorted(extra), dtype=np.int64)])
+        return keys
+
+    def document_frequency(self, column):
+        return len(self.postings(column))
+
+    def row_sizes(self, keys):
+        """Number of columns in the current row of each of `keys`."""
+        sizes = np.zeros(len(keys), dtype=np.float32)
+        if len(self.keys):
+            rows = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            in_base = self.keys[rows] == keys
+            sizes[in_base] = self.sizes[rows[in_base]]
+        if self.changed:
+            changed_keys = np.array(sorted(self.changed), dtype=np.int64)
+            for position in np.flatnonzero(_contains(changed_keys, keys)):
+                sizes[position] = len(self.changed[int(keys[position])])
+        return sizes
+
+    def overlaps(self, columns, min_count=1):
+        """
+        Returns (keys, overlap counts, row sizes) for the rows that contain at least
+        `min_count` of `columns`, reading only the postings of those columns.
+        """
+        postings_lists = sorted((self.postings(int(column)) for column in np.unique(columns)), key=len)
+        min_count = max(1, min_count)
+        if min_count > len(postings_lists):
+            return _NO_KEYS, np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.float32)
+
+        if min_count == 1:
+            keys, counts = np.unique(np.concatenate(postings_lists), return_counts=True)
+        elif min_count == len(postings_lists):
+            keys = intersect_postings(postings_lists)
+            counts = np.full(len(keys), min_count)
+        else:
+            # A row with min_count of the n columns has one of the n - min_count + 1 rarest.
+            keys = union_postings(postings_lists[:len(postings_lists) - min_count + 1])
+            counts = np.zeros(len(keys), dtype=np.int64)
+            for postings in postings_lists:
+                counts += _contains(postings, keys)
+            keep = counts >= min_count
+            keys, counts = keys[keep], counts[keep]
+        return keys, counts.astype(np.float32), self.row_sizes(keys)
+
+
+def top_k(keys, scores, k):
+    """
+    (key, score) pairs of the k highest scores, best first, via a partial sort.
+    Ties are broken by the lower key, also at the k-th place.
+    """
+    if k is not None and k <= 0:
+        return []
+    if k is not None and k < len(scores):
+        kth_score = -np.partition(-scores, k - 1)[k - 1]
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)
+        candidates = np.concatenate([above, ties[np.argsort(keys[ties], kind='stable')][:k - len(above)]])
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.lexsort((keys[candidates], -scores[candidates]))]
+    return [(int(keys[i]), round(float(scores[i]), 2)) for i in order]
+
+
+def _ranked(keys, scores, k, min_score):
+    if min_score is not None:
+        keep = scores >= min_score - 1e-6
+        keys, scores = keys[keep], scores[keep]
+    return top_k(keys, scores, k)
+
+
+class SkillMatchEngine:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._columns = {}
+        self._talents = None
+        self._jobs = None
+        self._built_at = 0.0
+        self._polled_at = 0.0
+        self._poll_since = None
+        self._pending_talents = set()
+        self._pending_jobs = set()
+
+    # --- Loading ---------------------------------------------------------------
+
+    def _column(self, skill_id):
+        column = self._columns.get(skill_id)
+        if column is None:
+            column = self._columns[skill_id] = len(self._columns)
+        return column
+
+    def _columns_for(self, skill_ids):
+        return np.array([self._column(skill_id) for skill_id in skill_ids], dtype=np.int32)
+
+    def _load_talent_rows(self, talent_ids=None):
+        from talent_management.models import Resume, ResumeSkill, UserRole
+
+        resumes = Resume.objects.filter(is_deleted=False, talent_id__user_role=UserRole.TALENT)
+        if talent_ids is not None:
+            resumes = resumes.filter(talent_id__in=talent_ids)
+        # Latest resume per talent, as the match views use.
+        latest = {}
+        for resume_id, talent_id in resumes.order_by('talent_id', '-updated_at', '-id').values_list('id', 'talent_id'):
+            latest.setdefault(talent_id, resume_id)
+        resume_to_talent = {resume_id: talent_id for talent_id, resume_id in latest.items()}
+
+        pairs = ResumeSkill.objects.filter(resume__is_deleted=False)
+        if talent_ids is not None:
+            pairs = pairs.filter(resume_id__in=list(resume_to_talent))
+        skills = defaultdict(list)
+        for resume_id, skill_id in pairs.values_list('resume_id', 'skill_id').iterator(chunk_size=10000):
+            talent_id = resume_to_talent.get(resume_id)
+            if talent_id is not None:
+                skills[talent_id].append(skill_id)
+        return {talent_id: self._columns_for(skills.get(talent_id, ())) for talent_id in latest}
+
+    def _load_job_rows(self, job_ids=None):
+        from employer_management.models import JobPosting, JobSkill, JobStatus
+
+        jobs = JobPosting.objects.filter(is_active=True, status=JobStatus.PUBLISHED)
+        pairs = JobSkill.objects.filter(job_posting__is_active=True, job_posting__status=JobStatus.PUBLISHED)
+        if job_ids is not None:
+            jobs = jobs.filter(id__in=job_ids)
+            pairs = pairs.filter(job_posting_id__in=job_ids)
+        skills = defaultdict(list)
+        for job_id, skill_id in pairs.values_list('job_posting_id', 'skill_id').iterator(chunk_size=10000):
+            skills[job_id].append(skill_id)
+        return {job_id: self._columns_for(skills.get(job_id, ())) for job_id in jobs.values_list('id', flat=True)}
+
+    def _build(self):
+        started = time.monotonic()
+        poll_since = timezone.now()
+        talent_rows, job_rows = self._load_talent_rows(), self._load_job_rows()
+        self._talents = SkillMatrix(talent_rows, len(self._columns))
+        self._jobs = SkillMatrix(job_rows, len(self._columns))
+        self._built_at = self._polled_at = time.monotonic()
+        self._poll_since = poll_since
+        self._pending_talents.clear()
+        self._pending_jobs.clear()
+        print(f"Match engine built: {len(self._talents)} talents, {len(self._jobs)} jobs, "
+              f"{len(self._columns)} skills in {time.monotonic() - started:.2f}s")
+
+    def _poll_changes(self):
+        from employer_management.models import JobPosting
+        from talent_management.models import Resume
+
+        poll_since = timezone.now()
+        since = self._poll_since - POLL_OVERLAP
+        self._pending_talents.update(
+            Resume.objects.filter(updated_at__gte=since, talent_id__isnull=False).values_list('talent_id', flat=True)
+        )
+        self._pending_jobs.update(JobPosting.objects.filter(updated_at__gte=since).values_list('id', flat=True))
+        self._poll_since = poll_since
+        self._polled_at = time.monotonic()
+
+    def _apply_pending(self):
+        if self._pending_talents:
+            talent_ids = list(self._pending_talents)
+            rows = self._load_talent_rows(talent_ids)
+            for talent_id in talent_ids:
+                self._talents.set_row(talent_id, rows.get(talent_id, _EMPTY))
+            self._pending_talents.clear()
+        if self._pending_jobs:
+            job_ids = list(self._pending_jobs)
+            rows = self._load_job_rows(job_ids)
+            for job_id in job_ids:
+                self._jobs.set_row(job_id, rows.get(job_id, _EMPTY))
+            self._pending_jobs.clear()
+
+        for name in ('_talents', '_jobs'):
+            matrix = getattr(self, name)
+            if matrix.needs_compaction():
+                setattr(self, name, SkillMatrix(matrix.current_rows(), len(self._columns)))
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._talents is None or now - self._built_at > settings.MATCH_ENGINE_REBUILD_SECONDS:
+            self._build()
+            return
+        if now - self._polled_at > settings.MATCH_ENGINE_REFRESH_SECONDS:
+            self._poll_changes()
+        if self._pending_talents or self._pending_jobs:
+            self._apply_pending()
+
+    # --- Change notifications (called from the models' save()) -----------------
+
+    def talent_changed(self, talent_id):
+        if talent_id is not None and self._talents is not None:
+            with self._lock:
+                self._pending_talents.add(talent_id)
+
+    def job_changed(self, job_id):
+        if self._jobs is not None:
+            with self._lock:
+                self._pending_jobs.add(job_id)
+
+    # --- Queries -----------------------------------------------------------------
+
+    def talent_skill_columns(self, talent_id):
+        with self._lock:
+            self._ensure_current()
+            return self._talents.row(talent_id)
+
+    def job_skill_columns(self, job_id):
+        with self._lock:
+            self._ensure_current()
+            return self._jobs.row(job_id)
+
+    def rank_talents_for_job(self, job_id=None, skill_ids=None, k=None, exclude_talent_ids=(), min_score=None):
+        """
+        Ranks the talents sharing at least one skill with a job (or an explicit list
+        of skill_ids). Returns up to k (talent_id, score) pairs with score >= min_score,
+        best first.
+        """
+        with self._lock:
+            self._ensure_current()
+            columns = self._jobs.row(job_id) if skill_ids is None else np.unique(self._columns_for(skill_ids))
+            if not len(columns):
+                return []
+            # The score is the share of the job's skills, so min_score needs this many of them.
+            min_count = math.ceil(min_score * len(columns) / 100.0 - 1e-6) if min_score else 1
+            keys, counts, _ = self._talents.overlaps(columns, min_count)
+        if exclude_talent_ids:
+            keep = ~np.isin(keys, np.fromiter(exclude_talent_ids, dtype=np.int64))
+            keys, counts = keys[keep], counts[keep]
+        return _ranked(keys, 100.0 * counts / len(columns), k, min_score)
+
+    def rank_jobs_for_talent(self, talent_id=None, skill_ids=None, k=None, min_score=None):
+        """
+        Ranks the active published jobs sharing at least one skill with a talent (or
+        an explicit list of skill_ids). Returns up to k (job_id, score) pairs with
+        score >= min_score, best first.
+        """
+        with self._lock:
+            self._ensure_current()
+            columns = self._talents.row(talent_id) if skill_ids is None else np.unique(self._columns_for(skill_ids))
+            keys, counts, sizes = self._jobs.overlaps(columns)
+        return _ranked(keys, 100.0 * counts / sizes, k, min_score)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_match_engine():
+    """The process-wide engine; its matrices are built on the first query."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = SkillMatchEngine()
+    return _engine
+
+
+def notify_talent_changed(talent_id):
+    """Queues a talent for re-reading (if this process has built the engine) and tells listeners."""
+    if _engine is not None:
+        _engine.talent_changed(talent_id)
+    if talent_id is not None:
+        talent_skills_changed.send(sender=SkillMatchEngine, talent_id=talent_id)
+
+
+def notify_job_changed(job_id):
+    if _engine is not None:
+        _engine.job_changed(job_id)
+    job_skills_changed.send(sender=SkillMatchEngine, job_id=job_id)
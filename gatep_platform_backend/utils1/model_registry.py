@@ -0,0 +1,215 @@
+# utils1/model_registry.py
+"""
+Central registry for the heavy ML models used across the platform.
+
+Models are NOT loaded at import time. Each model is registered with a loader
+function and is only loaded the first time `get_model(name)` is called. A
+process that knows it will need a model (e.g. a gunicorn worker serving the
+interview endpoints) can pre-load it with `warmup()`, which is what the
+`warmup_models` management command and the gunicorn `post_worker_init` hook use.
+
+Every load records how long it took and how much the process RSS grew, so we
+can see what each model actually costs (`model_stats()`).
+"""
+
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_LOADERS = {}   # name -> loader callable
+_MODELS = {}    # name -> loaded model object
+_STATS = {}     # name -> {"load_seconds": float, "rss_delta_mb": float|None, "rss_after_mb": float|None}
+_LOCK = threading.Lock()
+_NAME_LOCKS = {}
+
+
+def _current_rss_mb():
+    """Returns the RSS of the current process in MB, or None if psutil is unavailable."""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss / (1024 * 1024)
+
+
+def register_model(name, loader):
+    """
+    Registers a loader for a model. The loader is a zero-argument callable that
+    returns the loaded model; it is only called on first use.
+    """
+    with _LOCK:
+        _LOADERS[name] = loader
+        _NAME_LOCKS.setdefault(name, threading.Lock())
+
+
+def registered_models():
+    return sorted(_LOADERS.keys())
+
+
+def is_loaded(name):
+    return name in _MODELS
+
+
+def get_model(name):
+    """
+    Returns the model registered under `name`, loading it on first use.
+    Concurrent callers for the same model wait for a single load.
+    """
+    model = _MODELS.get(name)
+    if model is not None:
+        return model
+
+    if name not in _LOADERS:
+        raise KeyError(f"No model registered under '{name}'. Registered models: {registered_models()}")
+
+    with _NAME_LOCKS[name]:
+        # Another thread may have finished the load while we were waiting.
+        if name in _MODELS:
+            return _MODELS[name]
+
+        rss_before = _current_rss_mb()
+        start = time.perf_counter()
+        logger.info("Loading model '%s'...", name)
+        model = _LOADERS[name]()
+        elapsed = time.perf_counter() - start
+        rss_after = _current_rss_mb()
+
+        _MODELS[name] = model
+        _STATS[name] = {
+            "load_seconds": round(elapsed, 3),
+            "rss_delta_mb": round(rss_after - rss_before, 1) if rss_before is not None and rss_after is not None else None,
+            "rss_after_mb": round(rss_after, 1) if rss_after is not None else None,
+        }
+        logger.info("Model '%s' loaded in %.2fs (RSS delta: %s MB)", name, elapsed, _STATS[name]["rss_delta_mb"])
+        return model
+
+
+def unload_model(name):
+    """Drops the cached instance so the next `get_model` reloads it."""
+    with _LOCK:
+        _MODELS.pop(name, None)
+        _STATS.pop(name, None)
+
+
+def models_for_role(role):
+    """Returns the list of model names configured for a process role in settings.MODEL_WARMUP_ROLES."""
+    roles = getattr(settings, "MODEL_WARMUP_ROLES", {})
+    if role not in roles:
+        raise KeyError(f"Unknown process role '{role}'. Configured roles: {sorted(roles.keys())}")
+    return list(roles[role])
+
+
+def warmup(names=None, role=None):
+    """
+    Loads the given models (or the models configured for `role`) up-front.
+    Returns a dict of name -> stats for every model that was requested. A model
+    that fails to load is reported with an 'error' key instead of aborting the
+    whole warm-up.
+    """
+    if names is None:
+        names = models_for_role(role) if role else []
+
+    report = {}
+    for name in names:
+        try:
+            get_model(name)
+            report[name] = dict(_STATS.get(name, {}))
+        except Exception as e:
+            logger.exception("Failed to warm up model '%s'", name)
+            report[name] = {"error": str(e)}
+    return report
+
+
+def model_stats():
+    """Returns load statistics for every model loaded in this process."""
+    return {name: dict(stats) for name, stats in _STATS.items()}
+
+
+# --- Built-in model loaders ---
+# Heavy libraries are imported inside the loaders so that importing this
+# module (or any view that uses it) stays cheap.
+
+def _load_whisper():
+    import whisper
+    return whisper.load_model(getattr(settings, "WHISPER_MODEL_SIZE", "base"))
+
+
+def _load_yolov5():
+    import torch
+    # trust_repo=True is required for the current version of the ultralytics hub.
+    return torch.hub.load('ultralytics/yolov5', 'yolov5s', trust_repo=True)
+
+
+def _load_arcface():
+    # DeepFace keeps built models in its own module-level cache; building ArcFace
+    # here makes the first represent()/verify() call skip the weight load.
+    from deepface import DeepFace
+    DeepFace.build_model("ArcFace")
+    return DeepFace
+
+
+def _load_mediapipe_face_detection():
+    import mediapipe as mp
+    # model_selection=1 is the full-range model (faces up to ~5m from the camera).
+    return mp.solutions.face_detection.FaceDetection(model_selection=1, min_detection_confidence=0.5)
+
+
+def _load_mediapipe_face_mesh():
+    import mediapipe as mp
+    # static_image_mode=True: every snapshot is treated as an independent image.
+    return mp.solutions.face_mesh.FaceMesh(static_image_mode=True, max_num_faces=1, min_detection_confidence=0.5)
+
+
+def _load_yolov5_onnx():
+    from utils1.onnx_vision import OnnxYoloDetector
+    return OnnxYoloDetector(settings.ONNX_YOLOV5_PATH, use_int8=settings.ONNX_USE_INT8,
+                            intra_op_threads=settings.ONNX_INTRA_OP_THREADS)
+
+
+def _load_arcface_onnx():
+    from utils1.onnx_vision import OnnxArcFaceEmbedder
+    return OnnxArcFaceEmbedder(settings.ONNX_ARCFACE_PATH, use_int8=settings.ONNX_USE_INT8,
+                               intra_op_threads=settings.ONNX_INTRA_OP_THREADS)
+
+
+def _load_distilgpt2():
+    from transformers import AutoTokenizer, AutoModelForCausalLM, pipeline
+    model_id = "distilbert/distilgpt2"
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModelForCausalLM.from_pretrained(model_id)
+    return pipeline("text-generation", model=model, tokenizer=tokenizer)
+
+
+def _load_minilm():
+    # Plain transformers + mean pooling (what sentence-transformers does for this model);
+    # see utils1/text_embeddings.py.
+    from transformers import AutoTokenizer, AutoModel
+    model_id = getattr(settings, "SENTENCE_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    model = AutoModel.from_pretrained(model_id)
+    model.eval()
+    return tokenizer, model
+
+
+def _load_languagetool():
+    # Optional (language_tool_python + Java); only used when
+    # LANGUAGE_SCORER_USE_LANGUAGETOOL is set for the interview language scorer.
+    import language_tool_python
+    return language_tool_python.LanguageTool("en-US")
+
+
+register_model("whisper", _load_whisper)
+register_model("yolov5", _load_yolov5)
+register_model("arcface", _load_arcface)
+register_model("mediapipe_face_detection", _load_mediapipe_face_detection)
+register_model("mediapipe_face_mesh", _load_mediapipe_face_mesh)
+register_model("yolov5_onnx", _load_yolov5_onnx)
+register_model("arcface_onnx", _load_arcface_onnx)
+register_model("distilgpt2", _load_distilgpt2)
+register_model("minilm", _load_minilm)
+register_model("languagetool", _load_languagetool)
@@ -0,0 +1,168 @@
+# utils1/onnx_vision.py
+"""
+ONNX Runtime (CPU) versions of the interview vision models.
+
+Used when settings.VISION_INFERENCE_BACKEND == "onnx". Both models are loaded
+from local files, so nothing is fetched over the network at load time and
+neither torch nor TensorFlow has to be imported:
+
+  * YOLOv5s exported with the ultralytics exporter:
+        python export.py --weights yolov5s.pt --include onnx --dynamic
+    -> settings.ONNX_YOLOV5_PATH
+  * DeepFace's ArcFace exported from Keras with tf2onnx:
+        python -m tf2onnx.convert --saved-model arcface_savedmodel --output arcface.onnx
+    -> settings.ONNX_ARCFACE_PATH
+
+With settings.ONNX_USE_INT8 the dynamically int8-quantized copy of each model
+(`<name>.int8.onnx`, created next to the original on first load) is used
+instead. Validate either variant against the default backend with
+`python manage.py compare_vision_backends`.
+"""
+
+import os
+
+import numpy as np
+
+# COCO class names in YOLOv5 output order.
+COCO_CLASSES = [
+    'person', 'bicycle', 'car', 'motorcycle', 'airplane', 'bus', 'train', 'truck', 'boat', 'traffic light',
+    'fire hydrant', 'stop sign', 'parking meter', 'bench', 'bird', 'cat', 'dog', 'horse', 'sheep', 'cow',
+    'elephant', 'bear', 'zebra', 'giraffe', 'backpack', 'umbrella', 'handbag', 'tie', 'suitcase', 'frisbee',
+    'skis', 'snowboard', 'sports ball', 'kite', 'baseball bat', 'baseball glove', 'skateboard', 'surfboard',
+    'tennis racket', 'bottle', 'wine glass', 'cup', 'fork', 'knife', 'spoon', 'bowl', 'banana', 'apple',
+    'sandwich', 'orange', 'broccoli', 'carrot', 'hot dog', 'pizza', 'donut', 'cake', 'chair', 'couch',
+    'potted plant', 'bed', 'dining table', 'toilet', 'tv', 'laptop', 'mouse', 'remote', 'keyboard', 'cell phone',
+    'microwave', 'oven', 'toaster', 'sink', 'refrigerator', 'book', 'clock', 'vase', 'scissors', 'teddy bear',
+    'hair drier', 'toothbrush',
+]
+
+
+def quantized_path(model_path):
+    root, ext = os.path.splitext(model_path)
+    return f"{root}.int8{ext}"
+
+
+def quantize_onnx_model(model_path):
+    """Writes a dynamically int8-quantized copy of `model_path` and returns its path."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    output_path = quantized_path(model_path)
+    quantize_dynamic(model_path, output_path, weight_type=QuantType.QInt8)
+    return output_path
+
+
+def create_session(model_path, use_int8=False, intra_op_threads=0):
+    """
+    Creates a CPU InferenceSession for a local model file. With `use_int8` the
+    quantized copy is used (and created first if it does not exist yet).
+    """
+    import onnxruntime as ort
+
+    if not os.path.isfile(model_path):
+        raise FileNotFoundError(f"ONNX model not found: {model_path}")
+    if use_int8:
+        int8_path = quantized_path(model_path)
+        model_path = int8_path if os.path.isfile(int8_path) else quantize_onnx_model(model_path)
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if intra_op_threads:
+        options.intra_op_num_threads = intra_op_threads
+    return ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+
+
+def _nms(boxes, scores, iou_threshold):
+    """Greedy non-maximum suppression. boxes are (x1, y1, x2, y2); returns kept indices."""
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1) * (y2 - y1)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        xx1 = np.maximum(x1[i], x1[order[1:]])
+        yy1 = np.maximum(y1[i], y1[order[1:]])
+        xx2 = np.minimum(x2[i], x2[order[1:]])
+        yy2 = np.minimum(y2[i], y2[order[1:]])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / (areas[i] + areas[order[1:]] - inter + 1e-9)
+        order = order[1:][iou <= iou_threshold]
+    return keep
+
+
+class OnnxYoloDetector:
+    """
+    YOLOv5 on ONNX Runtime with the same thresholds as the torch.hub AutoShape
+    model (conf 0.25, IoU 0.45, class-wise NMS).
+    """
+
+    def __init__(self, model_path, use_int8=False, intra_op_threads=0, conf_threshold=0.25, iou_threshold=0.45):
+        self.session = create_session(model_path, use_int8, intra_op_threads)
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.input_size = model_input.shape[2] if isinstance(model_input.shape[2], int) else 640
+        # A model exported without --dynamic only accepts batch size 1.
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        self.conf_threshold = conf_threshold
+        self.iou_threshold = iou_threshold
+
+    def _letterbox(self, rgb_image):
+        import cv2
+        h, w = rgb_image.shape[:2]
+        scale = min(self.input_size / h, self.input_size / w)
+        new_w, new_h = int(round(w * scale)), int(round(h * scale))
+        canvas = np.full((self.input_size, self.input_size, 3), 114, dtype=np.uint8)
+        top, left = (self.input_size - new_h) // 2, (self.input_size - new_w) // 2
+        canvas[top:top + new_h, left:left + new_w] = cv2.resize(rgb_image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        return canvas.transpose(2, 0, 1).astype(np.float32) / 255.0
+
+    def _postprocess(self, prediction):
+        """prediction: (num_boxes, 5 + num_classes) -> list of class names after NMS."""
+        scores = prediction[:, 5:] * prediction[:, 4:5]
+        class_ids = scores.argmax(axis=1)
+        confidences = scores[np.arange(len(scores)), class_ids]
+        mask = confidences > self.conf_threshold
+        if not mask.any():
+            return []
+        xywh, class_ids, confidences = prediction[mask, :4], class_ids[mask], confidences[mask]
+        boxes = np.concatenate([xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, :2] + xywh[:, 2:] / 2], axis=1)
+        # Offset boxes per class so NMS never suppresses across classes.
+        keep = _nms(boxes + class_ids[:, None] * 4096.0, confidences, self.iou_threshold)
+        return [COCO_CLASSES[class_ids[i]] for i in sorted(keep, key=lambda i: -confidences[i])]
+
+    def detect(self, rgb_images):
+        """Returns one list of detected class names per RGB image."""
+        inputs = np.stack([self._letterbox(image) for image in rgb_images])
+        if self.dynamic_batch:
+            outputs = self.session.run(None, {self.input_name: inputs})[0]
+        else:
+            outputs = np.concatenate([self.session.run(None, {self.input_name: x[None]})[0] for x in inputs])
+        return [self._postprocess(prediction) for prediction in outputs]
+
+
+class OnnxArcFaceEmbedder:
+    """
+    ArcFace on ONNX Runtime. Takes an already cropped BGR face and applies
+    DeepFace-style preprocessing (pad-resize to 112x112, scale to [0, 1]).
+    """
+
+    def __init__(self, model_path, use_int8=False, intra_op_threads=0):
+        self.session = create_session(model_path, use_int8, intra_op_threads)
+        self.input_name = self.session.get_inputs()[0].name
+        self.target_size = 112
+
+    def _preprocess(self, face_bgr):
+        import cv2
+        h, w = face_bgr.shape[:2]
+        scale = min(self.target_size / h, self.target_size / w)
+        resized = cv2.resize(face_bgr, (max(1, int(w * scale)), max(1, int(h * scale))))
+        canvas = np.zeros((self.target_size, self.target_size, 3), dtype=np.uint8)
+        top = (self.target_size - resized.shape[0]) // 2
+        left = (self.target_size - resized.shape[1]) // 2
+        canvas[top:top + resized.shape[0], left:left + resized.shape[1]] = resized
+        return canvas.astype(np.float32) / 255.0
+
+    def embed(self, faces_bgr):
+        """Returns one embedding (list of floats) per cropped face, in a single run."""
+        batch = np.stack([self._preprocess(face) for face in faces_bgr])
+        outputs = self.session.run(None, {self.input_name: batch})[0]
+        return [[float(x) for x in row] for row in outputs]
@@ -0,0 +1,90 @@
+# utils1/prefix_index.py
+"""
+In-memory prefix completion over a sorted array of keys.
+
+Every value (e.g. a canonical skill name) is reachable through one or more keys:
+its own normalised spelling, its aliases and the suffixes starting at each later
+word ("learning" for "machine learning"). Keys are kept sorted, so the keys
+starting with a prefix are one contiguous range found with two binary searches;
+the range's best-ranked rows are cut with a partition and deduplicated by value.
+Answers are cached per prefix until the index is replaced by a new build.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+INNER_WORD_WEIGHT = 0.5   # a match inside a value ranks below one at its start
+CACHE_SIZE = 20000        # prefixes whose answer is kept
+
+
+class PrefixIndex:
+    def __init__(self, entries):
+        """
+        `entries` is an iterable of (value, weight, keys, matched_keys): `keys` are the
+        normalised spellings matching the value from its start, `matched_keys` those
+        that are aliases (reported back as the match). Word suffixes are added here.
+        """
+        rows = []
+        self.values, self.weights = [], []
+        for value_id, (value, weight, keys, aliases) in enumerate(entries):
+            self.values.append(value)
+            self.weights.append(weight)
+            seen = set()
+            for key in keys:
+                words = key.split(" ")
+                for start in range(len(words)):
+                    suffix = " ".join(words[start:])
+                    if suffix and suffix not in seen:
+                        seen.add(suffix)
+                        rank = (weight + 1) * (1.0 if start == 0 else INNER_WORD_WEIGHT)
+                        rows.append((suffix, rank, value_id, key if key in aliases else None))
+        rows.sort(key=lambda row: row[0])
+        self._keys = [row[0] for row in rows]
+        self._ranks = np.array([row[1] for row in rows], dtype=np.float64)
+        self._value_ids = [row[2] for row in rows]
+        self._matched = [row[3] for row in rows]
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.values)
+
+    def complete(self, prefix, limit=10):
+        """Returns up to `limit` (value, weight, matched alias or None) whose keys start with `prefix`, best first."""
+        cache_key = (prefix, limit)
+        with self._cache_lock:
+            if cache_key in self._cache:
+                self._cache.move_to_end(cache_key)
+                return self._cache[cache_key]
+
+        start = bisect.bisect_left(self._keys, prefix)
+        end = bisect.bisect_left(self._keys, prefix + "\uffff")
+        ranks = self._ranks[start:end]
+
+        def order(row):
+            # Best rank first; on a tie the value's own spelling before an alias.
+            return -ranks[row], self._matched[start + row] is not None, self._keys[start + row]
+
+        results, want, taken = [], limit, 0
+        while len(results) < limit and taken < len(ranks):
+            # Several keys can lead to one value, so take more rows than needed and widen if short.
+            want *= 4
+            taken = min(want, len(ranks))
+            picked = np.argpartition(-ranks, taken - 1)[:taken] if taken < len(ranks) else np.arange(taken)
+            results, seen = [], set()
+            for row in sorted(picked.tolist(), key=order):
+                value_id = self._value_ids[start + row]
+                if value_id not in seen:
+                    seen.add(value_id)
+                    results.append((self.values[value_id], self.weights[value_id], self._matched[start + row]))
+                    if len(results) == limit:
+                        break
+
+        with self._cache_lock:
+            self._cache[cache_key] = results
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return results
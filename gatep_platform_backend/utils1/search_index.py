@@ -0,0 +1,295 @@
+# utils1/search_index.py
+"""
+In-process BM25 full-text index stored under settings.SEARCH_INDEX_DIR/<name>/.
+
+A document is an integer key, a bag of weighted terms (`analyze` counts a term in
+a field of weight 3 three times) and filter terms such as "location:pune" that
+restrict results without scoring. A build writes every term's postings (document
+numbers in ascending order, int32) and BM25 impacts (the term-frequency and
+length-normalisation part of the score, float32) into flat .npy files that are
+memory-mapped, so a query only reads the postings of its own terms, adds
+idf * impact into one score array and cuts the requested page with a partition.
+
+Documents added, changed or removed after the build live in an in-memory delta
+(term -> {key: tf}) that is scored exactly, and the built copy of a changed
+document is masked out. Builds are published by atomically replacing the CURRENT
+pointer, as in utils1/vector_index.py.
+"""
+
+import json
+import math
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+from array import array
+from collections import defaultdict
+
+import numpy as np
+from django.conf import settings
+
+K1 = 1.2
+B = 0.75
+MAX_FIELD_TOKENS = 2000     # longer fields (pasted job descriptions) are cut
+_KEEP_OLD_BUILDS = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the this to we will with you your".split()
+)
+
+
+def tokenize(text):
+    """Lower-case word tokens; keeps skill spellings such as "c++", "c#" and "node.js" whole."""
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    return [token for token in _TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def analyze(fields, filters=()):
+    """
+    Turns [(text, weight)] into (term frequencies, document length, filter terms),
+    the document form taken by SearchIndex.build / upsert.
+    """
+    terms = defaultdict(float)
+    length = 0.0
+    for text, weight in fields:
+        for token in tokenize(text)[:MAX_FIELD_TOKENS]:
+            terms[token] += weight
+            length += weight
+    return dict(terms), length, frozenset(filters)
+
+
+def _impact(tf, length, avg_length):
+    """BM25 score of one occurrence count before multiplying by the term's idf."""
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
+
+
+def _idf(frequency, num_docs):
+    return math.log(1 + (num_docs - frequency + 0.5) / (frequency + 0.5))
+
+
+def _top_documents(scores, k):
+    """Document numbers of the k highest non-zero scores, best first; ties go to the lower number (key)."""
+    if k < np.count_nonzero(scores):
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        picked = np.concatenate([above, np.flatnonzero(scores == kth)[:k - len(above)]])
+    else:
+        picked = np.flatnonzero(scores)
+    return picked[np.lexsort((picked, -scores[picked]))]
+
+
+def _matches_filters(doc_filters, filter_groups):
+    return all(any(term in doc_filters for term in group) for group in filter_groups)
+
+
+class SearchIndex:
+    def __init__(self, name):
+        self.name = name
+        self._lock = threading.RLock()
+        self._build_name = None
+        self.built_at = None
+        self._keys = np.zeros(0, dtype=np.int64)      # document number -> key, ascending
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._impacts = np.zeros(0, dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._vocabulary = {}
+        self._avg_length = 1.0
+        self._hidden = np.zeros(0, dtype=bool)        # built documents changed or removed since
+        self._hidden_count = 0
+        self._delta_docs = {}                         # key -> (terms, length, filters) or None if removed
+        self._delta_terms = defaultdict(dict)         # term -> {key: tf} over the live delta documents
+
+    @property
+    def directory(self):
+        return os.path.join(settings.SEARCH_INDEX_DIR, self.name)
+
+    @property
+    def build_name(self):
+        return self._build_name
+
+    @property
+    def delta_size(self):
+        return len(self._delta_docs)
+
+    def __len__(self):
+        live_delta = sum(1 for doc in self._delta_docs.values() if doc is not None)
+        return len(self._keys) - self._hidden_count + live_delta
+
+    # --- Build / load -------------------------------------------------------------
+
+    def build(self, documents, built_at):
+        """Indexes (key, terms, length, filters) documents, publishes the build and loads it."""
+        vocabulary = {}
+        keys, lengths = array("q"), array("f")
+        term_ids, doc_numbers, tfs = array("i"), array("i"), array("f")
+        for number, (key, terms, length, filters) in enumerate(documents):
+            keys.append(key)
+            lengths.append(length)
+            for term, tf in [*terms.items(), *((term, 0.0) for term in filters)]:
+                term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+                doc_numbers.append(number)
+                tfs.append(tf)
+
+        keys = np.frombuffer(keys, dtype=np.int64)
+        term_ids = np.frombuffer(term_ids, dtype=np.int32)
+        lengths = np.frombuffer(lengths, dtype=np.float32)
+        avg_length = float(lengths.mean()) if len(lengths) and lengths.mean() > 0 else 1.0
+        doc_numbers = np.frombuffer(doc_numbers, dtype=np.int32)
+        impacts = _impact(np.frombuffer(tfs, dtype=np.float32), lengths[doc_numbers], avg_length).astype(np.float32)
+        # Number documents in key order so a key is found with a binary search.
+        by_key = np.argsort(keys, kind="stable")
+        renumber = np.empty(len(keys), dtype=np.int32)
+        renumber[by_key] = np.arange(len(keys), dtype=np.int32)
+        doc_numbers = renumber[doc_numbers]
+        order = np.lexsort((doc_numbers, term_ids))
+        offsets = np.searchsorted(term_ids[order], np.arange(len(vocabulary) + 1))
+
+        build_name = f"build-{time.time_ns()}"
+        build_dir = os.path.join(self.directory, build_name)
+        os.makedirs(build_dir, exist_ok=True)
+        np.save(os.path.join(build_dir, "keys.npy"), keys[by_key])
+        np.save(os.path.join(build_dir, "docs.npy"), doc_numbers[order])
+        np.save(os.path.join(build_dir, "impacts.npy"), impacts[order])
+        np.save(os.path.join(build_dir, "offsets.npy"), offsets.astype(np.int64))
+        with open(os.path.join(build_dir, "terms.json"), "w") as f:
+            json.dump(list(vocabulary), f)
+        with open(os.path.join(build_dir, "meta.json"), "w") as f:
+            json.dump({
+                "built_at": built_at,
+                "count": int(len(keys)),
+                "avg_length": avg_length,
+            }, f)
+
+        pointer = os.path.join(self.directory, "CURRENT")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(build_name)
+        os.replace(pointer + ".tmp", pointer)
+        old_builds = sorted(name for name in os.listdir(self.directory) if name.startswith("build-") and name != build_name)
+        for name in old_builds[:max(0, len(old_builds) - _KEEP_OLD_BUILDS)]:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        self.load()
+
+    def load(self):
+        """Maps the current build if it changed since the last load. Returns False if there is none."""
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as f:
+                build_name = f.read().strip()
+        except OSError:
+            return False
+        with self._lock:
+            if build_name == self._build_name:
+                return True
+            build_dir = os.path.join(self.directory, build_name)
+            try:
+                with open(os.path.join(build_dir, "meta.json")) as f:
+                    meta = json.load(f)
+                with open(os.path.join(build_dir, "terms.json")) as f:
+                    vocabulary = {term: term_id for term_id, term in enumerate(json.load(f))}
+                keys = np.load(os.path.join(build_dir, "keys.npy"))
+                docs = np.load(os.path.join(build_dir, "docs.npy"), mmap_mode="r")
+                impacts = np.load(os.path.join(build_dir, "impacts.npy"), mmap_mode="r")
+                offsets = np.load(os.path.join(build_dir, "offsets.npy"))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load search index {self.name}/{build_name}: {e}")
+                return False
+            self._keys, self._docs, self._impacts, self._offsets = keys, docs, impacts, offsets
+            self._vocabulary = vocabulary
+            self._avg_length = meta.get("avg_length") or 1.0
+            self._hidden = np.zeros(len(keys), dtype=bool)
+            self._hidden_count = 0
+            self._build_name = build_name
+            self.built_at = meta.get("built_at")
+            # The delta was relative to the previous build; callers re-add what changed since built_at.
+            self._delta_docs.clear()
+            self._delta_terms.clear()
+            return True
+
+    # --- Incremental updates ------------------------------------------------------
+
+    def _hide_built(self, key):
+        number = np.searchsorted(self._keys, key)
+        if number < len(self._keys) and self._keys[number] == key and not self._hidden[number]:
+            self._hidden[number] = True
+            self._hidden_count += 1
+
+    def _drop_delta(self, key):
+        previous = self._delta_docs.get(key)
+        if previous is not None:
+            for term in previous[0]:
+                postings = self._delta_terms.get(term)
+                if postings is not None:
+                    postings.pop(key, None)
+                    if not postings:
+                        del self._delta_terms[term]
+
+    def upsert(self, key, terms, length, filters):
+        with self._lock:
+            self._hide_built(key)
+            self._drop_delta(key)
+            self._delta_docs[key] = (terms, length, frozenset(filters))
+            for term, tf in terms.items():
+                self._delta_terms[term][key] = tf
+
+    def remove(self, key):
+        with self._lock:
+            self._hide_built(key)
+            self._drop_delta(key)
+            self._delta_docs[key] = None
+
+    # --- Search -------------------------------------------------------------------
+
+    def _postings(self, term):
+        term_id = self._vocabulary.get(term)
+        if term_id is None:
+            return self._docs[:0], self._impacts[:0]
+        start, end = self._offsets[term_id], self._offsets[term_id + 1]
+        return self._docs[start:end], self._impacts[start:end]
+
+    def search(self, terms, filter_groups=(), offset=0, limit=20):
+        """
+        Ranks the documents containing any of `terms` by BM25. `filter_groups` is a
+        list of filter-term lists: a document must have at least one term of every
+        group. Returns (total matches, [(key, score)] for the requested page).
+        """
+        terms = list(dict.fromkeys(terms))
+        with self._lock:
+            num_built = len(self._keys)
+            num_docs = max(1, len(self))
+            scores = np.zeros(num_built, dtype=np.float32)
+            delta_docs = {
+                key: doc for key, doc in self._delta_docs.items()
+                if doc is not None and _matches_filters(doc[2], filter_groups)
+            }
+            delta_scores = defaultdict(float)
+            for term in terms:
+                docs, impacts = self._postings(term)
+                delta_postings = self._delta_terms.get(term, {})
+                # Changed documents count in both the build and the delta; capped at the corpus size.
+                frequency = min(len(docs) + len(delta_postings), num_docs)
+                if not frequency:
+                    continue
+                idf = _idf(frequency, num_docs)
+                if len(docs):
+                    scores[docs] += np.float32(idf) * impacts  # a term lists each document once
+                for key, tf in delta_postings.items():
+                    if key in delta_docs:
+                        delta_scores[key] += idf * _impact(tf, delta_docs[key][1], self._avg_length)
+
+            if self._hidden_count:
+                scores[self._hidden] = 0
+            for group in filter_groups:
+                allowed = np.zeros(num_built, dtype=bool)
+                for term in group:
+                    allowed[self._postings(term)[0]] = True
+                scores[~allowed] = 0
+            keys = self._keys
+
+        total = int(np.count_nonzero(scores)) + len(delta_scores)
+        top = _top_documents(scores, offset + limit)
+        hits = list(zip(keys[top].tolist(), scores[top].tolist()))
+        if delta_scores:
+            hits = sorted([*hits, *delta_scores.items()], key=lambda hit: (-hit[1], hit[0]))
+        return total, [(key, round(score, 2)) for key, score in hits[offset:offset + limit]]
@@ -0,0 +1,176 @@
+# utils1/startup_profiler.py
+"""
+Startup-time profiler for the Django process.
+
+Measures what a cold `django.setup()` plus URL resolution costs, per imported
+module: wall time and RSS growth, both "self" (the module body only) and
+"cumulative" (including everything it imported). The measurement runs in a fresh
+child interpreter so that modules already imported by the caller (e.g. the
+management command itself) do not hide their cost.
+
+Used by the `profile_startup` management command and by the startup budget test
+in talent_management/tests.py.
+
+NOTE: this module must only import the standard library at the top level; it is
+executed as `python -m utils1.startup_profiler` in the child process before
+Django is set up.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+
+_PROCESS = None
+
+
+def _init_rss():
+    """Imports psutil up-front (it must not be imported from inside an import hook)."""
+    global _PROCESS
+    try:
+        import psutil
+    except ImportError:
+        _PROCESS = None
+        return
+    _PROCESS = psutil.Process(os.getpid())
+
+
+def _rss_mb():
+    if _PROCESS is None:
+        return None
+    return _PROCESS.memory_info().rss / (1024 * 1024)
+
+
+# ----------- Child process side ----------- #
+
+def _install_import_hooks(records):
+    """
+    Wraps the exec_module of the standard source/bytecode and extension loaders so
+    that every module body execution is timed and its RSS growth recorded.
+    """
+    import importlib._bootstrap_external as bootstrap_external
+
+    stack = []  # one entry per module currently executing: [child_seconds, child_rss]
+
+    def wrap(original):
+        def exec_module(self, module):
+            stack.append([0.0, 0.0])
+            rss_before = _rss_mb()
+            start = time.perf_counter()
+            try:
+                return original(self, module)
+            finally:
+                elapsed = time.perf_counter() - start
+                rss_after = _rss_mb()
+                rss_delta = (rss_after - rss_before) if rss_before is not None and rss_after is not None else 0.0
+                child_seconds, child_rss = stack.pop()
+                if stack:
+                    stack[-1][0] += elapsed
+                    stack[-1][1] += rss_delta
+                records.append({
+                    "module": module.__name__,
+                    "cumulative_seconds": elapsed,
+                    "self_seconds": max(elapsed - child_seconds, 0.0),
+                    "cumulative_rss_mb": rss_delta,
+                    "self_rss_mb": rss_delta - child_rss,
+                    "depth": len(stack),
+                })
+        return exec_module
+
+    bootstrap_external._LoaderBasics.exec_module = wrap(bootstrap_external._LoaderBasics.exec_module)
+    bootstrap_external.ExtensionFileLoader.exec_module = wrap(bootstrap_external.ExtensionFileLoader.exec_module)
+
+
+def _child_main(output_path):
+    records = []
+    _init_rss()
+    _install_import_hooks(records)
+
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+
+    import django
+    django.setup()
+    setup_seconds = time.perf_counter() - start
+
+    from django.urls import get_resolver
+    resolver = get_resolver()
+    resolver.url_patterns
+    resolver.reverse_dict  # forces every include() to be resolved
+    total_seconds = time.perf_counter() - start
+    rss_end = _rss_mb()
+
+    with open(output_path, "w") as f:
+        json.dump({
+            "setup_seconds": setup_seconds,
+            "url_resolution_seconds": total_seconds - setup_seconds,
+            "total_seconds": total_seconds,
+            "rss_start_mb": rss_start,
+            "rss_end_mb": rss_end,
+            "modules": records,
+        }, f)
+
+
+# ----------- Parent process side ----------- #
+
+def run_startup_profile(settings_module=None, base_dir=None, timeout=600):
+    """
+    Profiles a cold start in a child interpreter and returns the report dict:
+    setup/url/total seconds, start/end RSS and one record per imported module.
+    Raises RuntimeError if the child fails (e.g. a view module raises on import).
+    """
+    if settings_module is None:
+        settings_module = os.environ.get("DJANGO_SETTINGS_MODULE", "gatep_platform_config.settings")
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    env = dict(os.environ)
+    env["DJANGO_SETTINGS_MODULE"] = settings_module
+    env["PYTHONPATH"] = os.pathsep.join(p for p in [base_dir, env.get("PYTHONPATH", "")] if p)
+
+    fd, output_path = tempfile.mkstemp(suffix=".json", prefix="startup_profile_")
+    os.close(fd)
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "utils1.startup_profiler", output_path],
+            cwd=base_dir, env=env, capture_output=True, text=True, timeout=timeout,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"Startup profiling failed (exit code {proc.returncode}):\n{proc.stderr[-4000:]}")
+        with open(output_path) as f:
+            return json.load(f)
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+def top_modules(report, n=20, key="cumulative_seconds", top_level_only=False):
+    """Returns the n most expensive module records sorted by `key`."""
+    records = report["modules"]
+    if top_level_only:
+        records = [r for r in records if r["depth"] == 0]
+    return sorted(records, key=lambda r: r[key], reverse=True)[:n]
+
+
+def top_packages(report, n=20, key="self_seconds"):
+    """
+    Aggregates the per-module self cost by top-level package (e.g. all of 'torch.*')
+    and returns the n most expensive packages as dicts with seconds, rss_mb and module count.
+    """
+    totals = defaultdict(lambda: {"seconds": 0.0, "rss_mb": 0.0, "modules": 0})
+    for r in report["modules"]:
+        package = r["module"].split(".")[0]
+        totals[package]["seconds"] += r["self_seconds"]
+        totals[package]["rss_mb"] += r["self_rss_mb"]
+        totals[package]["modules"] += 1
+    sort_key = "seconds" if key == "self_seconds" else "rss_mb"
+    ranked = sorted(totals.items(), key=lambda item: item[1][sort_key], reverse=True)[:n]
+    return [{"package": name, **stats} for name, stats in ranked]
+
+
+if __name__ == "__main__":
+    _child_main(sys.argv[1])
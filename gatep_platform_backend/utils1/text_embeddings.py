@@ -0,0 +1,60 @@
+# utils1/text_embeddings.py
+"""
+Sentence embeddings with the small MiniLM model (settings.SENTENCE_EMBEDDING_MODEL,
+registered in utils1.model_registry as "minilm").
+
+Vectors are L2-normalised, so the cosine similarity of two of them is their dot
+product. For storage in JSON fields (e.g. the generated interview questions) a
+vector is packed as base64 float16, about 1 KB per 384-d vector.
+"""
+
+import base64
+
+import numpy as np
+
+from utils1.model_registry import get_model
+
+EMBEDDING_DIM = 384
+MAX_TOKENS = 256
+BATCH_SIZE = 32
+
+
+def embed_texts(texts):
+    """Returns a (len(texts), EMBEDDING_DIM) float32 array of normalised embeddings."""
+    import torch
+
+    if not texts:
+        return np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+
+    tokenizer, model = get_model("minilm")
+    vectors = []
+    with torch.inference_mode():
+        for start in range(0, len(texts), BATCH_SIZE):
+            batch = [text or "" for text in texts[start:start + BATCH_SIZE]]
+            encoded = tokenizer(batch, padding=True, truncation=True, max_length=MAX_TOKENS, return_tensors="pt")
+            token_embeddings = model(**encoded).last_hidden_state
+            # Mean pooling over the real (non-padding) tokens.
+            mask = encoded["attention_mask"].unsqueeze(-1).to(token_embeddings.dtype)
+            pooled = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors.append(torch.nn.functional.normalize(pooled, p=2, dim=1).numpy())
+    return np.vstack(vectors).astype(np.float32)
+
+
+def embed_text(text):
+    return embed_texts([text])[0]
+
+
+def encode_vector(vector):
+    """Packs a vector as base64 float16 for JSON storage."""
+    return base64.b64encode(np.asarray(vector, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def decode_vector(data):
+    return np.frombuffer(base64.b64decode(data), dtype=np.float16).astype(np.float32)
+
+
+def cosine_similarity(a, b):
+    """Cosine similarity of two vectors (works for non-normalised input as well)."""
+    a, b = np.asarray(a, dtype=np.float32), np.asarray(b, dtype=np.float32)
+    norm = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(np.dot(a, b) / norm) if norm else 0.0
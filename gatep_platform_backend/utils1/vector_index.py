@@ -0,0 +1,234 @@
+# utils1/vector_index.py
+"""
+In-process approximate nearest-neighbour search over L2-normalised float32 vectors
+(cosine similarity = dot product), e.g. the MiniLM embeddings of utils1/text_embeddings.py.
+
+An index is an IVF (inverted file) layout under settings.VECTOR_INDEX_DIR/<name>/:
+spherical k-means splits the vectors into about sqrt(N) lists and the vectors are
+written sorted by list into one .npy file that is memory-mapped, so a query only
+reads the settings.VECTOR_INDEX_NPROBE lists whose centroids are closest to it
+(contiguous slices of the file). Up to EXACT_SEARCH_MAX_VECTORS vectors there is a
+single list, i.e. exact search.
+
+Vectors added or changed after a build live in an in-memory delta that is searched
+exactly and shadows the built copy. A build is written to a new directory and then
+published by atomically replacing the CURRENT pointer, so processes that have the
+old files mapped keep working and pick up the new build on their next `load()`.
+"""
+
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+EXACT_SEARCH_MAX_VECTORS = 5000
+KMEANS_SAMPLE_SIZE = 20000
+KMEANS_ITERATIONS = 10
+_ASSIGN_CHUNK = 8192
+_KEEP_OLD_BUILDS = 2
+
+
+def _kmeans(vectors, num_lists, seed=0):
+    """Spherical k-means on a sample of the vectors; returns normalised centroids."""
+    rng = np.random.default_rng(seed)
+    sample = vectors[rng.choice(len(vectors), min(len(vectors), KMEANS_SAMPLE_SIZE), replace=False)]
+    centroids = sample[rng.choice(len(sample), num_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        sums[empty] = centroids[empty]  # keep a centroid that lost all its points
+        centroids = sums / np.where(norms == 0, 1.0, norms)
+    return centroids.astype(np.float32)
+
+
+def _top(keys, scores, k):
+    if k < len(scores):
+        picked = np.argpartition(-scores, k - 1)[:k]
+    else:
+        picked = np.arange(len(scores))
+    picked = picked[np.argsort(-scores[picked], kind="stable")]
+    return [(int(keys[i]), float(scores[i])) for i in picked]
+
+
+class VectorIndex:
+    def __init__(self, name, dim):
+        self.name = name
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._build_name = None
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._centroids = np.zeros((0, dim), dtype=np.float32)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._id_to_row = {}
+        self._delta = {}        # key -> vector (or None for removed keys)
+        self._delta_matrix = None  # (all delta keys, live keys, stacked live vectors), built on search
+        self.built_at = None    # ISO timestamp stored with the build
+
+    @property
+    def directory(self):
+        return os.path.join(settings.VECTOR_INDEX_DIR, self.name)
+
+    def __len__(self):
+        shadowed = sum(1 for key in self._delta if key in self._id_to_row)
+        return len(self._ids) - shadowed + sum(1 for vector in self._delta.values() if vector is not None)
+
+    @property
+    def build_name(self):
+        return self._build_name
+
+    @property
+    def delta_size(self):
+        return len(self._delta)
+
+    # --- Build / load -------------------------------------------------------------
+
+    def build(self, keys, vectors, built_at):
+        """Writes a new build of (keys, vectors), publishes it and loads it."""
+        keys = np.asarray(keys, dtype=np.int64)
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        num_lists = 1 if len(keys) <= EXACT_SEARCH_MAX_VECTORS else min(4096, int(np.sqrt(len(keys))))
+
+        if num_lists == 1:
+            centroids = np.zeros((1, self.dim), dtype=np.float32)
+            assignment = np.zeros(len(keys), dtype=np.int64)
+        else:
+            centroids = _kmeans(vectors, num_lists)
+            assignment = np.concatenate([
+                np.argmax(vectors[start:start + _ASSIGN_CHUNK] @ centroids.T, axis=1)
+                for start in range(0, len(vectors), _ASSIGN_CHUNK)
+            ])
+        order = np.argsort(assignment, kind="stable")
+        offsets = np.searchsorted(assignment[order], np.arange(num_lists + 1))
+
+        build_name = f"build-{time.time_ns()}"
+        build_dir = os.path.join(self.directory, build_name)
+        os.makedirs(build_dir, exist_ok=True)
+        np.save(os.path.join(build_dir, "vectors.npy"), vectors[order])
+        np.save(os.path.join(build_dir, "ids.npy"), keys[order])
+        np.save(os.path.join(build_dir, "centroids.npy"), centroids)
+        np.save(os.path.join(build_dir, "offsets.npy"), offsets.astype(np.int64))
+        with open(os.path.join(build_dir, "meta.json"), "w") as f:
+            json.dump({"built_at": built_at, "count": int(len(keys)), "lists": int(num_lists), "dim": self.dim}, f)
+
+        pointer = os.path.join(self.directory, "CURRENT")
+        with open(pointer + ".tmp", "w") as f:
+            f.write(build_name)
+        os.replace(pointer + ".tmp", pointer)
+        self._remove_old_builds(build_name)
+        self.load()
+
+    def _remove_old_builds(self, current):
+        import shutil
+
+        builds = sorted(name for name in os.listdir(self.directory) if name.startswith("build-") and name != current)
+        for name in builds[:-_KEEP_OLD_BUILDS] if len(builds) > _KEEP_OLD_BUILDS else []:
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def load(self):
+        """Maps the current build if it changed since the last load. Returns False if there is none."""
+        try:
+            with open(os.path.join(self.directory, "CURRENT")) as f:
+                build_name = f.read().strip()
+        except OSError:
+            return False
+        with self._lock:
+            if build_name == self._build_name:
+                return True
+            build_dir = os.path.join(self.directory, build_name)
+            try:
+                with open(os.path.join(build_dir, "meta.json")) as f:
+                    meta = json.load(f)
+                vectors = np.load(os.path.join(build_dir, "vectors.npy"), mmap_mode="r")
+                ids = np.load(os.path.join(build_dir, "ids.npy"))
+                centroids = np.load(os.path.join(build_dir, "centroids.npy"))
+                offsets = np.load(os.path.join(build_dir, "offsets.npy"))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not load vector index {self.name}/{build_name}: {e}")
+                return False
+            self._vectors, self._ids, self._centroids, self._offsets = vectors, ids, centroids, offsets
+            self._id_to_row = {int(key): row for row, key in enumerate(ids)}
+            self._build_name = build_name
+            self.built_at = meta.get("built_at")
+            # The delta was relative to the previous build; callers re-add what changed since built_at.
+            self._delta.clear()
+            self._delta_matrix = None
+            return True
+
+    # --- Incremental updates ------------------------------------------------------
+
+    def upsert(self, key, vector):
+        with self._lock:
+            self._delta[int(key)] = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+            self._delta_matrix = None
+
+    def remove(self, key):
+        with self._lock:
+            self._delta[int(key)] = None
+            self._delta_matrix = None
+
+    def similarities(self, query, keys):
+        """Returns {key: cosine similarity to query} for those of `keys` that are in the index."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        found, rows, row_keys = {}, [], []
+        with self._lock:
+            for key in keys:
+                key = int(key)
+                if key in self._delta:
+                    if self._delta[key] is not None:
+                        found[key] = float(self._delta[key] @ query)
+                elif key in self._id_to_row:
+                    rows.append(self._id_to_row[key])
+                    row_keys.append(key)
+            vectors = self._vectors
+        if rows:
+            order = np.argsort(rows)  # read the memory-mapped rows in file order
+            scores = np.asarray(vectors[np.asarray(rows)[order]]) @ query
+            found.update((row_keys[i], float(score)) for i, score in zip(order, scores))
+        return found
+
+    # --- Search -------------------------------------------------------------------
+
+    def search(self, query, k, nprobe=None):
+        """Returns up to k (key, cosine similarity) pairs, most similar first."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        nprobe = nprobe or settings.VECTOR_INDEX_NPROBE
+        with self._lock:
+            vectors, ids, centroids, offsets = self._vectors, self._ids, self._centroids, self._offsets
+            if self._delta_matrix is None:
+                live = [(key, vector) for key, vector in self._delta.items() if vector is not None]
+                self._delta_matrix = (
+                    np.fromiter(self._delta.keys(), dtype=np.int64, count=len(self._delta)),
+                    np.array([key for key, _ in live], dtype=np.int64),
+                    np.stack([vector for _, vector in live]) if live else np.zeros((0, self.dim), dtype=np.float32),
+                )
+            shadowed, delta_keys, delta_vectors = self._delta_matrix
+
+        keys, scores = [], []
+        if len(ids):
+            num_lists = len(centroids)
+            lists = np.arange(num_lists) if num_lists <= nprobe else np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+            for list_index in lists:
+                start, end = int(offsets[list_index]), int(offsets[list_index + 1])
+                if start == end:
+                    continue
+                keys.append(ids[start:end])
+                scores.append(np.asarray(vectors[start:end]) @ query)
+        if keys:
+            keys, scores = np.concatenate(keys), np.concatenate(scores)
+            if len(shadowed):
+                visible = ~np.isin(keys, shadowed)
+                keys, scores = keys[visible], scores[visible]
+        else:
+            keys, scores = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        if len(delta_keys):
+            keys = np.concatenate([keys, delta_keys])
+            scores = np.concatenate([scores, delta_vectors @ query])
+        return _top(keys, scores, k) if len(keys) and k > 0 else []